@@ -0,0 +1,332 @@
+"""
+Dashboard aggregates — precomputed rollups behind the Contract 5 widgets.
+
+The dashboard's charts need totals over the whole data set: ITC at risk
+per state and period, mismatch counts by status, and the top risky vendors
+of a period. Working these out from the graph on every page view is far
+too slow. `AggregateStore` keeps them in a small SQLite file instead, and
+each read is an index range scan over a few hundred rows at most:
+
+  - `mismatches`: one row per `(filing period, supplier state, match
+    status)`, with the invoice key count, the summed tax difference and
+    the ITC at risk (the positive differences of keys not MATCHED). The
+    ITC-at-risk and mismatch-count widgets are both sums over it.
+  - `vendors`: one row per `(gstin, return period)` with its rule risk
+    score, level, ITC mismatch and unpaid tax, indexed by period (and by
+    state and period) then score, so the top N of a period are the first
+    N index entries.
+  - `freshness`: when each rollup was last refreshed, and from what. Every
+    widget response carries it.
+
+Both rollups are refreshed incrementally, never rebuilt from scratch:
+
+  - `update_mismatches()` takes a reconciliation run's Contract 3 output
+    and replaces the rows of the filing periods it covers. A run covers
+    whole periods; write it with `--include-matched` so that a period with
+    no mismatches left still replaces its old rows.
+  - `update_vendors()` takes the vendor risk `FeatureStore`, already
+    updated with an ingestion manifest, and the `(gstin, period)` tags
+    the manifest touches (`cache.manifest_tags()`). Only those rows are
+    rescored and written.
+
+Each update is one transaction, freshness included, so a reader sees
+either the old rollup or the new one.
+
+Usage:
+    python -m backend.reconciliation.matching gstr1.csv gstr2b.csv --include-matched
+    python -m backend.api.aggregates mismatches data/processed/mismatch_vectors.ndjson
+    python -m backend.risk.feature_store data/processed/manifest_<ts>.json
+    python -m backend.api.aggregates vendors data/processed/manifest_<ts>.json
+"""
+
+import argparse
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from backend.graph.csr import read_columns
+from backend.ingestion import money
+from backend.ingestion.normalization import normalize_money
+from backend.reconciliation.matching import STATUSES
+from backend.reconciliation.schemas import MatchStatus
+from backend.risk.feature_store import DEFAULT_PATH as FEATURE_STORE_PATH
+from backend.risk.feature_store import FEATURES, FeatureStore
+from backend.risk.scoring import risk_levels, score
+
+from .cache import manifest_tags
+from .schemas import CONTRACT_VERSION
+
+DEFAULT_PATH = os.path.join("data", "processed", "aggregates.sqlite")
+DEFAULT_TOP_VENDORS = 10
+
+# Contract 3 fields a reconciliation run is rolled up from
+MISMATCH_FIELDS = ("supplierGstin", "filingPeriod", "matchStatus", "taxAmountDifference")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mismatches (
+    period TEXT NOT NULL,
+    state TEXT NOT NULL,
+    status TEXT NOT NULL,
+    month TEXT NOT NULL,
+    invoices INTEGER NOT NULL,
+    tax_difference INTEGER NOT NULL,
+    itc_at_risk INTEGER NOT NULL,
+    PRIMARY KEY (period, state, status)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS vendors (
+    gstin TEXT NOT NULL,
+    period TEXT NOT NULL,
+    month TEXT NOT NULL,
+    state TEXT NOT NULL,
+    risk_score INTEGER NOT NULL,
+    risk_level TEXT NOT NULL,
+    itc_mismatch INTEGER NOT NULL,
+    unpaid_tax INTEGER NOT NULL,
+    PRIMARY KEY (gstin, period)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS vendors_rank ON vendors (month, risk_score DESC, gstin);
+CREATE INDEX IF NOT EXISTS vendors_state_rank ON vendors (state, month, risk_score DESC, gstin);
+CREATE TABLE IF NOT EXISTS freshness (rollup TEXT PRIMARY KEY, updated_at TEXT NOT NULL, source TEXT NOT NULL);
+"""
+
+
+def month_of(period):
+    """`YYYYMM` of an `MMYYYY` period, which sorts in time order."""
+    return period[2:] + period[:2]
+
+
+def mismatch_rollup(frame):
+    """One row per `(period, state, status)` of a frame of Contract 3
+    fields (`MISMATCH_FIELDS`, amounts as text): invoices, summed tax
+    difference and ITC at risk, in paise."""
+    difference = money.parse_money(normalize_money(frame["taxAmountDifference"].fillna("0").to_numpy(dtype=object)))
+    status = frame["matchStatus"].to_numpy(dtype=object)
+    keys = pd.DataFrame(
+        {
+            "period": frame["filingPeriod"].to_numpy(dtype=object),
+            "state": frame["supplierGstin"].str[:2].to_numpy(dtype=object),
+            "status": status,
+            "invoices": np.ones(len(frame), dtype=np.int64),
+            "tax_difference": difference.paise,
+            "itc_at_risk": np.where(status != MatchStatus.MATCHED.value, np.maximum(difference.paise, 0), 0),
+        }
+    )
+    return keys.groupby(["period", "state", "status"], sort=True).sum().reset_index()
+
+
+def feature_rows(features, tags):
+    """Rows of a `FeatureStore` a set of `(gstin, period)` tags covers; a
+    None period covers every period of the GSTIN, a None GSTIN every GSTIN
+    in the period, `(None, None)` everything."""
+    if (None, None) in tags:
+        return np.arange(len(features))
+    rows = set()
+    for gstin, period in tags:
+        if gstin is None:
+            rows.update(row for row, row_period in enumerate(features.periods) if row_period == period)
+        elif period is None:
+            rows.update(features.by_gstin.get(gstin, ()))
+        elif (gstin, period) in features.index:
+            rows.add(features.index[gstin, period])
+    return np.array(sorted(rows), dtype=np.int64)
+
+
+class AggregateStore:
+    """Dashboard rollups in a SQLite file; each call opens its own
+    connection, so the API can read while a batch job refreshes."""
+
+    def __init__(self, path=DEFAULT_PATH, clock=None):
+        self.path = path
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        db = self.connect()
+        try:
+            # Readers keep their snapshot while a refresh writes
+            db.execute("PRAGMA journal_mode = WAL")
+            db.executescript(_SCHEMA)
+        finally:
+            db.close()
+
+    def connect(self):
+        return sqlite3.connect(self.path)
+
+    def _refreshed(self, db, rollup, source):
+        db.execute(
+            "INSERT INTO freshness (rollup, updated_at, source) VALUES (?, ?, ?) "
+            "ON CONFLICT (rollup) DO UPDATE SET updated_at = excluded.updated_at, source = excluded.source",
+            (rollup, self.clock().isoformat(), os.path.basename(source)),
+        )
+
+    def update_mismatches(self, frame, source):
+        """Replace the rollup rows of the periods a reconciliation run's
+        Contract 3 records (`frame`) cover; returns the periods."""
+        rollup = mismatch_rollup(frame)
+        periods = sorted(set(rollup["period"]))
+        rows = zip(
+            rollup["period"],
+            rollup["state"],
+            rollup["status"],
+            map(month_of, rollup["period"]),
+            rollup["invoices"].tolist(),
+            rollup["tax_difference"].tolist(),
+            rollup["itc_at_risk"].tolist(),
+        )
+        db = self.connect()
+        try:
+            with db:
+                db.executemany("DELETE FROM mismatches WHERE period = ?", [(period,) for period in periods])
+                db.executemany("INSERT INTO mismatches VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                self._refreshed(db, "mismatches", source)
+        finally:
+            db.close()
+        return periods
+
+    def update_vendors(self, features, tags, source):
+        """Rescore the feature rows `tags` touch and write them; returns
+        the number of rows written."""
+        rows = feature_rows(features, tags)
+        values = features.values[rows]
+        scores = score(values)["risk_score"]
+        levels = risk_levels(scores)
+        f = dict(zip(FEATURES, values.T))
+        gstins = [features.gstins[row] for row in rows.tolist()]
+        periods = [features.periods[row] for row in rows.tolist()]
+        written = zip(
+            gstins,
+            periods,
+            map(month_of, periods),
+            [gstin[:2] for gstin in gstins],
+            scores.tolist(),
+            levels.tolist(),
+            f["itc_mismatch"].tolist(),
+            f["unpaid_tax"].tolist(),
+        )
+        db = self.connect()
+        try:
+            with db:
+                db.executemany("INSERT OR REPLACE INTO vendors VALUES (?, ?, ?, ?, ?, ?, ?, ?)", written)
+                self._refreshed(db, "vendors", source)
+        finally:
+            db.close()
+        return len(rows)
+
+    # -----------------------------------------------------------------------
+    # Serving
+    # -----------------------------------------------------------------------
+    def _read(self, rollup, query, params):
+        """`(freshness, rows)` of a query, both from one snapshot."""
+        db = self.connect()
+        try:
+            with db:
+                db.execute("BEGIN")
+                found = db.execute("SELECT updated_at, source FROM freshness WHERE rollup = ?", (rollup,)).fetchone()
+                rows = db.execute(query, params).fetchall()
+        finally:
+            db.close()
+        freshness = {"updatedAt": found[0], "source": found[1]} if found else {"updatedAt": None, "source": None}
+        return freshness, rows
+
+    @staticmethod
+    def _mismatch_filter(state, period):
+        conditions, params = [], []
+        if state is not None:
+            conditions.append("state = ?")
+            params.append(state)
+        if period is not None:
+            conditions.append("period = ?")
+            params.append(period)
+        return " AND ".join(conditions) or "1", params
+
+    def itc_at_risk(self, state=None, period=None):
+        """Contract 5 `ItcAtRisk` dict: one point per state and period, in
+        time order."""
+        where, params = self._mismatch_filter(state, period)
+        freshness, rows = self._read(
+            "mismatches",
+            # A period reconciled with nothing at risk still gets its point
+            f"SELECT state, period, sum(CASE WHEN status <> ? THEN invoices ELSE 0 END), sum(itc_at_risk) "
+            f"FROM mismatches WHERE {where} GROUP BY month, state ORDER BY month, state",
+            [MatchStatus.MATCHED.value, *params],
+        )
+        points = [
+            {"state": s, "returnPeriod": p, "invoices": n, "itcAtRisk": amount} for s, p, n, amount in rows
+        ]
+        return {"contractVersion": CONTRACT_VERSION, "freshness": freshness, "points": points}
+
+    def mismatch_counts(self, state=None, period=None):
+        """Contract 5 `MismatchCounts` dict: one count per match status."""
+        where, params = self._mismatch_filter(state, period)
+        freshness, rows = self._read(
+            "mismatches",
+            f"SELECT status, sum(invoices), sum(tax_difference) FROM mismatches WHERE {where} GROUP BY status",
+            params,
+        )
+        found = {status: (n, difference) for status, n, difference in rows}
+        counts = [
+            {"matchStatus": status.value, "invoices": n, "taxDifference": difference}
+            for status in STATUSES
+            for n, difference in [found.get(status.value, (0, 0))]
+        ]
+        return {"contractVersion": CONTRACT_VERSION, "freshness": freshness, "counts": counts}
+
+    def top_vendors(self, period=None, state=None, limit=DEFAULT_TOP_VENDORS):
+        """Contract 5 `TopRiskyVendors` dict: the `limit` highest-scoring
+        vendors of `period` (default the latest), optionally of one state."""
+        month = month_of(period) if period is not None else None
+        conditions, params = ["month = coalesce(?, (SELECT max(month) FROM vendors))"], [month]
+        if state is not None:
+            conditions.append("state = ?")
+            params.append(state)
+        freshness, rows = self._read(
+            "vendors",
+            f"SELECT gstin, period, risk_score, risk_level, itc_mismatch, unpaid_tax FROM vendors "
+            f"WHERE {' AND '.join(conditions)} ORDER BY risk_score DESC, gstin LIMIT ?",
+            [*params, limit],
+        )
+        vendors = [
+            {
+                "gstin": gstin,
+                "returnPeriod": vendor_period,
+                "riskScore": risk_score,
+                "riskLevel": level,
+                "itcMismatch": itc_mismatch,
+                "unpaidTax": unpaid_tax,
+            }
+            for gstin, vendor_period, risk_score, level, itc_mismatch, unpaid_tax in rows
+        ]
+        ranked = period if period is not None else (vendors[0]["returnPeriod"] if vendors else None)
+        return {"contractVersion": CONTRACT_VERSION, "freshness": freshness, "returnPeriod": ranked, "vendors": vendors}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh the dashboard aggregates after a load or reconciliation")
+    commands = parser.add_subparsers(dest="rollup", required=True)
+    mismatches = commands.add_parser("mismatches", help="from a reconciliation run's Contract 3 NDJSON")
+    mismatches.add_argument("path", help="NDJSON written by backend.reconciliation.matching")
+    vendors = commands.add_parser("vendors", help="rescore the vendors an ingestion manifest touched")
+    vendors.add_argument("manifest", nargs="?", help="manifest_*.json applied to the feature store; all rows if absent")
+    vendors.add_argument("--features", default=FEATURE_STORE_PATH)
+    for command in (mismatches, vendors):
+        command.add_argument("--store", default=DEFAULT_PATH)
+    args = parser.parse_args(argv)
+
+    os.makedirs(os.path.dirname(args.store) or ".", exist_ok=True)
+    store = AggregateStore(args.store)
+    if args.rollup == "mismatches":
+        periods = store.update_mismatches(read_columns([args.path], list(MISMATCH_FIELDS)), args.path)
+        print(f"  periods refreshed={len(periods):,}")
+    else:
+        features = FeatureStore(args.features)
+        try:
+            tags = manifest_tags(args.manifest) if args.manifest else {(None, None)}
+            rows = store.update_vendors(features, tags, args.manifest or args.features)
+        finally:
+            features.close()
+        print(f"  vendor rows rescored={rows:,}")
+    print(f"Dashboard aggregates written to {args.store}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Response cache for per-taxpayer, per-period API views.
+
+Auditors pull the same `(gstin, period)` views again and again, and each
+pull re-runs a graph traversal. `ResponseCache` keeps the encoded response
+bodies instead:
+
+  - keys are `(gstin, period, contract version)`, so a contract bump never
+    serves an old shape
+  - LRU order with a per-entry TTL, and a cap on the summed body size
+  - each entry carries tags: the `(gstin, period)` pairs whose records it
+    was built from. A taxpayer's invoice view depends on its
+    counterparties' returns and payments as well as its own.
+  - hit / miss / eviction / expiry / invalidation counters (`stats()`)
+
+Invalidation follows the loads journal that `python -m backend.graph.loader`
+appends to (`loader.record_load`). `LoadJournal.poll()` returns the
+manifests loaded since the last poll, and `manifest_tags()` turns each one
+into the pairs its batches touch. An invoice touches its supplier and its
+recipient in its filing period. Returns and payments touch their GSTIN and
+return period, and a taxpayer record touches every period of its GSTIN.
+Tombstones carry only keys, so their tags are wider. A deleted invoice
+names its supplier and period but not its recipient, so it drops every
+entry of its period. A deleted return or payment names neither, so its
+manifest drops every entry.
+
+A body built while an invalidation ran may already be stale, so `put()`
+ignores any body whose read began before the last invalidation.
+"""
+
+import json
+import os
+import time
+from collections import OrderedDict
+
+from backend.graph.csr import read_columns
+from backend.graph.loader import read_manifest
+
+DEFAULT_MAX_BYTES = 64 << 20
+DEFAULT_TTL = 300.0
+
+# Entity -> [(GSTIN field, period field or None)] its batch rows touch
+BATCH_TAGS = {
+    "taxpayer": [("gstin", None)],
+    "invoice": [("supplierGstin", "filingPeriod"), ("recipientGstin", "filingPeriod")],
+    "return": [("gstin", "returnPeriod")],
+    "payment": [("gstin", "returnPeriod")],
+}
+# The same for tombstone rows, which hold only the natural key; a None
+# GSTIN field tags every GSTIN in the period (an invoice's unnamed recipient)
+TOMBSTONE_TAGS = {
+    "taxpayer": [("gstin", None)],
+    "invoice": [("supplierGstin", "filingPeriod"), (None, "filingPeriod")],
+    "return": None,
+    "payment": None,
+}
+
+
+def frame_tags(frame, fields):
+    """Distinct `(gstin, period)` tags of a frame; period None for all
+    periods, GSTIN None for all GSTINs."""
+    tags = set()
+    for gstin_field, period_field in fields:
+        if gstin_field is None:
+            tags.update((None, period) for period in frame[period_field])
+            continue
+        gstins = frame[gstin_field]
+        periods = frame[period_field] if period_field else [None] * len(frame)
+        tags.update((gstin, period) for gstin, period in zip(gstins, periods) if gstin)
+    return tags
+
+
+def manifest_tags(path, verify=False):
+    """The tags a loaded manifest touches; `{(None, None)}` means everything."""
+    _, batches, tombstones = read_manifest(path, verify)
+    tags = set()
+    for files, entity_tags in ((batches, BATCH_TAGS), (tombstones, TOMBSTONE_TAGS)):
+        for entity, batch in files:
+            if entity not in entity_tags:
+                continue
+            fields = entity_tags[entity]
+            if fields is None:
+                return {(None, None)}
+            columns = [field for pair in fields for field in pair if field]
+            tags |= frame_tags(read_columns([batch], list(dict.fromkeys(columns))), fields)
+    return tags
+
+
+class LoadJournal:
+    """Follows the graph loader's loads journal from its current end."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = os.path.getsize(path) if os.path.exists(path) else 0
+
+    def poll(self):
+        """Manifest paths appended since the last poll."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) <= self.offset:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        # A line still being written is read on the next poll
+        complete = data[: data.rfind(b"\n") + 1]
+        self.offset += len(complete)
+        return [json.loads(line)["manifest"] for line in complete.splitlines() if line.strip()]
+
+
+class ResponseCache:
+    """LRU + TTL cache of response bodies under a byte cap, invalidated by tag."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()  # key -> (body, expires, tags)
+        self.tagged = {}  # gstin -> {period -> keys}
+        self.size = 0
+        self.generation = 0
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """The cached body, or None (counted as a miss)."""
+        entry = self.entries.get(key)
+        if entry is not None and entry[1] <= self.clock():
+            self._drop(key)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, body, tags, generation):
+        """Cache `body` under `key`, unless an invalidation ran after
+        `generation` (`self.generation` when the body's read began) or it
+        alone exceeds the byte cap."""
+        if generation != self.generation or len(body) > self.max_bytes:
+            return
+        if key in self.entries:
+            self._drop(key)
+        tags = frozenset(tags)
+        self.entries[key] = (body, self.clock() + self.ttl, tags)
+        self.size += len(body)
+        for gstin, period in tags:
+            self.tagged.setdefault(gstin, {}).setdefault(period, set()).add(key)
+        while self.size > self.max_bytes:
+            self._drop(next(iter(self.entries)))
+            self.evictions += 1
+
+    def _drop(self, key):
+        body, _, tags = self.entries.pop(key)
+        self.size -= len(body)
+        for gstin, period in tags:
+            periods = self.tagged[gstin]
+            periods[period].discard(key)
+            if not periods[period]:
+                del periods[period]
+                if not periods:
+                    del self.tagged[gstin]
+
+    def invalidate(self, tags):
+        """Drop the entries tagged with any of `tags`. A None period matches
+        every period of the GSTIN, a None GSTIN every GSTIN in the period."""
+        self.generation += 1
+        keys = set()
+        for gstin, period in tags:
+            if gstin is None:
+                keys.update(
+                    key
+                    for periods in self.tagged.values()
+                    for tagged_period, tagged in periods.items()
+                    if period is None or tagged_period == period
+                    for key in tagged
+                )
+            elif period is None:
+                keys.update(key for tagged in self.tagged.get(gstin, {}).values() for key in tagged)
+            else:
+                keys.update(self.tagged.get(gstin, {}).get(period, ()))
+        for key in keys:
+            self._drop(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "maxBytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRatio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
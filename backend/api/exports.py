@@ -0,0 +1,219 @@
+"""
+Export store — Contract 3 / Contract 4 records for streamed, keyset-paged
+exports.
+
+A state's or a period's mismatches can run to millions of rows, far too
+many to build into one JSON list in the API. The batch jobs already write
+their results as NDJSON (`reconciliation.matching` the Contract 3 mismatch
+vectors, `risk.scoring` the Contract 4 scored entities). `ExportStore`
+indexes those lines in SQLite, one table per export, keyed on the records'
+stable keys:
+
+  - mismatches: `(supplierGstin, invoiceNumber, filingPeriod)`
+  - scores: `(gstin, returnPeriod)`
+
+Each line is stored verbatim next to its key, so an export is a range scan
+in key order that copies the lines out `PAGE_SIZE` at a time.
+
+Pages are keyset (cursor) pages, not OFFSET pages. A cursor is the last key
+a page returned. The next page starts with a `WHERE (key) > (cursor)` index
+seek, so page 1,000 costs the same as page 1, and rows added or removed
+between requests never shift a page. `page_end()` finds a page's last key
+up front, so the next cursor can go in a response header before the body
+streams. `lines()` reads the page with a single SELECT, so it comes from
+one snapshot even while the table is replaced (WAL mode), and only one
+group of lines is held in memory at a time.
+
+Usage (after the batch jobs have written their output):
+    python -m backend.api.exports mismatches data/processed/mismatch_vectors.ndjson
+    python -m backend.api.exports scores data/processed/scored_entities.ndjson
+"""
+
+import argparse
+import base64
+import binascii
+import json
+import os
+import sqlite3
+from itertools import islice
+
+from backend.graph.csr import extract_columns
+
+DEFAULT_PATH = os.path.join("data", "processed", "exports.sqlite")
+PAGE_SIZE = 5_000
+# Sorts after every character, so `prefix + PREFIX_END` bounds a prefix range
+PREFIX_END = chr(0x10FFFF)
+
+# Export -> (key fields, {filter: field}); a "state" filter matches the
+# first two digits of its field
+EXPORTS = {
+    "mismatches": (
+        ("supplierGstin", "invoiceNumber", "filingPeriod"),
+        {"state": "supplierGstin", "period": "filingPeriod", "status": "matchStatus"},
+    ),
+    "scores": (
+        ("gstin", "returnPeriod"),
+        {"state": "gstin", "period": "returnPeriod", "level": "riskLevel"},
+    ),
+}
+
+
+def columns(name):
+    """Key fields, then the filter fields not in the key."""
+    keys, filters = EXPORTS[name]
+    return keys + tuple(field for field in dict.fromkeys(filters.values()) if field not in keys)
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(list(key), separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    """The key a cursor encodes; raises `ValueError` if it is not one."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("malformed cursor") from None
+    if not isinstance(key, list) or len(key) != size or not all(isinstance(part, str) for part in key):
+        raise ValueError("malformed cursor")
+    return tuple(key)
+
+
+def _where(name, filters, after=None, until=None):
+    """`(SQL condition, parameters)` for a filtered key range."""
+    keys, fields = EXPORTS[name]
+    conditions, params = [], []
+    for filter_name, value in filters.items():
+        if value is None:
+            continue
+        field = fields[filter_name]
+        if filter_name == "state":
+            # The GSTINs with the state code as prefix: from "27" up to
+            # "27" + U+10FFFF, above any ASCII character that follows it
+            # (so "99" has a bound too). A cursor inside the state is the
+            # only lower bound, so SQLite seeks to the cursor rather than
+            # to the start of the state.
+            if after is None or after[0] < value:
+                conditions.append(f"{field} >= ?")
+                params.append(value)
+            conditions.append(f"{field} < ?")
+            params.append(value + PREFIX_END)
+        else:
+            conditions.append(f"{field} = ?")
+            params.append(value)
+    row = f"({', '.join(keys)})"
+    marks = f"({', '.join('?' * len(keys))})"
+    if after is not None:
+        conditions.append(f"{row} > {marks}")
+        params += after
+    if until is not None:
+        conditions.append(f"{row} <= {marks}")
+        params += until
+    return " AND ".join(conditions) or "1", params
+
+
+class ExportStore:
+    """Export tables in a SQLite file; each call opens its own connection,
+    so one store serves concurrent streams."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+
+    def connect(self):
+        # Lines are read from a worker thread other than the one that opened it
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def replace(self, name, paths, group_size=PAGE_SIZE):
+        """Replace export `name` with the lines of NDJSON `paths`, read and
+        inserted `group_size` lines at a time; returns the row count."""
+        fields = columns(name)
+        keys = EXPORTS[name][0]
+        period = EXPORTS[name][1]["period"]
+        db = self.connect()
+        try:
+            # Readers keep streaming their snapshot while the table is replaced
+            db.execute("PRAGMA journal_mode = WAL")
+            with db:
+                db.execute("BEGIN")  # the DDL too, so no reader sees the table missing
+                db.execute(f"DROP TABLE IF EXISTS {name}")
+                # The WITHOUT ROWID primary key keeps the rows in key order as they arrive
+                db.execute(
+                    f"CREATE TABLE {name} ({', '.join(f'{field} TEXT' for field in fields)}, line TEXT NOT NULL, "
+                    f"PRIMARY KEY ({', '.join(keys)})) WITHOUT ROWID"
+                )
+                insert = f"INSERT OR REPLACE INTO {name} VALUES ({', '.join('?' * (len(fields) + 1))})"
+                rows = 0
+                for path in paths:
+                    with open(path, "rb") as f:
+                        for group in iter(lambda: list(islice(f, group_size)), []):
+                            lines = [line.rstrip(b"\r\n") for line in group if not line.isspace()]
+                            if not lines:
+                                continue
+                            values = extract_columns(b"\n".join(lines) + b"\n", fields)
+                            if values is None:
+                                records = json.loads(b"[" + b",".join(lines) + b"]")
+                                values = [[record.get(field) for record in records] for field in fields]
+                            db.executemany(insert, zip(*values, (line.decode("utf-8") for line in lines)))
+                            rows += len(lines)
+                # Serves period exports in key order within the period; built once, after the rows
+                db.execute(f"CREATE INDEX {name}_period ON {name} ({period}, {', '.join(keys)})")
+        finally:
+            db.close()
+        return rows
+
+    def page_end(self, name, filters, after=None, limit=PAGE_SIZE):
+        """`(last key, more)` of the page of up to `limit` rows after
+        `after`: `(None, False)` when the rest fits in the page."""
+        keys = EXPORTS[name][0]
+        where, params = _where(name, filters, after)
+        db = self.connect()
+        try:
+            rows = db.execute(
+                f"SELECT {', '.join(keys)} FROM {name} WHERE {where} ORDER BY {', '.join(keys)} LIMIT 2 OFFSET ?",
+                [*params, limit - 1],
+            ).fetchall()
+        finally:
+            db.close()
+        if not rows:
+            return None, False
+        return rows[0], len(rows) > 1
+
+    def lines(self, name, filters, after=None, until=None, group_size=PAGE_SIZE):
+        """Yield the NDJSON text of the filtered rows after `after`, up to
+        and including `until`, in key order, `group_size` lines at a time."""
+        keys = EXPORTS[name][0]
+        where, params = _where(name, filters, after, until)
+        db = self.connect()
+        try:
+            cursor = db.execute(f"SELECT line FROM {name} WHERE {where} ORDER BY {', '.join(keys)}", params)
+            for rows in iter(lambda: cursor.fetchmany(group_size), []):
+                yield "".join(row[0] + "\n" for row in rows)
+        finally:
+            db.close()
+
+    def __contains__(self, name):
+        if not os.path.exists(self.path):
+            return False
+        db = sqlite3.connect(self.path)
+        try:
+            query = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+            return db.execute(query, (name,)).fetchone() is not None
+        finally:
+            db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index Contract 3 / Contract 4 NDJSON for the export endpoints")
+    parser.add_argument("export", choices=sorted(EXPORTS))
+    parser.add_argument("paths", nargs="+", help="NDJSON files written by the batch job")
+    parser.add_argument("--store", default=DEFAULT_PATH)
+    args = parser.parse_args(argv)
+
+    os.makedirs(os.path.dirname(args.store) or ".", exist_ok=True)
+    rows = ExportStore(args.store).replace(args.export, args.paths)
+    print(f"  {args.export}={rows:,}")
+    print(f"Export index written to {args.store}")
+
+
+if __name__ == "__main__":
+    main()
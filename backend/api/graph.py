@@ -0,0 +1,83 @@
+"""
+Shared async Neo4j access for the API — one driver, a bounded pool, 429s.
+
+Opening a driver (or even a session) per request costs a connection
+handshake each time and lets a burst of requests open as many connections
+as it likes. The app instead owns one `neo4j.AsyncDriver` for its whole
+lifetime (see `main.py`), capped at `pool_size` connections.
+
+Every query runs through `GraphPool.read()`, which first takes one of
+`pool_size` slots. A request that cannot get a slot within
+`acquire_timeout` seconds raises `PoolSaturated`, which the app answers
+with 429 and a `Retry-After` header. Waiting on the driver's own pool
+instead would queue requests until they time out at the client. Queries
+run as managed read transactions (`execute_read`), so on a cluster
+(`neo4j://` URIs) they are routed to read replicas and retried on
+transient errors.
+
+Settings come from the environment:
+
+    NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, NEO4J_DATABASE  (as the loader)
+    NEO4J_POOL_SIZE        connections and concurrent queries (default 50)
+    NEO4J_ACQUIRE_TIMEOUT  seconds to wait for a slot before 429 (default 0.1)
+"""
+
+import asyncio
+import os
+
+DEFAULT_POOL_SIZE = 50
+DEFAULT_ACQUIRE_TIMEOUT = 0.1
+# Seconds a saturated client is told to wait
+RETRY_AFTER = 1
+
+
+class PoolSaturated(Exception):
+    """No pool slot became free within the acquire timeout."""
+
+
+async def _collect(tx, query, params):
+    result = await tx.run(query, params)
+    return await result.data()
+
+
+class GraphPool:
+    """A shared async driver plus the slots that bound its use."""
+
+    def __init__(self, driver, database=None, pool_size=DEFAULT_POOL_SIZE, acquire_timeout=DEFAULT_ACQUIRE_TIMEOUT):
+        self.driver = driver
+        self.database = database
+        self.pool_size = pool_size
+        self.acquire_timeout = acquire_timeout
+        self.slots = asyncio.Semaphore(pool_size)
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls):
+        from neo4j import AsyncGraphDatabase
+
+        pool_size = int(os.environ.get("NEO4J_POOL_SIZE", DEFAULT_POOL_SIZE))
+        acquire_timeout = float(os.environ.get("NEO4J_ACQUIRE_TIMEOUT", DEFAULT_ACQUIRE_TIMEOUT))
+        driver = AsyncGraphDatabase.driver(
+            os.environ.get("NEO4J_URI", "bolt://localhost:7687"),
+            auth=(os.environ.get("NEO4J_USER", "neo4j"), os.environ.get("NEO4J_PASSWORD", "neo4j")),
+            max_connection_pool_size=pool_size,
+            # Slots already bound concurrency; this only guards a stuck pool
+            connection_acquisition_timeout=30.0,
+        )
+        return cls(driver, os.environ.get("NEO4J_DATABASE"), pool_size, acquire_timeout)
+
+    async def read(self, query, **params):
+        """Records of a read query as dicts; raises `PoolSaturated`."""
+        try:
+            await asyncio.wait_for(self.slots.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise PoolSaturated(f"all {self.pool_size} graph connections busy") from None
+        try:
+            async with self.driver.session(database=self.database, default_access_mode="READ") as session:
+                return await session.execute_read(_collect, query, params)
+        finally:
+            self.slots.release()
+
+    async def close(self):
+        await self.driver.close()
@@ -1,7 +1,392 @@
-from fastapi import FastAPI
+"""
+PramanaGST API.
 
-app = FastAPI(title="PramanaGST API")
+The app owns one `GraphPool` (an async Neo4j driver with a bounded pool,
+see `graph.py`) and, when one exists, the vendor risk `FeatureStore`, both
+opened at startup and closed at shutdown. Graph-backed endpoints are
+`async def` and share the pool; a saturated pool answers 429.
 
-@app.get("/")
-def read_root():
-    return {"message": "PramanaGST API Running"}
+Per-period invoice views are served from a `ResponseCache` (see
+`cache.py`). A background task follows the graph loader's loads journal
+and drops the entries each newly loaded manifest touches. The same task
+reopens the feature store whenever the batch jobs commit a new generation
+of it.
+
+Dashboard widgets read precomputed rollups from an `AggregateStore` (see
+`aggregates.py`), which the batch jobs refresh after each load or
+reconciliation run.
+
+Run with any ASGI server, e.g.:
+    uvicorn backend.api.main:app --workers 4
+"""
+
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import numpy as np
+from fastapi import FastAPI, HTTPException, Path, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from backend.graph.loader import LOADS_JOURNAL
+from backend.reconciliation.schemas import MatchStatus
+from backend.risk.feature_store import DEFAULT_PATH as FEATURE_STORE_PATH
+from backend.risk.feature_store import FEATURES, FeatureStore, committed_generation
+from backend.risk.schemas import RiskLevel
+from backend.risk.scoring import dump_scores, score
+
+from . import aggregates, exports, neighbourhood
+from .cache import DEFAULT_MAX_BYTES, DEFAULT_TTL, LoadJournal, ResponseCache, manifest_tags
+from .graph import RETRY_AFTER, GraphPool, PoolSaturated
+from .schemas import RankBy
+
+logger = logging.getLogger(__name__)
+
+GSTIN_PATTERN = r"^[0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1}$"
+PERIOD_PATTERN = r"^(0[1-9]|1[0-2])\d{4}$"
+MAX_LIMIT = 1000
+STATE_PATTERN = r"^[0-9]{2}$"
+MAX_EXPORT_LIMIT = 1_000_000
+MAX_NEIGHBOURHOOD_NODES = 2_000
+MAX_TOP_VENDORS = 100
+# Version of the Contract 2 invoice status view; part of its cache key
+CONTRACT_2_VERSION = "1.0.0"
+# Seconds between polls of the loads journal
+JOURNAL_POLL_INTERVAL = 1.0
+
+# Invoices the GSTIN supplied with no GSTR-1 return paid via a PAID payment
+MISSING_PAYMENT_QUERY = """
+MATCH (:Taxpayer {gstin: $gstin})-[:SUPPLIED]->(i:Invoice)
+WHERE $period IS NULL OR i.filingPeriod = $period
+OPTIONAL MATCH (i)-[:REPORTED_IN]->(f:ReturnFiling {returnType: 'GSTR1'})
+WITH i, collect(f) AS filings
+WHERE none(f IN filings WHERE EXISTS { (f)-[:PAID_VIA]->(:Payment {paymentStatus: 'PAID'}) })
+RETURN i.invoiceNumber AS invoiceNumber, i.filingPeriod AS filingPeriod, size(filings) > 0 AS reported
+ORDER BY filingPeriod, invoiceNumber
+LIMIT $limit
+"""
+
+# Invoices the GSTIN received that no taxpayer supplied
+GHOST_INVOICE_QUERY = """
+MATCH (:Taxpayer {gstin: $gstin})-[:RECEIVED]->(i:Invoice)
+WHERE ($period IS NULL OR i.filingPeriod = $period) AND NOT ()-[:SUPPLIED]->(i)
+RETURN i.supplierGstin AS supplierGstin, i.invoiceNumber AS invoiceNumber, i.filingPeriod AS filingPeriod
+ORDER BY filingPeriod, supplierGstin, invoiceNumber
+LIMIT $limit
+"""
+
+# Contract 2: every invoice the GSTIN supplied or received in the period and
+# how far along the Golden Path it got
+INVOICE_STATUS_QUERY = """
+MATCH (:Taxpayer {gstin: $gstin})-[rel:SUPPLIED|RECEIVED]->(i:Invoice {filingPeriod: $period})
+OPTIONAL MATCH (i)-[:REPORTED_IN]->(f:ReturnFiling)
+WITH i, type(rel) AS role, collect(f) AS filings
+WITH i, role,
+     any(f IN filings WHERE f.returnType = 'GSTR1') AS inGstr1,
+     any(f IN filings WHERE f.returnType = 'GSTR2B') AS inGstr2b,
+     any(f IN filings WHERE f.returnType = 'GSTR1'
+         AND EXISTS { (f)-[:PAID_VIA]->(:Payment {paymentStatus: 'PAID'}) }) AS paid,
+     EXISTS { ()-[:SUPPLIED]->(i) } AS supplied
+RETURN CASE role WHEN 'SUPPLIED' THEN 'OUTWARD' ELSE 'INWARD' END AS direction,
+       i.supplierGstin AS supplierGstin, i.recipientGstin AS recipientGstin,
+       i.invoiceNumber AS invoiceNumber, i.totalValue AS totalValue,
+       inGstr1, inGstr2b, paid,
+       CASE
+         WHEN NOT supplied THEN 'GHOST_INVOICE'
+         WHEN NOT inGstr1 THEN 'NOT_REPORTED'
+         WHEN i.recipientGstin IS NOT NULL AND NOT inGstr2b THEN 'MISSING_IN_GSTR2B'
+         WHEN NOT paid THEN 'MISSING_PAYMENT'
+         ELSE 'MATCHED'
+       END AS matchStatus
+ORDER BY direction, supplierGstin, invoiceNumber
+"""
+
+GstinPath = Path(..., pattern=GSTIN_PATTERN, description="15-character GSTIN")
+PeriodQuery = Query(None, pattern=PERIOD_PATTERN, description="Filing period in MMYYYY format")
+StateQuery = Query(None, pattern=STATE_PATTERN, description="Two-digit state code (GSTIN prefix)")
+CursorQuery = Query(None, description="X-Next-Cursor of the previous page")
+ExportLimitQuery = Query(None, ge=1, le=MAX_EXPORT_LIMIT, description="Page size; the whole rest when absent")
+
+
+def open_feature_store():
+    """The feature store at `FEATURE_STORE` (default path), if it exists."""
+    path = os.environ.get("FEATURE_STORE", FEATURE_STORE_PATH)
+    return FeatureStore(path) if os.path.exists(path) else None
+
+
+def open_export_store():
+    """The export store at `EXPORT_STORE` (default path), if it exists."""
+    path = os.environ.get("EXPORT_STORE", exports.DEFAULT_PATH)
+    return exports.ExportStore(path) if os.path.exists(path) else None
+
+
+def open_aggregate_store():
+    """The dashboard aggregate store at `AGGREGATE_STORE` (default path), if it exists."""
+    path = os.environ.get("AGGREGATE_STORE", aggregates.DEFAULT_PATH)
+    return aggregates.AggregateStore(path) if os.path.exists(path) else None
+
+
+def require_aggregates(request):
+    store = request.app.state.aggregates
+    if store is None:
+        raise HTTPException(503, "dashboard aggregates not available")
+    return store
+
+
+async def stream_export(store, name, filters, cursor, limit):
+    """NDJSON response streaming one keyset page of export `name` (the
+    whole rest without `limit`); `X-Next-Cursor` is set when more follow."""
+    if store is None or name not in store:
+        raise HTTPException(503, f"{name} export not available")
+    try:
+        after = exports.decode_cursor(cursor, len(exports.EXPORTS[name][0])) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(400, str(exc)) from None
+    until, headers = None, {}
+    if limit is not None:
+        until, more = await asyncio.to_thread(store.page_end, name, filters, after, limit)
+        if more:
+            headers["X-Next-Cursor"] = exports.encode_cursor(until)
+    # A sync iterator: Starlette reads it in a worker thread, group by group
+    lines = store.lines(name, filters, after, until)
+    return StreamingResponse(lines, media_type="application/x-ndjson", headers=headers)
+
+
+def cache_from_env():
+    """A `ResponseCache` sized by `API_CACHE_MAX_BYTES` / `API_CACHE_TTL`."""
+    max_bytes = int(os.environ.get("API_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+    return ResponseCache(max_bytes, float(os.environ.get("API_CACHE_TTL", DEFAULT_TTL)))
+
+
+async def apply_loads(cache, journal):
+    """Invalidate what each manifest loaded since the last poll touched;
+    returns the number of entries dropped."""
+    dropped = 0
+    for manifest in journal.poll():
+        try:
+            tags = await asyncio.to_thread(manifest_tags, manifest)
+        except (OSError, ValueError, KeyError):
+            logger.exception("cannot read loaded manifest %s; dropping the whole cache", manifest)
+            tags = {(None, None)}
+        dropped += cache.invalidate(tags)
+    return dropped
+
+
+async def reload_features(state):
+    """Swap in a freshly opened feature store if a newer generation was
+    committed since `state.features` was opened; returns whether it was."""
+    store = state.features
+    if store is None or await asyncio.to_thread(committed_generation, store.path) == store.generation:
+        return False
+    state.features = await asyncio.to_thread(FeatureStore, store.path)
+    # Requests only read the in-memory aggregates, so the old store can go
+    store.close()
+    return True
+
+
+def create_app(graph=None, features=None, cache=None, journal=None, export_store=None, aggregate_store=None):
+    """The API app. `graph` / `features` / `cache` / `journal` /
+    `export_store` / `aggregate_store` default to a `GraphPool` from the
+    environment, `open_feature_store()`, `cache_from_env()`, the loads
+    journal at `GRAPH_LOADS_JOURNAL`, `open_export_store()` and
+    `open_aggregate_store()`, opened at startup."""
+
+    async def follow_loads(app):
+        while True:
+            await asyncio.sleep(JOURNAL_POLL_INTERVAL)
+            try:
+                await apply_loads(app.state.cache, app.state.journal)
+            except Exception:
+                logger.exception("loads journal poll failed")
+            try:
+                await reload_features(app.state)
+            except Exception:
+                logger.exception("feature store reload failed")
+
+    @asynccontextmanager
+    async def lifespan(app):
+        if app.state.graph is None:
+            app.state.graph = GraphPool.from_env()
+        if app.state.features is None:
+            app.state.features = open_feature_store()
+        if app.state.journal is None:
+            app.state.journal = LoadJournal(os.environ.get("GRAPH_LOADS_JOURNAL", LOADS_JOURNAL))
+        if app.state.exports is None:
+            app.state.exports = open_export_store()
+        if app.state.aggregates is None:
+            app.state.aggregates = open_aggregate_store()
+        follower = asyncio.create_task(follow_loads(app))
+        try:
+            yield
+        finally:
+            follower.cancel()
+            await app.state.graph.close()
+            if app.state.features is not None:
+                app.state.features.close()
+
+    app = FastAPI(title="PramanaGST API", lifespan=lifespan)
+    app.state.graph = graph
+    app.state.features = features
+    app.state.cache = cache if cache is not None else cache_from_env()
+    app.state.journal = journal
+    app.state.exports = export_store
+    app.state.aggregates = aggregate_store
+
+    @app.exception_handler(PoolSaturated)
+    async def pool_saturated(request: Request, exc: PoolSaturated):
+        return JSONResponse({"detail": str(exc)}, status_code=429, headers={"Retry-After": str(RETRY_AFTER)})
+
+    @app.get("/")
+    def read_root():
+        return {"message": "PramanaGST API Running"}
+
+    @app.get("/reconciliation/{gstin}/broken-paths")
+    async def broken_paths(
+        request: Request,
+        gstin: str = GstinPath,
+        period: Optional[str] = PeriodQuery,
+        limit: int = Query(100, ge=1, le=MAX_LIMIT),
+    ):
+        """Invoices of `gstin` off the Golden Path: supplied with no paid
+        return (missing payment), received with no supplier (ghost)."""
+        graph = request.app.state.graph
+        params = {"gstin": gstin, "period": period, "limit": limit}
+        return {
+            "gstin": gstin,
+            "period": period,
+            "missingPayment": await graph.read(MISSING_PAYMENT_QUERY, **params),
+            "ghostInvoices": await graph.read(GHOST_INVOICE_QUERY, **params),
+        }
+
+    @app.get("/reconciliation/{gstin}/invoices")
+    async def invoice_status(
+        request: Request,
+        gstin: str = GstinPath,
+        period: str = Query(..., pattern=PERIOD_PATTERN, description="Filing period in MMYYYY format"),
+    ):
+        """Contract 2: every invoice `gstin` supplied or received in
+        `period` with its match status, served from the response cache."""
+        cache = request.app.state.cache
+        key = (gstin, period, CONTRACT_2_VERSION)
+        body = cache.get(key)
+        if body is not None:
+            return Response(body, media_type="application/json", headers={"X-Cache": "HIT"})
+        generation = cache.generation
+        invoices = await request.app.state.graph.read(INVOICE_STATUS_QUERY, gstin=gstin, period=period)
+        view = {"contractVersion": CONTRACT_2_VERSION, "gstin": gstin, "returnPeriod": period, "invoices": invoices}
+        body = json.dumps(view, separators=(",", ":"), default=str).encode()
+        # The view changes with the counterparties' returns and payments too
+        counterparties = {
+            invoice["recipientGstin"] if invoice["direction"] == "OUTWARD" else invoice["supplierGstin"]
+            for invoice in invoices
+        }
+        cache.put(key, body, {(party, period) for party in counterparties | {gstin} if party}, generation)
+        return Response(body, media_type="application/json", headers={"X-Cache": "MISS"})
+
+    @app.get("/cache/stats")
+    def cache_stats(request: Request):
+        """Hit / miss / eviction counters of this process's response cache."""
+        return request.app.state.cache.stats()
+
+    @app.get("/graph/{gstin}/neighbourhood")
+    async def taxpayer_neighbourhood(
+        request: Request,
+        gstin: str = GstinPath,
+        hops: int = Query(neighbourhood.DEFAULT_HOPS, ge=1, le=neighbourhood.MAX_HOPS),
+        period: Optional[str] = PeriodQuery,
+        max_nodes: int = Query(neighbourhood.DEFAULT_MAX_NODES, ge=2, le=MAX_NEIGHBOURHOOD_NODES),
+        rank_by: RankBy = RankBy.VALUE,
+        detail_invoices: int = Query(neighbourhood.DEFAULT_DETAIL_INVOICES, ge=0, le=500),
+    ):
+        """Contract 5: the pruned `hops`-hop trade neighbourhood of `gstin`
+        for the dashboard graph."""
+        store = request.app.state.features
+        risk = neighbourhood.risk_lookup(store, period) if store is not None else None
+        view = await neighbourhood.neighbourhood(
+            request.app.state.graph,
+            gstin,
+            hops,
+            period,
+            max_nodes,
+            rank_by,
+            risk,
+            max_links=5 * max_nodes,
+            detail_invoices=detail_invoices,
+        )
+        if view is None:
+            raise HTTPException(404, "no trade found for this GSTIN and period")
+        return Response(neighbourhood.dump_neighbourhood(view), media_type="application/json")
+
+    @app.get("/exports/mismatches")
+    async def export_mismatches(
+        request: Request,
+        state: Optional[str] = StateQuery,
+        period: Optional[str] = PeriodQuery,
+        status: Optional[MatchStatus] = None,
+        cursor: Optional[str] = CursorQuery,
+        limit: Optional[int] = ExportLimitQuery,
+    ):
+        """Contract 3 mismatch vectors as NDJSON, in `(supplierGstin,
+        invoiceNumber, filingPeriod)` order."""
+        filters = {"state": state, "period": period, "status": status.value if status else None}
+        return await stream_export(request.app.state.exports, "mismatches", filters, cursor, limit)
+
+    @app.get("/exports/scores")
+    async def export_scores(
+        request: Request,
+        state: Optional[str] = StateQuery,
+        period: Optional[str] = PeriodQuery,
+        level: Optional[RiskLevel] = None,
+        cursor: Optional[str] = CursorQuery,
+        limit: Optional[int] = ExportLimitQuery,
+    ):
+        """Contract 4 scored entities as NDJSON, in `(gstin, returnPeriod)` order."""
+        filters = {"state": state, "period": period, "level": level.value if level else None}
+        return await stream_export(request.app.state.exports, "scores", filters, cursor, limit)
+
+    @app.get("/dashboard/itc-at-risk")
+    def dashboard_itc_at_risk(request: Request, state: Optional[str] = StateQuery, period: Optional[str] = PeriodQuery):
+        """Contract 5: ITC at risk per supplier state and filing period."""
+        return require_aggregates(request).itc_at_risk(state, period)
+
+    @app.get("/dashboard/mismatch-counts")
+    def dashboard_mismatch_counts(
+        request: Request, state: Optional[str] = StateQuery, period: Optional[str] = PeriodQuery
+    ):
+        """Contract 5: reconciled invoice keys per match status."""
+        return require_aggregates(request).mismatch_counts(state, period)
+
+    @app.get("/dashboard/risky-vendors")
+    def dashboard_risky_vendors(
+        request: Request,
+        period: Optional[str] = PeriodQuery,
+        state: Optional[str] = StateQuery,
+        limit: int = Query(aggregates.DEFAULT_TOP_VENDORS, ge=1, le=MAX_TOP_VENDORS),
+    ):
+        """Contract 5: the highest-scoring vendors of `period` (default the latest)."""
+        return require_aggregates(request).top_vendors(period, state, limit)
+
+    @app.get("/risk/{gstin}")
+    async def risk(request: Request, gstin: str = GstinPath, period: Optional[str] = PeriodQuery):
+        """Contract 4 scored entities of `gstin`, one per period (or the one
+        `period`), scored from the feature store."""
+        store = request.app.state.features
+        if store is None:
+            raise HTTPException(503, "feature store not available")
+        history = store.history(gstin)
+        periods = [period] if period else sorted(history)
+        if not periods or periods[0] not in history:
+            raise HTTPException(404, "no features for this GSTIN and period")
+        values = np.array([[history[p][name] for name in FEATURES] for p in periods], dtype=np.int64)
+        gstins = np.full(len(periods), gstin, dtype=object)
+        lines = dump_scores(gstins, np.array(periods, dtype=object), values, score(values)).splitlines()
+        # The lines already are the Contract 4 JSON; no need to re-encode them
+        return Response("[" + ",".join(lines) + "]", media_type="application/json")
+
+    return app
+
+
+app = create_app()
@@ -0,0 +1,290 @@
+"""
+Taxpayer neighbourhoods — the Contract 5 view behind the dashboard graph.
+
+A hub taxpayer's ego network can hold hundreds of thousands of invoices,
+far more than the API can serialize quickly or a browser can draw.
+`neighbourhood()` builds a bounded view instead:
+
+  - invoices are collapsed in the graph: each hop query returns one entry
+    per (supplier, recipient) taxpayer pair, with its invoice count and
+    the invoices' `totalValue` strings, never the invoices themselves. The
+    entries come as columns of a single record, so a hub's tens of
+    thousands of pairs are ranked with array operations rather than row
+    by row.
+  - hop by hop, only the new taxpayers ranking highest (by traded value or
+    by risk score) are kept, up to `max_nodes` in all, and only those are
+    expanded further. Every kept node has a link to a kept node one hop
+    nearer the centre.
+  - a last query adds the links among the outermost nodes, so loops
+    through the rim (A -> B -> C -> A around the centre) stay visible
+  - beyond `max_links`, the weakest links go, but never a node's strongest
+    link towards the centre
+  - level of detail: when the centre's links stand for at most
+    `detail_invoices` invoices in all, each one is drawn as its own
+    invoice node between its supplier and recipient
+
+Values are summed in the API, as integer paise (`money`), so no amount
+passes through a float the way `toFloat()` in Cypher would.
+
+The result is encoded as columns with integer node IDs (see `schemas.py`).
+At the default limits it stays well under 1 MB.
+"""
+
+import json
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from backend.ingestion import money
+from backend.ingestion.normalization import normalize_money
+from backend.risk.scoring import rule_scores
+
+from .schemas import CONTRACT_VERSION, NodeKind, RankBy
+
+DEFAULT_HOPS = 2
+MAX_HOPS = 3
+DEFAULT_MAX_NODES = 300
+DEFAULT_MAX_LINKS = 1_500
+DEFAULT_DETAIL_INVOICES = 50
+
+# Taxpayer pairs trading with the frontier, invoices collapsed, as one
+# record of columns: `near` is the frontier end, `far` the other end
+HOP_QUERY = """
+CALL {
+  UNWIND $frontier AS gstin
+  MATCH (:Taxpayer {gstin: gstin})-[:SUPPLIED]->(i:Invoice)<-[:RECEIVED]-(r:Taxpayer)
+  WHERE r.gstin <> gstin AND ($period IS NULL OR i.filingPeriod = $period)
+  RETURN gstin AS near, r.gstin AS far, true AS outbound, count(i) AS invoices, collect(i.totalValue) AS values
+  UNION ALL
+  UNWIND $frontier AS gstin
+  MATCH (s:Taxpayer)-[:SUPPLIED]->(i:Invoice)<-[:RECEIVED]-(:Taxpayer {gstin: gstin})
+  WHERE s.gstin <> gstin AND ($period IS NULL OR i.filingPeriod = $period)
+  RETURN gstin AS near, s.gstin AS far, false AS outbound, count(i) AS invoices, collect(i.totalValue) AS values
+}
+RETURN collect(near) AS near, collect(far) AS far, collect(outbound) AS outbound,
+       collect(invoices) AS invoices, collect(values) AS values
+"""
+
+# Taxpayer pairs within the outermost hop
+RIM_QUERY = """
+UNWIND $frontier AS gstin
+MATCH (:Taxpayer {gstin: gstin})-[:SUPPLIED]->(i:Invoice)<-[:RECEIVED]-(r:Taxpayer)
+WHERE r.gstin IN $frontier AND r.gstin <> gstin AND ($period IS NULL OR i.filingPeriod = $period)
+RETURN gstin AS supplier, r.gstin AS recipient, count(i) AS invoices, collect(i.totalValue) AS values
+"""
+
+# The invoices between the centre and the given counterparties: anchored on
+# the centre's node and expanded each way, so the planner starts from its
+# key lookup rather than from every invoice
+INVOICE_QUERY = """
+MATCH (c:Taxpayer {gstin: $gstin})
+CALL {
+  WITH c
+  MATCH (c)-[:SUPPLIED]->(i:Invoice)<-[:RECEIVED]-(r:Taxpayer)
+  WHERE r.gstin IN $others AND ($period IS NULL OR i.filingPeriod = $period)
+  RETURN c.gstin AS supplier, r.gstin AS recipient, i.invoiceNumber AS invoiceNumber, i.totalValue AS totalValue
+  UNION ALL
+  WITH c
+  MATCH (s:Taxpayer)-[:SUPPLIED]->(i:Invoice)<-[:RECEIVED]-(c)
+  WHERE s.gstin IN $others AND ($period IS NULL OR i.filingPeriod = $period)
+  RETURN s.gstin AS supplier, c.gstin AS recipient, i.invoiceNumber AS invoiceNumber, i.totalValue AS totalValue
+}
+RETURN supplier, recipient, invoiceNumber, totalValue
+ORDER BY supplier, recipient, invoiceNumber
+"""
+
+
+def paise_sums(value_lists):
+    """Exact paise totals of lists of `totalValue` strings, one per list."""
+    lengths = np.fromiter(map(len, value_lists), dtype=np.int64, count=len(value_lists))
+    flat = np.array(list(chain.from_iterable(value_lists)), dtype=object)
+    codes = np.repeat(np.arange(len(value_lists)), lengths)
+    return money.group_sums(money.parse_money(normalize_money(flat)), codes, len(value_lists)).paise
+
+
+def _period_order(period):
+    return period[2:] + period[:2]
+
+
+def risk_lookup(store, period=None):
+    """A function from GSTINs to their rule risk scores in the feature store
+    (for `period`, else each GSTIN's latest period); None where absent."""
+
+    def risk(gstins):
+        rows = []
+        for gstin in gstins:
+            if period is not None:
+                rows.append(store.index.get((gstin, period), -1))
+            else:
+                candidates = store.by_gstin.get(gstin, ())
+                rows.append(max(candidates, key=lambda row: _period_order(store.periods[row]), default=-1))
+        rows = np.array(rows, dtype=np.int64)
+        scores = np.zeros(len(rows), dtype=np.int64)
+        found = rows >= 0
+        if found.any():
+            scores[found] = rule_scores(store.values[rows[found]])[0]
+        return [int(score) if ok else None for score, ok in zip(scores.tolist(), found.tolist())]
+
+    return risk
+
+
+def rank(gstins, values, rank_by, risk=None, limit=None):
+    """Positions of `gstins`, which traded `values` paise with the view,
+    highest ranking first; only the first `limit` when given. Ties go by
+    GSTIN."""
+    if limit is not None and limit <= 0:
+        return np.zeros(0, dtype=np.int64)
+    shortlist = np.arange(len(gstins))
+    if rank_by == RankBy.RISK and risk is not None:
+        scores = np.array([-1 if s is None else s for s in risk(gstins)], dtype=np.int64)
+    else:
+        scores = np.zeros(len(gstins), dtype=np.int64)
+        if limit is not None and limit < len(gstins):
+            # Only the values at or above the `limit`-th largest are sorted
+            cut = np.partition(values, len(values) - limit)[len(values) - limit]
+            shortlist = np.flatnonzero(values >= cut)
+    labels = np.array(gstins, dtype=object)[shortlist]
+    return shortlist[np.lexsort((labels, -values[shortlist], -scores[shortlist]))][:limit]
+
+
+def prune_links(sources, targets, values, hops, max_links):
+    """Indices of the links to keep: every node's strongest link towards
+    the centre, then the strongest of the rest, `max_links` in all."""
+    n_links = len(sources)
+    if n_links <= max_links:
+        return np.arange(n_links)
+    # A link leads towards the centre for whichever end is further out
+    outer = np.where(hops[sources] > hops[targets], sources, targets)
+    inward = hops[sources] != hops[targets]
+    # Per outer node: its inward links first, strongest first
+    by_value = np.lexsort((-values, ~inward, outer))
+    first = np.ones(n_links, dtype=bool)
+    first[1:] = outer[by_value][1:] != outer[by_value][:-1]
+    tree = np.zeros(n_links, dtype=bool)
+    tree[by_value[first & inward[by_value]]] = True
+    rest = np.flatnonzero(~tree)
+    rest = rest[np.argsort(-values[rest], kind="stable")][: max(max_links - int(tree.sum()), 0)]
+    return np.sort(np.concatenate([np.flatnonzero(tree), rest]))
+
+
+async def neighbourhood(
+    graph,
+    gstin,
+    hops=DEFAULT_HOPS,
+    period=None,
+    max_nodes=DEFAULT_MAX_NODES,
+    rank_by=RankBy.VALUE,
+    risk=None,
+    max_links=DEFAULT_MAX_LINKS,
+    detail_invoices=DEFAULT_DETAIL_INVOICES,
+):
+    """The Contract 5 neighbourhood of `gstin` as a dict, read through
+    `graph` (a `GraphPool`); `risk` maps GSTINs to risk scores (see
+    `risk_lookup()`). None if the taxpayer traded with no one."""
+    hop_of = {gstin: 0}
+    order = [gstin]
+    edges = {}  # (supplier, recipient) -> (invoices, paise)
+    reached = {gstin}
+    frontier = [gstin]
+    truncated = False
+    for hop in range(1, hops + 1):
+        (columns,) = await graph.read(HOP_QUERY, frontier=frontier, period=period)
+        near, far, outbound, invoices = columns["near"], columns["far"], columns["outbound"], columns["invoices"]
+        values = paise_sums(columns["values"])
+        # One entry per far-end taxpayer: the value it trades with the frontier
+        codes, names = pd.factorize(np.array(far, dtype=object))
+        totals = np.zeros(len(names), dtype=np.int64)
+        np.add.at(totals, codes, values)
+        placed = np.fromiter((name in hop_of for name in names), dtype=bool, count=len(names))
+        candidates = np.flatnonzero(~placed)
+        reached.update(names[candidates].tolist())
+        room = max_nodes - len(order)
+        kept = candidates[rank(names[candidates].tolist(), totals[candidates], rank_by, risk, limit=room)]
+        truncated |= len(candidates) > len(kept)
+        for node in names[kept].tolist():
+            hop_of[node] = hop
+            order.append(node)
+        placed[kept] = True
+        # Only links between kept nodes are drawn; a link between two
+        # frontier nodes comes back once from each end
+        for row in np.flatnonzero(placed[codes]).tolist():
+            pair = (near[row], far[row]) if outbound[row] else (far[row], near[row])
+            edges.setdefault(pair, (invoices[row], int(values[row])))
+        frontier = names[kept].tolist()
+        if not frontier:
+            break
+    if len(order) == 1:
+        return None
+    if frontier:
+        rows = await graph.read(RIM_QUERY, frontier=frontier, period=period)
+        for row, value in zip(rows, paise_sums([row["values"] for row in rows]).tolist()):
+            edges.setdefault((row["supplier"], row["recipient"]), (row["invoices"], value))
+
+    ids = {node: i for i, node in enumerate(order)}
+    links = [(ids[s], ids[r], n, v) for (s, r), (n, v) in edges.items()]
+    sources, targets, invoices, values = (np.array(column, dtype=np.int64) for column in zip(*links))
+    node_hops = np.array([hop_of[node] for node in order], dtype=np.int64)
+    keep = prune_links(sources, targets, values, node_hops, max_links)
+    truncated |= len(keep) < len(links)
+    sources, targets, invoices, values = sources[keep], targets[keep], invoices[keep], values[keep]
+
+    labels = list(order)
+    kinds = [NodeKind.TAXPAYER.value] * len(order)
+    scores = risk(order) if risk is not None else [None] * len(order)
+    node_hops = node_hops.tolist()
+
+    # Level of detail: the centre's few invoices as nodes of their own
+    centre = (sources == 0) | (targets == 0)
+    if 0 < invoices[centre].sum() <= detail_invoices:
+        others = [order[i] for i in np.where(sources[centre] == 0, targets[centre], sources[centre]).tolist()]
+        rows = await graph.read(INVOICE_QUERY, gstin=gstin, others=others, period=period)
+        detail = {"source": [], "target": [], "value": []}
+        paise = paise_sums([[row["totalValue"]] for row in rows]).tolist()
+        for row, value in zip(rows, paise):
+            node = len(labels)
+            supplier, recipient = ids[row["supplier"]], ids[row["recipient"]]
+            labels.append(row["invoiceNumber"])
+            kinds.append(NodeKind.INVOICE.value)
+            scores.append(None)
+            node_hops.append(max(node_hops[supplier], node_hops[recipient]))
+            detail["source"] += [supplier, node]
+            detail["target"] += [node, recipient]
+            detail["value"] += [value] * 2
+        sources = np.concatenate([sources[~centre], np.array(detail["source"], dtype=np.int64)])
+        targets = np.concatenate([targets[~centre], np.array(detail["target"], dtype=np.int64)])
+        values = np.concatenate([values[~centre], np.array(detail["value"], dtype=np.int64)])
+        invoices = np.concatenate([invoices[~centre], np.ones(len(detail["source"]), dtype=np.int64)])
+
+    node_values = np.zeros(len(labels), dtype=np.int64)
+    np.add.at(node_values, sources, values)
+    np.add.at(node_values, targets, values)
+    # An invoice node sits on two links carrying the same value
+    node_values[np.array(kinds) == NodeKind.INVOICE.value] //= 2
+    return {
+        "contractVersion": CONTRACT_VERSION,
+        "gstin": gstin,
+        "returnPeriod": period,
+        "hops": hops,
+        "rankBy": RankBy(rank_by).value,
+        "truncated": truncated,
+        "totalNodes": len(reached),
+        "nodes": {
+            "label": labels,
+            "kind": kinds,
+            "hop": node_hops,
+            "value": node_values.tolist(),
+            "risk": scores,
+        },
+        "links": {
+            "source": sources.tolist(),
+            "target": targets.tolist(),
+            "invoices": invoices.tolist(),
+            "value": values.tolist(),
+        },
+    }
+
+
+def dump_neighbourhood(view):
+    """Compact JSON bytes of a neighbourhood dict."""
+    return json.dumps(view, separators=(",", ":")).encode()
@@ -0,0 +1,232 @@
+"""
+Contract 5 — API ↔ Frontend Dashboard, v1.1.0.
+
+The taxpayer neighbourhood view drawn by the dashboard's force-directed
+graph (react-force-graph). Nodes and links are sent as columns: node `i` is
+entry `i` of every `nodes` column, and links refer to nodes by that integer
+ID. The client zips the columns into `{nodes: [...], links: [...]}`.
+
+v1.1.0 adds the statistical widgets (Recharts), read from precomputed
+rollups: ITC at risk per state and period, mismatch counts by status, and
+the top risky vendors. Each carries the rollup's `freshness`. Amounts are
+integer paise throughout.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from backend.reconciliation.schemas import MatchStatus
+from backend.risk.schemas import RiskLevel
+
+CONTRACT_VERSION = "1.1.0"
+PERIOD_PATTERN = r"^(0[1-9]|1[0-2])\d{4}$"
+
+
+class NodeKind(str, Enum):
+    """What a node stands for."""
+
+    TAXPAYER = "TAXPAYER"
+    INVOICE = "INVOICE"
+
+
+class RankBy(str, Enum):
+    """What decides which nodes are kept when a neighbourhood is pruned."""
+
+    VALUE = "VALUE"
+    RISK = "RISK"
+
+
+class NodeColumns(BaseModel):
+    """One entry per node; a node's ID is its position."""
+
+    label: List[str] = Field(..., description="GSTIN of a taxpayer node, invoice number of an invoice node")
+    kind: List[NodeKind] = Field(..., description="What each node stands for")
+    hop: List[int] = Field(..., description="Hops from the centre taxpayer (0 for the centre)")
+
+    value: List[int] = Field(
+        ...,
+        description="Paise traded between the node and the other nodes in the view",
+    )
+
+    risk: List[Optional[int]] = Field(
+        ...,
+        description="Rule risk score (0-100) of a taxpayer node; null for invoices or without features",
+    )
+
+
+class LinkColumns(BaseModel):
+    """One entry per link, from supplier to recipient."""
+
+    source: List[int] = Field(..., description="Node ID of the supplying end")
+    target: List[int] = Field(..., description="Node ID of the receiving end")
+    invoices: List[int] = Field(..., description="Invoices the link stands for (1 for an invoice's own links)")
+    value: List[int] = Field(..., description="Paise invoiced along the link")
+
+
+class Neighbourhood(BaseModel):
+    """
+    Canonical schema for a Contract 5 taxpayer neighbourhood.
+
+    Invoices between two taxpayers are collapsed into one weighted link,
+    unless the centre's links stand for few enough invoices to draw each
+    one as a node. Only the `maxNodes` nodes ranking highest by `rankBy`
+    are kept, each linked to a kept node one hop nearer the centre.
+    """
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        json_schema_extra={
+            "entity": "NEIGHBOURHOOD",
+            "contract_version": CONTRACT_VERSION,
+        },
+    )
+
+    contract_version: str = Field(CONTRACT_VERSION, alias="contractVersion")
+    gstin: str = Field(..., description="GSTIN of the centre taxpayer (node 0)")
+
+    return_period: Optional[str] = Field(
+        None,
+        alias="returnPeriod",
+        pattern=PERIOD_PATTERN,
+        description="Filing period the invoices were restricted to, in MMYYYY format (null for all)",
+    )
+
+    hops: int = Field(..., ge=1, description="Hops expanded from the centre")
+    rank_by: RankBy = Field(..., alias="rankBy", description="What decided which nodes were kept")
+    truncated: bool = Field(..., description="Whether nodes or links were pruned")
+    total_nodes: int = Field(
+        ...,
+        alias="totalNodes",
+        description="Taxpayers reached from the kept nodes, before pruning",
+    )
+    nodes: NodeColumns
+    links: LinkColumns
+
+
+class Freshness(BaseModel):
+    """When a rollup was last refreshed, and from what."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    updated_at: Optional[datetime] = Field(
+        None,
+        alias="updatedAt",
+        description="When the rollup was last refreshed (null if never)",
+    )
+
+    source: Optional[str] = Field(
+        None,
+        description="File name of the ingestion manifest or reconciliation output it was refreshed from",
+    )
+
+
+class ItcAtRiskPoint(BaseModel):
+    """ITC at risk for one state and filing period."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    state: str = Field(..., pattern=r"^[0-9]{2}$", description="Two-digit state code of the suppliers")
+    return_period: str = Field(..., alias="returnPeriod", pattern=PERIOD_PATTERN)
+    invoices: int = Field(..., description="Invoice keys not MATCHED")
+
+    itc_at_risk: int = Field(
+        ...,
+        alias="itcAtRisk",
+        description="Paise: positive GSTR-1 minus GSTR-2B tax differences of those keys",
+    )
+
+
+class ItcAtRisk(BaseModel):
+    """Canonical schema for the ITC-at-risk widget, one point per state and period."""
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        json_schema_extra={
+            "entity": "ITC_AT_RISK",
+            "contract_version": CONTRACT_VERSION,
+        },
+    )
+
+    contract_version: str = Field(CONTRACT_VERSION, alias="contractVersion")
+    freshness: Freshness
+    points: List[ItcAtRiskPoint]
+
+
+class MismatchCount(BaseModel):
+    """Invoice keys with one reconciliation outcome."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    match_status: MatchStatus = Field(..., alias="matchStatus")
+    invoices: int
+    tax_difference: int = Field(..., alias="taxDifference", description="Paise, GSTR-1 minus GSTR-2B tax")
+
+
+class MismatchCounts(BaseModel):
+    """Canonical schema for the mismatch-count widget, one count per status."""
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        json_schema_extra={
+            "entity": "MISMATCH_COUNTS",
+            "contract_version": CONTRACT_VERSION,
+        },
+    )
+
+    contract_version: str = Field(CONTRACT_VERSION, alias="contractVersion")
+    freshness: Freshness
+    counts: List[MismatchCount]
+
+
+class RiskyVendor(BaseModel):
+    """One taxpayer's rule risk in one return period."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    gstin: str
+    return_period: str = Field(..., alias="returnPeriod", pattern=PERIOD_PATTERN)
+    risk_score: int = Field(..., alias="riskScore", ge=0, le=100)
+    risk_level: RiskLevel = Field(..., alias="riskLevel")
+    itc_mismatch: int = Field(..., alias="itcMismatch", description="Paise of ITC claimed beyond inward tax")
+    unpaid_tax: int = Field(..., alias="unpaidTax", description="Paise of liability not covered by paid challans")
+
+
+class TopRiskyVendors(BaseModel):
+    """Canonical schema for the top-risky-vendors widget."""
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        json_schema_extra={
+            "entity": "TOP_RISKY_VENDORS",
+            "contract_version": CONTRACT_VERSION,
+        },
+    )
+
+    contract_version: str = Field(CONTRACT_VERSION, alias="contractVersion")
+    freshness: Freshness
+
+    return_period: Optional[str] = Field(
+        None,
+        alias="returnPeriod",
+        pattern=PERIOD_PATTERN,
+        description="Return period ranked (the latest one unless asked; null if there are no vendors)",
+    )
+
+    vendors: List[RiskyVendor] = Field(..., description="Highest risk score first")
+
+
+def generate_contract() -> dict:
+    """The Contract 5 JSON schema document (contracts/contract_5.json)."""
+    return {
+        "contract": "API <-> FRONTEND DASHBOARD",
+        "version": CONTRACT_VERSION,
+        "entities": {
+            "NEIGHBOURHOOD": Neighbourhood.model_json_schema(by_alias=True),
+            "ITC_AT_RISK": ItcAtRisk.model_json_schema(by_alias=True),
+            "MISMATCH_COUNTS": MismatchCounts.model_json_schema(by_alias=True),
+            "TOP_RISKY_VENDORS": TopRiskyVendors.model_json_schema(by_alias=True),
+        },
+    }
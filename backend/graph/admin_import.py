@@ -0,0 +1,340 @@
+"""
+Offline graph build — Contract 1 NDJSON batches to `neo4j-admin` import CSVs.
+
+A cold graph (a full financial year) is far faster to build with
+`neo4j-admin database import full` than with transactional MERGE: the import
+tool writes the store files directly, with no transactions, locks or index
+lookups per row. `GraphLoader` is kept for deltas on a live graph.
+
+`export_import_csv()` converts the batches of a manifest into the tool's
+header/data CSV format:
+
+  - one node file per label per batch, each in its own ID space
+    (`:ID(Invoice)` ...). Taxpayer, ReturnFiling, Payment and IRN use their
+    key property as the ID; an Invoice's ID is its composite key joined with
+    `|`, and is not stored (the key properties already are). Every node
+    carries the Contract 1 properties plus `ingestedAt` / `sourceFile` /
+    `contractVersion`, as in docs/graph/node_definitions.md.
+  - one relationship file per edge type per batch, following
+    docs/graph/relationship_definitions.md and matching endpoints exactly
+    as `loader.RELATIONSHIPS` does. Return batches are exported first so
+    REPORTED_IN and PAID_VIA can resolve a return's `returnId` from its
+    GSTIN, period and type.
+
+It writes `import.args`, the argument file for the import command (see
+`import_command()`).
+
+The result is the graph a MERGE load of the same batches leaves behind:
+
+  - a node ID seen in several rows gets its last row, as `SET n += row`
+    leaves it. Each entity's key columns are scanned first for IDs that
+    occur more than once (by `hash()`, a superset); only those rows are
+    held back, last one winning, and written with their edges to a
+    `{name}-repeated.csv` file once the entity's batches are done
+  - edges are MERGEd, so each `(start, end)` pair is written once per
+    relationship type, however many rows produce it. Every edge has the
+    row's own node at one end, so only repeated rows can repeat an edge
+  - return lookups use the returns' last rows, as the loader matches
+    returns only after every node is loaded
+  - edges whose endpoint was never exported are dropped
+    (`--skip-bad-relationships`), like a MATCH that finds nothing
+
+Usage:
+    python -m backend.graph.admin_import <manifest.json> <output_dir>
+"""
+
+import argparse
+import csv
+import io
+import os
+from collections import defaultdict
+from datetime import datetime, timezone
+from operator import itemgetter
+
+import numpy as np
+
+from backend.graph.csr import read_columns
+from backend.graph.loader import NODE_KEYS, iter_row_groups, node_fields, read_manifest
+from backend.ingestion.ingest_service import ENTITY_MODELS
+from backend.ingestion.serializer import line_plan
+
+DEFAULT_GROUP_SIZE = 50_000
+AUDIT_FIELDS = ("ingestedAt", "sourceFile", "contractVersion")
+
+# Returns first: invoice and payment edges look returns up by GSTIN/period
+EXPORT_ORDER = ("taxpayer", "return", "payment", "irn", "invoice")
+
+# Relationship type -> (start ID space, end ID space)
+RELATIONSHIP_ENDS = {
+    "SUPPLIED": ("Taxpayer", "Invoice"),
+    "RECEIVED": ("Taxpayer", "Invoice"),
+    "FILED": ("Taxpayer", "ReturnFiling"),
+    "REPORTED_IN": ("Invoice", "ReturnFiling"),
+    "PAID_VIA": ("ReturnFiling", "Payment"),
+    "REGISTERED": ("Invoice", "IRN"),
+}
+
+# Contract 1 field kinds that need a typed header column
+_HEADER_TYPES = {"bool": "boolean"}
+_BOOL_TEXT = {True: "true", False: "false", None: None}
+
+
+def header_types(entity):
+    """`{field: import type}` for the entity's non-string properties."""
+    plan = line_plan(ENTITY_MODELS[entity])
+    return {key.strip('"'): _HEADER_TYPES[kind] for _, key, kind, _, _ in plan if kind in _HEADER_TYPES}
+
+
+def node_header(entity):
+    """Header columns for an entity's node file."""
+    label, keys = NODE_KEYS[entity]
+    types = header_types(entity)
+    columns = [] if len(keys) == 1 else [f":ID({label})"]
+    for field in node_fields(entity):
+        if len(keys) == 1 and field == keys[0]:
+            columns.append(f"{field}:ID({label})")
+        elif field in types:
+            columns.append(f"{field}:{types[field]}")
+        else:
+            columns.append(field)
+    return columns + list(AUDIT_FIELDS)
+
+
+def relationship_header(rel_type):
+    start, end = RELATIONSHIP_ENDS[rel_type]
+    return [f":START_ID({start})", f":END_ID({end})"]
+
+
+def invoice_id(row):
+    return f"{row['supplierGstin']}|{row['invoiceNumber']}|{row['filingPeriod']}"
+
+
+def node_id_getter(entity):
+    """Row dict -> node ID in the entity's ID space."""
+    _, keys = NODE_KEYS[entity]
+    return invoice_id if len(keys) > 1 else itemgetter(keys[0])
+
+
+def repeated_id_hashes(entity, paths):
+    """`hash()`es of the node IDs found in more than one row of the
+    entity's batches; colliding hashes only add false candidates."""
+    _, keys = NODE_KEYS[entity]
+    frame = read_columns(paths, keys)
+    ids = frame[keys[0]]
+    for key in keys[1:]:
+        ids = ids + "|" + frame[key]
+    hashes = np.fromiter(map(hash, ids), dtype=np.int64, count=len(ids))
+    values, counts = np.unique(hashes, return_counts=True)
+    return set(values[counts > 1].tolist())
+
+
+class AdminImportExporter:
+    """Writes `neo4j-admin` import CSVs for a manifest's batches into
+    `output_dir`; `export()` returns the import arguments."""
+
+    def __init__(self, output_dir, group_size=DEFAULT_GROUP_SIZE):
+        self.output_dir = os.path.abspath(output_dir)
+        self.group_size = group_size
+        self.node_files = defaultdict(list)  # label -> data files
+        self.relationship_files = defaultdict(list)  # type -> data files
+        self.counts = defaultdict(int)  # label or type -> rows written
+        self.multiline = False
+        # (gstin, returnPeriod, returnType) -> returnId, (gstin, returnPeriod) -> [returnId]
+        self.return_ids = {}
+        self.period_returns = defaultdict(list)
+
+    def export(self, manifest_path, verify=True):
+        contract_version, batches, tombstones = read_manifest(manifest_path, verify)
+        if tombstones:
+            raise ValueError("A delta manifest (with tombstones) cannot seed a cold build; load it with GraphLoader")
+        ingested_at = datetime.now(timezone.utc).isoformat()
+        os.makedirs(os.path.join(self.output_dir, "nodes"), exist_ok=True)
+        os.makedirs(os.path.join(self.output_dir, "relationships"), exist_ok=True)
+
+        for entity in EXPORT_ORDER:
+            paths = [path for name, path in batches if name == entity]
+            if paths:
+                self._export_entity(entity, paths, ingested_at, contract_version)
+
+        headers = {}
+        for entity in EXPORT_ORDER:
+            headers[NODE_KEYS[entity][0]] = self._write_header("nodes", NODE_KEYS[entity][0], node_header(entity))
+        for rel_type in RELATIONSHIP_ENDS:
+            headers[rel_type] = self._write_header("relationships", rel_type, relationship_header(rel_type))
+
+        args = ["--skip-bad-relationships=true"]
+        if self.multiline:
+            args.append("--multiline-fields=true")
+        for label, files in self.node_files.items():
+            args.append(f"--nodes={label}={','.join([headers[label]] + files)}")
+        for rel_type, files in self.relationship_files.items():
+            args.append(f"--relationships={rel_type}={','.join([headers[rel_type]] + files)}")
+        with open(os.path.join(self.output_dir, "import.args"), "w", encoding="utf-8") as f:
+            f.write("".join((f'"{arg}"' if " " in arg else arg) + "\n" for arg in args))
+        return args
+
+    def _write_header(self, kind, name, columns):
+        path = os.path.join(self.output_dir, kind, f"{name}-header.csv")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            csv.writer(f, lineterminator="\n").writerow(columns)
+        return path
+
+    def _export_entity(self, entity, paths, ingested_at, contract_version):
+        """Export every batch of one entity, then its repeated IDs."""
+        repeated = repeated_id_hashes(entity, paths)
+        held = {}  # node ID -> (record, row) of the last row seen
+        held_edges = defaultdict(dict)  # type -> {(start, end): None}, in first-seen order
+        for path in paths:
+            audit = (ingested_at, os.path.basename(path), contract_version)
+            self._export_batch(entity, path, audit, repeated, held, held_edges)
+        if not held:
+            return
+
+        rows = [row for _, row in held.values()]
+        if entity == "return":
+            self._register_returns(rows)
+        label, _ = NODE_KEYS[entity]
+        writers = {}
+        try:
+            self._write_rows(self._writer(writers, "nodes", label, "repeated"), label, [r for r, _ in held.values()])
+            for rel_type, edges in held_edges.items():
+                self._write_rows(self._writer(writers, "relationships", rel_type, "repeated"), rel_type, list(edges))
+        finally:
+            for f in writers.values():
+                f.close()
+
+    def _writer(self, writers, kind, name, stem):
+        if name not in writers:
+            file_path = os.path.join(self.output_dir, kind, f"{name}-{stem}.csv")
+            (self.node_files if kind == "nodes" else self.relationship_files)[name].append(file_path)
+            writers[name] = open(file_path, "w", encoding="utf-8", newline="")
+        return writers[name]
+
+    def _export_batch(self, entity, path, audit, repeated, held, held_edges):
+        label, keys = NODE_KEYS[entity]
+        stem = os.path.splitext(os.path.basename(path))[0]
+        fields = node_fields(entity)
+        values = itemgetter(*fields)
+        node_id = node_id_getter(entity)
+        bools = [field for field, kind in header_types(entity).items() if kind == "boolean"]
+        writers = {}
+
+        try:
+            for rows in iter_row_groups(path, self.group_size):
+                for field in bools:
+                    for row in rows:
+                        row[field] = _BOOL_TEXT[row.get(field)]
+                try:
+                    records = [values(row) + audit for row in rows]
+                except KeyError:
+                    records = [tuple(map(row.get, fields)) + audit for row in rows]
+                if len(keys) > 1:
+                    records = [(invoice_id(row),) + record for row, record in zip(rows, records)]
+
+                if repeated:
+                    ids = list(map(node_id, rows))
+                    hold = [hash(i) in repeated for i in ids]
+                    if any(hold):
+                        for i, record, row, held_row in zip(ids, records, rows, hold):
+                            if held_row:
+                                held.pop(i, None)  # re-inserted: the last row keeps its place last
+                                held[i] = (record, row)
+                        for rel_type, edges in self._edges(entity, [r for r, h in zip(rows, hold) if h]).items():
+                            held_edges[rel_type].update(dict.fromkeys(edges))
+                        records = [record for record, held_row in zip(records, hold) if not held_row]
+                        rows = [row for row, held_row in zip(rows, hold) if not held_row]
+
+                if entity == "return":
+                    self._register_returns(rows)
+                self._write_rows(self._writer(writers, "nodes", label, stem), label, records)
+                for rel_type, edges in self._edges(entity, rows).items():
+                    self._write_rows(self._writer(writers, "relationships", rel_type, stem), rel_type, edges)
+        finally:
+            for f in writers.values():
+                f.close()
+
+    def _register_returns(self, rows):
+        """Make returns findable by GSTIN, period and type for the invoice
+        and payment edges."""
+        for row in rows:
+            self.return_ids[(row["gstin"], row["returnPeriod"], row["returnType"])] = row["returnId"]
+            self.period_returns[(row["gstin"], row["returnPeriod"])].append(row["returnId"])
+
+    def _edges(self, entity, rows):
+        """`{type: [(start_id, end_id)]}` for one group of rows."""
+        if entity == "return":
+            return {"FILED": [(row["gstin"], row["returnId"]) for row in rows]}
+        if entity == "payment":
+            return {
+                "PAID_VIA": [
+                    (return_id, row["paymentId"])
+                    for row in rows
+                    for return_id in self.period_returns.get((row["gstin"], row["returnPeriod"]), ())
+                ]
+            }
+        if entity != "invoice":
+            return {}
+
+        ids = list(map(invoice_id, rows))
+        edges = {
+            "SUPPLIED": [(row["supplierGstin"], i) for row, i in zip(rows, ids)],
+            "RECEIVED": [(row["recipientGstin"], i) for row, i in zip(rows, ids) if row.get("recipientGstin")],
+            "REGISTERED": [(i, row["irn"]) for row, i in zip(rows, ids) if row.get("irn")],
+            "REPORTED_IN": [],
+        }
+        lookup = self.return_ids.get
+        for row, i in zip(rows, ids):
+            gstr1 = lookup((row["supplierGstin"], row["filingPeriod"], "GSTR1"))
+            if gstr1:
+                edges["REPORTED_IN"].append((i, gstr1))
+            if row.get("recipientGstin"):
+                gstr2b = lookup((row["recipientGstin"], row["filingPeriod"], "GSTR2B"))
+                if gstr2b:
+                    edges["REPORTED_IN"].append((i, gstr2b))
+        return edges
+
+    def _write_rows(self, f, name, records):
+        if not records:
+            return
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(records)
+        text = buffer.getvalue()
+        # A quoted newline inside a value needs the import's multiline mode
+        if not self.multiline and text.count("\n") != len(records):
+            self.multiline = True
+        f.write(text)
+        self.counts[name] += len(records)
+
+
+def export_import_csv(manifest_path, output_dir, verify=True, group_size=DEFAULT_GROUP_SIZE):
+    """Export a manifest's batches to `output_dir`; returns the exporter,
+    whose `counts` hold the rows written per label and relationship type."""
+    exporter = AdminImportExporter(output_dir, group_size)
+    exporter.export(manifest_path, verify)
+    return exporter
+
+
+def import_command(output_dir, database="neo4j"):
+    """The `neo4j-admin` command that builds `database` from an export.
+    The database must be stopped (or not yet exist); it is overwritten."""
+    args_file = os.path.join(os.path.abspath(output_dir), "import.args")
+    return ["neo4j-admin", "database", "import", "full", database, "--overwrite-destination=true", f"@{args_file}"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export Contract 1 NDJSON batches as neo4j-admin import CSVs")
+    parser.add_argument("manifest", help="manifest_*.json written by IngestService")
+    parser.add_argument("output_dir")
+    parser.add_argument("--database", default="neo4j")
+    args = parser.parse_args(argv)
+
+    exporter = export_import_csv(args.manifest, args.output_dir)
+    for name, count in exporter.counts.items():
+        print(f"  {name:<12} {count:,}")
+    print("Build the graph (database stopped) with:")
+    print("  " + " ".join(import_command(args.output_dir, args.database)))
+    print("then apply the schema: python -m backend.graph.migrations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+In-memory graph engine — CSR adjacency over Contract 1 batches.
+
+The broken-path patterns in docs/graph/traversal_philosophy.md are
+whole-graph questions ("every invoice without a PAID path"), and one Cypher
+traversal per pattern over a large graph takes hours. `CSRGraph` builds the
+same graph in process instead, as arrays:
+
+  - every label gets dense integer node IDs `0..n-1`, one row per node in a
+    properties frame (`graph.nodes[label]`); a key seen in several batches
+    keeps its last row, as MERGE + SET would
+  - every edge type is a compressed sparse row `Adjacency` from its source
+    label's IDs to its target label's IDs: `indptr` (n_source + 1 offsets)
+    and `indices` (target IDs, sorted per source, duplicates removed)
+
+Edges follow the loader's matching rules (`loader.RELATIONSHIPS`), and
+endpoints that do not exist create no edge, so the same paths are broken in
+both places. The patterns are then evaluated as boolean masks over all
+nodes of a label at once (`Adjacency.any`, `Adjacency.reached`), with no
+per-invoice traversal.
+
+Usage:
+    graph = CSRGraph.from_manifest("manifest_<ts>.json")
+    report = graph.reconcile()          # one row per invoice
+"""
+
+import json
+import re
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from backend.graph.loader import NODE_KEYS, iter_row_groups, read_manifest
+
+GROUP_SIZE = 50_000
+
+# Entity -> the properties kept on its nodes (keys first)
+NODE_COLUMNS = {
+    "taxpayer": ("gstin",),
+    "invoice": ("supplierGstin", "invoiceNumber", "filingPeriod", "recipientGstin", "irn"),
+    "return": ("returnId", "gstin", "returnPeriod", "returnType"),
+    "payment": ("paymentId", "gstin", "returnPeriod", "paymentStatus"),
+    "irn": ("irn",),
+}
+
+# Relationship type -> (source label, target label)
+EDGE_LABELS = {
+    "SUPPLIED": ("Taxpayer", "Invoice"),
+    "RECEIVED": ("Taxpayer", "Invoice"),
+    "FILED": ("Taxpayer", "ReturnFiling"),
+    "REPORTED_IN": ("Invoice", "ReturnFiling"),
+    "PAID_VIA": ("ReturnFiling", "Payment"),
+    "REGISTERED": ("Invoice", "IRN"),
+}
+
+
+class Adjacency(NamedTuple):
+    """One edge type in CSR form: the targets of source `i` are
+    `indices[indptr[i]:indptr[i + 1]]`."""
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    n_targets: int
+
+    @classmethod
+    def from_pairs(cls, sources, targets, n_sources, n_targets):
+        """Build from parallel ID arrays; pairs with a -1 end are dropped."""
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        keep = (sources >= 0) & (targets >= 0)
+        # One sort orders the edges by source, then target, and dedupes them
+        pairs = np.sort(sources[keep] * max(n_targets, 1) + targets[keep])
+        pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))] if len(pairs) else pairs
+        sources, targets = np.divmod(pairs, max(n_targets, 1))
+        indptr = np.zeros(n_sources + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n_sources), out=indptr[1:])
+        return cls(indptr, targets.astype(np.int32 if n_targets < 2**31 else np.int64), n_targets)
+
+    @property
+    def n_sources(self):
+        return len(self.indptr) - 1
+
+    def __len__(self):
+        return len(self.indices)
+
+    def degree(self):
+        return np.diff(self.indptr)
+
+    def sources(self):
+        """The source ID of every edge, aligned with `indices`."""
+        return np.repeat(np.arange(self.n_sources), self.degree())
+
+    def transpose(self):
+        return Adjacency.from_pairs(self.indices, self.sources(), self.n_targets, self.n_sources)
+
+    def any(self, target_mask=None):
+        """Per source: has an edge (to a target where `target_mask` holds)."""
+        if target_mask is None:
+            return self.degree() > 0
+        hits = self.sources()[target_mask[self.indices]]
+        return np.bincount(hits, minlength=self.n_sources) > 0
+
+    def reached(self, source_mask=None):
+        """Per target: has an edge (from a source where `source_mask` holds)."""
+        indices = self.indices if source_mask is None else self.indices[np.repeat(source_mask, self.degree())]
+        return np.bincount(indices, minlength=self.n_targets) > 0
+
+
+# ---------------------------------------------------------------------------
+# Building
+# ---------------------------------------------------------------------------
+def field_pattern(field):
+    """Matches `"field":<scalar>` in a JSON line. A key cannot be forged
+    inside a string value, where every quote is escaped."""
+    return re.compile(rb'"' + re.escape(field.encode()) + rb'":(null|true|false|"[^"\\]*(?:\\.[^"\\]*)*")')
+
+
+def extract_columns(data, fields):
+    """The values of `fields` in a batch's bytes, one list per field, or
+    None unless every field occurs exactly once per line."""
+    lines = data.count(b"\n") + (not data.endswith(b"\n") and bool(data))
+    columns = []
+    for field in fields:
+        values = field_pattern(field).findall(data)
+        if len(values) != lines:
+            return None
+        # One decode per column handles nulls and escapes in C
+        columns.append(json.loads(b"[" + b",".join(values) + b"]"))
+    return columns
+
+
+def read_columns(paths, fields, group_size=GROUP_SIZE):
+    """The values of `fields` in NDJSON batches, as a frame of strings
+    (absent values as None).
+
+    Canonical batch lines hold every field once, so each column is cut
+    straight out of the file's bytes; other files are decoded row by row.
+    """
+    columns = [[] for _ in fields]
+    for path in paths:
+        with open(path, "rb") as f:
+            extracted = extract_columns(f.read(), fields)
+        if extracted is not None:
+            for column, part in zip(columns, extracted):
+                column.extend(part)
+            continue
+        for rows in iter_row_groups(path, group_size):
+            for column, field in zip(columns, fields):
+                column.extend(row.get(field) for row in rows)
+    return pd.DataFrame({field: pd.Series(column, dtype=object) for field, column in zip(fields, columns)})
+
+
+def dedupe_nodes(frame, keys):
+    """One row per distinct key, the last one seen, in first-seen order."""
+    ids = frame.groupby(list(keys), sort=False, dropna=False).ngroup().to_numpy()
+    last = pd.Series(np.arange(len(ids))).groupby(ids).max().to_numpy()
+    return frame.iloc[last].reset_index(drop=True)
+
+
+def lookup(index, values):
+    """Node IDs of `values` in a unique key `index` (-1 where absent)."""
+    return index.get_indexer(values)
+
+
+def join_ids(left, right, on):
+    """`(left_ids, right_ids)` for every pair of rows of two frames equal
+    on `on`, where the IDs are the frames' row positions."""
+    pairs = pd.merge(
+        left[on].assign(_left=np.arange(len(left))),
+        right[on].assign(_right=np.arange(len(right))),
+        on=on,
+        how="inner",
+    )
+    return pairs["_left"].to_numpy(), pairs["_right"].to_numpy()
+
+
+class CSRGraph:
+    """The Contract 1 graph as node frames and CSR edge arrays."""
+
+    def __init__(self, nodes, edges):
+        self.nodes = nodes  # label -> frame, row = node ID
+        self.edges = edges  # type -> Adjacency
+        self._reverse = {}
+
+    @classmethod
+    def from_manifest(cls, path, verify=True):
+        _, batches, _ = read_manifest(path, verify)
+        return cls.from_batches(batches)
+
+    @classmethod
+    def from_batches(cls, batches):
+        """Build from `(entity, path)` Contract 1 batches."""
+        nodes = {}
+        for entity, (label, keys) in NODE_KEYS.items():
+            paths = [path for name, path in batches if name == entity]
+            nodes[label] = dedupe_nodes(read_columns(paths, NODE_COLUMNS[entity]), keys)
+
+        taxpayers = pd.Index(nodes["Taxpayer"]["gstin"])
+        invoices, returns = nodes["Invoice"], nodes["ReturnFiling"]
+        sizes = {label: len(frame) for label, frame in nodes.items()}
+        invoice_ids = np.arange(len(invoices))
+
+        pairs = {
+            "SUPPLIED": (lookup(taxpayers, invoices["supplierGstin"]), invoice_ids),
+            "RECEIVED": (lookup(taxpayers, invoices["recipientGstin"]), invoice_ids),
+            "FILED": (lookup(taxpayers, returns["gstin"]), np.arange(len(returns))),
+            "REGISTERED": (invoice_ids, lookup(pd.Index(nodes["IRN"]["irn"]), invoices["irn"])),
+        }
+        # REPORTED_IN: the supplier's GSTR1 and, for B2B, the recipient's
+        # GSTR2B of the invoice's filing period
+        reported = []
+        for gstin, return_type in (("supplierGstin", "GSTR1"), ("recipientGstin", "GSTR2B")):
+            side = invoices[[gstin, "filingPeriod"]].set_axis(["gstin", "returnPeriod"], axis=1)
+            candidates = returns[returns["returnType"] == return_type]
+            left, right = join_ids(side, candidates, ["gstin", "returnPeriod"])
+            reported.append((left, candidates.index.to_numpy()[right]))
+        pairs["REPORTED_IN"] = tuple(np.concatenate(part) for part in zip(*reported))
+        # PAID_VIA: a payment settles every return of its GSTIN and period
+        pairs["PAID_VIA"] = join_ids(returns, nodes["Payment"], ["gstin", "returnPeriod"])
+
+        edges = {
+            rel_type: Adjacency.from_pairs(*pairs[rel_type], sizes[source], sizes[target])
+            for rel_type, (source, target) in EDGE_LABELS.items()
+        }
+        return cls(nodes, edges)
+
+    def reverse(self, rel_type):
+        """The edge type with its direction flipped (cached)."""
+        if rel_type not in self._reverse:
+            self._reverse[rel_type] = self.edges[rel_type].transpose()
+        return self._reverse[rel_type]
+
+    def property_mask(self, label, name, value):
+        return (self.nodes[label][name] == value).to_numpy()
+
+    # -----------------------------------------------------------------------
+    # Traversal patterns (docs/graph/traversal_philosophy.md)
+    # -----------------------------------------------------------------------
+    def reconcile(self):
+        """Per-invoice path flags, one row per Invoice node:
+
+          - `supplied`: some Taxpayer SUPPLIED it
+          - `reportedInGstr1`: REPORTED_IN a GSTR1 return
+          - `goldenPath`: supplied, and one of its GSTR1 returns is PAID_VIA
+            a PAID payment (the Golden Path)
+          - `missingPayment`: supplied and reported in GSTR1, but no such
+            return has a PAID payment (tax reported but unpaid)
+          - `ghostInvoice`: RECEIVED by a Taxpayer, but nobody SUPPLIED it
+        """
+        paid = self.edges["PAID_VIA"].any(self.property_mask("Payment", "paymentStatus", "PAID"))
+        gstr1 = self.property_mask("ReturnFiling", "returnType", "GSTR1")
+        reported_in = self.edges["REPORTED_IN"]
+
+        supplied = self.edges["SUPPLIED"].reached()
+        received = self.edges["RECEIVED"].reached()
+        reported = reported_in.any(gstr1)
+        paid_path = reported_in.any(gstr1 & paid)
+
+        report = self.nodes["Invoice"][list(NODE_KEYS["invoice"][1])].copy()
+        report["supplied"] = supplied
+        report["reportedInGstr1"] = reported
+        report["goldenPath"] = supplied & paid_path
+        report["missingPayment"] = supplied & reported & ~paid_path
+        report["ghostInvoice"] = received & ~supplied
+        return report
@@ -0,0 +1,288 @@
+"""
+Circular trading detection — bounded cycles in the taxpayer trade graph.
+
+Shell-company loops (A sells to B, B to C, C back to A) show up as cycles in
+the trade graph: one node per GSTIN and one edge per (supplier, recipient)
+pair, valued at the sum of their invoices' `totalValue`. Enumerating paths
+with Cypher explodes beyond four or so hops; `find_cycles()` instead cuts
+the graph down to the part that can hold a cycle before enumerating:
+
+  1. edges worth less than `min_value` are dropped (a cycle's weakest edge
+     bounds how much value can have gone round it)
+  2. trimming: nodes with no incoming or no outgoing edge are removed,
+     repeatedly
+  3. strongly connected components: every cycle lies inside one SCC, so
+     edges between SCCs and single-node SCCs are dropped. The SCCs are
+     found by colouring: each node takes the largest node ID that can
+     reach it, then each colour's root collects, backwards, the nodes of
+     its colour that reach it. Every step is a vectorized pass over the
+     edge arrays.
+
+What is left is enumerated with a depth-bounded search from every node,
+visiting only higher node IDs, so each cycle is found once, from its lowest
+node. The start nodes are split into tasks of similar edge counts and run
+in a process pool. Cycles are yielded as each task finishes, never
+collected.
+
+The trade graph is built from one manifest's invoice batches, so the
+manifest must come from a full ingestion run. A delta run (with a
+fingerprint store) leaves out unchanged invoices and deletes others
+through tombstones, so `TradeGraph.from_manifest()` refuses its manifest.
+
+Usage:
+    python -m backend.graph.cycles data/processed/manifest_<ts>.json -o cycles.ndjson
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from backend.graph.csr import Adjacency, read_columns
+from backend.graph.loader import read_manifest
+from backend.ingestion import money
+from backend.ingestion.normalization import normalize_money
+
+DEFAULT_MAX_LENGTH = 6
+DEFAULT_WORKERS = os.cpu_count() or 1
+# Start nodes per task are cut so each task covers about this many edges
+TASK_EDGES = 50_000
+
+
+class TradeGraph(NamedTuple):
+    """Taxpayer -> taxpayer trade: `gstins[i]` is node `i`; `values[j]` is
+    the paise traded along edge `adjacency.indices[j]`."""
+
+    gstins: np.ndarray
+    adjacency: Adjacency
+    values: np.ndarray
+
+    @classmethod
+    def from_invoices(cls, suppliers, recipients, values):
+        """Aggregate invoices (GSTIN arrays and `Money` values); invoices
+        without a recipient and self-supplies are left out."""
+        suppliers = np.asarray(suppliers, dtype=object)
+        recipients = np.asarray(recipients, dtype=object)
+        codes, gstins = pd.factorize(np.concatenate([suppliers, recipients]))
+        source, target = codes[: len(suppliers)], codes[len(suppliers) :]
+        keep = (source >= 0) & (target >= 0) & (source != target)
+
+        n = len(gstins)
+        pairs = source[keep].astype(np.int64) * max(n, 1) + target[keep]
+        pair_codes, unique_pairs = pd.factorize(pairs, sort=True)
+        totals = money.group_sums(values.take(np.flatnonzero(keep)), pair_codes, len(unique_pairs))
+        # Sorted unique pairs are exactly the CSR edge order
+        adjacency = Adjacency.from_pairs(*np.divmod(unique_pairs, max(n, 1)), n, n)
+        return cls(np.asarray(gstins, dtype=object), adjacency, totals.paise)
+
+    @classmethod
+    def from_batches(cls, batches):
+        paths = [path for entity, path in batches if entity == "invoice"]
+        invoices = read_columns(paths, ("supplierGstin", "recipientGstin", "totalValue"))
+        values = money.parse_money(normalize_money(invoices["totalValue"].to_numpy(dtype=object)))
+        return cls.from_invoices(invoices["supplierGstin"], invoices["recipientGstin"], values)
+
+    @classmethod
+    def from_manifest(cls, path, verify=True):
+        """The trade graph of a full run's manifest; raises `ValueError`
+        for a delta run's, which holds only the changed invoices."""
+        _, batches, tombstones = read_manifest(path, verify)
+        with open(path, encoding="utf-8") as f:
+            sources = json.load(f).get("sources", [])
+        if tombstones or any(source.get("unchanged") for source in sources):
+            raise ValueError(
+                f"{path} is a delta run's manifest (unchanged records left out or tombstones); "
+                "trade cycles need a full ingestion run"
+            )
+        return cls.from_batches(batches)
+
+    def edges(self):
+        """`(sources, targets, values)` arrays, one entry per edge."""
+        return self.adjacency.sources(), self.adjacency.indices.astype(np.int64), self.values
+
+
+# ---------------------------------------------------------------------------
+# Pruning
+# ---------------------------------------------------------------------------
+def trim(n, sources, targets):
+    """Mask of nodes left after repeatedly removing nodes with no incoming
+    or no outgoing edge among the remaining ones."""
+    alive = np.ones(n, dtype=bool)
+    while True:
+        live = alive[sources] & alive[targets]
+        keep = (np.bincount(sources[live], minlength=n) > 0) & (np.bincount(targets[live], minlength=n) > 0)
+        if (keep == alive).all():
+            return alive
+        alive = keep
+
+
+def strongly_connected_components(n, sources, targets):
+    """SCC label per node (its root's ID), -1 for nodes on no cycle."""
+    labels = np.full(n, -1, dtype=np.int64)
+    remaining = np.ones(n, dtype=bool)
+    while True:
+        # Nodes only fed by, or only feeding, SCCs already found drop out
+        live = remaining[sources] & remaining[targets]
+        remaining &= trim(n, sources[live], targets[live])
+        if not remaining.any():
+            break
+        live = remaining[sources] & remaining[targets]
+        src, dst = sources[live], targets[live]
+
+        # Forward: each node's colour becomes the largest ID reaching it
+        color = np.where(remaining, np.arange(n), -1)
+        while True:
+            before = color[dst]
+            np.maximum.at(color, dst, color[src])
+            if (color[dst] == before).all():
+                break
+
+        # Backward: a colour's SCC is the same-coloured nodes reaching its root
+        member = remaining & (color == np.arange(n))
+        same = color[src] == color[dst]
+        while True:
+            grow = same & member[dst] & ~member[src]
+            if not grow.any():
+                break
+            member[src[grow]] = True
+        labels[member] = color[member]
+        remaining &= ~member
+
+    sizes = np.bincount(labels[labels >= 0], minlength=n)
+    labels[(labels >= 0) & (sizes[np.maximum(labels, 0)] < 2)] = -1
+    return labels
+
+
+def cyclic_subgraph(graph, min_value=0):
+    """The edges that can lie on a cycle worth at least `min_value` paise:
+    `(sources, targets, values)`, each edge inside one SCC."""
+    sources, targets, values = graph.edges()
+    heavy = values >= min_value
+    sources, targets, values = sources[heavy], targets[heavy], values[heavy]
+    labels = strongly_connected_components(len(graph.gstins), sources, targets)
+    inside = (labels[sources] >= 0) & (labels[sources] == labels[targets])
+    return sources[inside], targets[inside], values[inside]
+
+
+# ---------------------------------------------------------------------------
+# Enumeration
+# ---------------------------------------------------------------------------
+_WORKER_GRAPH = None
+
+
+def _init_worker(indptr, indices, values, max_length):
+    """Hold the cyclic subgraph in each pool process as Python lists."""
+    global _WORKER_GRAPH
+    _WORKER_GRAPH = (indptr.tolist(), indices.tolist(), values.tolist(), max_length)
+
+
+def cycles_from(start, indptr, indices, values, max_length):
+    """`(nodes, edge_values)` of every cycle of at most `max_length` edges
+    whose lowest node is `start`."""
+    path = [start]
+    path_values = []
+    # One iterator over the out-edges of each node on the path
+    stack = [iter(range(indptr[start], indptr[start + 1]))]
+    while stack:
+        for edge in stack[-1]:
+            target = indices[edge]
+            if target == start:
+                yield list(path), path_values + [values[edge]]
+            elif target > start and len(path) < max_length and target not in path:
+                path.append(target)
+                path_values.append(values[edge])
+                stack.append(iter(range(indptr[target], indptr[target + 1])))
+                break
+        else:
+            stack.pop()
+            path.pop()
+            if path_values:
+                path_values.pop()
+
+
+def _enumerate(task):
+    first, last = task
+    indptr, indices, values, max_length = _WORKER_GRAPH
+    return [cycle for start in range(first, last) for cycle in cycles_from(start, indptr, indices, values, max_length)]
+
+
+def plan_tasks(indptr, task_edges=TASK_EDGES):
+    """`(first, last)` start node ranges of about `task_edges` edges each,
+    skipping nodes with no edge."""
+    nodes = np.flatnonzero(np.diff(indptr) > 0)
+    if not len(nodes):
+        return []
+    cuts = np.searchsorted(indptr[nodes], np.arange(0, indptr[-1], task_edges), side="right") - 1
+    bounds = np.unique(np.append(nodes[np.maximum(cuts, 0)], nodes[-1] + 1))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def find_cycles(graph, max_length=DEFAULT_MAX_LENGTH, min_value=0, workers=DEFAULT_WORKERS):
+    """Yield every simple cycle of 2 to `max_length` trade edges, each edge
+    worth at least `min_value` paise, as `(gstins, edge_values)`: the
+    cycle's GSTINs from its lowest node ID, and the paise along each edge
+    (the last one closes the loop)."""
+    sources, targets, values = cyclic_subgraph(graph, min_value)
+    n = len(graph.gstins)
+    adjacency = Adjacency.from_pairs(sources, targets, n, n)
+    # The edges kept their CSR order, so `values` lines up with `indices`
+    initargs = (adjacency.indptr, adjacency.indices, values, max_length)
+    tasks = plan_tasks(adjacency.indptr)
+
+    if workers <= 1:
+        _init_worker(*initargs)
+        results = map(_enumerate, tasks)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs)
+        results = pool.map(_enumerate, tasks)
+    try:
+        for cycles in results:
+            for nodes, edge_values in cycles:
+                yield graph.gstins[nodes].tolist(), edge_values
+    finally:
+        if workers > 1:
+            pool.shutdown(cancel_futures=True)
+
+
+def cycle_record(gstins, edge_values):
+    """The NDJSON record of one cycle; amounts as rupee strings."""
+    paise = np.asarray(edge_values, dtype=np.int64)
+    amounts = money.format_money(money.Money(paise, np.full(len(paise), money.BASE_SCALE, dtype=np.int8)))
+    return {
+        "gstins": gstins,
+        "length": len(gstins),
+        "edgeValues": amounts,
+        "minValue": amounts[int(paise.argmin())],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detect circular trading loops in the taxpayer trade graph")
+    parser.add_argument("manifest", help="manifest_*.json of a full (non-delta) IngestService run")
+    parser.add_argument("-o", "--output", default=os.path.join("data", "processed", "trade_cycles.ndjson"))
+    parser.add_argument("--max-length", type=int, default=DEFAULT_MAX_LENGTH)
+    parser.add_argument("--min-value", default="0", help="smallest edge value (rupees) a cycle may include")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args(argv)
+
+    try:
+        graph = TradeGraph.from_manifest(args.manifest)
+    except ValueError as exc:
+        parser.error(str(exc))
+    min_value = int(money.parse_money([args.min_value]).paise[0])
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    count = 0
+    with open(args.output, "w", encoding="utf-8") as f:
+        for gstins, edge_values in find_cycles(graph, args.max_length, min_value, args.workers):
+            f.write(json.dumps(cycle_record(gstins, edge_values)) + "\n")
+            count += 1
+    print(f"  taxpayers={len(graph.gstins):,}  trade edges={len(graph.adjacency):,}  cycles={count:,}")
+    print(f"Cycles written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Graph loader — Contract 1 NDJSON batches into Neo4j.
+
+Batches (see docs/ingestion/batch_format.md) are streamed `batch_size`
+lines at a time; each group is decoded in one `json.loads` call and sent as
+a parameterized `UNWIND $rows AS r MERGE ...` transaction. Rows travel as
+positional lists rather than maps (see `positional()`): the driver packs
+parameters in Python, and that packing, not the server, is what bounds the
+load rate on the client. A pool of `sessions` threads writes the
+transactions concurrently, each in its own driver session. Installing
+`neo4j-rust-ext` in place of `neo4j` swaps in a compiled packer.
+
+The load runs in three phases:
+
+  1. Nodes, one label at a time (docs/graph/node_definitions.md): every
+     node is MERGEd on its key and gets the Contract 1 properties plus the
+     `ingestedAt` / `sourceFile` / `contractVersion` audit properties.
+  2. Relationships (docs/graph/relationship_definitions.md), MATCHing both
+     ends on their keys. Each entity's batches are read once and fanned out
+     to every edge type they drive: invoices give SUPPLIED, RECEIVED,
+     REPORTED_IN and REGISTERED, returns give FILED and payments PAID_VIA.
+     Rows are cut down to the key fields the edge queries need.
+     Missing endpoints (a seller with no Taxpayer record, say) create no
+     edge, so broken paths stay visible to traversal.
+  3. Tombstones from a delta run (docs/ingestion/batch_format.md): the
+     nodes they key are DETACH DELETEd.
+
+MERGE only stays fast with the uniqueness constraints from
+docs/graph/graph_model.md in place, so `load()` first checks the schema
+(`migrations.verify_schema`) and refuses to start without it. Transactions go through
+`execute_write`, which retries the deadlocks parallel sessions can hit on
+shared Taxpayer nodes.
+
+After a load, the CLI appends the manifest to the loads journal
+(`record_load()`), which readers of the graph follow to learn what changed.
+
+Usage:
+    python -m backend.graph.loader <manifest.json> [--migrate] [--batch-size N] [--sessions N]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from itertools import islice
+from operator import itemgetter
+
+from backend.graph.migrations import migrate, verify_schema
+from backend.ingestion.ingest_service import ENTITY_MODELS
+
+DEFAULT_BATCH_SIZE = 10_000
+DEFAULT_SESSIONS = 4
+CONTRACT_VERSION = "1.0.0"
+# One JSON line per manifest loaded: {"manifest": path, "loadedAt": iso}
+LOADS_JOURNAL = os.path.join("data", "processed", "loads.ndjson")
+
+# Entity name (as in batch file names) -> (label, key properties), in load order
+NODE_KEYS = {
+    "taxpayer": ("Taxpayer", ("gstin",)),
+    "invoice": ("Invoice", ("supplierGstin", "invoiceNumber", "filingPeriod")),
+    "return": ("ReturnFiling", ("returnId",)),
+    "payment": ("Payment", ("paymentId",)),
+    "irn": ("IRN", ("irn",)),
+}
+
+
+def node_fields(entity):
+    """The entity's Contract 1 properties (camelCase aliases), in order."""
+    return tuple(field.alias or name for name, field in ENTITY_MODELS[entity].model_fields.items())
+
+
+def positional(query, fields):
+    """Rewrite `r.<field>` references to `r[<index>]` into `fields`.
+
+    Rows go over the wire as lists rather than maps, which halves what the
+    driver has to pack per row; queries stay written against field names.
+    """
+    return re.sub(r"\br\.(\w+)", lambda m: f"r[{fields.index(m.group(1))}]", query)
+
+
+def delete_nodes_query(label, keys):
+    key_map = ", ".join(f"{key}: r.{key}" for key in keys)
+    return positional(f"UNWIND $rows AS r MATCH (n:{label} {{{key_map}}}) DETACH DELETE n", keys)
+
+
+def merge_nodes_query(label, keys, fields):
+    key_map = ", ".join(f"{key}: r.{key}" for key in keys)
+    properties = ", ".join(f"{field}: r.{field}" for field in fields)
+    query = (
+        f"UNWIND $rows AS r MERGE (n:{label} {{{key_map}}}) "
+        f"SET n += {{{properties}}}, n.ingestedAt = $ingestedAt, n.sourceFile = $sourceFile, "
+        "n.contractVersion = $contractVersion"
+    )
+    return positional(query, fields)
+
+
+# ---------------------------------------------------------------------------
+# Relationships
+# ---------------------------------------------------------------------------
+MATCH_INVOICE = (
+    "MATCH (i:Invoice {supplierGstin: r.supplierGstin, invoiceNumber: r.invoiceNumber, "
+    "filingPeriod: r.filingPeriod})"
+)
+
+# Entity -> (fields each row is projected to, [(relationship type, field a
+# row needs to be non-empty or None, query)]). An invoice is REPORTED_IN
+# its supplier's GSTR-1 and, for B2B, its recipient's GSTR-2B of the same
+# filing period; a payment settles every return of its GSTIN and period.
+RELATIONSHIPS = {
+    "invoice": (
+        ("supplierGstin", "invoiceNumber", "filingPeriod", "recipientGstin", "irn"),
+        [
+            (
+                "SUPPLIED",
+                None,
+                f"UNWIND $rows AS r MATCH (t:Taxpayer {{gstin: r.supplierGstin}}) {MATCH_INVOICE} "
+                "MERGE (t)-[:SUPPLIED]->(i)",
+            ),
+            (
+                "RECEIVED",
+                "recipientGstin",
+                f"UNWIND $rows AS r MATCH (t:Taxpayer {{gstin: r.recipientGstin}}) {MATCH_INVOICE} "
+                "MERGE (t)-[:RECEIVED]->(i)",
+            ),
+            (
+                "REPORTED_IN",
+                None,
+                f"UNWIND $rows AS r {MATCH_INVOICE} "
+                "MATCH (f:ReturnFiling {gstin: r.supplierGstin, returnPeriod: r.filingPeriod, returnType: 'GSTR1'}) "
+                "MERGE (i)-[:REPORTED_IN]->(f)",
+            ),
+            (
+                "REPORTED_IN",
+                "recipientGstin",
+                f"UNWIND $rows AS r {MATCH_INVOICE} "
+                "MATCH (f:ReturnFiling {gstin: r.recipientGstin, returnPeriod: r.filingPeriod, returnType: 'GSTR2B'}) "
+                "MERGE (i)-[:REPORTED_IN]->(f)",
+            ),
+            (
+                "REGISTERED",
+                "irn",
+                f"UNWIND $rows AS r {MATCH_INVOICE} MATCH (n:IRN {{irn: r.irn}}) MERGE (i)-[:REGISTERED]->(n)",
+            ),
+        ],
+    ),
+    "return": (
+        ("gstin", "returnId"),
+        [
+            (
+                "FILED",
+                None,
+                "UNWIND $rows AS r MATCH (t:Taxpayer {gstin: r.gstin}) "
+                "MATCH (f:ReturnFiling {returnId: r.returnId}) MERGE (t)-[:FILED]->(f)",
+            ),
+        ],
+    ),
+    "payment": (
+        ("paymentId", "gstin", "returnPeriod"),
+        [
+            (
+                "PAID_VIA",
+                None,
+                "UNWIND $rows AS r MATCH (p:Payment {paymentId: r.paymentId}) "
+                "MATCH (f:ReturnFiling {gstin: r.gstin, returnPeriod: r.returnPeriod}) "
+                "MERGE (f)-[:PAID_VIA]->(p)",
+            ),
+        ],
+    ),
+}
+
+
+# ---------------------------------------------------------------------------
+# Batches
+# ---------------------------------------------------------------------------
+def iter_row_groups(path, size):
+    """Rows of an NDJSON batch in lists of up to `size`, read `size` lines
+    at a time and decoded with one `json.loads` call per list."""
+    with open(path, encoding="utf-8") as f:
+        while True:
+            lines = [line for line in islice(f, size) if not line.isspace()]
+            if not lines:
+                return
+            yield json.loads("[" + ",".join(lines) + "]")
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_manifest(path, verify=True):
+    """`(contract_version, batches, tombstones)` from an ingestion manifest,
+    each a list of `(entity, path)`; with `verify`, every file's SHA-256 is
+    checked first."""
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    base = os.path.dirname(path)
+    files = {"batches": [], "tombstones": []}
+    for section, paths in files.items():
+        for batch in manifest.get(section, []):
+            batch_path = os.path.join(base, batch["file"])
+            if verify and batch.get("sha256") and file_sha256(batch_path) != batch["sha256"]:
+                raise ValueError(f"{batch['file']}: SHA-256 does not match the manifest")
+            paths.append((batch["entity"], batch_path))
+    return manifest.get("contractVersion", CONTRACT_VERSION), files["batches"], files["tombstones"]
+
+
+def record_load(manifest, journal=LOADS_JOURNAL):
+    """Append a loaded manifest to the loads journal."""
+    os.makedirs(os.path.dirname(journal) or ".", exist_ok=True)
+    line = {"manifest": os.path.abspath(manifest), "loadedAt": datetime.now(timezone.utc).isoformat()}
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write(json.dumps(line) + "\n")
+
+
+def _write_tx(tx, query, rows, params):
+    counters = tx.run(query, rows=rows, **params).consume().counters
+    return {
+        "nodes": counters.nodes_created,
+        "relationships": counters.relationships_created,
+        "deleted": counters.nodes_deleted,
+    }
+
+
+class GraphLoader:
+    """Loads Contract 1 NDJSON batches into Neo4j through `driver`."""
+
+    def __init__(
+        self, driver, database=None, batch_size=DEFAULT_BATCH_SIZE, sessions=DEFAULT_SESSIONS, check_schema=True
+    ):
+        self.driver = driver
+        self.database = database
+        self.batch_size = batch_size
+        self.sessions = sessions
+        self.check_schema = check_schema
+
+    def load_manifest(self, path, verify=True):
+        contract_version, batches, tombstones = read_manifest(path, verify)
+        return self.load(batches, contract_version, tombstones)
+
+    def load(self, batches, contract_version=CONTRACT_VERSION, tombstones=()):
+        """Load `(entity, path)` batches: all nodes, then all relationships,
+        then delete the nodes keyed by `(entity, path)` tombstone files.
+
+        Returns `{"nodes": {label: counts}, "relationships": {type: counts},
+        "deleted": {label: counts}, "seconds": {phase: s}}`, where counts are
+        `{"rows": rows sent, "created" (or "deleted"): entities affected}`.
+        Raises `migrations.SchemaError` before writing if the schema is
+        incomplete.
+        """
+        if self.check_schema:
+            verify_schema(self.driver, self.database)
+        params = {
+            "ingestedAt": datetime.now(timezone.utc).isoformat(),
+            "contractVersion": contract_version,
+        }
+        stats = {"nodes": {}, "relationships": {}, "deleted": {}, "seconds": {}}
+        with ThreadPoolExecutor(max_workers=self.sessions) as pool:
+            start = time.perf_counter()
+            for entity, (label, keys) in NODE_KEYS.items():
+                paths = [path for name, path in batches if name == entity]
+                fields = node_fields(entity)
+                routes = [(label, None, merge_nodes_query(label, keys, fields))]
+                stats["nodes"].update(self._stream(pool, paths, fields, routes, params, "nodes"))
+            stats["seconds"]["nodes"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for entity, (fields, routes) in RELATIONSHIPS.items():
+                paths = [path for name, path in batches if name == entity]
+                routes = [(name, required, positional(query, fields)) for name, required, query in routes]
+                stats["relationships"].update(self._stream(pool, paths, fields, routes, params, "relationships"))
+            stats["seconds"]["relationships"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for entity, (label, keys) in NODE_KEYS.items():
+                paths = [path for name, path in tombstones if name == entity]
+                if paths:
+                    routes = [(label, None, delete_nodes_query(label, keys))]
+                    stats["deleted"].update(self._stream(pool, paths, keys, routes, params, "deleted"))
+            stats["seconds"]["deleted"] = time.perf_counter() - start
+        return stats
+
+    def _stream(self, pool, paths, fields, routes, params, counter):
+        """Stream `paths` once in groups of `batch_size` rows, as lists of
+        the values of `fields`, and send each group to every route's query,
+        less the rows missing the route's required field. Returns
+        `{"rows", outcome}` counts per route name, the outcome being the
+        `counter` ("nodes" / "relationships" created, or "deleted")."""
+        outcome = "deleted" if counter == "deleted" else "created"
+        counts = {name: {"rows": 0, outcome: 0} for name, _, _ in routes}
+        pending = {}
+        # itemgetter of one field returns the bare value; rows are always tuples
+        values = itemgetter(*fields) if len(fields) > 1 else lambda row: (row[fields[0]],)
+        required_index = {required: fields.index(required) for _, required, _ in routes if required}
+
+        def collect(done):
+            for future in done:
+                name = pending.pop(future)
+                counts[name][outcome] += future.result()[counter]
+
+        for path in paths:
+            # Transactions never span batch files, so sourceFile is exact
+            batch_params = dict(params, sourceFile=os.path.basename(path))
+            for rows in iter_row_groups(path, self.batch_size):
+                try:
+                    rows = list(map(values, rows))
+                except KeyError:
+                    # Absent properties load as null
+                    rows = [tuple(map(row.get, fields)) for row in rows]
+                for name, required, query in routes:
+                    if required is None:
+                        routed = rows
+                    else:
+                        index = required_index[required]
+                        routed = [row for row in rows if row[index]]
+                    if not routed:
+                        continue
+                    if len(pending) >= 2 * self.sessions:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(done)
+                    pending[pool.submit(self._write, query, routed, batch_params)] = name
+                    counts[name]["rows"] += len(routed)
+        collect(wait(pending).done)
+        return counts
+
+    def _write(self, query, rows, params):
+        with self.driver.session(database=self.database) as session:
+            return session.execute_write(_write_tx, query, rows, params)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load Contract 1 NDJSON batches into Neo4j")
+    parser.add_argument("manifest", help="manifest_*.json written by IngestService")
+    parser.add_argument("--uri", default=os.environ.get("NEO4J_URI", "bolt://localhost:7687"))
+    parser.add_argument("--user", default=os.environ.get("NEO4J_USER", "neo4j"))
+    parser.add_argument("--password", default=os.environ.get("NEO4J_PASSWORD", "neo4j"))
+    parser.add_argument("--database", default=os.environ.get("NEO4J_DATABASE"))
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS)
+    parser.add_argument("--migrate", action="store_true", help="apply pending schema migrations first")
+    parser.add_argument("--journal", default=LOADS_JOURNAL, help="loads journal to append the manifest to")
+    args = parser.parse_args(argv)
+
+    from neo4j import GraphDatabase
+
+    with GraphDatabase.driver(args.uri, auth=(args.user, args.password)) as driver:
+        if args.migrate:
+            migrate(driver, args.database)
+        loader = GraphLoader(driver, args.database, args.batch_size, args.sessions)
+        stats = loader.load_manifest(args.manifest)
+    record_load(args.manifest, args.journal)
+    for kind in ("nodes", "relationships", "deleted"):
+        rows = sum(counts["rows"] for counts in stats[kind].values())
+        secs = stats["seconds"][kind]
+        print(f"{kind}: {rows:,} rows in {secs:.1f}s ({rows / max(secs, 1e-9):,.0f}/s)")
+        for name, counts in stats[kind].items():
+            print(f"  {name:<12} " + "  ".join(f"{key}={value:,}" for key, value in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Graph schema migrations — versioned constraints and indexes.
+
+The schema lives in `schema/neo4j_schema.cypher` as numbered
+`// version N: <description>` blocks. `migrate()` applies the blocks newer
+than the graph's recorded version, in order, recording each on a
+`(:SchemaMigration {version, description, checksum, appliedAt})` node once
+its statements have run. Statements are `IF NOT EXISTS`, so re-running a
+half-applied block is safe, and a recorded block whose checksum no longer
+matches the file is refused rather than silently skipped.
+
+`verify_schema()` checks that every constraint and index the file names
+exists and is ONLINE. `GraphLoader` calls it before writing anything: without
+the key constraints each MERGE scans its whole label, and a load turns
+quadratic.
+
+Usage:
+    python -m backend.graph.migrations            # apply, then verify
+    python -m backend.graph.migrations --verify   # verify only
+"""
+
+import argparse
+import hashlib
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+SCHEMA_FILE = Path(__file__).resolve().parent / "schema" / "neo4j_schema.cypher"
+INDEX_WAIT_SECONDS = 300
+
+LEDGER_CONSTRAINT = (
+    "CREATE CONSTRAINT schema_migration_version IF NOT EXISTS "
+    "FOR (m:SchemaMigration) REQUIRE m.version IS UNIQUE"
+)
+
+_VERSION_HEADER = re.compile(r"^// version (\d+): (.+)$")
+_SCHEMA_NAME = re.compile(r"^CREATE (?:(CONSTRAINT)|(?:\w+ )?INDEX) (\w+) IF NOT EXISTS", re.IGNORECASE)
+
+
+class SchemaError(Exception):
+    """The graph schema is missing, offline or out of step with the file."""
+
+
+class Migration:
+    """One `// version N` block of the schema file."""
+
+    def __init__(self, version, description, statements):
+        self.version = version
+        self.description = description
+        self.statements = statements
+
+    @property
+    def checksum(self):
+        return hashlib.sha256("\n".join(self.statements).encode("utf-8")).hexdigest()
+
+    def __repr__(self):
+        return f"Migration({self.version}, {self.description!r})"
+
+
+def load_migrations(path=SCHEMA_FILE):
+    """Parse the schema file into `Migration`s, in version order."""
+    migrations = []
+    statement = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        header = _VERSION_HEADER.match(line)
+        if header:
+            migrations.append(Migration(int(header.group(1)), header.group(2).strip(), []))
+            continue
+        if not line or line.startswith("//"):
+            continue
+        if not migrations:
+            raise SchemaError(f"{path}: statement before the first '// version N:' header")
+        statement.append(line)
+        if line.endswith(";"):
+            migrations[-1].statements.append(" ".join(statement)[:-1])
+            statement = []
+    if statement:
+        raise SchemaError(f"{path}: unterminated statement: {' '.join(statement)}")
+
+    versions = [m.version for m in migrations]
+    if versions != list(range(1, len(versions) + 1)):
+        raise SchemaError(f"{path}: versions must run 1, 2, 3, ... (found {versions})")
+    return migrations
+
+
+def expected_schema(migrations):
+    """`({constraint names}, {index names})` the migrations create."""
+    constraints, indexes = set(), set()
+    for migration in migrations:
+        for statement in migration.statements:
+            match = _SCHEMA_NAME.match(statement)
+            if not match:
+                raise SchemaError(f"Not a named CREATE ... IF NOT EXISTS statement: {statement}")
+            (constraints if match.group(1) else indexes).add(match.group(2))
+    return constraints, indexes
+
+
+def applied_migrations(driver, database=None):
+    """`{version: checksum}` recorded in the graph."""
+    records, _, _ = driver.execute_query(
+        "MATCH (m:SchemaMigration) RETURN m.version AS version, m.checksum AS checksum",
+        database_=database,
+    )
+    return {record["version"]: record["checksum"] for record in records}
+
+
+def migrate(driver, database=None, migrations=None):
+    """Apply pending migrations in order; returns the versions applied."""
+    migrations = load_migrations() if migrations is None else migrations
+    driver.execute_query(LEDGER_CONSTRAINT, database_=database)
+    applied = applied_migrations(driver, database)
+
+    for migration in migrations:
+        recorded = applied.get(migration.version)
+        if recorded is not None and recorded != migration.checksum:
+            raise SchemaError(
+                f"Schema version {migration.version} ({migration.description}) was changed after it was "
+                "applied; add a new version instead of editing it"
+            )
+
+    done = []
+    for migration in migrations:
+        if migration.version in applied:
+            continue
+        # Schema commands cannot share a transaction with each other or with
+        # data writes, so each runs on its own
+        for statement in migration.statements:
+            driver.execute_query(statement, database_=database)
+        driver.execute_query(
+            "MERGE (m:SchemaMigration {version: $version}) "
+            "SET m.description = $description, m.checksum = $checksum, m.appliedAt = $appliedAt",
+            version=migration.version,
+            description=migration.description,
+            checksum=migration.checksum,
+            appliedAt=datetime.now(timezone.utc).isoformat(),
+            database_=database,
+        )
+        done.append(migration.version)
+    if done:
+        driver.execute_query(f"CALL db.awaitIndexes({INDEX_WAIT_SECONDS})", database_=database)
+    return done
+
+
+def verify_schema(driver, database=None, migrations=None):
+    """Raise `SchemaError` unless every constraint and index in the schema
+    file exists and every index is ONLINE."""
+    migrations = load_migrations() if migrations is None else migrations
+    constraints, indexes = expected_schema(migrations)
+
+    records, _, _ = driver.execute_query("SHOW CONSTRAINTS YIELD name RETURN name", database_=database)
+    missing = sorted(constraints - {record["name"] for record in records})
+    records, _, _ = driver.execute_query("SHOW INDEXES YIELD name, state RETURN name, state", database_=database)
+    states = {record["name"]: record["state"] for record in records}
+    missing += sorted(indexes - states.keys())
+    # A constraint's backing index shares its name
+    offline = sorted(name for name in constraints | indexes if states.get(name, "ONLINE") != "ONLINE")
+
+    problems = []
+    if missing:
+        problems.append(f"missing {', '.join(missing)}")
+    if offline:
+        problems.append(f"not ONLINE: {', '.join(f'{name} ({states[name]})' for name in offline)}")
+    if problems:
+        raise SchemaError(
+            f"Graph schema incomplete: {'; '.join(problems)}. Run `python -m backend.graph.migrations`."
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply and verify the graph schema")
+    parser.add_argument("--verify", action="store_true", help="only check the schema, change nothing")
+    parser.add_argument("--uri", default=os.environ.get("NEO4J_URI", "bolt://localhost:7687"))
+    parser.add_argument("--user", default=os.environ.get("NEO4J_USER", "neo4j"))
+    parser.add_argument("--password", default=os.environ.get("NEO4J_PASSWORD", "neo4j"))
+    parser.add_argument("--database", default=os.environ.get("NEO4J_DATABASE"))
+    args = parser.parse_args(argv)
+
+    from neo4j import GraphDatabase
+
+    with GraphDatabase.driver(args.uri, auth=(args.user, args.password)) as driver:
+        if not args.verify:
+            applied = migrate(driver, args.database)
+            print(f"Applied schema versions: {applied}" if applied else "Schema already up to date")
+        verify_schema(driver, args.database)
+    print("Schema verified")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,32 @@
-// Placeholder Neo4j schema
-// Create constraints and indexes here
-CREATE CONSTRAINT ON (t:Taxpayer) ASSERT t.gstin IS UNIQUE;
+// Neo4j schema for the PramanaGST graph (Neo4j 5 syntax).
+//
+// Applied by backend/graph/migrations.py: each `// version N: ...` block is
+// one migration, applied once, in order, and recorded on a
+// (:SchemaMigration) node. Applied blocks must not be edited; add a new
+// version instead. Every statement is idempotent (IF NOT EXISTS), so the
+// file can also be run directly with cypher-shell.
+
+// version 1: Node keys (docs/graph/graph_model.md)
+CREATE CONSTRAINT taxpayer_gstin IF NOT EXISTS
+FOR (t:Taxpayer) REQUIRE t.gstin IS UNIQUE;
+CREATE CONSTRAINT invoice_key IF NOT EXISTS
+FOR (i:Invoice) REQUIRE (i.supplierGstin, i.invoiceNumber, i.filingPeriod) IS UNIQUE;
+CREATE CONSTRAINT return_filing_return_id IF NOT EXISTS
+FOR (r:ReturnFiling) REQUIRE r.returnId IS UNIQUE;
+CREATE CONSTRAINT payment_payment_id IF NOT EXISTS
+FOR (p:Payment) REQUIRE p.paymentId IS UNIQUE;
+CREATE CONSTRAINT irn_irn IF NOT EXISTS
+FOR (n:IRN) REQUIRE n.irn IS UNIQUE;
+
+// version 2: Range indexes on hot filter properties and loader lookups
+CREATE RANGE INDEX invoice_filing_period IF NOT EXISTS
+FOR (i:Invoice) ON (i.filingPeriod);
+CREATE RANGE INDEX payment_payment_status IF NOT EXISTS
+FOR (p:Payment) ON (p.paymentStatus);
+CREATE RANGE INDEX irn_irn_status IF NOT EXISTS
+FOR (n:IRN) ON (n.irnStatus);
+CREATE RANGE INDEX return_filing_return_type IF NOT EXISTS
+FOR (r:ReturnFiling) ON (r.returnType);
+// REPORTED_IN and PAID_VIA find returns by GSTIN and period
+CREATE RANGE INDEX return_filing_gstin_period IF NOT EXISTS
+FOR (r:ReturnFiling) ON (r.gstin, r.returnPeriod);
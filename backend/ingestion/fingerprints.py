@@ -0,0 +1,177 @@
+"""
+Fingerprint store — delta ingestion keyed on content hashes.
+
+A monthly refresh re-sends mostly unchanged rows. With a fingerprint store,
+`IngestService` remembers each record it has emitted as
+`(entity, natural key) -> hash of its Contract 1 line`, in a SQLite file,
+and cuts every serialized chunk down to the rows that are new or whose
+canonical JSON changed before it is written as a batch. Records it has
+emitted before that a run no longer contains are emitted as tombstones.
+
+The batch line is the canonical JSON: `serializer.dump_models` writes
+exactly `model_dump_json(by_alias=True)`, so two rows hash alike exactly
+when they would load alike, whatever their raw CSV spelling. A line's
+digest covers its key too, so an unchanged row is recognised by its digest
+alone and only new or changed lines are ever parsed.
+
+Tombstones are scoped. A source is taken to be complete for the scopes its
+rows cover: the filing or return periods of invoices, returns and payments,
+and the whole entity for taxpayers and IRNs. A record is tombstoned when
+its scope was covered by the run but its key was not seen. A January
+refresh therefore never deletes February invoices.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from collections import defaultdict
+from itertools import repeat
+from operator import itemgetter
+
+# Entity -> natural key fields (camelCase, as in the batch lines)
+NATURAL_KEYS = {
+    "taxpayer": ("gstin",),
+    "invoice": ("supplierGstin", "invoiceNumber", "filingPeriod"),
+    "return": ("returnId",),
+    "payment": ("paymentId",),
+    "irn": ("irn",),
+}
+
+# Entity -> field whose value bounds tombstones (None: the whole entity)
+TOMBSTONE_SCOPES = {
+    "taxpayer": None,
+    "invoice": "filingPeriod",
+    "return": "returnPeriod",
+    "payment": "returnPeriod",
+    "irn": None,
+}
+
+# Joins the parts of a composite key; cannot occur in a GSTIN or period
+KEY_SEPARATOR = "\x1f"
+GROUP_SIZE = 20_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    entity TEXT NOT NULL,
+    key TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (entity, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fingerprints_digest ON fingerprints (entity, digest, scope);
+"""
+
+
+def digest(line):
+    return hashlib.blake2b(line, digest_size=16).hexdigest()
+
+
+def key_getter(entity):
+    """Row dict -> natural key text."""
+    fields = NATURAL_KEYS[entity]
+    if len(fields) == 1:
+        return itemgetter(fields[0])
+    parts = itemgetter(*fields)
+    return lambda row: KEY_SEPARATOR.join(parts(row))
+
+
+def scope_getter(entity):
+    field = TOMBSTONE_SCOPES[entity]
+    return (lambda row: "") if field is None else itemgetter(field)
+
+
+class FingerprintStore:
+    """The persistent `(entity, key) -> digest` table for delta runs.
+
+    Changes made while filtering a run are held in one SQLite transaction
+    until `commit()`, which `IngestService` calls only once the run's
+    manifest is on disk (or the run turned out to change nothing).
+    """
+
+    def __init__(self, path, readonly=False):
+        self.path = path
+        self.readonly = readonly
+        if readonly:
+            self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.db = sqlite3.connect(path)
+            self.db.executescript(_SCHEMA)
+        self.seen = defaultdict(set)  # entity -> line digests in this run
+        self.scopes = defaultdict(set)  # entity -> scopes covered this run
+
+    def filter_lines(self, entity, lines, group_size=GROUP_SIZE):
+        """The subset of NDJSON `lines` (bytes, newline-terminated) that is
+        new or changed; records every line as seen this run.
+
+        The kept lines are stored as well, unless the store is read-only:
+        a worker process filters against the store and leaves storing the
+        lines it kept to the store's owner (`record()`).
+        """
+        digests = list(map(digest, lines))
+        self.seen[entity].update(digests)
+        known = {}
+        for start in range(0, len(digests), group_size):
+            known.update(
+                self.db.execute(
+                    "SELECT digest, scope FROM fingerprints "
+                    "WHERE entity = ? AND digest IN (SELECT value FROM json_each(?))",
+                    (entity, json.dumps(digests[start : start + group_size])),
+                )
+            )
+        self.scopes[entity].update(known.values())
+
+        kept = []
+        kept_digests = []
+        for line, line_digest in zip(lines, digests):
+            if line_digest not in known:
+                known[line_digest] = None  # a repeat within the run is not a change
+                kept.append(line)
+                kept_digests.append(line_digest)
+        if not self.readonly:
+            self.record(entity, kept, kept_digests)
+        return kept
+
+    def record(self, entity, lines, digests=None):
+        """Store the digests of new or changed `lines` under their keys."""
+        if not lines:
+            return
+        rows = json.loads(b"[" + b",".join(lines) + b"]")
+        scopes = list(map(scope_getter(entity), rows))
+        self.scopes[entity].update(scopes)
+        self.db.executemany(
+            "INSERT INTO fingerprints (entity, key, scope, digest) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (entity, key) DO UPDATE SET scope = excluded.scope, digest = excluded.digest",
+            zip(repeat(entity), map(key_getter(entity), rows), scopes, digests or map(digest, lines)),
+        )
+
+    def tombstones(self, entity):
+        """Key dicts for `entity` records in the run's covered scopes that
+        the run did not contain, removed from the store.
+
+        Every record the run contained now holds the digest of its line, so
+        a stored digest the run never produced marks a removed record.
+        """
+        fields = NATURAL_KEYS[entity]
+        scopes = sorted(self.scopes.get(entity, ()))
+        if not scopes:
+            return []
+        seen = self.seen[entity]
+        removed = [
+            key
+            for key, line_digest in self.db.execute(
+                "SELECT key, digest FROM fingerprints "
+                "WHERE entity = ? AND scope IN (SELECT value FROM json_each(?)) ORDER BY key",
+                (entity, json.dumps(scopes)),
+            )
+            if line_digest not in seen
+        ]
+        self.db.executemany("DELETE FROM fingerprints WHERE entity = ? AND key = ?", ((entity, key) for key in removed))
+        return [dict(zip(fields, key.split(KEY_SEPARATOR))) for key in removed]
+
+    def commit(self):
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
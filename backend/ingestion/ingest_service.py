@@ -1,5 +1,385 @@
+"""
+Ingestion service — raw CSV to Contract 1 NDJSON batches.
+
+Each source CSV is streamed in chunks of `chunksize` rows. A chunk is
+normalized column-wise (`normalization.py`), validated in one
+`TypeAdapter(list[Model])` call, serialized column-wise (`serializer.py`)
+and written as its own `{entity}_batch_{timestamp}_p{process_id}.ndjson`
+file (see docs/ingestion/batch_format.md), so memory is bounded by the
+chunk size however large the source is.
+
+Rows that fail validation are dropped from the batch and their errors are
+written to `logs/ingestion_errors.json` (docs/ingestion/validation_rules.md).
+
+With `workers > 1` every source is cut into byte-range shards (see
+`sharding.py`) that a process pool ingests concurrently; worker N writes
+its own `*_pN.ndjson` batches. Either way the run ends with a
+`manifest_{timestamp}.json` listing every batch with its row count and
+SHA-256, in source order, for the graph loader to pick up.
+
+With a `fingerprints` store (`fingerprints.py`) the run is a delta: each
+serialized chunk is cut down to the lines whose canonical digest is new or
+changed since the store last saw them before its batch is written (a chunk
+with none writes nothing), and records missing from the periods the run
+covers are listed in `{entity}_tombstone_*.ndjson` files. Workers filter
+against a read-only view of the store; the parent stores what they kept. A
+delta run that emits neither batches nor tombstones writes no manifest. The
+store is committed only after the manifest is written.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Annotated
+
+import numpy as np
+import pandas as pd
+from pydantic import TypeAdapter, ValidationError, WrapValidator
+
+from .fingerprints import FingerprintStore
+from .normalization import normalize_chunk
+from .schemas import IRN, Invoice, Payment, ReturnFiling, Taxpayer
+from .serializer import dump_models
+from .sharding import open_shard, plan_shards
+
+OUTPUT_DIR = os.path.join("backend", "ingestion", "dataset", "generated_data")
+ERROR_LOG = os.path.join("logs", "ingestion_errors.json")
+DEFAULT_CHUNKSIZE = 50_000
+CONTRACT_VERSION = "1.0.0"
+# Shards per worker, so one slow shard does not leave the pool idle
+SHARDS_PER_WORKER = 4
+MIN_SHARD_BYTES = 4 << 20
+# Per-source manifest fields ("unchanged" only in delta runs)
+SOURCE_FIELDS = ("entity", "source", "rows", "valid", "invalid", "unchanged")
+
+# Entity name (as used in batch file names) -> Contract 1 model
+ENTITY_MODELS = {
+    "taxpayer": Taxpayer,
+    "invoice": Invoice,
+    "return": ReturnFiling,
+    "payment": Payment,
+    "irn": IRN,
+}
+
+_ADAPTERS = {}
+
+
+def _capture_errors(value, handler):
+    """Item validator: a failing row yields its ValidationError instead of
+    aborting the whole batch, so a chunk is validated in a single pass."""
+    try:
+        return handler(value)
+    except ValidationError as exc:
+        return exc
+
+
+def batch_adapter(entity):
+    """The cached `TypeAdapter(list[Model])` for an entity."""
+    if entity not in _ADAPTERS:
+        item = Annotated[ENTITY_MODELS[entity], WrapValidator(_capture_errors)]
+        _ADAPTERS[entity] = TypeAdapter(list[item])
+    return _ADAPTERS[entity]
+
+
+def read_chunks(path, chunksize, shard=None):
+    """Stream a raw CSV (or one `(header_end, start, end)` shard of it) as
+    all-string chunks; empty cells become NaN."""
+    source = path if shard is None else open_shard(path, *shard)
+    return pd.read_csv(source, dtype=str, chunksize=chunksize)
+
+
+def chunk_records(data, rows=None):
+    """Row dicts for Pydantic from normalized column arrays, optionally
+    limited to the row positions `rows`."""
+    names = list(data)
+    columns = [(values if rows is None else values[rows]).tolist() for values in data.values()]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def validate_batch(entity, records):
+    """Validate a chunk of records in bulk.
+
+    Returns `(models, errors)`: the valid rows as model instances, in order,
+    and a list of `(index, error)` pairs for every failed row, where `error`
+    is a Pydantic error dict.
+    """
+    models = []
+    errors = []
+    for index, result in enumerate(batch_adapter(entity).validate_python(records)):
+        if isinstance(result, ValidationError):
+            errors.extend((index, err) for err in result.errors(include_url=False))
+        else:
+            models.append(result)
+    return models, errors
+
+
+class ErrorLog:
+    """Streams rejected-row records into a JSON array on disk."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = None
+
+    def write(self, record):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._file.write("[")
+        self._file.write(",\n " if self.count else "\n ")
+        self._file.write(json.dumps(record, default=str))
+        self.count += 1
+
+    def close(self):
+        if self._file is None:
+            # A clean run still leaves an (empty) log behind
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write("[]\n")
+            return
+        self._file.write("\n]\n")
+        self._file.close()
+        self._file = None
+
+
 class IngestService:
     """Service to handle ingestion of GST data."""
-    
-    def process(self):
-        pass
+
+    def __init__(
+        self,
+        output_dir=OUTPUT_DIR,
+        error_log=ERROR_LOG,
+        chunksize=DEFAULT_CHUNKSIZE,
+        process_id=1,
+        workers=1,
+        fingerprints=None,
+    ):
+        self.output_dir = output_dir
+        self.error_log = error_log
+        self.chunksize = chunksize
+        self.process_id = process_id
+        self.workers = workers
+        self.fingerprints = fingerprints
+        self.manifest_path = None
+        self._last_timestamp = 0
+
+    def process(self, sources):
+        """Ingest raw CSVs into Contract 1 NDJSON batches.
+
+        `sources` maps an entity name from `ENTITY_MODELS` to a CSV path (or
+        is a list of `(entity, path)` pairs). CSV headers may be either the
+        model field names or their camelCase aliases; unknown columns are
+        ignored. Returns one summary dict per source; the run's manifest is
+        written to `self.manifest_path`. With `fingerprints` set, only new
+        and changed rows are emitted, plus tombstones for removed ones.
+        """
+        if isinstance(sources, dict):
+            sources = list(sources.items())
+        os.makedirs(self.output_dir, exist_ok=True)
+        store = FingerprintStore(self.fingerprints) if self.fingerprints else None
+        try:
+            errors = ErrorLog(self.error_log)
+            try:
+                if self.workers > 1:
+                    summaries = self._process_parallel(sources, errors, store)
+                else:
+                    summaries = [self.ingest_file(entity, path, errors, store=store) for entity, path in sources]
+            finally:
+                errors.close()
+            if store is None:
+                self.manifest_path = self.write_manifest(summaries, errors.count)
+                return summaries
+
+            tombstones = self.write_tombstones(store, summaries)
+            # Nothing new, changed or removed: no manifest for the loader
+            self.manifest_path = None
+            if tombstones or any(summary["batches"] for summary in summaries):
+                self.manifest_path = self.write_manifest(summaries, errors.count, tombstones)
+            store.commit()
+        finally:
+            if store is not None:
+                store.close()
+        return summaries
+
+    def write_tombstones(self, store, summaries):
+        """Write a tombstone batch per entity of the run with removed
+        records; returns their manifest entries."""
+        tombstones = []
+        for entity in dict.fromkeys(summary["entity"] for summary in summaries):
+            keys = store.tombstones(entity)
+            if keys:
+                data = "".join(json.dumps(key, separators=(",", ":")) + "\n" for key in keys).encode("utf-8")
+                tombstones.append(self._write_file(self.batch_path(entity, "tombstone"), entity, len(keys), data))
+        return tombstones
+
+    def ingest_file(self, entity, path, errors, shard=None, rows_before=0, store=None):
+        summary = {"entity": entity, "source": path, "rows": 0, "valid": 0, "invalid": 0, "batches": []}
+        if store is not None:
+            summary["unchanged"] = 0
+        for chunk in read_chunks(path, self.chunksize, shard):
+            start = rows_before + summary["rows"]
+            data, rejected = normalize_chunk(ENTITY_MODELS[entity], chunk)
+            kept = None
+            if rejected:
+                kept = np.setdiff1d(np.arange(len(chunk)), [row for row, _ in rejected])
+            models, failures = validate_batch(entity, chunk_records(data, kept))
+            if kept is not None:
+                failures = [(int(kept[index]), err) for index, err in failures]
+            failures = sorted(rejected + failures, key=lambda failure: failure[0])
+
+            for index, err in failures:
+                errors.write(error_record(entity, path, start + index + 1, err))
+            summary["rows"] += len(chunk)
+            summary["valid"] += len(models)
+            summary["invalid"] += len({index for index, _ in failures})
+
+            if models:
+                batch = self.write_batch(entity, models, store)
+                if store is not None:
+                    summary["unchanged"] += len(models) - (batch["rows"] if batch else 0)
+                if batch:
+                    summary["batches"].append(batch)
+        return summary
+
+    def _process_parallel(self, sources, errors, store=None):
+        tasks = []
+        for n, (entity, path) in enumerate(sources):
+            count = min(self.workers * SHARDS_PER_WORKER, max(os.path.getsize(path) // MIN_SHARD_BYTES, 1))
+            header_end, shards = plan_shards(path, count)
+            # The source's index keeps sources with the same file name apart
+            part = f"{self.error_log}.{n}.{os.path.basename(path)}"
+            for i, (start, end, rows_before) in enumerate(shards):
+                tasks.append((entity, path, (header_end, start, end), rows_before, f"{part}.{i}.part"))
+            if not shards:
+                # Header-only or empty file: ingest as-is for its (empty) summary
+                tasks.append((entity, path, None, 0, f"{part}.part"))
+
+        counter = multiprocessing.Value("i", 0)
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(counter, self.output_dir, self.chunksize, store and store.path),
+        ) as pool:
+            results = list(pool.map(_ingest_shard, tasks))
+
+        # Merge shard results in source/shard order
+        summaries = {}
+        for (entity, path, _, _, part), result in zip(tasks, results):
+            summary = summaries.setdefault(
+                (entity, path),
+                {"entity": entity, "source": path, "rows": 0, "valid": 0, "invalid": 0, "batches": []},
+            )
+            for key in ("rows", "valid", "invalid", "unchanged"):
+                if key in result:
+                    summary[key] = summary.get(key, 0) + result[key]
+            summary["batches"].extend(result["batches"])
+            if store is not None:
+                # The worker filtered against the store; store what it kept.
+                # A line new to two shards is kept by both: the loader MERGEs
+                store.seen[entity].update(result["seen"])
+                store.scopes[entity].update(result["scopes"])
+                for batch in result["batches"]:
+                    with open(os.path.join(self.output_dir, batch["file"]), "rb") as f:
+                        store.record(entity, f.readlines())
+            with open(part, encoding="utf-8") as f:
+                for record in json.load(f):
+                    errors.write(record)
+            os.remove(part)
+        return list(summaries.values())
+
+    def batch_path(self, entity, kind="batch"):
+        """A fresh batch file path; timestamps are epoch ms, unique per process."""
+        timestamp = max(int(time.time() * 1000), self._last_timestamp + 1)
+        self._last_timestamp = timestamp
+        return os.path.join(self.output_dir, f"{entity}_{kind}_{timestamp}_p{self.process_id}.ndjson")
+
+    def write_batch(self, entity, models, store=None):
+        """Write `models` as a batch; with a fingerprint `store`, only the
+        new or changed lines, and nothing (None) when there are none."""
+        data = dump_models(ENTITY_MODELS[entity], models).encode("utf-8")
+        if store is None:
+            return self._write_file(self.batch_path(entity), entity, len(models), data)
+        lines = store.filter_lines(entity, data.splitlines(keepends=True))
+        if not lines:
+            return None
+        return self._write_file(self.batch_path(entity), entity, len(lines), b"".join(lines))
+
+    def _write_file(self, path, entity, rows, data):
+        with open(path, "wb") as f:
+            f.write(data)
+        return {
+            "file": os.path.basename(path),
+            "entity": entity,
+            "rows": rows,
+            "bytes": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "processId": f"p{self.process_id}",
+        }
+
+    def write_manifest(self, summaries, error_count, tombstones=()):
+        timestamp = max(int(time.time() * 1000), self._last_timestamp + 1)
+        manifest = {
+            "contractVersion": CONTRACT_VERSION,
+            "createdAt": datetime.now(timezone.utc).isoformat(),
+            "sources": [
+                {key: summary[key] for key in SOURCE_FIELDS if key in summary} for summary in summaries
+            ],
+            "batches": [batch for summary in summaries for batch in summary["batches"]],
+            "tombstones": list(tombstones),
+            "errorLog": self.error_log,
+            "errors": error_count,
+        }
+        path = os.path.join(self.output_dir, f"manifest_{timestamp}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return path
+
+
+# ---------------------------------------------------------------------------
+# Worker processes
+# ---------------------------------------------------------------------------
+_WORKER_SERVICE = None
+_WORKER_STORE = None
+
+
+def _init_worker(counter, output_dir, chunksize, fingerprints=None):
+    """Give each pool process its own service and process number (p1..pN),
+    and a read-only view of the fingerprint store in delta runs."""
+    global _WORKER_SERVICE, _WORKER_STORE
+    with counter.get_lock():
+        counter.value += 1
+        process_id = counter.value
+    _WORKER_SERVICE = IngestService(output_dir=output_dir, chunksize=chunksize, process_id=process_id)
+    if fingerprints:
+        _WORKER_STORE = FingerprintStore(fingerprints, readonly=True)
+
+
+def _ingest_shard(task):
+    entity, path, shard, rows_before, error_part = task
+    errors = ErrorLog(error_part)
+    try:
+        if _WORKER_STORE is None:
+            return _WORKER_SERVICE.ingest_file(entity, path, errors, shard, rows_before)
+        _WORKER_STORE.seen.clear()
+        _WORKER_STORE.scopes.clear()
+        summary = _WORKER_SERVICE.ingest_file(entity, path, errors, shard, rows_before, _WORKER_STORE)
+        return {**summary, "seen": _WORKER_STORE.seen[entity], "scopes": _WORKER_STORE.scopes[entity]}
+    finally:
+        errors.close()
+
+
+def error_record(entity, path, row, err):
+    """One `logs/ingestion_errors.json` entry for a Pydantic error dict."""
+    return {
+        "entity": entity,
+        "source": path,
+        "row": row,
+        "column": ".".join(str(part) for part in err["loc"]),
+        "input": err.get("input"),
+        "constraint": err["type"],
+        "message": err["msg"],
+    }
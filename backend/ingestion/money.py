@@ -0,0 +1,262 @@
+"""
+Fixed-point money columns — int64 paise.
+
+Contract 1 amounts are `Decimal`s with `max_digits=15, decimal_places=2`,
+which is exact but far too slow to aggregate over millions of rows. On the
+hot path an amount column is instead held as a `Money` pair of arrays:
+
+  - `paise`: the value in paise (1/100 rupee) as int64
+  - `scale`: the number of decimal places `Decimal` would print (int8)
+
+Keeping the scale is what makes results bit-identical to `Decimal`
+arithmetic: `Decimal("1.5") + Decimal("2")` is `"3.5"`, not `"3.50"`, and
+`Decimal` addition keeps the larger scale of its operands. Scales above 2
+(`"1.000"`) are carried as long as the value is a whole number of paise, and
+negative scales (`"1E+3"`) are rendered through `Decimal` itself.
+
+Negative zero (`"-0.00"`, which the models accept) is 0 paise at its scale,
+with its sign in an optional third array, `negative_zero`. The array is None
+unless a column has one, and `add()` / `subtract()` carry the sign the way
+`Decimal` does.
+
+Conversion happens once, at the consumers' edge. Ingestion itself keeps
+Contract 1 `Decimal`s: Pydantic validates them and batches render them.
+Bulk consumers (reconciliation, the trade graph, the feature store,
+aggregates) use `parse_money()` to read the amount strings of a raw chunk
+or an NDJSON batch. `money_from_decimals()` takes validated model values.
+`format_money()` / `to_decimals()` turn results back into exactly the
+strings / `Decimal`s the `Decimal` path would produce. In between, sums,
+differences, tolerance comparisons and tax-component checks are plain
+NumPy integer operations.
+"""
+
+from decimal import Decimal, InvalidOperation
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+PAISE_PER_RUPEE = 100
+BASE_SCALE = 2
+# Trailing-zero places carried beyond BASE_SCALE ("1.000"), as long as the
+# value still fits int64 at that scale
+MAX_SCALE = 6
+_INT64_MAX = np.iinfo(np.int64).max
+_POW10 = 10 ** np.arange(MAX_SCALE + 1, dtype=np.int64)
+
+
+class Money(NamedTuple):
+    """A column of amounts: int64 paise plus the `Decimal` scale of each,
+    and where any value is `-0`, a bool mask of them."""
+
+    paise: np.ndarray
+    scale: np.ndarray
+    negative_zero: Optional[np.ndarray] = None
+
+    def take(self, rows):
+        negative_zero = None if self.negative_zero is None else self.negative_zero[rows]
+        return Money(self.paise[rows], self.scale[rows], negative_zero)
+
+
+def _negative_zero(mask):
+    return mask if mask.any() else None
+
+
+def concat(columns):
+    """One column of the values of several, in order."""
+    negative_zero = None
+    if any(column.negative_zero is not None for column in columns):
+        negative_zero = np.concatenate(
+            [np.zeros(len(c.paise), dtype=bool) if c.negative_zero is None else c.negative_zero for c in columns]
+        )
+    return Money(
+        np.concatenate([column.paise for column in columns]),
+        np.concatenate([column.scale for column in columns]),
+        negative_zero,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Edges: strings / Decimal in and out
+# ---------------------------------------------------------------------------
+def _decimal_paise(value):
+    """`(paise, scale)` of one `Decimal`, or ValueError if not exact."""
+    sign, digits, exponent = value.as_tuple()
+    if not isinstance(exponent, int):
+        raise ValueError(f"not a finite amount: {value}")
+    scale = -exponent
+    if scale > MAX_SCALE:
+        raise ValueError(f"too many decimal places for a money amount: {value}")
+    paise = value.scaleb(BASE_SCALE)
+    if paise != paise.to_integral_value():
+        raise ValueError(f"not a whole number of paise: {value}")
+    if abs(paise) * 10 ** max(scale - BASE_SCALE, 0) > _INT64_MAX:
+        raise ValueError(f"amount out of int64 paise range: {value}")
+    return int(paise), scale
+
+
+def money_from_decimals(values):
+    """A `Money` column from `Decimal`s (e.g. validated model fields)."""
+    pairs = [_decimal_paise(value) for value in values]
+    return Money(
+        np.fromiter((paise for paise, _ in pairs), dtype=np.int64, count=len(pairs)),
+        np.fromiter((scale for _, scale in pairs), dtype=np.int8, count=len(pairs)),
+        _negative_zero(np.fromiter((v.is_zero() and v.is_signed() for v in values), dtype=bool, count=len(pairs))),
+    )
+
+
+def money_columns(models, fields):
+    """`{field: Money}` for the named `Decimal` fields of validated models."""
+    return {field: money_from_decimals([getattr(model, field) for model in models]) for field in fields}
+
+
+def parse_money(values):
+    """A `Money` column from amount strings, read exactly.
+
+    Plain `[-]digits[.digits]` strings (at most 15 whole and 2 fractional
+    digits) are parsed column-wise, one pass per character position over
+    the strings' code points; anything else `Decimal` accepts (exponents,
+    a leading `+`, surrounding whitespace) goes through `Decimal` row by
+    row. Raises ValueError for values `Decimal` rejects or that are not a
+    whole number of paise; `"-0.00"` is a negative zero.
+    """
+    text = np.asarray(values, dtype=str)
+    n = len(text)
+    width = text.dtype.itemsize // 4
+    chars = text.view(np.uint32).reshape(n, width)
+
+    value = np.zeros(n, dtype=np.int64)
+    digits = np.zeros(n, dtype=np.int64)
+    frac = np.zeros(n, dtype=np.int64)
+    dots = np.zeros(n, dtype=np.int64)
+    other = np.zeros(n, dtype=bool)
+    ended = np.zeros(n, dtype=bool)
+    for j in range(width):
+        code = chars[:, j].astype(np.int64)
+        digit = code - ord("0")
+        is_digit = (digit >= 0) & (digit <= 9)
+        value = np.where(is_digit, value * 10 + digit, value)
+        digits += is_digit
+        frac += is_digit & (dots > 0)
+        is_dot = code == ord(".")
+        dots += is_dot
+        padding = code == 0
+        sign = (code == ord("-")) & (j == 0)
+        other |= ~(is_digit | is_dot | padding | sign) | (ended & ~padding)
+        ended |= padding
+
+    negative = chars[:, 0] == ord("-") if width else np.zeros(n, dtype=bool)
+    plain = ~other & (dots <= 1) & (digits > 0) & (frac <= BASE_SCALE) & (digits - frac <= 15)
+
+    paise = np.where(negative, -value, value) * _POW10[np.clip(BASE_SCALE - frac, 0, BASE_SCALE)]
+    scale = frac.astype(np.int8)
+    negative_zero = negative & (value == 0) & plain
+    for row in np.flatnonzero(~plain):
+        try:
+            amount = Decimal(str(text[row]))
+        except InvalidOperation:
+            raise ValueError(f"not a money amount: {str(text[row])!r}") from None
+        paise[row], scale[row] = _decimal_paise(amount)
+        negative_zero[row] = amount.is_zero() and amount.is_signed()
+    return Money(paise, scale, _negative_zero(negative_zero))
+
+
+def _format(paise, scale, negative_zero=False):
+    if scale < 0:
+        # Positive exponents print in scientific notation; let Decimal do it
+        value = Decimal(paise // 10 ** (BASE_SCALE - scale)).scaleb(-scale)
+        return str(value.copy_negate() if negative_zero else value)
+    if scale >= BASE_SCALE:
+        units = paise * 10 ** (scale - BASE_SCALE)
+    else:
+        units = paise // 10 ** (BASE_SCALE - scale)
+    whole, part = divmod(abs(units), 10**scale)
+    sign = "-" if units < 0 or negative_zero else ""
+    return f"{sign}{whole}.{part:0{scale}d}" if scale else f"{sign}{whole}"
+
+
+def to_decimals(column):
+    """The `Decimal` of each value, equal in value and exponent to the
+    result of the same arithmetic on `Decimal`s."""
+    return [Decimal(text) for text in format_money(column)]
+
+
+def format_money(column):
+    """`str(Decimal)` of each value, as a list of strings."""
+    texts = [_format(paise, scale) for paise, scale in zip(column.paise.tolist(), column.scale.tolist())]
+    if column.negative_zero is not None:
+        for row in np.flatnonzero(column.negative_zero).tolist():
+            texts[row] = _format(0, int(column.scale[row]), True)
+    return texts
+
+
+# ---------------------------------------------------------------------------
+# Arithmetic
+# ---------------------------------------------------------------------------
+def add(*columns):
+    """Row-wise sum of money columns; as with `Decimal`, a sum is `-0`
+    only when every term is."""
+    paise = columns[0].paise.copy()
+    scale = columns[0].scale.copy()
+    for column in columns[1:]:
+        paise += column.paise
+        np.maximum(scale, column.scale, out=scale)
+    negative_zero = None
+    if all(column.negative_zero is not None for column in columns):
+        negative_zero = _negative_zero(np.logical_and.reduce([column.negative_zero for column in columns]))
+    return Money(paise, scale, negative_zero)
+
+
+def subtract(a, b):
+    """Row-wise `a - b`; `-0` only for `-0 - 0`, as with `Decimal`."""
+    negative_zero = None
+    if a.negative_zero is not None:
+        positive_zero = b.paise == 0
+        if b.negative_zero is not None:
+            positive_zero &= ~b.negative_zero
+        negative_zero = _negative_zero(a.negative_zero & positive_zero)
+    return Money(a.paise - b.paise, np.maximum(a.scale, b.scale), negative_zero)
+
+
+def total(column):
+    """`sum()` of the column's `Decimal`s; `Decimal(0)` when empty.
+
+    Like `sum()`, which starts from the int 0, the result never has a
+    positive exponent and is never `-0`.
+    """
+    if not len(column.paise):
+        return Decimal(0)
+    scale = np.maximum(column.scale.max(keepdims=True), 0)
+    [value] = to_decimals(Money(column.paise.sum(keepdims=True), scale))
+    return value
+
+
+def group_sums(column, codes, groups):
+    """Per-group sums for integer group `codes` in `[0, groups)`.
+
+    Uses a stable sort and `np.add.reduceat`, so sums stay exact int64
+    (a `bincount` with weights would go through float64). Each group
+    matches `total()` of its rows; groups with no rows are `Decimal(0)`.
+    """
+    codes = np.asarray(codes)
+    paise = np.zeros(groups, dtype=np.int64)
+    scale = np.zeros(groups, dtype=np.int8)
+    if len(codes):
+        order = np.argsort(codes, kind="stable")
+        ordered = codes[order]
+        starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+        present = ordered[starts]
+        paise[present] = np.add.reduceat(column.paise[order], starts)
+        scale[present] = np.maximum(np.maximum.reduceat(column.scale[order], starts), 0)
+    return Money(paise, scale)
+
+
+def within_tolerance(a, b, tolerance_paise=0):
+    """Rows where `|a - b| <= tolerance`, with the tolerance in paise."""
+    return np.abs(a.paise - b.paise) <= tolerance_paise
+
+
+def tax_component_mismatch(total_value, components, tolerance_paise=0):
+    """Rows whose tax components (`cgst + sgst + igst + cess`, plus the
+    taxable value where the total includes it) do not add up to
+    `total_value` within `tolerance_paise`."""
+    return ~within_tolerance(add(*components), total_value, tolerance_paise)
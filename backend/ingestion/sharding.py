@@ -0,0 +1,118 @@
+"""
+Byte-range sharding of raw CSVs for multi-process ingestion.
+
+`plan_shards()` cuts a CSV into contiguous byte ranges that each start on a
+record boundary, so worker processes can parse their share independently.
+Quote parity is tracked while scanning (an escaped `""` flips it twice), so
+a newline inside a quoted field is never chosen as a boundary.
+
+`open_shard()` exposes one range, prefixed with the header line, as a file
+object `pd.read_csv` can stream in chunks.
+"""
+
+import bisect
+import io
+import os
+import re
+
+SCAN_BLOCK = 1 << 22
+_QUOTE_OR_NEWLINE = re.compile(rb'["\n]')
+
+
+def plan_shards(path, count, block_size=SCAN_BLOCK):
+    """Split a CSV into at most `count` byte ranges of roughly equal size.
+
+    Returns `(header_end, shards)` where `header_end` is the offset just
+    past the header record and each shard is `(start, end, rows_before)`,
+    `rows_before` being the number of data rows preceding `start`. A file
+    with no complete header record yields no shards.
+    """
+    size = os.path.getsize(path)
+    pending = [size * k // count for k in range(1, count)]
+    cuts = []
+    header_end = None
+    record_ends = 0
+    in_quotes = False
+    offset = 0
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            if in_quotes or b'"' in block:
+                ends = []
+                for match in _QUOTE_OR_NEWLINE.finditer(block):
+                    if match.group() == b'"':
+                        in_quotes = not in_quotes
+                    elif not in_quotes:
+                        ends.append(match.start())
+
+                def next_end(pos, ends=ends):
+                    i = bisect.bisect_left(ends, pos)
+                    return (ends[i], i) if i < len(ends) else (None, len(ends))
+
+                block_ends = len(ends)
+            else:
+                def next_end(pos, block=block):
+                    i = block.find(b"\n", pos)
+                    return (i, block.count(b"\n", 0, i)) if i >= 0 else (None, 0)
+
+                block_ends = block.count(b"\n")
+
+            if header_end is None:
+                end, _ = next_end(0)
+                if end is not None:
+                    header_end = offset + end + 1
+
+            while pending and pending[0] < offset + len(block):
+                end, before = next_end(max(pending[0] - offset, 0))
+                if end is None:
+                    break
+                cut = offset + end + 1
+                # record ends up to and including this one, less the header
+                cuts.append((cut, record_ends + before))
+                pending = [target for target in pending if target >= cut]
+
+            record_ends += block_ends
+            offset += len(block)
+
+    if header_end is None:
+        return size, []
+    bounds = [(header_end, 0)] + [(cut, rows) for cut, rows in cuts if header_end < cut < size]
+    ends = [cut for cut, _ in bounds[1:]] + [size]
+    shards = [(start, end, rows) for (start, rows), end in zip(bounds, ends) if start < end]
+    return header_end, shards
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of a file's header followed by `[start, end)`."""
+
+    def __init__(self, path, header_end, start, end):
+        self._file = open(path, "rb")
+        self._header = self._file.read(header_end)
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._header:
+            n = min(len(buffer), len(self._header))
+            buffer[:n] = self._header[:n]
+            self._header = self._header[n:]
+            return n
+        n = min(len(buffer), self._remaining)
+        if n <= 0:
+            return 0
+        data = self._file.read(n)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def open_shard(path, header_end, start, end):
+    """A buffered binary file over the header plus bytes `[start, end)`."""
+    return io.BufferedReader(_ByteRange(path, header_end, start, end))
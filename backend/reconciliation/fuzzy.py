@@ -0,0 +1,189 @@
+"""
+Near-miss invoice matching — a blocking index over unmatched invoice keys.
+
+Suppliers and recipients format invoice numbers differently, so some
+invoices are reported on both sides but land on different exact keys:
+"INV/23-24/0017" in GSTR-1 and "2324/17" in GSTR-2B. `reconcile()` reports
+each side as missing from the other. `near_matches()` pairs them up again
+without comparing all pairs.
+
+Only a `MISSING_IN_GSTR2B` key and a `MISSING_IN_GSTR1` key of the same
+bucket (supplier GSTIN, filing period) can pair. Within a bucket, each
+invoice number gets blocking keys read off its digit runs:
+
+  - `suffix`: the last digit run, as a number ("INV/23-24/0017" -> 17),
+    which survives a changed or dropped prefix or financial year
+  - `digits`: every digit run, leading zeros dropped, concatenated
+    ("INV/23-24/0017" -> "232417"), which survives changed letters and
+    separators
+  - `sorted`: the same digits in sorted order, which survives transposed
+    digits ("INV-1243" for "INV-1234")
+
+Candidate pairs share a bucket and at least one blocking key. A block that
+would yield more than `max_block` pairs (a suffix every invoice ends in,
+say) is skipped. Every candidate is scored column-wise with the Dice
+coefficient of the two invoice keys' character bigrams. A candidate is a
+near match when its score reaches `min_similarity` and both amounts agree
+within the reconciliation tolerances. Pairs are one to one, each key
+taking its highest-scoring partner.
+
+`merge_near_matches()` folds each pair into a single vector: the GSTR-1
+key, with the GSTR-2B amounts and spelling (`gstr2bInvoiceNumber`).
+
+Usage:
+    result = matching.reconcile(gstr1, gstr2b)
+    result = merge_near_matches(result, near_matches(result))
+"""
+
+import numpy as np
+import pandas as pd
+
+from .matching import AMOUNTS, DEFAULT_TOLERANCES, classify, fold_codes
+
+BLOCKING_KEYS = ("suffix", "digits", "sorted")
+DEFAULT_MIN_SIMILARITY = 0.5
+DEFAULT_MAX_BLOCK = 64
+
+
+def sorted_unique(values):
+    """`np.unique` by sorting, which beats its hash path on int64 codes."""
+    values = np.sort(values)
+    return values[np.concatenate(([True], values[1:] != values[:-1]))] if len(values) else values
+
+
+def blocking_keys(numbers):
+    """`{name: key per number}` for raw invoice numbers; None where a number
+    has no digits. Computed once per distinct number."""
+    codes, uniques = pd.factorize(np.asarray(numbers, dtype=object))
+    runs = pd.Series(uniques, dtype=object).str.findall(r"[0-9]+")
+    runs = runs.map(lambda parts: [part.lstrip("0") or "0" for part in parts])
+    digits = runs.map("".join)
+    keys = {
+        "suffix": runs.map(lambda parts: parts[-1] if parts else None),
+        "digits": digits.where(digits != "", None),
+        "sorted": digits.map(lambda text: "".join(sorted(text)) if text else None),
+    }
+    return {name: np.append(values.to_numpy(dtype=object, na_value=None), None)[codes] for name, values in keys.items()}
+
+
+def candidate_pairs(buckets, keys, left, right, max_block=DEFAULT_MAX_BLOCK):
+    """`(left_rows, right_rows)` sharing a bucket and a blocking key, for
+    row masks `left` / `right`; deduplicated across blocking keys."""
+    rows = np.arange(len(buckets))
+    found = [np.zeros(0, dtype=np.int64)]
+    for name in BLOCKING_KEYS:
+        key_codes, key_uniques = pd.factorize(keys[name])
+        blocks = fold_codes(buckets, key_codes, max(len(key_uniques), 1))
+        usable = key_codes >= 0
+        l_rows, r_rows = rows[left & usable], rows[right & usable]
+        # Block sizes on each side bound the pairs a block yields
+        sizes = [np.bincount(blocks[side], minlength=len(blocks)) for side in (l_rows, r_rows)]
+        small = sizes[0] * sizes[1] <= max_block
+        l_rows, r_rows = l_rows[small[blocks[l_rows]]], r_rows[small[blocks[r_rows]]]
+        pairs = pd.merge(
+            pd.DataFrame({"block": blocks[l_rows], "left": l_rows}),
+            pd.DataFrame({"block": blocks[r_rows], "right": r_rows}),
+            on="block",
+        )
+        found.append(pairs["left"].to_numpy() * len(buckets) + pairs["right"].to_numpy())
+    return np.divmod(sorted_unique(np.concatenate(found)), max(len(buckets), 1))
+
+
+def bigram_sets(keys):
+    """CSR sets of the distinct character bigrams of each key:
+    `(indptr, grams)`, grams as small integer codes."""
+    text = np.asarray(keys, dtype=str)
+    n = len(text)
+    width = text.dtype.itemsize // 4
+    chars = text.view(np.uint32).reshape(n, width).astype(np.int64)
+    grams = chars[:, :-1] * 0x110000 + chars[:, 1:]
+    valid = chars[:, 1:] != 0
+    codes, uniques = pd.factorize(grams[valid])
+    # One sort orders each key's bigrams and drops repeats
+    pairs = sorted_unique(np.repeat(np.arange(n), valid.sum(axis=1)) * max(len(uniques), 1) + codes)
+    owner, grams = np.divmod(pairs, max(len(uniques), 1))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(owner, minlength=n), out=indptr[1:])
+    return indptr, grams
+
+
+def _expand(indptr, members, pair_ids):
+    """`(pair, gram)` rows of every pair's member set."""
+    counts = indptr[members + 1] - indptr[members]
+    starts = np.repeat(indptr[members] - np.cumsum(counts) + counts, counts)
+    return np.repeat(pair_ids, counts), starts + np.arange(counts.sum())
+
+
+def dice_similarity(keys, left, right):
+    """Bigram Dice coefficient of `keys[left]` vs `keys[right]`, pairwise;
+    keys shorter than two characters score 1 when equal, else 0."""
+    codes, uniques = pd.factorize(np.asarray(keys, dtype=object))
+    indptr, grams = bigram_sets(uniques)
+    a, b = codes[left], codes[right]
+    span = int(grams.max(initial=0)) + 1
+    pair_ids = np.arange(len(a))
+    # A (pair, bigram) seen from both keys is a shared bigram
+    rows = [pairs * span + grams[positions] for pairs, positions in (_expand(indptr, m, pair_ids) for m in (a, b))]
+    both = np.sort(np.concatenate(rows))
+    shared = np.bincount(both[1:][both[1:] == both[:-1]] // span, minlength=len(a))
+    sizes = np.diff(indptr)
+    total = sizes[a] + sizes[b]
+    return np.where(total > 0, 2 * shared / np.maximum(total, 1), (a == b).astype(float))
+
+
+def near_matches(
+    result,
+    tolerances=None,
+    min_similarity=DEFAULT_MIN_SIMILARITY,
+    max_block=DEFAULT_MAX_BLOCK,
+):
+    """Near-miss pairs among the unmatched keys of a `reconcile()` result.
+
+    Returns a frame with one row per pair: `gstr1_row` / `gstr2b_row` (row
+    positions in `result` of the `MISSING_IN_GSTR2B` and `MISSING_IN_GSTR1`
+    keys) and their `similarity`.
+    """
+    tolerances = {**DEFAULT_TOLERANCES, **(tolerances or {})}
+    status = result["match_status"].to_numpy()
+    left, right = status == "MISSING_IN_GSTR2B", status == "MISSING_IN_GSTR1"
+    numbers = result["invoice_number"].to_numpy(dtype=object)
+
+    buckets = fold_codes(
+        pd.factorize(result["supplier_gstin"])[0], pd.factorize(result["filing_period"])[0], len(result) + 1
+    )
+    l_rows, r_rows = candidate_pairs(buckets, blocking_keys(numbers), left, right, max_block)
+
+    agree = np.ones(len(l_rows), dtype=bool)
+    for field in AMOUNTS:
+        # An amount one side does not report is not compared (`classify()`)
+        gstr1, gstr2b = result[f"gstr1_{field}"], result[f"gstr2b_{field}"]
+        unreported = gstr1.isna().to_numpy()[l_rows] | gstr2b.isna().to_numpy()[r_rows]
+        gstr1 = gstr1.to_numpy(dtype=np.int64, na_value=0)[l_rows]
+        gstr2b = gstr2b.to_numpy(dtype=np.int64, na_value=0)[r_rows]
+        agree &= unreported | (np.abs(gstr1 - gstr2b) <= tolerances[field])
+    l_rows, r_rows = l_rows[agree], r_rows[agree]
+    similarity = dice_similarity(result["invoice_key"].to_numpy(dtype=object), l_rows, r_rows)
+
+    pairs = pd.DataFrame({"gstr1_row": l_rows, "gstr2b_row": r_rows, "similarity": similarity})
+    pairs = pairs[pairs["similarity"] >= min_similarity]
+    # Best pair per GSTR-1 key, then per GSTR-2B key: one to one, and a
+    # key whose best partner prefers another key stays unmatched
+    pairs = pairs.sort_values(["similarity", "gstr1_row", "gstr2b_row"], ascending=[False, True, True])
+    pairs = pairs.drop_duplicates("gstr1_row").drop_duplicates("gstr2b_row")
+    return pairs.sort_values("gstr1_row").reset_index(drop=True)
+
+
+def merge_near_matches(result, pairs, tolerances=None):
+    """`result` with each near-match pair folded into its GSTR-1 key's row
+    (GSTR-2B amounts and spelling filled in) and the GSTR-2B row dropped."""
+    merged = result.copy()
+    gstr1, gstr2b = pairs["gstr1_row"].to_numpy(), pairs["gstr2b_row"].to_numpy()
+    for column in ("gstr2b_taxable_value", "gstr2b_tax_amount"):
+        merged.iloc[gstr1, merged.columns.get_loc(column)] = result[column].to_numpy()[gstr2b]
+    merged.iloc[gstr1, merged.columns.get_loc("gstr2b_invoice_number")] = result["invoice_number"].to_numpy()[gstr2b]
+    recipients = merged["recipient_gstin"].to_numpy(dtype=object, copy=True)
+    fill = pd.isna(recipients[gstr1])
+    recipients[gstr1[fill]] = result["recipient_gstin"].to_numpy(dtype=object)[gstr2b[fill]]
+    merged["recipient_gstin"] = recipients
+    merged = merged.drop(index=merged.index[gstr2b]).reset_index(drop=True)
+    return classify(merged, tolerances)
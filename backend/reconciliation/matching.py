@@ -0,0 +1,555 @@
+"""
+GSTR-1 vs GSTR-2B reconciliation — vectorized hash join on invoice keys.
+
+Both sides are frames of invoice records in Contract 1 field names (or
+their camelCase aliases): `supplier_gstin`, `invoice_number`,
+`filing_period`, optionally `recipient_gstin` and `taxable_value`, and the
+tax components `igst_amount` / `cgst_amount` / `sgst_amount` /
+`cess_amount` (at least one). The validator's sample `gstr1.csv` and
+`gstr2b.csv` layouts are mapped onto these by `adapt_layout()`; GSTR-2B
+claims there name no supplier, which `resolve_suppliers()` looks up in
+GSTR-1.
+
+Records are matched on a composite key:
+
+  - supplier GSTIN, stripped and uppercased (normalization Rule 4)
+  - invoice number, uppercased, leading zeros of each digit run dropped,
+    then each run of punctuation and spaces collapsed to one "/" (none at
+    the ends): "inv/0042" and "INV - 42" are the same invoice. The
+    separators keep their positions, so "A-1/23" and "A-12/3" stay two
+    invoices; looser spellings ("INV42") are left to the near-match pass
+    (`fuzzy.py`)
+  - filing period, stripped
+
+The join never compares strings row by row. Each key part is hashed once
+per distinct value (`pd.factorize` over both sides together, normalized
+per distinct value, factorized again), the parts are folded into one
+integer code per row, and every record lands in its key's slot. Amounts
+are int64 paise (`money.parse_money`), summed per key and side with
+`money.group_sums`, so a key reported twice on one side is compared on its
+total. Each key is then classified with array masks:
+
+  - `MATCHED`: on both sides, every amount within its paise tolerance
+  - `AMOUNT_MISMATCH`: on both sides, some amount beyond its tolerance
+  - `MISSING_IN_GSTR2B`: reported by the supplier only
+  - `MISSING_IN_GSTR1`: in the recipient's GSTR-2B only
+
+The result has one row per key, shaped like the Contract 3
+`MismatchVector` (amounts in paise), and `dump_vectors()` writes it as
+Contract 3 NDJSON.
+
+`reconcile()` holds both sides in memory. The command line goes through
+`reconcile_files()`, which spills both files to disk by filing period and
+reconciles one period at a time, so a side larger than memory only needs
+its largest period to fit.
+
+Usage:
+    python -m backend.reconciliation.matching gstr1.csv gstr2b.csv -o mismatches.ndjson
+"""
+
+import argparse
+import os
+import pickle
+import re
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from backend.ingestion import money
+from backend.ingestion.normalization import normalize_money, normalize_upper
+from backend.ingestion.schemas import Invoice
+from backend.ingestion.serializer import dump_columns, field_kind
+
+from .schemas import MatchStatus, MismatchVector
+
+KEY_FIELDS = ("supplier_gstin", "invoice_number", "filing_period")
+TAX_FIELDS = ("igst_amount", "cgst_amount", "sgst_amount", "cess_amount")
+AMOUNTS = ("taxable_value", "tax_amount")
+
+# The validator's GSTR-2B layout reports ITC claimed in place of tax components
+CLAIM_FIELD = "itc_claimed"
+# Columns of the validator's layouts that `adapt_layout()` maps
+LAYOUT_COLUMNS = {"invoice_date", "invoice_value", "claim_period", CLAIM_FIELD}
+UNRESOLVED_COLUMNS = ("recipient_gstin", "invoice_number", "filing_period", "tax_amount")
+_ALIASES = {field.alias: name for name, field in Invoice.model_fields.items()}
+
+# Amount -> largest |GSTR-1 - GSTR-2B| still MATCHED, in paise
+DEFAULT_TOLERANCES = {"taxable_value": 100, "tax_amount": 100}
+
+# Status codes index this tuple
+STATUSES = (
+    MatchStatus.MATCHED,
+    MatchStatus.AMOUNT_MISMATCH,
+    MatchStatus.MISSING_IN_GSTR2B,
+    MatchStatus.MISSING_IN_GSTR1,
+)
+MATCHED, AMOUNT_MISMATCH, MISSING_IN_GSTR2B, MISSING_IN_GSTR1 = range(len(STATUSES))
+_STATUS_VALUES = np.array([status.value for status in STATUSES], dtype=object)
+
+CHUNKSIZE = 1_000_000
+
+
+# ---------------------------------------------------------------------------
+# Key normalization (per distinct value)
+# ---------------------------------------------------------------------------
+_LEADING_ZEROS = re.compile(r"(?<![0-9])0+(?=[0-9])")
+_SEPARATORS = re.compile(r"[^0-9A-Z]+")
+SEPARATOR = "/"
+
+
+def invoice_key(raw):
+    """Normalized invoice number; leading zeros of each digit run go, then
+    each run of other characters becomes one `SEPARATOR`."""
+    return _SEPARATORS.sub(SEPARATOR, _LEADING_ZEROS.sub("", raw.upper())).strip(SEPARATOR)
+
+
+def normalize_invoice_numbers(uniques):
+    """`invoice_key()` of every value, one pass per character position
+    over the strings' code points; non-ASCII values go through
+    `invoice_key()` itself."""
+    text = np.asarray(uniques, dtype=str)
+    n = len(text)
+    width = text.dtype.itemsize // 4
+    chars = text.view(np.uint32).reshape(n, width).copy()
+    chars[(chars >= ord("a")) & (chars <= ord("z"))] -= ord("a") - ord("A")
+    digit = (chars >= ord("0")) & (chars <= ord("9"))
+    alnum = digit | ((chars >= ord("A")) & (chars <= ord("Z")))
+    keep = alnum.copy()
+
+    # The first character of each separator run between two alphanumerics
+    # stands for the run; the padding is NUL and separates nothing
+    separator = ~alnum & (chars != 0)
+    first = separator.copy()
+    first[:, 1:] &= ~separator[:, :-1]
+    before = np.zeros_like(alnum)
+    before[:, 1:] = np.logical_or.accumulate(alnum, axis=1)[:, :-1]
+    after = np.zeros_like(alnum)
+    after[:, :-1] = np.logical_or.accumulate(alnum[:, ::-1], axis=1)[:, ::-1][:, 1:]
+    joins = first & before & after
+    chars[joins] = ord(SEPARATOR)
+    keep |= joins
+
+    leading = np.zeros(n, dtype=bool)
+    for j in range(width - 1):
+        # A zero in a run of zeros that starts a digit run, with a digit next
+        after_digit = digit[:, j - 1] if j else np.zeros(n, dtype=bool)
+        leading = (chars[:, j] == ord("0")) & (leading | ~after_digit)
+        keep[:, j] &= ~(leading & digit[:, j + 1])
+
+    # Kept characters move left in order; the padding is NUL
+    order = np.argsort(~keep, axis=1, kind="stable")
+    packed = np.take_along_axis(np.where(keep, chars, 0), order, axis=1).astype(np.uint32)
+    keys = np.ascontiguousarray(packed).view(f"U{max(width, 1)}").reshape(n).astype(object)
+    for row in np.flatnonzero((chars >= 128).any(axis=1)):
+        keys[row] = invoice_key(str(text[row]))
+    return keys
+
+
+def normalize_periods(uniques):
+    return np.array([v.strip() for v in uniques], dtype=object)
+
+
+KEY_NORMALIZERS = {
+    "supplier_gstin": normalize_upper,
+    "invoice_number": normalize_invoice_numbers,
+    "filing_period": normalize_periods,
+}
+
+
+def normalized_codes(values, normalize):
+    """`(codes, uniques)` of `values` after `normalize`, which runs once per
+    distinct raw value; missing values get code -1."""
+    raw_codes, raw_uniques = pd.factorize(values)
+    codes, uniques = pd.factorize(normalize(np.asarray(raw_uniques, dtype=object)))
+    return np.append(codes, -1)[raw_codes], np.asarray(uniques, dtype=object)
+
+
+def fold_codes(codes, part, size):
+    """Combine two code arrays into one code per distinct pair, 0-based."""
+    return pd.factorize(codes * size + part)[0]
+
+
+# ---------------------------------------------------------------------------
+# Sides
+# ---------------------------------------------------------------------------
+def parse_amounts(values):
+    return money.parse_money(normalize_money(np.asarray(values, dtype=object)))
+
+
+def invoice_periods(dates):
+    """MMYYYY filing periods of ISO invoice dates (the validator's GSTR-1
+    layout), one slice per distinct date; None where a date is missing."""
+    codes, uniques = pd.factorize(np.asarray(dates, dtype=object))
+    periods = [f"{date.strip()[5:7]}{date.strip()[:4]}" for date in uniques]
+    return np.array(periods + [None], dtype=object)[codes]
+
+
+def adapt_layout(frame):
+    """`frame` with the columns `prepare_side()` reads.
+
+    Contract 1 camelCase aliases become field names. The validator's sample
+    returns (`scripts/validator.py`) are laid out differently and mapped:
+
+      - GSTR-1 (`invoice_date`, tax-inclusive `invoice_value`): the filing
+        period is the invoice month; the taxable value is worked out in
+        `prepare_side()` as `invoice_value` less the tax components
+      - GSTR-2B (`recipient_gstin`, `invoice_number`, `claim_period`,
+        `itc_claimed`): one ITC claim per row. GSTR-2B lists an invoice
+        under the period its supplier filed it in, so `claim_period` is
+        the filing period and `itc_claimed` the tax. There is no taxable
+        value, and no supplier GSTIN: see `resolve_suppliers()`
+    """
+    frame = frame.rename(columns=_ALIASES)
+    if "filing_period" not in frame:
+        if "claim_period" in frame:
+            frame = frame.rename(columns={"claim_period": "filing_period"})
+        elif "invoice_date" in frame:
+            frame = frame.assign(filing_period=invoice_periods(frame["invoice_date"].array))
+    return frame
+
+
+def prepare_side(frame, name):
+    """Key columns (object arrays) and `AMOUNTS` (`Money`) of one side.
+
+    The taxable value is None when the side does not report one, and the
+    supplier GSTINs are None in the validator's GSTR-2B layout.
+    """
+    frame = adapt_layout(frame)
+    taxes = [field for field in TAX_FIELDS if field in frame] or [field for field in (CLAIM_FIELD,) if field in frame]
+    required = ("invoice_number", "filing_period", "recipient_gstin" if CLAIM_FIELD in taxes else "supplier_gstin")
+    missing = [field for field in required if field not in frame]
+    if missing or not taxes:
+        raise ValueError(f"{name} is missing columns: {', '.join(missing) or ' / '.join(TAX_FIELDS)}")
+
+    side = {}
+    for field in KEY_FIELDS + ("recipient_gstin",):
+        if field in frame:
+            side[field] = np.asarray(frame[field].array, dtype=object)
+        else:
+            side[field] = np.full(len(frame), None, dtype=object)
+    side["tax_amount"] = money.add(*(parse_amounts(frame[field].array) for field in taxes))
+    if "taxable_value" in frame:
+        side["taxable_value"] = parse_amounts(frame["taxable_value"].array)
+    elif "invoice_value" in frame:
+        side["taxable_value"] = money.subtract(parse_amounts(frame["invoice_value"].array), side["tax_amount"])
+    else:
+        side["taxable_value"] = None
+    return side
+
+
+def empty_side():
+    side = {field: np.empty(0, dtype=object) for field in KEY_FIELDS + ("recipient_gstin",)}
+    for field in AMOUNTS:
+        side[field] = money.Money(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int8))
+    return side
+
+
+def take_side(side, rows):
+    """The records of `side` at `rows`."""
+    taken = {field: side[field][rows] for field in KEY_FIELDS + ("recipient_gstin",)}
+    for field in AMOUNTS:
+        taken[field] = None if side[field] is None else side[field].take(rows)
+    return taken
+
+
+def concat_sides(parts):
+    """One side from the records of several, in order."""
+    if not parts:
+        return empty_side()
+    side = {field: np.concatenate([part[field] for part in parts]) for field in KEY_FIELDS + ("recipient_gstin",)}
+    for field in AMOUNTS:
+        if any(part[field] is None for part in parts):
+            side[field] = None
+        else:
+            side[field] = money.concat([part[field] for part in parts])
+    return side
+
+
+def read_chunks(path, chunksize=CHUNKSIZE):
+    """The CSV's chunks as strings, with only the columns reconciliation
+    (or a layout `adapt_layout()` maps) needs."""
+    wanted = set(KEY_FIELDS + TAX_FIELDS) | {"recipient_gstin", "taxable_value"}
+    wanted |= {Invoice.model_fields[field].alias for field in wanted}
+    wanted |= LAYOUT_COLUMNS
+    return pd.read_csv(path, dtype=str, chunksize=chunksize, usecols=wanted.__contains__)
+
+
+def read_side(path, chunksize=CHUNKSIZE):
+    """A whole side from a CSV; amounts are converted to paise chunk by
+    chunk, but every record is held in memory. `reconcile_files()` holds
+    one filing period at a time instead."""
+    return concat_sides([prepare_side(chunk, path) for chunk in read_chunks(path, chunksize)])
+
+
+def resolve_suppliers(gstr1, gstr2b):
+    """Supplier GSTINs for GSTR-2B records that have none.
+
+    A record takes the supplier of the GSTR-1 invoices with the same
+    recipient GSTIN, invoice key and filing period, when exactly one
+    supplier filed such an invoice. Returns `(side, unresolved)`: the
+    GSTR-2B side without the records still lacking a supplier, and those
+    records as a frame (recipient GSTIN, invoice number, filing period,
+    tax). A claim nobody filed for the recipient lands in `unresolved`.
+    """
+    missing = pd.isna(gstr2b["supplier_gstin"])
+    if not missing.any():
+        return gstr2b, pd.DataFrame(columns=UNRESOLVED_COLUMNS)
+    claims = np.flatnonzero(missing)
+    n1 = len(gstr1["supplier_gstin"])
+    codes = None
+    valid = np.ones(n1 + len(claims), dtype=bool)
+    for field, normalize in (
+        ("recipient_gstin", normalize_upper),
+        ("invoice_number", normalize_invoice_numbers),
+        ("filing_period", normalize_periods),
+    ):
+        part, uniques = normalized_codes(np.concatenate([gstr1[field], gstr2b[field][claims]]), normalize)
+        valid &= part >= 0
+        codes = part if codes is None else fold_codes(codes, part, len(uniques))
+
+    # Invoice codes filed by exactly one (normalized) supplier
+    supplier_codes, suppliers = normalized_codes(gstr1["supplier_gstin"], normalize_upper)
+    filed = pd.DataFrame({"code": codes[:n1], "supplier": supplier_codes})[valid[:n1]].drop_duplicates()
+    filed = filed.drop_duplicates("code", keep=False)
+    found = pd.Index(filed["code"]).get_indexer(codes[n1:])
+    found[~valid[n1:]] = -1
+
+    side = {**gstr2b, "supplier_gstin": gstr2b["supplier_gstin"].copy()}
+    resolved = found >= 0
+    side["supplier_gstin"][claims[resolved]] = suppliers[filed["supplier"].to_numpy()[found[resolved]]]
+    keep = ~missing
+    keep[claims[resolved]] = True
+    left = claims[~resolved]
+    unresolved = pd.DataFrame({field: gstr2b[field][left] for field in UNRESOLVED_COLUMNS[:-1]})
+    unresolved["tax_amount"] = money.format_money(gstr2b["tax_amount"].take(left))
+    return take_side(side, np.flatnonzero(keep)), unresolved
+
+
+def partition_side(path, directory, name, chunksize=CHUNKSIZE):
+    """Split a side's CSV into pickles under `directory`, one per chunk and
+    filing period; returns `{period: [pickle paths]}`, periods normalized
+    as in the key."""
+    partitions = {}
+    for number, chunk in enumerate(read_chunks(path, chunksize)):
+        side = prepare_side(chunk, path)
+        codes, periods = normalized_codes(side["filing_period"], normalize_periods)
+        if (codes < 0).any():
+            raise ValueError(f"{path}: {int((codes < 0).sum())} records have no filing_period")
+        order = np.argsort(codes, kind="stable")
+        starts = np.searchsorted(codes[order], np.arange(len(periods) + 1))
+        for code, period in enumerate(periods):
+            target = os.path.join(directory, f"{name}.{number}.{code}.pkl")
+            with open(target, "wb") as f:
+                pickle.dump(take_side(side, order[starts[code]:starts[code + 1]]), f, pickle.HIGHEST_PROTOCOL)
+            partitions.setdefault(period, []).append(target)
+    return partitions
+
+
+def load_partition(paths):
+    parts = []
+    for path in paths:
+        with open(path, "rb") as f:
+            parts.append(pickle.load(f))
+    return concat_sides(parts)
+
+
+def _period_order(period):
+    return period[2:], period[:2]
+
+
+def reconcile_files(gstr1_path, gstr2b_path, tolerances=None, chunksize=CHUNKSIZE):
+    """Reconcile two CSVs one filing period at a time.
+
+    Both files are read in chunks and spilled to a temporary directory, one
+    pickle per chunk and period, so memory holds a chunk while splitting
+    and a period's records while matching, never a whole side. The period
+    is part of the key, so the per-period results are the whole-file
+    result split by period. GSTR-2B records without a supplier GSTIN go
+    through `resolve_suppliers()` against the period's GSTR-1.
+
+    Yields `(period, result, unresolved)`, oldest period first.
+    """
+    with tempfile.TemporaryDirectory(prefix="reconcile-") as directory:
+        gstr1 = partition_side(gstr1_path, directory, "gstr1", chunksize)
+        gstr2b = partition_side(gstr2b_path, directory, "gstr2b", chunksize)
+        for period in sorted(gstr1.keys() | gstr2b.keys(), key=_period_order):
+            filed = load_partition(gstr1.get(period, []))
+            claimed, unresolved = resolve_suppliers(filed, load_partition(gstr2b.get(period, [])))
+            yield period, reconcile(filed, claimed, tolerances), unresolved
+
+
+# ---------------------------------------------------------------------------
+# Matching
+# ---------------------------------------------------------------------------
+def reconcile(gstr1, gstr2b, tolerances=None):
+    """Match GSTR-1 records against GSTR-2B records.
+
+    `gstr1` / `gstr2b` are frames (see the module docstring) or sides from
+    `read_side()`; GSTR-2B records without a supplier GSTIN must first go
+    through `resolve_suppliers()`. `tolerances` overrides `DEFAULT_TOLERANCES` per amount.
+    Returns a frame with one row per invoice key, in first-seen order
+    (GSTR-1 keys first), with the `MismatchVector` field names as columns;
+    amounts are in paise, nullable where the side has no record or does
+    not report the amount.
+    """
+    sides = [
+        side if isinstance(side, dict) else prepare_side(side, name)
+        for side, name in ((gstr1, "gstr1"), (gstr2b, "gstr2b"))
+    ]
+    n1 = len(sides[0]["supplier_gstin"])
+
+    # One integer code per composite key, shared by both sides
+    codes = None
+    parts = {}
+    for field in KEY_FIELDS:
+        values = np.concatenate([side[field] for side in sides])
+        part, uniques = normalized_codes(values, KEY_NORMALIZERS[field])
+        if (part < 0).any():
+            raise ValueError(f"{int((part < 0).sum())} records have no {field}")
+        parts[field] = (part, uniques)
+        codes = part if codes is None else fold_codes(codes, part, len(uniques))
+    keys = int(codes.max()) + 1 if len(codes) else 0
+    side_codes = (codes[:n1], codes[n1:])
+
+    # The first record of each key (GSTR-1 rows come first) names it
+    rows = np.arange(len(codes))
+    first = np.empty(keys, dtype=np.int64)
+    first[codes[::-1]] = rows[::-1]
+    invoice_numbers = np.concatenate([side["invoice_number"] for side in sides])
+    recipients = np.concatenate([side["recipient_gstin"] for side in sides])
+
+    present = [np.bincount(c, minlength=keys) > 0 for c in side_codes]
+    first_gstr2b = np.zeros(keys, dtype=np.int64)
+    first_gstr2b[side_codes[1][::-1]] = rows[n1:][::-1]
+
+    def key_part(field):
+        part, uniques = parts[field]
+        return uniques[part[first]]
+
+    def side_amount(field, index):
+        if sides[index][field] is None:
+            return pd.array(np.full(keys, pd.NA), dtype="Int64")
+        amounts = pd.array(money.group_sums(sides[index][field], side_codes[index], keys).paise, dtype="Int64")
+        amounts[~present[index]] = pd.NA
+        return amounts
+
+    result = pd.DataFrame(
+        {
+            "supplier_gstin": key_part("supplier_gstin"),
+            "recipient_gstin": recipients[first],
+            "invoice_number": invoice_numbers[first],
+            "gstr2b_invoice_number": np.where(present[1], invoice_numbers[first_gstr2b], None),
+            "invoice_key": key_part("invoice_number"),
+            "filing_period": key_part("filing_period"),
+            "gstr1_taxable_value": side_amount("taxable_value", 0),
+            "gstr2b_taxable_value": side_amount("taxable_value", 1),
+            "gstr1_tax_amount": side_amount("tax_amount", 0),
+            "gstr2b_tax_amount": side_amount("tax_amount", 1),
+        }
+    )
+    return classify(result, tolerances)
+
+
+def classify(result, tolerances=None):
+    """Set the differences and `match_status` of a result frame from its
+    side amounts (in place); returns the frame. A key on both sides is
+    compared only on the amounts both report; the difference of an amount
+    one of them does not report is 0."""
+    tolerances = {**DEFAULT_TOLERANCES, **(tolerances or {})}
+    present = [result[f"{side}_tax_amount"].notna().to_numpy() for side in ("gstr1", "gstr2b")]
+    both = present[0] & present[1]
+    within = np.ones(len(result), dtype=bool)
+    for field in AMOUNTS:
+        gstr1, gstr2b = result[f"gstr1_{field}"], result[f"gstr2b_{field}"]
+        difference = gstr1.fillna(0).to_numpy(dtype=np.int64) - gstr2b.fillna(0).to_numpy(dtype=np.int64)
+        difference[both & (gstr1.isna() | gstr2b.isna()).to_numpy()] = 0
+        result[f"{field}_difference"] = difference
+        within &= np.abs(difference) <= tolerances[field]
+    status = np.select(
+        [both & within, both, present[0]], [MATCHED, AMOUNT_MISMATCH, MISSING_IN_GSTR2B], MISSING_IN_GSTR1
+    )
+    result["match_status"] = _STATUS_VALUES[status]
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Contract 3 output
+# ---------------------------------------------------------------------------
+def _rupees(paise):
+    """Amount strings ("1180.00") of a paise column; None where missing."""
+    paise = pd.array(paise, dtype="Int64")
+    missing = paise.isna()
+    scale = np.full(len(paise), money.BASE_SCALE, dtype=np.int8)
+    texts = np.array(money.format_money(money.Money(paise.to_numpy(dtype=np.int64, na_value=0), scale)), dtype=object)
+    texts[missing] = None
+    return texts
+
+
+def dump_vectors(result, include_matched=False):
+    """Contract 3 NDJSON text for a `reconcile()` result; MATCHED keys are
+    left out unless `include_matched`."""
+    if not include_matched:
+        result = result[result["match_status"] != MatchStatus.MATCHED.value]
+    columns = {}
+    for name, field in MismatchVector.model_fields.items():
+        values = result[name]
+        if field_kind(field.annotation)[0] == "money":
+            columns[name] = _rupees(values)
+        else:
+            columns[name] = np.asarray(values, dtype=object)
+    for name in ("recipient_gstin", "gstr2b_invoice_number"):
+        columns[name] = np.where(pd.isna(columns[name]), None, columns[name])
+    return dump_columns(MismatchVector, columns)
+
+
+def status_counts(result):
+    """`{status: keys}` for every status, in `STATUSES` order."""
+    counts = result["match_status"].value_counts()
+    return {status.value: int(counts.get(status.value, 0)) for status in STATUSES}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconcile GSTR-1 against GSTR-2B into Contract 3 mismatch vectors")
+    parser.add_argument("gstr1", help="GSTR-1 invoice records (CSV)")
+    parser.add_argument("gstr2b", help="GSTR-2B invoice records (CSV)")
+    parser.add_argument("-o", "--output", default=os.path.join("data", "processed", "mismatch_vectors.ndjson"))
+    parser.add_argument("--taxable-tolerance", type=int, default=DEFAULT_TOLERANCES["taxable_value"], help="paise")
+    parser.add_argument("--tax-tolerance", type=int, default=DEFAULT_TOLERANCES["tax_amount"], help="paise")
+    parser.add_argument("--include-matched", action="store_true")
+    parser.add_argument("--near-matches", action="store_true", help="pair differently spelled invoice numbers")
+    args = parser.parse_args(argv)
+
+    tolerances = {"taxable_value": args.taxable_tolerance, "tax_amount": args.tax_tolerance}
+    if args.near_matches:
+        from .fuzzy import merge_near_matches, near_matches
+
+    counts = {status.value: 0 for status in STATUSES}
+    paired = 0
+    unresolved = []
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        for _, result, claims in reconcile_files(args.gstr1, args.gstr2b, tolerances):
+            if args.near_matches:
+                pairs = near_matches(result, tolerances)
+                result = merge_near_matches(result, pairs, tolerances)
+                paired += len(pairs)
+            f.write(dump_vectors(result, args.include_matched))
+            for status, count in status_counts(result).items():
+                counts[status] += count
+            unresolved.append(claims)
+    if args.near_matches:
+        print(f"  near matches       {paired:,}")
+    for status, count in counts.items():
+        print(f"  {status:<18} {count:,}")
+    print(f"Mismatch vectors written to {args.output}")
+
+    unresolved = pd.concat(unresolved, ignore_index=True) if unresolved else pd.DataFrame()
+    if len(unresolved):
+        path = f"{os.path.splitext(args.output)[0]}.unresolved.csv"
+        unresolved.to_csv(path, index=False)
+        print(f"{len(unresolved):,} GSTR-2B claims match no GSTR-1 supplier; written to {path}")
+
+
+if __name__ == "__main__":
+    main()
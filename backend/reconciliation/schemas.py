@@ -0,0 +1,105 @@
+"""
+Contract 3 — RECONCILIATION ENGINE ↔ RISK AI Interface, v1.0.0.
+
+One mismatch vector per composite invoice key (supplier GSTIN, normalized
+invoice number, filing period) seen in GSTR-1 or GSTR-2B, carrying the
+amounts each side reported and how they compare.
+"""
+
+from decimal import Decimal
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+CONTRACT_VERSION = "1.1.0"
+
+
+class MatchStatus(str, Enum):
+    """How an invoice key's GSTR-1 and GSTR-2B records compare."""
+
+    MATCHED = "MATCHED"
+    AMOUNT_MISMATCH = "AMOUNT_MISMATCH"
+    MISSING_IN_GSTR2B = "MISSING_IN_GSTR2B"
+    MISSING_IN_GSTR1 = "MISSING_IN_GSTR1"
+
+
+class MismatchVector(BaseModel):
+    """
+    Canonical schema for a Contract 3 mismatch vector.
+
+    Amounts are the sums over every record of the key on that side, and are
+    null where the side has no record. Differences are GSTR-1 minus GSTR-2B,
+    a missing side counting as zero.
+    """
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        json_schema_extra={
+            "entity": "MISMATCH_VECTOR",
+            "contract_version": CONTRACT_VERSION,
+        },
+    )
+
+    supplier_gstin: str = Field(..., alias="supplierGstin", description="GSTIN of the supplier")
+
+    recipient_gstin: Optional[str] = Field(
+        None,
+        alias="recipientGstin",
+        description="GSTIN of the recipient (GSTR-1 record first, else GSTR-2B)",
+    )
+
+    invoice_number: str = Field(
+        ...,
+        alias="invoiceNumber",
+        description="Invoice number as first reported (GSTR-1 record first, else GSTR-2B)",
+    )
+
+    gstr2b_invoice_number: Optional[str] = Field(
+        None,
+        alias="gstr2bInvoiceNumber",
+        description="Invoice number as the GSTR-2B record spells it (null when not in GSTR-2B)",
+    )
+
+    invoice_key: str = Field(
+        ...,
+        alias="invoiceKey",
+        description="Normalized invoice number the records were matched on (GSTR-1 side for a near match)",
+    )
+
+    filing_period: str = Field(
+        ...,
+        alias="filingPeriod",
+        pattern=r"^(0[1-9]|1[0-2])\d{4}$",
+        description="Filing period in MMYYYY format",
+    )
+
+    match_status: MatchStatus = Field(..., alias="matchStatus", description="Reconciliation outcome for the key")
+
+    gstr1_taxable_value: Optional[Decimal] = Field(None, alias="gstr1TaxableValue", decimal_places=2)
+    gstr2b_taxable_value: Optional[Decimal] = Field(None, alias="gstr2bTaxableValue", decimal_places=2)
+    gstr1_tax_amount: Optional[Decimal] = Field(None, alias="gstr1TaxAmount", decimal_places=2)
+    gstr2b_tax_amount: Optional[Decimal] = Field(None, alias="gstr2bTaxAmount", decimal_places=2)
+
+    taxable_value_difference: Decimal = Field(
+        ...,
+        alias="taxableValueDifference",
+        decimal_places=2,
+        description="GSTR-1 minus GSTR-2B taxable value",
+    )
+
+    tax_amount_difference: Decimal = Field(
+        ...,
+        alias="taxAmountDifference",
+        decimal_places=2,
+        description="GSTR-1 minus GSTR-2B tax (IGST + CGST + SGST + cess); positive is ITC at risk",
+    )
+
+
+def generate_contract() -> dict:
+    """The Contract 3 JSON schema document (contracts/contract_3.json)."""
+    return {
+        "contract": "RECONCILIATION ENGINE <-> RISK AI INTERFACE",
+        "version": CONTRACT_VERSION,
+        "entities": {"MISMATCH_VECTOR": MismatchVector.model_json_schema(by_alias=True)},
+    }
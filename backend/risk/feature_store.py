@@ -0,0 +1,448 @@
+"""
+Vendor risk feature store — per-(GSTIN, return period) aggregates, kept
+current batch by batch.
+
+Vendor risk scoring reads the same few features for a taxpayer again and
+again: what it invoiced and was invoiced, the ITC it claimed against the
+tax on its inward invoices, what it owed and paid, and how late it filed.
+`FeatureStore` keeps them as one row per `(gstin, period)` and updates the
+rows as each ingestion manifest's Invoice, ReturnFiling and Payment batches
+and tombstones arrive, so nothing is recomputed from the graph.
+
+Each record contributes a fixed vector of integer features to one row. An
+invoice contributes to two rows: its supplier's and its recipient's. Every
+contribution is kept in a SQLite table, keyed by the record's natural key
+(as in `fingerprints.py`), so:
+
+  - a changed record replaces its old contribution
+  - a tombstone subtracts it
+  - loading the same batch twice changes nothing
+
+The aggregates are an int64 matrix held in memory, with one column per
+feature and amounts in paise. It is saved as an `.npz` snapshot next to the
+SQLite file. A dict maps each `(gstin, period)` to its row, so `vector()`
+is a dict lookup plus a row read. The snapshot and the contributions carry
+a generation number. If they disagree on open (a crash between the two
+writes), the aggregates are rebuilt from the contributions.
+
+Usage:
+    python -m backend.risk.feature_store data/processed/manifest_<ts>.json
+    python -m backend.risk.feature_store --gstin 27AAPFU0939F1ZV --period 012026
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from backend.graph.csr import read_columns
+from backend.graph.loader import read_manifest
+from backend.ingestion import money
+from backend.ingestion.fingerprints import KEY_SEPARATOR, NATURAL_KEYS
+from backend.ingestion.normalization import normalize_money
+
+DEFAULT_PATH = os.path.join("data", "processed", "features.sqlite")
+GROUP_SIZE = 20_000
+
+# Summed from record contributions
+BASE_FEATURES = (
+    "invoices_issued",
+    "outward_taxable_value",
+    "outward_tax",
+    "invoices_received",
+    "inward_tax",
+    "returns_filed",
+    "returns_not_filed",
+    "returns_late",
+    "filing_delay_days",
+    "tax_liability",
+    "itc_claimed",
+    "payments_made",
+    "tax_paid",
+)
+# Computed from the base features of the same row
+DERIVED_FEATURES = (
+    "itc_mismatch",  # ITC claimed minus tax on inward invoices
+    "unpaid_tax",  # liability not covered by PAID payments
+    "missing_payment_invoices",  # invoices issued in a period with no PAID payment
+)
+FEATURES = BASE_FEATURES + DERIVED_FEATURES
+_COLUMN = {name: i for i, name in enumerate(FEATURES)}
+
+# Entity -> the features each of its contributions carries, per slot (an
+# invoice counts for its supplier, then its recipient); stored blobs hold
+# these columns only
+SLOT_FEATURES = {
+    "invoice": (("invoices_issued", "outward_taxable_value", "outward_tax"), ("invoices_received", "inward_tax")),
+    "return": (
+        ("returns_filed", "returns_not_filed", "returns_late", "filing_delay_days", "tax_liability", "itc_claimed"),
+    ),
+    "payment": (("payments_made", "tax_paid"),),
+}
+
+# Day of the following month a monthly return is due
+DUE_DAYS = {"GSTR1": 11, "GSTR3B": 20}
+# Tax liability and ITC claimed are read off the summary return only
+LIABILITY_RETURN = "GSTR3B"
+TAX_FIELDS = ("igstAmount", "cgstAmount", "sgstAmount", "cessAmount")
+ITC_FIELDS = ("itcClaimedIgst", "itcClaimedCgst", "itcClaimedSgst", "itcClaimedCess")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contributions (
+    entity TEXT NOT NULL,
+    key TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    gstin TEXT NOT NULL,
+    period TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (entity, key, slot)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+
+# ---------------------------------------------------------------------------
+# Record contributions
+# ---------------------------------------------------------------------------
+def _paise(frame, *fields):
+    """Summed paise of amount columns; absent amounts count as zero."""
+    total = np.zeros(len(frame), dtype=np.int64)
+    for field in fields:
+        values = frame[field].fillna("0").to_numpy(dtype=object)
+        total += money.parse_money(normalize_money(values)).paise
+    return total
+
+
+def _vectors(n, names, **features):
+    """Contribution matrix with one column per feature in `names`."""
+    matrix = np.zeros((n, len(names)), dtype=np.int64)
+    for column, name in enumerate(names):
+        matrix[:, column] = features[name]
+    return matrix
+
+
+def filing_delays(return_types, periods, filing_dates):
+    """Days each return was filed after its due date (0 when on time, not
+    yet filed, or of a type with no monthly due date)."""
+    periods = pd.Series(periods, dtype=object)
+    months = periods.str[2:].astype(int) * 12 + periods.str[:2].astype(int)  # next month, 0-based
+    next_month = (months.to_numpy() - 1970 * 12).astype("datetime64[M]").astype("datetime64[D]")
+    due_day = pd.Series(return_types, dtype=object).map(DUE_DAYS)
+    due = next_month + (due_day.fillna(1).to_numpy(dtype=np.int64) - 1).astype("timedelta64[D]")
+    filed = pd.to_datetime(pd.Series(filing_dates, dtype=object), format="%Y-%m-%d", errors="coerce")
+    delay = (filed.to_numpy(dtype="datetime64[D]") - due).astype("timedelta64[D]").astype(np.int64)
+    return np.where(filed.notna().to_numpy() & due_day.notna().to_numpy(), np.maximum(delay, 0), 0)
+
+
+def invoice_contributions(frame):
+    n = len(frame)
+    supplier_features, recipient_features = SLOT_FEATURES["invoice"]
+    supplier = _vectors(
+        n,
+        supplier_features,
+        invoices_issued=1,
+        outward_taxable_value=_paise(frame, "taxableValue"),
+        outward_tax=_paise(frame, *TAX_FIELDS),
+    )
+    recipient = _vectors(n, recipient_features, invoices_received=1, inward_tax=_paise(frame, *TAX_FIELDS))
+    period = frame["filingPeriod"]
+    return [(frame["supplierGstin"], period, supplier), (frame["recipientGstin"], period, recipient)]
+
+
+def return_contributions(frame):
+    status = frame["filingStatus"].to_numpy(dtype=object)
+    delay = filing_delays(frame["returnType"], frame["returnPeriod"], frame["filingDate"])
+    summary = (frame["returnType"] == LIABILITY_RETURN).to_numpy()
+    vectors = _vectors(
+        len(frame),
+        SLOT_FEATURES["return"][0],
+        returns_filed=status != "NOT_FILED",
+        returns_not_filed=status == "NOT_FILED",
+        returns_late=(status == "LATE_FILED") | (delay > 0),
+        filing_delay_days=delay,
+        tax_liability=np.where(summary, _paise(frame, "totalTaxLiability"), 0),
+        itc_claimed=np.where(summary, _paise(frame, *ITC_FIELDS), 0),
+    )
+    return [(frame["gstin"], frame["returnPeriod"], vectors)]
+
+
+def payment_contributions(frame):
+    paid = (frame["paymentStatus"] == "PAID").to_numpy()
+    tax_paid = np.where(paid, _paise(frame, "totalPaid"), 0)
+    vectors = _vectors(len(frame), SLOT_FEATURES["payment"][0], payments_made=paid, tax_paid=tax_paid)
+    return [(frame["gstin"], frame["returnPeriod"], vectors)]
+
+
+# Entity -> (fields read from its batches, contributions per slot)
+CONTRIBUTIONS = {
+    "invoice": (
+        ("supplierGstin", "recipientGstin", "invoiceNumber", "filingPeriod", "taxableValue") + TAX_FIELDS,
+        invoice_contributions,
+    ),
+    "return": (
+        ("returnId", "gstin", "returnType", "returnPeriod", "filingDate", "filingStatus", "totalTaxLiability")
+        + ITC_FIELDS,
+        return_contributions,
+    ),
+    "payment": (("paymentId", "gstin", "returnPeriod", "paymentStatus", "totalPaid"), payment_contributions),
+}
+
+
+def record_keys(frame, entity):
+    """Natural key text per row, joined as `fingerprints.key_getter` does."""
+    fields = NATURAL_KEYS[entity]
+    keys = frame[fields[0]].astype(object)
+    for field in fields[1:]:
+        keys = keys + KEY_SEPARATOR + frame[field]
+    return keys.to_numpy(dtype=object)
+
+
+def derive(values):
+    """Fill the derived columns of an aggregate matrix (in place)."""
+    f = dict(zip(BASE_FEATURES, values[:, : len(BASE_FEATURES)].T))
+    values[:, _COLUMN["itc_mismatch"]] = f["itc_claimed"] - f["inward_tax"]
+    values[:, _COLUMN["unpaid_tax"]] = np.maximum(f["tax_liability"] - f["tax_paid"], 0)
+    values[:, _COLUMN["missing_payment_invoices"]] = np.where(f["payments_made"] == 0, f["invoices_issued"], 0)
+    return values
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+def committed_generation(path):
+    """The generation last committed to the store at `path` (0 if none)."""
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        row = db.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()
+    finally:
+        db.close()
+    return row[0] if row else 0
+
+
+class FeatureStore:
+    """Per-`(gstin, period)` feature rows, persisted as SQLite record
+    contributions plus an `.npz` snapshot of the aggregates.
+
+    Updates stay uncommitted until `commit()`, which bumps the generation,
+    writes the snapshot and then commits the SQLite transaction.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.snapshot_path = os.path.splitext(path)[0] + ".npz"
+        # The API opens a fresh store from a worker thread and closes the old one from another
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(_SCHEMA)
+        row = self.db.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()
+        self.generation = row[0] if row else 0
+        self._reset()
+        if not self._load_snapshot():
+            self.rebuild()
+
+    def _reset(self, capacity=1024):
+        self.gstins = []
+        self.periods = []
+        self.index = {}  # (gstin, period) -> row
+        self.by_gstin = {}  # gstin -> rows
+        self.values = np.zeros((capacity, len(FEATURES)), dtype=np.int64)
+
+    def __len__(self):
+        return len(self.gstins)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def _load_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return self.generation == 0
+        with np.load(self.snapshot_path) as snapshot:
+            if int(snapshot["generation"]) != self.generation:
+                return False
+            gstins, periods, values = snapshot["gstins"].tolist(), snapshot["periods"].tolist(), snapshot["values"]
+        self._reset(max(len(values), 1024))
+        self._rows(gstins, periods)
+        self.values[: len(values)] = values
+        return True
+
+    def rebuild(self):
+        """Recompute every aggregate from the stored contributions."""
+        self._reset()
+        cursor = self.db.execute("SELECT entity, slot, gstin, period, vector FROM contributions")
+        for stored in iter(lambda: cursor.fetchmany(GROUP_SIZE), []):
+            self._add_stored(stored)
+
+    def _rows(self, gstins, periods):
+        """Row per `(gstin, period)`, appending rows for new pairs."""
+        gstin_codes, gstin_uniques = pd.factorize(np.asarray(gstins, dtype=object))
+        period_codes, period_uniques = pd.factorize(np.asarray(periods, dtype=object))
+        codes, pairs = pd.factorize(gstin_codes * len(period_uniques) + period_codes)
+        unique_rows = np.empty(len(pairs), dtype=np.int64)
+        for i, (gstin, period) in enumerate(
+            zip(gstin_uniques[pairs // len(period_uniques)], period_uniques[pairs % len(period_uniques)])
+        ):
+            row = self.index.get((gstin, period))
+            if row is None:
+                row = self.index[gstin, period] = len(self.gstins)
+                self.gstins.append(gstin)
+                self.periods.append(period)
+                self.by_gstin.setdefault(gstin, []).append(row)
+            unique_rows[i] = row
+        rows = unique_rows[codes]
+        if len(self.gstins) > len(self.values):
+            grown = np.zeros((max(len(self.gstins), 2 * len(self.values)), len(FEATURES)), dtype=np.int64)
+            grown[: len(self.values)] = self.values
+            self.values = grown
+        return rows
+
+    def _add(self, gstins, periods, names, vectors, sign=1):
+        """Add contribution `vectors` (columns `names`) to their rows."""
+        if not len(vectors):
+            return
+        rows = self._rows(gstins, periods)
+        columns = np.array([_COLUMN[name] for name in names])
+        np.add.at(self.values, (rows[:, None], columns), sign * vectors)
+        touched = np.unique(rows)
+        self.values[touched] = derive(self.values[touched])
+
+    def _add_stored(self, stored, sign=1):
+        """Add `(entity, slot, gstin, period, vector)` contribution rows."""
+        groups = {}
+        for entity, slot, gstin, period, vector in stored:
+            group = groups.setdefault((entity, slot), ([], [], []))
+            group[0].append(gstin)
+            group[1].append(period)
+            group[2].append(vector)
+        for (entity, slot), (gstins, periods, vectors) in groups.items():
+            names = SLOT_FEATURES[entity][slot]
+            matrix = np.frombuffer(b"".join(vectors), dtype=np.int64).reshape(-1, len(names))
+            self._add(gstins, periods, names, matrix, sign)
+
+    def _remove(self, entity, keys):
+        """Subtract and delete the stored contributions of `keys`."""
+        stored = self.db.execute(
+            "SELECT entity, slot, gstin, period, vector FROM contributions "
+            "WHERE entity = ? AND key IN (SELECT value FROM json_each(?))",
+            (entity, json.dumps(keys)),
+        ).fetchall()
+        self._add_stored(stored, sign=-1)
+        self.db.execute(
+            "DELETE FROM contributions WHERE entity = ? AND key IN (SELECT value FROM json_each(?))",
+            (entity, json.dumps(keys)),
+        )
+
+    def apply(self, entity, frame):
+        """Apply a frame of batch rows (camelCase columns): each record's
+        contribution replaces the one stored under its natural key."""
+        if entity not in CONTRIBUTIONS or not len(frame):
+            return
+        keys = record_keys(frame, entity)
+        last = ~pd.Series(keys).duplicated(keep="last").to_numpy()
+        frame, keys = frame[last].reset_index(drop=True), keys[last].tolist()
+        for start in range(0, len(keys), GROUP_SIZE):
+            self._remove(entity, keys[start : start + GROUP_SIZE])
+        contributions = CONTRIBUTIONS[entity][1](frame)
+        for slot, ((gstins, periods, vectors), names) in enumerate(zip(contributions, SLOT_FEATURES[entity])):
+            present = gstins.notna().to_numpy()
+            gstins, periods = gstins[present].tolist(), periods[present].tolist()
+            vectors = vectors[present]
+            self._add(gstins, periods, names, vectors)
+            blobs = map(np.ndarray.tobytes, vectors)
+            self.db.executemany(
+                "INSERT INTO contributions (entity, key, slot, gstin, period, vector) VALUES (?, ?, ?, ?, ?, ?)",
+                zip(repeat(entity), np.asarray(keys, dtype=object)[present], repeat(slot), gstins, periods, blobs),
+            )
+
+    def remove(self, entity, frame):
+        """Subtract the records keyed by a frame of tombstone rows."""
+        if entity not in CONTRIBUTIONS or not len(frame):
+            return
+        keys = record_keys(frame, entity).tolist()
+        for start in range(0, len(keys), GROUP_SIZE):
+            self._remove(entity, keys[start : start + GROUP_SIZE])
+
+    def update(self, batches, tombstones=()):
+        """Apply `(entity, path)` batches, then tombstone files."""
+        for entity, path in batches:
+            if entity in CONTRIBUTIONS:
+                self.apply(entity, read_columns([path], CONTRIBUTIONS[entity][0]))
+        for entity, path in tombstones:
+            if entity in CONTRIBUTIONS:
+                self.remove(entity, read_columns([path], NATURAL_KEYS[entity]))
+
+    def update_manifest(self, path, verify=True):
+        _, batches, tombstones = read_manifest(path, verify)
+        self.update(batches, tombstones)
+
+    def commit(self):
+        self.generation += 1
+        self.db.execute(
+            "INSERT INTO meta (name, value) VALUES ('generation', ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+            (self.generation,),
+        )
+        temporary = self.snapshot_path + ".tmp"
+        with open(temporary, "wb") as f:
+            np.savez(
+                f,
+                generation=self.generation,
+                gstins=np.array(self.gstins, dtype=str),
+                periods=np.array(self.periods, dtype=str),
+                values=self.values[: len(self)],
+            )
+        os.replace(temporary, self.snapshot_path)
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    # -----------------------------------------------------------------------
+    # Serving
+    # -----------------------------------------------------------------------
+    def vector(self, gstin, period):
+        """`{feature: value}` of one row, or None if the pair is unknown."""
+        row = self.index.get((gstin, period))
+        return None if row is None else dict(zip(FEATURES, self.values[row].tolist()))
+
+    def history(self, gstin):
+        """`{period: {feature: value}}` of every period seen for `gstin`."""
+        rows = self.by_gstin.get(gstin, ())
+        return {self.periods[row]: dict(zip(FEATURES, self.values[row].tolist())) for row in rows}
+
+    def frame(self):
+        """Every row as a frame: `gstin`, `period`, then the features."""
+        frame = pd.DataFrame(self.values[: len(self)], columns=list(FEATURES))
+        frame.insert(0, "period", pd.Series(self.periods, dtype=object))
+        frame.insert(0, "gstin", pd.Series(self.gstins, dtype=object))
+        return frame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update or query the vendor risk feature store")
+    parser.add_argument("manifest", nargs="?", help="manifest_*.json written by IngestService")
+    parser.add_argument("--store", default=DEFAULT_PATH)
+    parser.add_argument("--gstin", help="print the feature vectors of this GSTIN")
+    parser.add_argument("--period", help="only this filing period (MMYYYY)")
+    args = parser.parse_args(argv)
+
+    store = FeatureStore(args.store)
+    try:
+        if args.manifest:
+            store.update_manifest(args.manifest)
+            store.commit()
+            print(f"Feature store updated: {len(store):,} (gstin, period) rows in {args.store}")
+        if args.gstin:
+            vectors = store.history(args.gstin)
+            if args.period:
+                vectors = {args.period: vectors.get(args.period)}
+            print(json.dumps(vectors, indent=2))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Contract 4 — RISK AI ↔ API Interface, v1.0.0.
+
+One scored entity per taxpayer and return period: the 0-100 risk score,
+the rule and model scores it combines, the reasons behind it and an
+English audit narrative.
+"""
+
+from decimal import Decimal
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+CONTRACT_VERSION = "1.0.0"
+
+
+class RiskLevel(str, Enum):
+    """Severity band of a risk score."""
+
+    LOW = "LOW"
+    MEDIUM = "MEDIUM"
+    HIGH = "HIGH"
+    CRITICAL = "CRITICAL"
+
+
+class RiskReason(str, Enum):
+    """A compliance rule the taxpayer's period broke."""
+
+    EXCESS_ITC = "EXCESS_ITC"
+    UNPAID_TAX = "UNPAID_TAX"
+    MISSING_PAYMENT = "MISSING_PAYMENT"
+    LATE_FILING = "LATE_FILING"
+    RETURN_NOT_FILED = "RETURN_NOT_FILED"
+
+
+class ScoredEntity(BaseModel):
+    """
+    Canonical schema for a Contract 4 scored entity.
+
+    `riskScore` is the rule score alone, or a weighted blend of the rule and
+    model scores when a model was used. Reasons are listed in `RiskReason`
+    order.
+    """
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        json_schema_extra={
+            "entity": "SCORED_ENTITY",
+            "contract_version": CONTRACT_VERSION,
+        },
+    )
+
+    gstin: str = Field(..., description="GSTIN of the scored taxpayer")
+
+    return_period: str = Field(
+        ...,
+        alias="returnPeriod",
+        pattern=r"^(0[1-9]|1[0-2])\d{4}$",
+        description="Return period the features cover, in MMYYYY format",
+    )
+
+    risk_score: int = Field(..., alias="riskScore", ge=0, le=100, description="Combined risk score")
+    risk_level: RiskLevel = Field(..., alias="riskLevel", description="Severity band of the risk score")
+    rule_score: int = Field(..., alias="ruleScore", ge=0, le=100, description="Score from the compliance rules")
+
+    model_score: Optional[int] = Field(
+        None,
+        alias="modelScore",
+        ge=0,
+        le=100,
+        description="Score from the tree model (null when no model was used)",
+    )
+
+    reasons: List[RiskReason] = Field(default_factory=list, description="Rules broken, in RiskReason order")
+
+    itc_mismatch_amount: Decimal = Field(
+        ...,
+        alias="itcMismatchAmount",
+        decimal_places=2,
+        description="ITC claimed minus tax on inward invoices; positive is excess ITC",
+    )
+
+    unpaid_tax_amount: Decimal = Field(
+        ...,
+        alias="unpaidTaxAmount",
+        decimal_places=2,
+        description="GSTR-3B liability not covered by PAID payments",
+    )
+
+    audit_narrative: str = Field(..., alias="auditNarrative", description="Why the score is what it is, in English")
+
+
+def generate_contract() -> dict:
+    """The Contract 4 JSON schema document (contracts/contract_4.json)."""
+    return {
+        "contract": "RISK AI <-> API INTERFACE",
+        "version": CONTRACT_VERSION,
+        "entities": {"SCORED_ENTITY": ScoredEntity.model_json_schema(by_alias=True)},
+    }
@@ -0,0 +1,255 @@
+"""
+Batch risk scoring — feature store rows to Contract 4 scored entities.
+
+Scoring one taxpayer per request repeats the same small computation
+millions of times. `score_chunks()` scores the whole feature matrix
+(`FeatureStore.values`) instead, `chunk_size` rows at a time:
+
+  - rule score: each `RULES` entry turns feature columns into a severity in
+    [0, 1] for every row; the score is the weighted sum of severities
+    (weights sum to 100), and a rule with a positive severity is a reason
+  - model score (optional): any fitted classifier with `predict_proba`
+    (scikit-learn, XGBoost's sklearn API) over the `FEATURES` columns; the
+    positive-class probability is scaled to 0-100 and blended with the
+    rule score by `model_weight`
+  - level, narrative and the Contract 4 NDJSON lines, encoded column-wise
+    by `serializer.dump_columns`
+
+With `workers > 1` the chunks are scored and serialized in a process pool
+and written in order as they come back.
+
+Usage:
+    python -m backend.risk.scoring --store data/processed/features.sqlite -o scores.ndjson
+    python -m backend.risk.scoring --model model.pkl --model-weight 0.5 --workers 8
+"""
+
+import argparse
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backend.ingestion import money
+from backend.ingestion.serializer import dump_columns
+
+from .feature_store import DEFAULT_PATH, FEATURES, FeatureStore
+from .schemas import RiskLevel, RiskReason, ScoredEntity
+
+DEFAULT_CHUNK_SIZE = 200_000
+DEFAULT_MODEL_WEIGHT = 0.5
+DEFAULT_WORKERS = 1
+# Days of filing delay at which the late-filing rule is at full severity
+LATE_DAYS_FULL = 30
+
+# Lower bounds of the MEDIUM, HIGH and CRITICAL bands
+LEVEL_BOUNDS = np.array([25, 50, 75])
+LEVELS = np.array([level.value for level in RiskLevel], dtype=object)
+REASONS = list(RiskReason)
+
+
+def _ratio(numerator, denominator):
+    return np.clip(numerator / np.maximum(denominator, 1), 0, 1)
+
+
+def _severity_excess_itc(f):
+    return np.where(f["itc_mismatch"] > 0, _ratio(f["itc_mismatch"], f["itc_claimed"]), 0)
+
+
+def _severity_unpaid_tax(f):
+    return _ratio(f["unpaid_tax"], f["tax_liability"])
+
+
+def _severity_missing_payment(f):
+    return (f["missing_payment_invoices"] > 0).astype(float)
+
+
+def _severity_late_filing(f):
+    # A return marked LATE_FILED without a measurable delay still counts
+    return np.where(f["returns_late"] > 0, np.clip(f["filing_delay_days"] / LATE_DAYS_FULL, 0.25, 1), 0)
+
+
+def _severity_not_filed(f):
+    return (f["returns_not_filed"] > 0).astype(float)
+
+
+# (reason, weight, severity from feature columns), in RiskReason order
+RULES = (
+    (RiskReason.EXCESS_ITC, 35, _severity_excess_itc),
+    (RiskReason.UNPAID_TAX, 25, _severity_unpaid_tax),
+    (RiskReason.MISSING_PAYMENT, 20, _severity_missing_payment),
+    (RiskReason.LATE_FILING, 10, _severity_late_filing),
+    (RiskReason.RETURN_NOT_FILED, 10, _severity_not_filed),
+)
+
+
+def rule_scores(values):
+    """`(scores, reasons)` for a feature matrix: int scores 0-100, and a
+    bitmask per row of the broken rules (bit i is `RULES[i]`)."""
+    f = dict(zip(FEATURES, values.T))
+    total = np.zeros(len(values))
+    reasons = np.zeros(len(values), dtype=np.int64)
+    for bit, (_, weight, severity) in enumerate(RULES):
+        s = severity(f)
+        total += weight * s
+        reasons |= (s > 0).astype(np.int64) << bit
+    return np.rint(total).astype(np.int64), reasons
+
+
+def model_scores(model, values):
+    """Positive-class probability of `model` per row, as int 0-100."""
+    return np.rint(100 * model.predict_proba(values.astype(np.float64))[:, 1]).astype(np.int64)
+
+
+def score(values, model=None, model_weight=DEFAULT_MODEL_WEIGHT):
+    """`{"risk_score", "rule_score", "model_score", "reasons"}` arrays for
+    a feature matrix; `model_score` is None without a model."""
+    rules, reasons = rule_scores(values)
+    scored = {"risk_score": rules, "rule_score": rules, "model_score": None, "reasons": reasons}
+    if model is not None:
+        scored["model_score"] = model_scores(model, values)
+        blended = (1 - model_weight) * rules + model_weight * scored["model_score"]
+        scored["risk_score"] = np.rint(blended).astype(np.int64)
+    return scored
+
+
+def risk_levels(scores):
+    return LEVELS[np.searchsorted(LEVEL_BOUNDS, scores, side="right")]
+
+
+def _money(paise):
+    """A `Money` column of paise, printed with two decimal places."""
+    return money.Money(paise, np.full(len(paise), money.BASE_SCALE, dtype=np.int8))
+
+
+def narratives(values, scores, levels, reasons):
+    """The audit narrative of each row: the score, then one sentence per
+    broken rule with the figures behind it."""
+    f = dict(zip(FEATURES, values.T))
+    mismatch, unpaid = (money.format_money(_money(f[name])) for name in ("itc_mismatch", "unpaid_tax"))
+    counts = ("missing_payment_invoices", "returns_late", "filing_delay_days", "returns_not_filed")
+    unpaid_invoices, late, delay, not_filed = (f[name].tolist() for name in counts)
+    sentences = {
+        RiskReason.EXCESS_ITC: lambda i: f"ITC claimed exceeds the tax on inward invoices by ₹{mismatch[i]}.",
+        RiskReason.UNPAID_TAX: lambda i: f"₹{unpaid[i]} of the GSTR-3B liability is not covered by a paid challan.",
+        RiskReason.MISSING_PAYMENT: lambda i: (
+            f"{unpaid_invoices[i]} outward invoice(s) have no paid tax payment for the period."
+        ),
+        RiskReason.LATE_FILING: lambda i: f"{late[i]} return(s) filed late, {delay[i]} day(s) past due in total.",
+        RiskReason.RETURN_NOT_FILED: lambda i: f"{not_filed[i]} return(s) not filed.",
+    }
+    texts = []
+    for i, (risk, level, mask) in enumerate(zip(scores.tolist(), levels, reasons.tolist())):
+        header = f"{level.capitalize()} risk (score {risk}/100)."
+        if not mask:
+            texts.append(f"{header} No compliance rule was broken.")
+            continue
+        broken = [sentences[reason](i) for bit, reason in enumerate(REASONS) if mask >> bit & 1]
+        texts.append(" ".join([header, *broken]))
+    return texts
+
+
+def dump_scores(gstins, periods, values, scored):
+    """Contract 4 NDJSON text for scored feature rows."""
+    levels = risk_levels(scored["risk_score"])
+    reason_lists = {}  # bitmask -> reasons, built once per combination
+    reasons = [
+        reason_lists.setdefault(mask, [reason for bit, reason in enumerate(REASONS) if mask >> bit & 1])
+        for mask in scored["reasons"].tolist()
+    ]
+    f = dict(zip(FEATURES, values.T))
+    model_score = scored["model_score"]
+    columns = {
+        "gstin": gstins,
+        "return_period": periods,
+        "risk_score": scored["risk_score"].tolist(),
+        "risk_level": levels,
+        "rule_score": scored["rule_score"].tolist(),
+        "model_score": [None] * len(values) if model_score is None else model_score.tolist(),
+        "reasons": reasons,
+        "itc_mismatch_amount": _money(f["itc_mismatch"]),
+        "unpaid_tax_amount": _money(f["unpaid_tax"]),
+        "audit_narrative": narratives(values, scored["risk_score"], levels, scored["reasons"]),
+    }
+    return dump_columns(ScoredEntity, columns)
+
+
+# ---------------------------------------------------------------------------
+# Chunked / pooled scoring
+# ---------------------------------------------------------------------------
+_WORKER_MODEL = None
+
+
+def _init_worker(model, model_weight):
+    """Hold the model in each pool process."""
+    global _WORKER_MODEL
+    _WORKER_MODEL = (model, model_weight)
+
+
+def _score_chunk(chunk):
+    gstins, periods, values = chunk
+    return dump_scores(gstins, periods, values, score(values, *_WORKER_MODEL))
+
+
+def score_chunks(
+    gstins,
+    periods,
+    values,
+    model=None,
+    model_weight=DEFAULT_MODEL_WEIGHT,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    workers=DEFAULT_WORKERS,
+):
+    """Yield the Contract 4 NDJSON text of each `chunk_size` rows, in row
+    order; `values` is the feature matrix (`FEATURES` columns)."""
+    chunks = (
+        (gstins[start : start + chunk_size], periods[start : start + chunk_size], values[start : start + chunk_size])
+        for start in range(0, len(values), chunk_size)
+    )
+    if workers <= 1:
+        _init_worker(model, model_weight)
+        yield from map(_score_chunk, chunks)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model, model_weight)) as pool:
+        yield from pool.map(_score_chunk, chunks)
+
+
+def load_model(path):
+    """A pickled fitted classifier; its library must be installed."""
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score every feature store row into Contract 4 scored entities")
+    parser.add_argument("--store", default=DEFAULT_PATH, help="feature store SQLite file")
+    parser.add_argument("-o", "--output", default=os.path.join("data", "processed", "scored_entities.ndjson"))
+    parser.add_argument("--period", help="only this return period (MMYYYY)")
+    parser.add_argument("--model", help="pickled classifier with predict_proba over the store's features")
+    parser.add_argument("--model-weight", type=float, default=DEFAULT_MODEL_WEIGHT)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args(argv)
+
+    store = FeatureStore(args.store)
+    try:
+        gstins = np.array(store.gstins, dtype=object)
+        periods = np.array(store.periods, dtype=object)
+        values = store.values[: len(store)]
+    finally:
+        store.close()
+    if args.period:
+        rows = periods == args.period
+        gstins, periods, values = gstins[rows], periods[rows], values[rows]
+    model = load_model(args.model) if args.model else None
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        for text in score_chunks(gstins, periods, values, model, args.model_weight, args.chunk_size, args.workers):
+            f.write(text)
+    print(f"  scored={len(values):,}")
+    print(f"Scored entities written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Dashboard Aggregates Benchmark
+==============================
+Refreshes the dashboard rollups from a synthetic reconciliation run and a
+synthetic feature store, then times the widget reads. Reports the time to
+roll up a run, to rescore every vendor and to rescore only the rows one
+manifest touches, and the median latency of each widget read.
+
+Usage:
+    python scripts/bench_aggregates.py
+    python scripts/bench_aggregates.py --keys 5000000 --vendors 1000000 --touched 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.api.aggregates import AggregateStore  # noqa: E402
+from backend.reconciliation.matching import STATUSES  # noqa: E402
+from backend.risk.feature_store import FEATURES  # noqa: E402
+
+PERIODS = [f"{month:02d}2025" for month in range(1, 13)]
+
+
+class FeatureRows:
+    """The parts of a `FeatureStore` the vendor rollup reads."""
+
+    def __init__(self, gstins, periods, values):
+        self.gstins, self.periods, self.values = gstins, periods, values
+        self.index = {pair: row for row, pair in enumerate(zip(gstins, periods))}
+        self.by_gstin = {}
+        for row, gstin in enumerate(gstins):
+            self.by_gstin.setdefault(gstin, []).append(row)
+
+    def __len__(self):
+        return len(self.gstins)
+
+
+def make_run(keys, rng):
+    """Contract 3 fields of a reconciliation run: `keys` invoice keys over 36 states and 12 periods."""
+    states = rng.integers(1, 37, keys)
+    differences = rng.integers(-50_000, 50_000, keys)
+    return pd.DataFrame(
+        {
+            "supplierGstin": pd.Series([f"{s:02d}AAAAA0000A1Z5" for s in states.tolist()], dtype=object),
+            "filingPeriod": pd.Series(np.array(PERIODS, dtype=object)[rng.integers(0, 12, keys)], dtype=object),
+            "matchStatus": pd.Series(
+                np.array([s.value for s in STATUSES], dtype=object)[rng.integers(0, len(STATUSES), keys)], dtype=object
+            ),
+            "taxAmountDifference": pd.Series([f"{d / 100:.2f}" for d in differences.tolist()], dtype=object),
+        }
+    )
+
+
+def make_features(vendors, rng):
+    gstins = [f"{1 + i % 36:02d}AAAAA{i // 36 % 10_000:04d}A{1 + i // 360_000}Z5" for i in range(vendors)]
+    periods = [PERIODS[i % 12] for i in range(vendors)]
+    values = rng.integers(0, 100_000, (vendors, len(FEATURES))).astype(np.int64)
+    return FeatureRows(gstins, periods, values)
+
+
+def median_ms(read, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read()
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, default=1_000_000, help="invoice keys in the reconciliation run")
+    parser.add_argument("--vendors", type=int, default=300_000, help="(gstin, period) feature rows")
+    parser.add_argument("--touched", type=int, default=5_000, help="feature rows one manifest touches")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(0)
+
+    run, features = make_run(args.keys, rng), make_features(args.vendors, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AggregateStore(os.path.join(tmp, "aggregates.sqlite"))
+        start = time.perf_counter()
+        store.update_mismatches(run, "mismatch_vectors.ndjson")
+        print(f"  roll up {args.keys:,} keys: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        store.update_vendors(features, {(None, None)}, "features.sqlite")
+        print(f"  rescore all {args.vendors:,} vendors: {time.perf_counter() - start:.2f}s")
+        rows = rng.choice(args.vendors, args.touched, replace=False)
+        tags = {(features.gstins[row], features.periods[row]) for row in rows.tolist()}
+        start = time.perf_counter()
+        store.update_vendors(features, tags, "manifest.json")
+        print(f"  rescore {args.touched:,} touched vendors: {(time.perf_counter() - start) * 1000:.0f}ms")
+
+        reads = {
+            "itc-at-risk (all)": lambda: store.itc_at_risk(),
+            "itc-at-risk (state)": lambda: store.itc_at_risk(state="27"),
+            "mismatch-counts (period)": lambda: store.mismatch_counts(period="062025"),
+            "risky-vendors (latest)": lambda: store.top_vendors(),
+            "risky-vendors (state)": lambda: store.top_vendors(period="062025", state="27"),
+        }
+        for name, read in reads.items():
+            print(f"  {name:<26} {median_ms(read, args.repeat):.2f}ms")
+        print(f"  store size: {os.path.getsize(store.path) / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+API Load Benchmark
+==================
+Drives the broken-paths endpoint through the ASGI app with a stand-in
+async graph: each query sleeps for a random latency like a Neo4j round
+trip. At each concurrency level, `--requests` requests are issued by that
+many concurrent clients against one `GraphPool`, and the p50/p99 latency
+and the number of 429s are reported. Above the pool size, p99 stays
+bounded and the excess is turned away with 429 rather than queued.
+(Runs in-process; no HTTP server or client is needed.)
+
+Usage:
+    python scripts/bench_api.py
+    python scripts/bench_api.py --pool-size 20 --concurrency 10 50 200 --requests 5000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.api.graph import DEFAULT_ACQUIRE_TIMEOUT, DEFAULT_POOL_SIZE, GraphPool  # noqa: E402
+from backend.api.main import create_app  # noqa: E402
+
+GSTIN = "27ABCDE1234F1Z5"
+RECORDS = [{"invoiceNumber": f"INV-{i:03d}", "filingPeriod": "012026", "reported": False} for i in range(20)]
+
+
+class StandInDriver:
+    """An async driver whose queries take `latency` seconds (mean, uniform ±50%)."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def session(self, **config):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_read(self, fn, *args):
+        return await fn(self, *args)
+
+    async def run(self, query, params):
+        await asyncio.sleep(self.latency * random.uniform(0.5, 1.5))
+        return self
+
+    async def data(self):
+        return RECORDS
+
+    async def close(self):
+        pass
+
+
+async def get(app, path, query=""):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [],
+        "client": ("bench", 1),
+        "server": ("bench", 80),
+    }
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+
+async def run_level(app, concurrency, requests):
+    """`(latencies of 200s, count of 429s)` for `requests` requests from `concurrency` clients."""
+    path = f"/reconciliation/{GSTIN}/broken-paths"
+    latencies, rejected = [], 0
+    remaining = iter(range(requests))
+
+    async def client():
+        nonlocal rejected
+        for _ in remaining:
+            start = time.perf_counter()
+            status = await get(app, path)
+            if status == 429:
+                rejected += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return np.array(latencies), rejected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE)
+    parser.add_argument("--acquire-timeout", type=float, default=DEFAULT_ACQUIRE_TIMEOUT)
+    parser.add_argument("--latency", type=float, default=0.005, help="mean seconds per graph query")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200, 500])
+    parser.add_argument("--requests", type=int, default=2_000)
+    args = parser.parse_args(argv)
+
+    async def bench():
+        graph = GraphPool(StandInDriver(args.latency), pool_size=args.pool_size, acquire_timeout=args.acquire_timeout)
+        app = create_app(graph=graph, features=None)
+        print(f"  pool size={args.pool_size}  acquire timeout={args.acquire_timeout}s  query latency~{args.latency}s")
+        for concurrency in args.concurrency:
+            start = time.perf_counter()
+            latencies, rejected = await run_level(app, concurrency, args.requests)
+            elapsed = time.perf_counter() - start
+            p50, p99 = (np.percentile(latencies, [50, 99]) * 1000) if len(latencies) else (0, 0)
+            print(
+                f"  concurrency={concurrency:<4}  ok={len(latencies):,}  429={rejected:,}  "
+                f"p50={p50:.1f}ms  p99={p99:.1f}ms  {args.requests / elapsed:,.0f} req/s"
+            )
+
+    asyncio.run(bench())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+API Response Cache Benchmark
+============================
+Times the Contract 2 invoice status view through the ASGI app with a
+stand-in graph: the cold (miss) request runs the query, warm requests are
+served from the `ResponseCache`. Then fills the cache with one entry per
+taxpayer and times invalidating one load's worth of tags.
+
+Usage:
+    python scripts/bench_cache.py
+    python scripts/bench_cache.py --invoices 20000 --requests 5000 --taxpayers 100000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.api.cache import ResponseCache  # noqa: E402
+from backend.api.graph import GraphPool  # noqa: E402
+from backend.api.main import create_app  # noqa: E402
+from bench_api import GSTIN, StandInDriver, get  # noqa: E402
+
+PERIOD = "012026"
+
+
+def invoice_view(invoices):
+    return [
+        {
+            "direction": "INWARD",
+            "supplierGstin": f"27AAAAA{i % 10_000:04d}A1Z5",
+            "recipientGstin": GSTIN,
+            "invoiceNumber": f"INV-{i:06d}",
+            "totalValue": "118.00",
+            "inGstr1": True,
+            "inGstr2b": True,
+            "paid": i % 7 != 0,
+            "matchStatus": "MATCHED" if i % 7 else "MISSING_PAYMENT",
+        }
+        for i in range(invoices)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=2_000, help="invoices in the view")
+    parser.add_argument("--requests", type=int, default=2_000, help="warm requests")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per graph query")
+    parser.add_argument("--taxpayers", type=int, default=50_000, help="cache entries for the invalidation test")
+    parser.add_argument("--touched", type=int, default=5_000, help="tags one load touches")
+    args = parser.parse_args(argv)
+
+    driver = StandInDriver(args.latency)
+    driver.data = lambda: asyncio.sleep(0, invoice_view(args.invoices))
+    app = create_app(graph=GraphPool(driver), features=None)
+    path = f"/reconciliation/{GSTIN}/invoices"
+
+    async def timed():
+        start = time.perf_counter()
+        status = await get(app, path, f"period={PERIOD}")
+        return status, time.perf_counter() - start
+
+    async def bench():
+        _, cold = await timed()
+        warm = np.array([(await timed())[1] for _ in range(args.requests)])
+        return cold, warm
+
+    cold, warm = asyncio.run(bench())
+    assert app.state.cache.hits == args.requests
+    stats = app.state.cache.stats()
+    p50, p99 = np.percentile(warm, [50, 99]) * 1000
+    print(f"  view: {args.invoices:,} invoices, {stats['bytes'] / 1024:,.0f} KiB")
+    print(f"  cold={cold * 1000:.1f}ms  warm p50={p50:.2f}ms  p99={p99:.2f}ms  hit ratio={stats['hitRatio']:.3f}")
+
+    cache = ResponseCache()
+    body = b"x" * 1024
+    for i in range(args.taxpayers):
+        gstin = f"G{i:014d}"
+        cache.put((gstin, PERIOD, "1.0.0"), body, {(gstin, PERIOD), (f"G{i // 10:014d}", PERIOD)}, cache.generation)
+    tags = {(f"G{i:014d}", PERIOD) for i in range(0, args.taxpayers, max(args.taxpayers // args.touched, 1))}
+    start = time.perf_counter()
+    dropped = cache.invalidate(tags)
+    elapsed = time.perf_counter() - start
+    print(f"  invalidate {len(tags):,} tags over {args.taxpayers:,} entries: dropped={dropped:,}", end="")
+    print(f" in {elapsed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
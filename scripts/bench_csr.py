@@ -0,0 +1,98 @@
+"""
+In-Memory Graph Reconciliation Benchmark
+========================================
+Writes synthetic Contract 1 batches (taxpayers, GSTR1/GSTR2B returns,
+payments and full invoice lines), builds a `CSRGraph` from them and
+evaluates the broken-path patterns over every invoice. Reports the time to
+read the batches, to build the CSR arrays and to reconcile, and the number
+of invoices each pattern flags.
+
+Usage:
+    python scripts/bench_csr.py
+    python scripts/bench_csr.py --invoices 10000000 --taxpayers 200000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.graph import csr  # noqa: E402
+
+PERIODS = ["012026", "022026", "032026"]
+INVOICE_LINE = (
+    '{{"invoiceNumber":"INV-{i:09d}","invoiceDate":"2026-01-15","invoiceType":"B2B","invoiceStatus":"ACTIVE",'
+    '"supplyType":"INTRA_STATE","documentType":"INV","supplierGstin":"{supplier}","recipientGstin":"{recipient}",'
+    '"taxableValue":"1000.00","igstAmount":"0.00","cgstAmount":"90.00","sgstAmount":"90.00","cessAmount":"0.00",'
+    '"totalValue":"1180.00","placeOfSupply":"27","reverseCharge":false,"irn":null,"filingPeriod":"{period}"}}\n'
+)
+
+
+def gstin(n):
+    return f"27{n:08d}A1Z5"
+
+
+def write_batches(directory, invoices, taxpayers, seed=0):
+    """Write one batch per entity; ~1% of invoices name an unregistered
+    supplier and ~5% of returns have no PAID payment."""
+    rng = np.random.default_rng(seed)
+    gstins = [gstin(n) for n in range(taxpayers)]
+    paths = {entity: os.path.join(directory, f"{entity}_batch_1_p1.ndjson") for entity in csr.NODE_COLUMNS}
+
+    with open(paths["taxpayer"], "w") as f:
+        f.writelines(f'{{"gstin":"{g}"}}\n' for g in gstins)
+    with open(paths["return"], "w") as f, open(paths["payment"], "w") as p:
+        for g in gstins:
+            for period in PERIODS:
+                for return_type in ("GSTR1", "GSTR2B"):
+                    f.write(
+                        f'{{"returnId":"RET-{g}-{return_type}-{period}","gstin":"{g}",'
+                        f'"returnType":"{return_type}","returnPeriod":"{period}"}}\n'
+                    )
+                status = "PAID" if rng.random() > 0.05 else "PENDING"
+                p.write(
+                    f'{{"paymentId":"PMT-{g}-{period}","gstin":"{g}",'
+                    f'"returnPeriod":"{period}","paymentStatus":"{status}"}}\n'
+                )
+    open(paths["irn"], "w").close()
+
+    suppliers = rng.integers(0, taxpayers, invoices)
+    recipients = rng.integers(0, taxpayers, invoices)
+    ghost = rng.random(invoices) < 0.01
+    periods = rng.integers(0, len(PERIODS), invoices)
+    with open(paths["invoice"], "w") as f:
+        rows = zip(suppliers.tolist(), recipients.tolist(), ghost.tolist(), periods.tolist())
+        for i, (s, r, g, k) in enumerate(rows):
+            supplier = gstin(taxpayers + s) if g else gstins[s]
+            f.write(INVOICE_LINE.format(i=i, supplier=supplier, recipient=gstins[r], period=PERIODS[k]))
+    return list(paths.items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=1_000_000)
+    parser.add_argument("--taxpayers", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        batches = write_batches(tmp, args.invoices, args.taxpayers)
+        start = time.perf_counter()
+        graph = csr.CSRGraph.from_batches(batches)
+        built = time.perf_counter()
+        report = graph.reconcile()
+        done = time.perf_counter()
+
+    edges = sum(len(adjacency) for adjacency in graph.edges.values())
+    print(f"  invoices={args.invoices:,}  taxpayers={args.taxpayers:,}  edges={edges:,}")
+    print(f"  build (read batches + CSR)={built - start:.2f}s  reconcile={done - built:.3f}s")
+    for flag in ("goldenPath", "missingPayment", "ghostInvoice"):
+        print(f"  {flag:<15} {int(report[flag].sum()):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Circular Trading Detection Benchmark
+====================================
+Generates a supply-chain shaped trade graph: taxpayers in tiers, invoices
+flowing from each tier to the next (no cycles), a fraction of invoices
+flowing back upstream (incidental cycles), and planted shell-company loops
+of 3 to 6 taxpayers with high values. Times building the trade graph,
+the SCC pruning of all edges, and the enumeration of the loops worth at
+least the planted value, and checks every planted loop is found. (The
+incidental cycles of a dense random SCC are far too many to enumerate
+unfiltered; that is what `min_value` is for.)
+
+Usage:
+    python scripts/bench_cycles.py
+    python scripts/bench_cycles.py --taxpayers 1000000 --invoices 40000000 --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.graph import cycles  # noqa: E402
+from backend.ingestion import money  # noqa: E402
+
+TIERS = 8
+LOOP_VALUE = 10_000_000  # paise per planted loop edge
+
+
+def make_invoices(taxpayers, invoices, loops, back=0.002, seed=0):
+    """`(suppliers, recipients, values, planted)`; `planted` lists the node
+    IDs of each planted loop."""
+    rng = np.random.default_rng(seed)
+    tier = rng.integers(0, TIERS, taxpayers)
+    order = np.argsort(tier, kind="stable")
+    starts = np.searchsorted(tier[order], np.arange(TIERS + 1))
+
+    supplier = rng.integers(0, taxpayers, invoices)
+    # Recipients in the next tier; a few invoices go back upstream
+    step = np.where(rng.random(invoices) < back, -1, 1)
+    next_tier = np.clip(tier[supplier] + step, 0, TIERS - 1)
+    low, high = starts[next_tier], starts[next_tier + 1]
+    recipient = order[low + (rng.random(invoices) * (high - low)).astype(np.int64)]
+    values = rng.integers(10_000, 5_000_000, invoices)
+
+    lengths = rng.integers(3, 7, loops)
+    members = [rng.choice(taxpayers, size, replace=False) for size in lengths.tolist()]
+    loop_sources = np.concatenate(members)
+    loop_targets = np.concatenate([np.roll(m, -1) for m in members])
+
+    suppliers = np.concatenate([supplier, loop_sources])
+    recipients = np.concatenate([recipient, loop_targets])
+    paise = np.concatenate([values, np.full(len(loop_sources), LOOP_VALUE)])
+    return suppliers, recipients, money.Money(paise, np.full(len(paise), 2, dtype=np.int8)), members
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--taxpayers", type=int, default=200_000)
+    parser.add_argument("--invoices", type=int, default=4_000_000)
+    parser.add_argument("--loops", type=int, default=1_000)
+    parser.add_argument("--max-length", type=int, default=cycles.DEFAULT_MAX_LENGTH)
+    parser.add_argument("--workers", type=int, default=cycles.DEFAULT_WORKERS)
+    args = parser.parse_args(argv)
+
+    suppliers, recipients, values, planted = make_invoices(args.taxpayers, args.invoices, args.loops)
+    gstins = np.array([f"G{i:014d}" for i in range(args.taxpayers)], dtype=object)
+    start = time.perf_counter()
+    graph = cycles.TradeGraph.from_invoices(gstins[suppliers], gstins[recipients], values)
+    built = time.perf_counter()
+    sources, _, _ = cycles.cyclic_subgraph(graph)
+    pruned = time.perf_counter()
+    found = {frozenset(g) for g, _ in cycles.find_cycles(graph, args.max_length, LOOP_VALUE, args.workers)}
+    done = time.perf_counter()
+
+    recovered = sum(frozenset(gstins[m]) in found for m in planted)
+    print(f"  taxpayers={len(graph.gstins):,}  trade edges={len(graph.adjacency):,}")
+    print(f"  edges left after SCC pruning={len(sources):,}")
+    print(f"  build={built - start:.2f}s  prune={pruned - built:.2f}s")
+    print(f"  loops at >= {LOOP_VALUE / 100:,.0f}: found={len(found):,}  planted recovered={recovered}/{len(planted)}")
+    print(f"  find_cycles(min_value)={done - pruned:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Streaming Export Benchmark
+==========================
+Reconciles a synthetic GSTR-1 / GSTR-2B pair into Contract 3 mismatch
+vectors, indexes them in an `ExportStore`, then, through the ASGI app:
+
+  - streams the whole export and one state's, reporting rows/s and the
+    peak Python memory held while streaming (flat, whatever the rows)
+  - times a keyset page at the start, middle and end of the export
+    (each one an index seek, so all about the same)
+
+Usage:
+    python scripts/bench_exports.py
+    python scripts/bench_exports.py --invoices 5000000 --page 10000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.api.exports import ExportStore, encode_cursor  # noqa: E402
+from backend.api.graph import GraphPool  # noqa: E402
+from backend.api.main import create_app  # noqa: E402
+from backend.reconciliation.matching import dump_vectors, reconcile  # noqa: E402
+from bench_api import StandInDriver  # noqa: E402
+
+STATES = ["27", "29", "07", "33", "24"]
+
+
+def sides(invoices, seed=0):
+    rng = np.random.default_rng(seed)
+    suppliers = np.array([f"{STATES[i % len(STATES)]}AAAAA{i:04d}A1Z5" for i in range(10_000)], dtype=object)
+    frame = pd.DataFrame(
+        {
+            "supplier_gstin": suppliers[rng.integers(0, len(suppliers), invoices)],
+            "recipient_gstin": "29AABCU9603R1ZM",
+            "invoice_number": [f"INV-{i}" for i in range(invoices)],
+            "filing_period": "012026",
+            "taxable_value": "1000.00",
+            "igst_amount": "180.00",
+        }
+    )
+    gstr2b = frame[rng.random(invoices) < 0.7].copy()
+    gstr2b.loc[gstr2b.index[::5], "igst_amount"] = "170.00"
+    return frame, gstr2b
+
+
+async def collect(app, path, query=""):
+    """`(status, headers, rows)` of a streamed GET, counting the lines as they arrive."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [],
+        "client": ("bench", 1),
+        "server": ("bench", 80),
+    }
+    response = {"rows": 0}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {k.decode(): v.decode() for k, v in message["headers"]}
+        else:
+            response["rows"] += message.get("body", b"").count(b"\n")
+
+    await app(scope, receive, send)
+    return response["status"], response["headers"], response["rows"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=5_000, help="rows per keyset page")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vectors = os.path.join(tmp, "mismatch_vectors.ndjson")
+        start = time.perf_counter()
+        with open(vectors, "w", encoding="utf-8") as f:
+            f.write(dump_vectors(reconcile(*sides(args.invoices))))
+        store = ExportStore(os.path.join(tmp, "exports.sqlite"))
+        made = time.perf_counter()
+        rows = store.replace("mismatches", [vectors])
+        indexed = time.perf_counter()
+        print(f"  mismatch vectors={rows:,}  reconcile+dump={made - start:.1f}s  index={indexed - made:.1f}s")
+
+        app = create_app(graph=GraphPool(StandInDriver(0)), features=None, export_store=store)
+        for label, query in (("whole export", ""), ("state 27", "state=27")):
+            tracemalloc.start()
+            start = time.perf_counter()
+            _, _, streamed = asyncio.run(collect(app, "/exports/mismatches", query))
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"  {label:<12} rows={streamed:,}  {elapsed:.2f}s ({streamed / elapsed:,.0f} rows/s)"
+                f"  peak memory={peak / 2**20:.1f} MiB"
+            )
+
+        keys = sorted(store.connect().execute("SELECT supplierGstin, invoiceNumber, filingPeriod FROM mismatches"))
+        for label, index in (("first", None), ("middle", len(keys) // 2), ("last", len(keys) - args.page - 1)):
+            query = f"limit={args.page}" + (f"&cursor={encode_cursor(keys[index])}" if index is not None else "")
+            start = time.perf_counter()
+            _, headers, streamed = asyncio.run(collect(app, "/exports/mismatches", query))
+            elapsed = time.perf_counter() - start
+            more = "x-next-cursor" in headers
+            print(f"  {label:<6} page: rows={streamed:,}  {elapsed * 1000:.0f}ms  next cursor={more}")
+
+
+if __name__ == "__main__":
+    main()
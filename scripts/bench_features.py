@@ -0,0 +1,129 @@
+"""
+Vendor Risk Feature Store Benchmark
+===================================
+Writes synthetic Contract 1 invoice, return and payment batches for
+`--taxpayers` GSTINs over `--periods` months, applies them to a fresh
+`FeatureStore`, re-applies a slice of changed invoices (the delta case),
+commits, reopens the store from its snapshot, and times point lookups.
+
+Usage:
+    python scripts/bench_features.py
+    python scripts/bench_features.py --invoices 2000000 --taxpayers 50000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.risk.feature_store import FeatureStore  # noqa: E402
+
+
+def write_batch(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+
+
+def make_batches(directory, invoices, taxpayers, periods, seed=0):
+    rng = np.random.default_rng(seed)
+    gstins = [f"{i % 37:02d}AAAAA{i:05d}A1Z5" for i in range(taxpayers)]
+    months = [f"{m:02d}2025" for m in range(1, periods + 1)]
+    supplier = rng.integers(0, taxpayers, invoices).tolist()
+    recipient = rng.integers(0, taxpayers, invoices).tolist()
+    period = rng.integers(0, periods, invoices).tolist()
+    taxable = rng.integers(1_000, 1_000_000, invoices).tolist()
+    invoice_rows = [
+        {
+            "supplierGstin": gstins[s],
+            "recipientGstin": gstins[r],
+            "invoiceNumber": f"INV-{i}",
+            "filingPeriod": months[p],
+            "taxableValue": f"{t}.00",
+            "igstAmount": f"{t * 18 // 100}.00",
+            "cgstAmount": "0",
+            "sgstAmount": "0",
+            "cessAmount": "0",
+        }
+        for i, (s, r, p, t) in enumerate(zip(supplier, recipient, period, taxable))
+    ]
+    return_rows = [
+        {
+            "returnId": f"RET-{g}-{kind}-{m}",
+            "gstin": g,
+            "returnType": kind,
+            "returnPeriod": m,
+            "filingDate": f"2026-01-{day:02d}",
+            "filingStatus": "FILED",
+            "totalTaxLiability": "1000.00",
+            "itcClaimedIgst": "100.00",
+            "itcClaimedCgst": "0",
+            "itcClaimedSgst": "0",
+            "itcClaimedCess": "0",
+        }
+        for g in gstins
+        for m in months
+        for kind, day in (("GSTR1", 11), ("GSTR3B", 25))
+    ]
+    payment_rows = [
+        {"paymentId": f"PMT-{g}-{m}", "gstin": g, "returnPeriod": m, "paymentStatus": "PAID", "totalPaid": "900.00"}
+        for g in gstins
+        for m in months
+    ]
+    batches = []
+    for entity, rows in (("invoice", invoice_rows), ("return", return_rows), ("payment", payment_rows)):
+        path = os.path.join(directory, f"{entity}_batch.ndjson")
+        write_batch(path, rows)
+        batches.append((entity, path))
+    changed = os.path.join(directory, "invoice_delta.ndjson")
+    write_batch(changed, [dict(row, igstAmount="1.00") for row in invoice_rows[: invoices // 20]])
+    records = len(invoice_rows) + len(return_rows) + len(payment_rows)
+    return batches, ("invoice", changed), [(g, m) for g in gstins[:1000] for m in months], records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=500_000)
+    parser.add_argument("--taxpayers", type=int, default=20_000)
+    parser.add_argument("--periods", type=int, default=12)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        batches, delta, keys, records = make_batches(directory, args.invoices, args.taxpayers, args.periods)
+        path = os.path.join(directory, "features.sqlite")
+        store = FeatureStore(path)
+        start = time.perf_counter()
+        store.update(batches)
+        loaded = time.perf_counter()
+        store.update([delta])
+        updated = time.perf_counter()
+        store.commit()
+        committed = time.perf_counter()
+        store.close()
+
+        start_open = time.perf_counter()
+        store = FeatureStore(path)
+        opened = time.perf_counter()
+        rounds = 20
+        lookup_start = time.perf_counter()
+        for _ in range(rounds):
+            for gstin, period in keys:
+                store.vector(gstin, period)
+        lookup = (time.perf_counter() - lookup_start) / (rounds * len(keys))
+        rows = len(store)
+        store.close()
+
+    print(f"  invoices={args.invoices:,}  (gstin, period) rows={rows:,}")
+    print(f"  full load of {records:,} records={loaded - start:.2f}s ({records / (loaded - start):,.0f} records/s)")
+    print(f"  delta of {args.invoices // 20:,} changed invoices={updated - loaded:.2f}s")
+    print(f"  commit={committed - updated:.2f}s")
+    print(f"  reopen from snapshot={opened - start_open:.2f}s  vector() lookup={lookup * 1e6:.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Near-Miss Invoice Matching Benchmark
+====================================
+Generates GSTR-1 / GSTR-2B invoice records with `faker`: every supplier
+numbers its invoices "<PREFIX>/<FY>/<serial>", and GSTR-2B re-spells each
+number (separators changed, prefix or financial year dropped, zero padding
+changed, two serial digits transposed), alongside invoices that really are
+missing on one side. Runs the exact `reconcile()` and then
+`fuzzy.near_matches()` on the keys it left unmatched, and reports the
+near-miss recall and precision against the known pairs, and the time taken.
+
+Usage:
+    python scripts/bench_fuzzy.py
+    python scripts/bench_fuzzy.py --invoices 1000000 --suppliers 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from faker import Faker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.reconciliation import fuzzy, matching  # noqa: E402
+
+PERIODS = np.array(["012026", "022026", "032026"], dtype=object)
+FY = "25-26"
+# GSTR-2B spellings of "<prefix>/<fy>/<serial>"
+VARIANTS = [
+    lambda prefix, serial: f"{prefix}-{FY.replace('-', '')}-{serial}",
+    lambda prefix, serial: f"{FY.replace('-', '')}/{serial}",
+    lambda prefix, serial: f"{prefix}/{serial:06d}",
+    lambda prefix, serial: f"{prefix.lower()} {FY} {serial:04d}",
+]
+
+
+def transposed(serial):
+    """The serial with its last two digits swapped (a typo)."""
+    text = f"{serial:04d}"
+    return text[:-2] + text[-1] + text[-2]
+
+
+def make_sides(invoices, suppliers, missing=0.05, seed=0):
+    """`(gstr1, gstr2b, truth)`; `truth` maps GSTR-1 invoice numbers to the
+    GSTR-2B spelling of the same invoice, per supplier and period."""
+    fake = Faker("en_IN")
+    Faker.seed(seed)
+    rng = np.random.default_rng(seed)
+    gstins = np.array([f"{rng.integers(1, 37):02d}{fake.bothify('?????####?').upper()}1Z5" for _ in range(suppliers)])
+    prefixes = [fake.lexify("???").upper() for _ in range(suppliers)]
+
+    supplier = rng.integers(0, suppliers, invoices)
+    period = rng.integers(0, len(PERIODS), invoices)
+    serial = rng.integers(1, 100_000, invoices)
+    variant = rng.integers(0, len(VARIANTS) + 1, invoices)  # the last is a transposition
+    taxable = rng.integers(10_000, 10_000_000, invoices)
+    gstr1_only = rng.random(invoices) < missing
+    gstr2b_only = ~gstr1_only & (rng.random(invoices) < missing)
+
+    gstr1_numbers = [f"{prefixes[s]}/{FY}/{n:04d}" for s, n in zip(supplier.tolist(), serial.tolist())]
+    gstr2b_numbers = [
+        f"{prefixes[s]}/{FY}/{transposed(n)}" if v == len(VARIANTS) else VARIANTS[v](prefixes[s], n)
+        for s, n, v in zip(supplier.tolist(), serial.tolist(), variant.tolist())
+    ]
+
+    def frame(rows, numbers):
+        return pd.DataFrame(
+            {
+                "supplier_gstin": gstins[supplier[rows]].astype(object),
+                "invoice_number": np.asarray(numbers, dtype=object)[rows],
+                "filing_period": PERIODS[period[rows]],
+                "taxable_value": (taxable[rows] // 100).astype(str).astype(object),
+                "igst_amount": (taxable[rows] * 18 // 10_000).astype(str).astype(object),
+            }
+        )
+
+    gstr1 = frame(np.flatnonzero(~gstr2b_only), gstr1_numbers)
+    gstr2b = frame(np.flatnonzero(~gstr1_only), gstr2b_numbers)
+    both = np.flatnonzero(~gstr1_only & ~gstr2b_only)
+    truth = pd.DataFrame(
+        {
+            "supplier_gstin": gstins[supplier[both]].astype(object),
+            "filing_period": PERIODS[period[both]],
+            "invoice_number": np.asarray(gstr1_numbers, dtype=object)[both],
+            "gstr2b_invoice_number": np.asarray(gstr2b_numbers, dtype=object)[both],
+        }
+    )
+    return gstr1, gstr2b, truth
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=500_000)
+    parser.add_argument("--suppliers", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    gstr1, gstr2b, truth = make_sides(args.invoices, args.suppliers)
+    start = time.perf_counter()
+    result = matching.reconcile(gstr1, gstr2b)
+    reconciled = time.perf_counter()
+    pairs = fuzzy.near_matches(result)
+    matched = time.perf_counter()
+
+    unmatched = int(result["match_status"].isin(["MISSING_IN_GSTR2B", "MISSING_IN_GSTR1"]).sum())
+    found = pd.DataFrame(
+        {
+            "supplier_gstin": result["supplier_gstin"].to_numpy()[pairs["gstr1_row"]],
+            "filing_period": result["filing_period"].to_numpy()[pairs["gstr1_row"]],
+            "invoice_number": result["invoice_number"].to_numpy()[pairs["gstr1_row"]],
+            "gstr2b_invoice_number": result["invoice_number"].to_numpy()[pairs["gstr2b_row"]],
+        }
+    )
+    # Pairs the exact join already matched are not near misses
+    exact = result.loc[result["match_status"] == "MATCHED", ["supplier_gstin", "filing_period", "invoice_number"]]
+    expected = truth.merge(exact, how="left", indicator=True).query("_merge == 'left_only'").drop(columns="_merge")
+    expected = expected.drop_duplicates()
+    correct = len(found.merge(expected))
+
+    print(f"  gstr1={len(gstr1):,}  gstr2b={len(gstr2b):,}  unmatched after exact join={unmatched:,}")
+    print(f"  reconcile={reconciled - start:.2f}s  near_matches={matched - reconciled:.2f}s")
+    print(f"  near-miss pairs: expected={len(expected):,}  found={len(pairs):,}  correct={correct:,}")
+    print(f"  recall={correct / max(len(expected), 1):.4f}  precision={correct / max(len(pairs), 1):.4f}")
+
+
+if __name__ == "__main__":
+    main()
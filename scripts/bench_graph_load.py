@@ -0,0 +1,148 @@
+"""
+Graph Load Benchmark
+====================
+Ingests a generated invoice CSV into Contract 1 batches, then loads them with
+`GraphLoader` and reports nodes/sec and relationships/sec for each `--rows`
+size.
+
+With `--uri` the load goes to that Neo4j server, once with the schema from
+`backend/graph/migrations.py` and once without it (`--schema` picks one).
+Without the key constraints every MERGE scans its label, so the load is
+O(n^2) and its rate falls as n grows; with them each MERGE is an index
+seek, O(log n), and the rate stays flat. Each size is also exported to
+`neo4j-admin` import CSVs (`backend/graph/admin_import.py`), the cold-build
+path, and the export rate is reported alongside. Run it against a disposable
+server, since the graph and its schema are wiped before every load:
+
+    docker run --rm -p 7687:7687 -e NEO4J_AUTH=neo4j/testpassword neo4j:5
+
+Without `--uri` the transactions go to a driver that packs every parameter
+the way Bolt would and discards it, which measures the client-side ceiling:
+NDJSON decoding plus the driver's parameter packing.
+
+Usage:
+    python scripts/bench_graph_load.py --rows 200000
+    python scripts/bench_graph_load.py --rows 10000 20000 40000 --uri bolt://localhost:7687 --password testpassword
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_ingest import make_invoices  # noqa: E402
+
+from backend.graph.admin_import import export_import_csv  # noqa: E402
+from backend.graph.loader import DEFAULT_BATCH_SIZE, DEFAULT_SESSIONS, GraphLoader  # noqa: E402
+from backend.graph.migrations import expected_schema, load_migrations, migrate  # noqa: E402
+from backend.ingestion.ingest_service import IngestService  # noqa: E402
+
+
+def reset_graph(driver, with_schema):
+    """Empty the graph, then apply the schema or drop it entirely."""
+    driver.execute_query("MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS")
+    constraints, indexes = expected_schema(load_migrations())
+    for name in sorted(constraints) + ["schema_migration_version"]:
+        driver.execute_query(f"DROP CONSTRAINT {name} IF EXISTS")
+    for name in sorted(indexes):
+        driver.execute_query(f"DROP INDEX {name} IF EXISTS")
+    if with_schema:
+        migrate(driver)
+
+
+class PackingDriver:
+    """Packs each transaction's parameters as the Bolt driver would, then
+    drops them."""
+
+    def __init__(self):
+        from neo4j._codec.packstream.v1 import Packer
+
+        self.packer = Packer
+
+    def session(self, database=None):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, fn, *args):
+        return fn(self, *args)
+
+    def run(self, query, rows, **params):
+        stream = _Sink()
+        self.packer(stream).pack(dict(params, rows=rows))
+        n = len(rows)
+        counters = SimpleNamespace(nodes_created=n, relationships_created=n, nodes_deleted=n)
+        return SimpleNamespace(consume=lambda: SimpleNamespace(counters=counters))
+
+
+class _Sink:
+    def write(self, data):
+        pass
+
+
+def load(manifest_path, args, with_schema):
+    if not args.uri:
+        loader = GraphLoader(PackingDriver(), batch_size=args.batch_size, sessions=args.sessions, check_schema=False)
+        return loader.load_manifest(manifest_path)
+
+    from neo4j import GraphDatabase
+
+    with GraphDatabase.driver(args.uri, auth=(args.user, args.password)) as driver:
+        reset_graph(driver, with_schema)
+        loader = GraphLoader(driver, batch_size=args.batch_size, sessions=args.sessions, check_schema=with_schema)
+        return loader.load_manifest(manifest_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[200_000])
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS)
+    parser.add_argument("--uri", help="Neo4j server to load into (wiped first)")
+    parser.add_argument("--user", default="neo4j")
+    parser.add_argument("--password", default="neo4j")
+    parser.add_argument("--schema", choices=["both", "with", "without"], default="both")
+    args = parser.parse_args(argv)
+
+    if not args.uri:
+        settings = [("packing-only driver", False)]
+    else:
+        choices = ["with", "without"] if args.schema == "both" else [args.schema]
+        settings = [(f"{choice} schema", choice == "with") for choice in choices]
+
+    print(f"  batch_size={args.batch_size:,}  sessions={args.sessions}  ({args.uri or 'no server'})")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "invoices.csv")
+            make_invoices(rows).to_csv(source, index=False)
+            service = IngestService(output_dir=os.path.join(tmp, "out"), error_log=os.path.join(tmp, "errors.json"))
+            service.process({"invoice": source})
+            for label, with_schema in settings:
+                stats = load(service.manifest_path, args, with_schema)
+                rates = []
+                for kind in ("nodes", "relationships"):
+                    count = sum(counts["rows"] for counts in stats[kind].values())
+                    secs = stats["seconds"][kind]
+                    rates.append(f"{kind}={count:,} in {secs:.2f}s ({count / max(secs, 1e-9):,.0f}/s)")
+                print(f"  rows={rows:>10,}  {label:<20} " + "  ".join(rates))
+
+            start = time.perf_counter()
+            exporter = export_import_csv(service.manifest_path, os.path.join(tmp, "import"))
+            secs = time.perf_counter() - start
+            written = sum(exporter.counts.values())
+            print(
+                f"  rows={rows:>10,}  {'admin import CSVs':<20} "
+                f"{written:,} nodes+relationships in {secs:.2f}s ({written / max(secs, 1e-9):,.0f}/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Ingestion Throughput Benchmark
+==============================
+Generates a raw invoice CSV (with ~0.1% rows that fail validation), runs it
+through `IngestService.process` once per `--workers` setting and reports
+invoices/sec, the speedup over the first setting, and the parent's peak RSS.
+Also reports what column-wise normalization costs next to Pydantic
+validation of the same chunks, and the bulk NDJSON serializer next to
+per-object `model_dump_json`. With `--delta`, times a first run and an
+unchanged re-run against a fingerprint store (delta ingestion).
+
+Usage:
+    python scripts/bench_ingest.py
+    python scripts/bench_ingest.py --rows 1000000 --chunksize 50000
+    python scripts/bench_ingest.py --rows 2000000 --workers 1 4 16
+    python scripts/bench_ingest.py --rows 1000000 --delta
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ingestion.ingest_service import (  # noqa: E402
+    ENTITY_MODELS,
+    IngestService,
+    chunk_records,
+    read_chunks,
+    validate_batch,
+)
+from backend.ingestion.normalization import normalize_chunk  # noqa: E402
+from backend.ingestion.serializer import dump_models  # noqa: E402
+
+GSTINS = ["27AAPFU0939F1ZV", "29AABCU9603R1ZM", "33AAACX0000A1ZQ", "07AAACR5055K1Z5"]
+
+
+def make_invoices(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    taxable = rng.integers(100, 10_000_000, rows) / 100
+    cgst = np.round(taxable * 0.09, 2)
+    intra = rng.random(rows) < 0.6
+    df = pd.DataFrame(
+        {
+            "invoice_number": [f"INV-{i:09d}" for i in range(rows)],
+            "invoice_date": (
+                np.datetime64("2025-04-01") + rng.integers(0, 365, rows).astype("timedelta64[D]")
+            ).astype(str),
+            "invoice_type": "B2B",
+            "invoice_status": "ACTIVE",
+            "supply_type": np.where(intra, "INTRA_STATE", "INTER_STATE"),
+            "document_type": "INV",
+            "supplier_gstin": rng.choice(GSTINS, rows),
+            "recipient_gstin": rng.choice(GSTINS, rows),
+            "taxable_value": taxable,
+            "igst_amount": np.where(intra, 0.0, cgst * 2),
+            "cgst_amount": np.where(intra, cgst, 0.0),
+            "sgst_amount": np.where(intra, cgst, 0.0),
+            "cess_amount": 0.0,
+            "total_value": np.round(taxable + cgst * 2, 2),
+            "place_of_supply": "27",
+            "reverse_charge": "false",
+            "irn": "",
+            "filing_period": "012026",
+        }
+    )
+    bad = rng.choice(rows, size=max(rows // 1000, 1), replace=False)
+    df.loc[bad, "filing_period"] = "132026"
+    return df
+
+
+def stage_costs(source, chunksize):
+    """Seconds spent normalizing, validating and serializing (bulk and
+    per-object) every chunk of `source`."""
+    normalize_secs = validate_secs = dump_secs = model_dump_secs = 0.0
+    for chunk in read_chunks(source, chunksize):
+        start = time.perf_counter()
+        data, _ = normalize_chunk(ENTITY_MODELS["invoice"], chunk)
+        normalize_secs += time.perf_counter() - start
+        records = chunk_records(data)
+        start = time.perf_counter()
+        models, _ = validate_batch("invoice", records)
+        validate_secs += time.perf_counter() - start
+        start = time.perf_counter()
+        bulk = dump_models(ENTITY_MODELS["invoice"], models)
+        dump_secs += time.perf_counter() - start
+        start = time.perf_counter()
+        per_object = "".join(model.model_dump_json(by_alias=True) + "\n" for model in models)
+        model_dump_secs += time.perf_counter() - start
+        assert bulk == per_object
+    return normalize_secs, validate_secs, dump_secs, model_dump_secs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    parser.add_argument("--delta", action="store_true", help="also time an unchanged re-run with fingerprints")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "invoice.csv")
+        make_invoices(args.rows).to_csv(source, index=False, float_format="%.2f")
+        normalize_secs, validate_secs, dump_secs, model_dump_secs = stage_costs(source, args.chunksize)
+        print(
+            f"  normalize={normalize_secs:.2f}s  validate={validate_secs:.2f}s  "
+            f"normalization cost={normalize_secs / validate_secs:.1%} of validation"
+        )
+        print(
+            f"  serialize: bulk={dump_secs:.2f}s  model_dump_json={model_dump_secs:.2f}s  "
+            f"speedup={model_dump_secs / dump_secs:.1f}x  (byte-identical)"
+        )
+        baseline = None
+        for workers in args.workers:
+            service = IngestService(
+                output_dir=os.path.join(tmp, f"out{workers}"),
+                error_log=os.path.join(tmp, "logs", "ingestion_errors.json"),
+                chunksize=args.chunksize,
+                workers=workers,
+            )
+            start = time.perf_counter()
+            [summary] = service.process({"invoice": source})
+            secs = time.perf_counter() - start
+            baseline = baseline or secs
+
+            peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(
+                f"  workers={workers:>2}  rows={summary['rows']:,}  invalid={summary['invalid']:,}  "
+                f"batches={len(summary['batches'])}  {secs:.2f}s  "
+                f"{summary['rows'] / secs:,.0f} invoices/sec  speedup={baseline / secs:4.1f}x  "
+                f"peak RSS={peak_mb:,.0f} MB"
+            )
+
+        if args.delta:
+            service = IngestService(
+                output_dir=os.path.join(tmp, "delta"),
+                error_log=os.path.join(tmp, "logs", "ingestion_errors.json"),
+                chunksize=args.chunksize,
+                workers=args.workers[-1],
+                fingerprints=os.path.join(tmp, "fingerprints.sqlite"),
+            )
+            for label in ("first run", "unchanged re-run"):
+                start = time.perf_counter()
+                [summary] = service.process({"invoice": source})
+                secs = time.perf_counter() - start
+                emitted = summary["valid"] - summary["unchanged"]
+                print(f"  delta {label:<16} {secs:.2f}s  emitted={emitted:,}  unchanged={summary['unchanged']:,}")
+
+
+if __name__ == "__main__":
+    main()
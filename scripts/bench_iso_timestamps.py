@@ -0,0 +1,85 @@
+"""
+ISO Timestamp Validation Benchmark
+==================================
+Compares the per-value `datetime.fromisoformat` loop the validator used to
+run (and, as a floor, a bare `map` over the C parser) against the
+column-wise `iso_timestamp_validity` check, and asserts all of them accept
+exactly the same rows.
+
+Usage:
+    python scripts/bench_iso_timestamps.py
+    python scripts/bench_iso_timestamps.py --rows 1000000 10000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from validator import _fromisoformat_ok, iso_timestamp_validity  # noqa: E402
+
+
+def make_timestamps(rows, seed=0):
+    """E-invoice style timestamps with ~0.1% malformed or exotic values."""
+    rng = np.random.default_rng(seed)
+    base = np.datetime64("2025-04-01T00:00:00")
+    stamps = (base + rng.integers(0, 365 * 86400, rows).astype("timedelta64[s]")).astype(str)
+    values = stamps.astype(object)
+    odd = rng.choice(rows, size=max(rows // 1000, 1), replace=False)
+    samples = ["2025-02-29T10:00:00", "2025-04-01 25:00:00", "20250401T101500", "2025-04-01T10:15:00+05:30", "n/a"]
+    values[odd] = [samples[i % len(samples)] for i in range(len(odd))]
+    return values
+
+
+def old_check_loop(series):
+    """The loop check_iso_dates ran before it went column-wise."""
+    bad_ts = []
+    for val in series.dropna().astype(str):
+        try:
+            datetime.fromisoformat(val)
+        except ValueError:
+            bad_ts.append(val)
+    return len(bad_ts)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def bench(rows):
+    values = make_timestamps(rows)
+    series = pd.Series(values, dtype=str)
+
+    old_invalid, old_secs = timed(old_check_loop, series)
+    expected, map_secs = timed(
+        lambda: np.fromiter(map(_fromisoformat_ok, values), dtype=bool, count=len(values))
+    )
+    got, vector_secs = timed(iso_timestamp_validity, values)
+
+    assert np.array_equal(expected, got), "column-wise check disagrees with fromisoformat"
+    assert old_invalid == int((~got).sum())
+    print(
+        f"  rows={rows:>11,}  invalid={old_invalid:>7,}  "
+        f"old loop={old_secs:7.2f}s  map={map_secs:7.2f}s  column-wise={vector_secs:7.2f}s  "
+        f"speedup vs old loop={old_secs / vector_secs:5.1f}x"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    args = parser.parse_args(argv)
+    for rows in args.rows:
+        bench(rows)
+
+
+if __name__ == "__main__":
+    main()
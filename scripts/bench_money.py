@@ -0,0 +1,103 @@
+"""
+Money Aggregation Benchmark
+===========================
+Sums invoice totals per group (e.g. supplier GSTIN) and runs the tax-component
+check (taxable + cgst + sgst + igst + cess vs total_value) twice: once on
+`Decimal`s and once on int64 paise columns (`backend/ingestion/money.py`).
+Reports the one-off string conversion and the aggregation time of each path
+separately, and verifies the rendered results are identical.
+
+Usage:
+    python scripts/bench_money.py
+    python scripts/bench_money.py --rows 2000000 --groups 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from decimal import Decimal
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ingestion import money  # noqa: E402
+
+COMPONENTS = ["taxable_value", "cgst_amount", "sgst_amount", "igst_amount", "cess_amount"]
+
+
+def make_amounts(rows, groups, seed=0):
+    rng = np.random.default_rng(seed)
+    taxable = rng.integers(100, 10_000_000, rows)
+    cgst = taxable * 9 // 100
+    total = taxable + 2 * cgst + (rng.random(rows) < 0.001)  # ~0.1% off by a paisa
+    columns = {
+        "taxable_value": taxable,
+        "cgst_amount": cgst,
+        "sgst_amount": cgst,
+        "igst_amount": np.zeros(rows, dtype=np.int64),
+        "cess_amount": np.zeros(rows, dtype=np.int64),
+        "total_value": total,
+    }
+    text = {name: [f"{p // 100}.{p % 100:02d}" for p in paise.tolist()] for name, paise in columns.items()}
+    return text, rng.integers(0, groups, rows)
+
+
+def to_decimal_columns(text):
+    return {name: [Decimal(v) for v in column] for name, column in text.items()}
+
+
+def decimal_path(values, codes):
+    sums = defaultdict(Decimal)
+    for code, value in zip(codes.tolist(), values["total_value"]):
+        sums[code] += value
+    mismatched = sum(
+        sum(parts[1:], parts[0]) != total
+        for *parts, total in zip(*(values[name] for name in COMPONENTS), values["total_value"])
+    )
+    return {code: str(value) for code, value in sums.items()}, mismatched
+
+
+def to_paise_columns(text):
+    return {name: money.parse_money(column) for name, column in text.items()}
+
+
+def paise_path(columns, codes, groups):
+    sums = money.group_sums(columns["total_value"], codes, groups)
+    present = np.flatnonzero(np.bincount(codes, minlength=groups))
+    rendered = dict(zip(present.tolist(), money.format_money(sums.take(present))))
+    mismatched = int(money.tax_component_mismatch(columns["total_value"], [columns[n] for n in COMPONENTS]).sum())
+    return rendered, mismatched
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--groups", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    text, codes = make_amounts(args.rows, args.groups)
+
+    timings = {}
+    results = {}
+    for label, convert, aggregate in [
+        ("Decimal", to_decimal_columns, lambda columns: decimal_path(columns, codes)),
+        ("paise", to_paise_columns, lambda columns: paise_path(columns, codes, args.groups)),
+    ]:
+        start = time.perf_counter()
+        columns = convert(text)
+        converted = time.perf_counter()
+        results[label] = aggregate(columns)
+        timings[label] = (converted - start, time.perf_counter() - converted)
+
+    assert results["paise"] == results["Decimal"], "paise results differ from Decimal"
+    print(f"  rows={args.rows:,}  groups={args.groups:,}  mismatched={results['paise'][1]:,}  (results identical)")
+    for label, (convert_secs, aggregate_secs) in timings.items():
+        print(f"  {label:>7}: convert={convert_secs:.2f}s  aggregate={aggregate_secs:.3f}s")
+    print(f"  aggregation speedup={timings['Decimal'][1] / timings['paise'][1]:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
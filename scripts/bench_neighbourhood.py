@@ -0,0 +1,158 @@
+"""
+Taxpayer Neighbourhood Benchmark
+================================
+Builds a random trade graph with one hub taxpayer trading with tens of
+thousands of counterparties, and serves the Contract 5 neighbourhood
+endpoint from it through the ASGI app. The stand-in graph answers the
+collapsed hop queries from sorted pair arrays, as the database would after
+aggregating, each pair with its invoices' `totalValue` strings. Reports,
+for the hub and for an ordinary taxpayer at 1 and 2 hops, the response
+time, the time spent in the stand-in graph, and the payload size.
+
+Usage:
+    python scripts/bench_neighbourhood.py
+    python scripts/bench_neighbourhood.py --taxpayers 1000000 --hub-partners 200000 --max-nodes 1000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.api import neighbourhood as hood  # noqa: E402
+from backend.api.graph import GraphPool  # noqa: E402
+from backend.api.main import create_app  # noqa: E402
+from bench_api import StandInDriver  # noqa: E402
+from bench_exports import collect  # noqa: E402
+
+
+class PairGraph(StandInDriver):
+    """Answers the neighbourhood queries from (supplier, recipient) pairs
+    with invoice counts and value strings, indexed both ways."""
+
+    def __init__(self, gstins, suppliers, recipients, invoices, values):
+        super().__init__(0)
+        self.gstins = gstins
+        self.ids = {g: i for i, g in enumerate(gstins.tolist())}
+        self.columns = (suppliers, recipients, invoices, values)
+        self.by = {}
+        for name, key in (("out", suppliers), ("in", recipients)):
+            order = np.argsort(key, kind="stable")
+            self.by[name] = (order, np.searchsorted(key[order], np.arange(len(gstins) + 1)))
+        self.seconds = 0.0
+
+    def pairs(self, direction, nodes):
+        order, indptr = self.by[direction]
+        if not len(nodes):
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([order[indptr[n] : indptr[n + 1]] for n in nodes])
+
+    async def run(self, query, params):
+        start = time.perf_counter()
+        frontier = np.array([self.ids[g] for g in params.get("frontier", ())], dtype=np.int64)
+        if query == hood.INVOICE_QUERY:
+            records = []  # the bench centres trade too much for invoice detail
+        elif query == hood.RIM_QUERY:
+            rows = self.pairs("out", frontier)
+            rows = rows[np.isin(self.columns[1][rows], frontier)]
+            suppliers, recipients, invoices, values = (column[rows] for column in self.columns)
+            names = self.gstins[suppliers].tolist(), self.gstins[recipients].tolist()
+            records = [
+                {"supplier": s, "recipient": r, "invoices": n, "values": v}
+                for s, r, n, v in zip(*names, invoices.tolist(), values.tolist())
+            ]
+        else:
+            outward, inward = self.pairs("out", frontier), self.pairs("in", frontier)
+            rows = np.concatenate([outward, inward])
+            suppliers, recipients, invoices, values = (column[rows] for column in self.columns)
+            outbound = np.arange(len(rows)) < len(outward)
+            records = [
+                {
+                    "near": self.gstins[np.where(outbound, suppliers, recipients)].tolist(),
+                    "far": self.gstins[np.where(outbound, recipients, suppliers)].tolist(),
+                    "outbound": outbound.tolist(),
+                    "invoices": invoices.tolist(),
+                    "values": values.tolist(),
+                }
+            ]
+        self.seconds += time.perf_counter() - start
+        self.records = records
+        return self
+
+    async def data(self):
+        return self.records
+
+
+def make_graph(taxpayers, invoices, hub_partners, hub_invoices, seed=0):
+    rng = np.random.default_rng(seed)
+    suppliers = rng.integers(0, taxpayers, invoices)
+    recipients = rng.integers(0, taxpayers, invoices)
+    # Taxpayer 0 is the hub, selling to and buying from `hub_partners` taxpayers
+    partners = rng.choice(np.arange(1, taxpayers), hub_partners, replace=False)
+    hub_side = rng.integers(0, 2, hub_invoices).astype(bool)
+    partner = partners[rng.integers(0, hub_partners, hub_invoices)]
+    suppliers = np.concatenate([suppliers, np.where(hub_side, 0, partner)])
+    recipients = np.concatenate([recipients, np.where(hub_side, partner, 0)])
+    paise = rng.integers(10_000, 5_000_000, len(suppliers))
+    keep = suppliers != recipients
+    frame = pd.DataFrame({"s": suppliers[keep], "r": recipients[keep], "v": paise[keep]})
+    frame["v"] = [f"{p // 100}.{p % 100:02d}" for p in frame["v"].tolist()]
+    pairs = frame.groupby(["s", "r"], sort=False)["v"].agg(["count", list]).reset_index()
+    gstins = np.array([f"{27 + i % 10:02d}AAAAA{i % 10_000:04d}{chr(65 + i // 10_000 % 26)}{1 + i // 260_000}Z5"
+                       for i in range(taxpayers)], dtype=object)
+    columns = [pairs[name].to_numpy(dtype=np.int64) for name in ("s", "r", "count")] + [pairs["list"].to_numpy()]
+    return PairGraph(gstins, *columns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--taxpayers", type=int, default=200_000)
+    parser.add_argument("--invoices", type=int, default=2_000_000)
+    parser.add_argument("--hub-partners", type=int, default=50_000)
+    parser.add_argument("--hub-invoices", type=int, default=300_000)
+    parser.add_argument("--max-nodes", type=int, default=hood.DEFAULT_MAX_NODES)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    driver = make_graph(args.taxpayers, args.invoices, args.hub_partners, args.hub_invoices)
+    app = create_app(graph=GraphPool(driver), features=None)
+    print(f"  taxpayer pairs={len(driver.columns[0]):,}  hub invoices={args.hub_invoices:,}")
+    for label, centre in (("hub", driver.gstins[0]), ("ordinary", driver.gstins[1])):
+        for hops in (1, 2):
+            query = f"hops={hops}&max_nodes={args.max_nodes}"
+            times, graph_times = [], []
+            for _ in range(args.repeat):
+                driver.seconds = 0.0
+                start = time.perf_counter()
+                size = {"bytes": 0}
+                status, _, _ = asyncio.run(measure(app, f"/graph/{centre}/neighbourhood", query, size))
+                times.append(time.perf_counter() - start)
+                graph_times.append(driver.seconds)
+            assert status == 200, status
+            total, graph = np.median(times) * 1000, np.median(graph_times) * 1000
+            print(
+                f"  {label:<8} hops={hops}  {total:.0f}ms (stand-in graph {graph:.0f}ms, API {total - graph:.0f}ms)"
+                f"  payload={size['bytes'] / 1024:.0f} KiB"
+            )
+
+
+async def measure(app, path, query, size):
+    """`collect()`, also counting the response bytes into `size`."""
+    async def app_counting(scope, receive, send):
+        async def counting(message):
+            size["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        await app(scope, receive, counting)
+
+    return await collect(app_counting, path, query)
+
+
+if __name__ == "__main__":
+    main()
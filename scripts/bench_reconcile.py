@@ -0,0 +1,93 @@
+"""
+GSTR-1 vs GSTR-2B Reconciliation Benchmark
+==========================================
+Builds synthetic GSTR-1 and GSTR-2B invoice frames (GSTR-2B drops ~3% of
+invoices, misstates tax on ~2%, spells invoice numbers differently and adds
+~1% invoices of its own) and times `matching.reconcile()` on them, then the
+Contract 3 NDJSON output of the keys that did not match.
+
+Usage:
+    python scripts/bench_reconcile.py
+    python scripts/bench_reconcile.py --rows 5000000 --suppliers 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.reconciliation import matching  # noqa: E402
+
+PERIODS = np.array(["012026", "022026", "032026"], dtype=object)
+
+
+def amounts(paise):
+    """Amount strings ("1180.00") for int paise."""
+    whole, part = np.divmod(paise, 100)
+    return np.char.add(np.char.add(whole.astype(str), "."), np.char.zfill(part.astype(str), 2)).astype(object)
+
+
+def make_sides(rows, suppliers, seed=0):
+    rng = np.random.default_rng(seed)
+    gstins = np.array([f"27{n:08d}A1Z5" for n in range(suppliers)], dtype=object)
+    supplier = gstins[rng.integers(0, suppliers, rows)]
+    period = PERIODS[rng.integers(0, len(PERIODS), rows)]
+    numbers = np.arange(rows)
+    taxable = rng.integers(10_000, 10_000_000, rows)
+    tax = taxable * 18 // 100
+
+    gstr1 = pd.DataFrame(
+        {
+            "supplier_gstin": supplier,
+            "invoice_number": np.char.add("INV/", np.char.zfill(numbers.astype(str), 9)).astype(object),
+            "filing_period": period,
+            "taxable_value": amounts(taxable),
+            "igst_amount": amounts(tax),
+        }
+    )
+
+    kept = rng.random(rows) >= 0.03
+    misstated = rng.random(rows) < 0.02
+    extra = max(rows // 100, 1)
+    gstr2b = pd.DataFrame(
+        {
+            "supplier_gstin": np.concatenate([supplier[kept], gstins[rng.integers(0, suppliers, extra)]]),
+            "invoice_number": np.char.add("inv-", np.arange(rows + extra).astype(str))[
+                np.concatenate([numbers[kept], rows + np.arange(extra)])
+            ].astype(object),
+            "filing_period": np.concatenate([period[kept], PERIODS[rng.integers(0, len(PERIODS), extra)]]),
+            "taxable_value": amounts(np.concatenate([taxable[kept], rng.integers(10_000, 10_000_000, extra)])),
+            "igst_amount": amounts(np.concatenate([(tax + misstated * 500)[kept], np.full(extra, 1800)])),
+        }
+    )
+    return gstr1, gstr2b
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="GSTR-1 rows")
+    parser.add_argument("--suppliers", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    gstr1, gstr2b = make_sides(args.rows, args.suppliers)
+    start = time.perf_counter()
+    result = matching.reconcile(gstr1, gstr2b)
+    reconciled = time.perf_counter()
+    text = matching.dump_vectors(result)
+    done = time.perf_counter()
+
+    rows = len(gstr1) + len(gstr2b)
+    print(f"  gstr1={len(gstr1):,}  gstr2b={len(gstr2b):,}  keys={len(result):,}")
+    print(f"  reconcile={reconciled - start:.2f}s  ({rows / (reconciled - start):,.0f} rows/sec)")
+    print(f"  contract 3 output={done - reconciled:.2f}s  ({text.count(chr(10)):,} vectors)")
+    for status, count in matching.status_counts(result).items():
+        print(f"  {status:<18} {count:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Columnar CSV Snapshot Cache
+===========================
+Stores a parsed CSV as one .npy file per column so repeated runs over the
+same generated_data skip `pd.read_csv` type inference entirely.
+
+Numeric columns are saved as-is; string columns are dictionary-encoded as
+int32 codes plus a fixed-width (bytes when ASCII) array of their distinct
+values. Every array
+is reloaded with `np.load(mmap_mode="r")`, so only the pages a check
+touches are read from disk.
+
+An entry is keyed on the source path and the `dtype` overrides it was
+parsed with, and is valid while the file's size and mtime are unchanged.
+When only the mtime moved, the content hash decides: an identical file
+re-stamps the entry, anything else rebuilds it.
+
+Usage:
+    cache = CSVCache(".cache")
+    df = cache.read_csv("gstr1.csv", dtype={"invoice_number": str})
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 1
+HASH_BLOCK = 1 << 20
+
+
+def content_hash(path):
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _dtype_key(dtype):
+    """JSON-stable description of a `read_csv` dtype argument."""
+    if dtype is None:
+        return None
+    if isinstance(dtype, dict):
+        return {str(col): _dtype_key(value) for col, value in sorted(dtype.items())}
+    return getattr(dtype, "__name__", str(dtype))
+
+
+def entry_key(path, dtype):
+    """Everything besides the file contents that determines the parsed frame."""
+    return {
+        "format": FORMAT_VERSION,
+        "pandas": pd.__version__,
+        "source": os.path.abspath(path),
+        "dtype": _dtype_key(dtype),
+    }
+
+
+def _encode_strings(series):
+    """Dictionary-encode a string column as (codes, fixed-width uniques).
+
+    Returns None when the fixed-width form would not round-trip, i.e. a
+    value ends in NUL, which numpy strips from "U" arrays.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    uniques = np.asarray(uniques, dtype=object)
+    fixed = uniques.astype("U") if len(uniques) else np.array([], dtype="U1")
+    lengths = np.fromiter(map(len, uniques), dtype=np.int64, count=len(uniques))
+    if not np.array_equal(np.char.str_len(fixed), lengths):
+        return None
+    try:
+        # ASCII-only columns (GSTINs, IRN hashes, periods) at a quarter the size
+        fixed = fixed.astype("S")
+    except UnicodeEncodeError:
+        pass
+    return codes.astype(np.int32), fixed
+
+
+def _decode_strings(codes, uniques, dtype):
+    codes = np.asarray(codes)
+    if len(codes) < len(uniques):
+        # A slice: decode only the distinct values it references
+        used, codes = np.unique(codes, return_inverse=True)
+        uniques = np.asarray(uniques)[used[used >= 0]]
+        if len(used) and used[0] < 0:
+            codes = codes - 1
+    uniques = np.asarray(uniques)
+    if uniques.dtype.kind == "S":
+        uniques = uniques.astype("U")
+    values = uniques.astype(object).take(codes)
+    values[codes < 0] = np.nan
+    return pd.array(values, dtype=dtype)
+
+
+class CSVCache:
+    """A directory of columnar snapshots, one subdirectory per source CSV."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def entry_dir(self, path):
+        source = os.path.abspath(path)
+        tag = hashlib.blake2b(source.encode(), digest_size=8).hexdigest()
+        return os.path.join(self.cache_dir, f"{os.path.basename(source)}-{tag}")
+
+    # -- lookup ---------------------------------------------------------------
+    def lookup(self, path, dtype=None):
+        """Return the metadata of a valid entry for `path`, or None."""
+        meta_path = os.path.join(self.entry_dir(path), "meta.json")
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get("key") != entry_key(path, dtype):
+            return None
+
+        stat = os.stat(path)
+        if stat.st_size != meta["size"]:
+            return None
+        if stat.st_mtime_ns != meta["mtime_ns"]:
+            if content_hash(path) != meta["hash"]:
+                return None
+            # Touched but unchanged: re-stamp so the next lookup is stat-only
+            meta["mtime_ns"] = stat.st_mtime_ns
+            self._write_meta(self.entry_dir(path), meta)
+        return meta
+
+    # -- read / write ---------------------------------------------------------
+    def read_csv(self, path, dtype=None):
+        """`pd.read_csv(path, dtype=dtype)`, served from the cache when valid.
+
+        A stale or missing entry is rebuilt from the freshly parsed frame;
+        if the cache directory is not writable the frame is still returned.
+        """
+        meta = self.lookup(path, dtype)
+        if meta is not None:
+            return self.load(path, meta)
+
+        stat = os.stat(path)
+        digest = content_hash(path)
+        df = pd.read_csv(path, dtype=dtype)
+        try:
+            self.store(path, df, dtype, stat, digest)
+        except OSError:
+            pass
+        return df
+
+    def iter_chunks(self, path, chunksize, dtype=None):
+        """Yield a cached frame in `chunksize`-row slices, or None on a miss.
+
+        Chunks are cut from the memory-mapped arrays, so memory stays bounded
+        by `chunksize` just like streaming the CSV.
+        """
+        meta = self.lookup(path, dtype)
+        if meta is None:
+            return None
+        return self._iter_slices(path, meta, chunksize)
+
+    def _iter_slices(self, path, meta, chunksize):
+        for start in range(0, max(meta["rows"], 1), chunksize):
+            yield self.load(path, meta, slice(start, start + chunksize))
+
+    def load(self, path, meta, rows=slice(None)):
+        entry = self.entry_dir(path)
+        data = {}
+        for i, column in enumerate(meta["columns"]):
+            base = os.path.join(entry, f"c{i}")
+            if column["kind"] == "numeric":
+                # A plain ndarray view, so the memmap subclass doesn't leak out
+                values = np.asarray(np.load(base + ".npy", mmap_mode="r")[rows])
+                data[column["name"]] = pd.Series(values, dtype=column["dtype"], copy=False)
+            elif column["kind"] == "string":
+                codes = np.load(base + ".codes.npy", mmap_mode="r")[rows]
+                uniques = np.load(base + ".uniques.npy", mmap_mode="r")
+                data[column["name"]] = pd.Series(_decode_strings(codes, uniques, column["dtype"]))
+            else:
+                values = np.load(base + ".npy", allow_pickle=True)[rows]
+                data[column["name"]] = pd.Series(values, dtype=column["dtype"])
+        df = pd.DataFrame(data, columns=[c["name"] for c in meta["columns"]], copy=False)
+        if rows.start:
+            df.index = pd.RangeIndex(rows.start, rows.start + len(df))
+        return df
+
+    def store(self, path, df, dtype, stat, digest):
+        entry = self.entry_dir(path)
+        staging = f"{entry}.tmp-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+
+        columns = []
+        for i, name in enumerate(df.columns):
+            series = df[name]
+            base = os.path.join(staging, f"c{i}")
+            column = {"name": name, "dtype": str(series.dtype)}
+            encoded = None
+            if isinstance(series.dtype, pd.StringDtype):
+                encoded = _encode_strings(series)
+            if encoded is not None:
+                column["kind"] = "string"
+                np.save(base + ".codes.npy", encoded[0])
+                np.save(base + ".uniques.npy", encoded[1])
+            elif isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufcmM":
+                column["kind"] = "numeric"
+                np.save(base + ".npy", series.to_numpy())
+            else:
+                column["kind"] = "object"
+                np.save(base + ".npy", series.to_numpy(dtype=object), allow_pickle=True)
+            columns.append(column)
+
+        meta = {
+            "key": entry_key(path, dtype),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": digest,
+            "rows": len(df),
+            "columns": columns,
+        }
+        self._write_meta(staging, meta)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(staging, entry)
+
+    @staticmethod
+    def _write_meta(entry, meta):
+        tmp = os.path.join(entry, f"meta.json.tmp-{os.getpid()}")
+        with open(tmp, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, os.path.join(entry, "meta.json"))
@@ -6,15 +6,25 @@ ingestion output for the Knowledge Graph layer.
 
 Usage:
     python scripts/validator.py
+    python scripts/validator.py --chunksize 500000   # bounded-memory streaming
+    python scripts/validator.py --workers 5          # one process per dataset
+    python scripts/validator.py --no-cache           # always re-parse the CSVs
 """
 
+import argparse
+import copy
 import os
 import re
 import sys
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
+from csv_cache import CSVCache
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -120,24 +130,423 @@ class ValidationReport:
 # ---------------------------------------------------------------------------
 # Loader
 # ---------------------------------------------------------------------------
-def load_datasets():
+# Columns that contain leading-zero formatted strings (e.g., MMYYYY periods),
+# plus the identifier columns feeding the key-set checks. Pinning the latter
+# to str keeps per-chunk dtype inference from turning "00123" into 123 (or
+# 123.0 in a chunk with gaps), so streamed and full-load key sets agree.
+STR_DTYPE_OVERRIDES = {
+    "taxpayers": {"gstin": str},
+    "gstr1": {"supplier_gstin": str, "recipient_gstin": str, "invoice_number": str, "irn": str},
+    "gstr2b": {"recipient_gstin": str, "invoice_number": str, "claim_period": str},
+    "payments": {"supplier_gstin": str, "return_period": str},
+    "einvoice": {"irn": str, "invoice_number": str, "status": str},
+}
+
+
+def read_dataset(key, data_dir=DATA_DIR, cache=None):
+    """Parse one dataset, through the columnar snapshot `cache` if given."""
+    path = os.path.join(data_dir, REQUIRED_FILES[key])
+    if cache is not None:
+        return cache.read_csv(path, dtype=STR_DTYPE_OVERRIDES.get(key))
+    return pd.read_csv(path, dtype=STR_DTYPE_OVERRIDES.get(key))
+
+
+def load_datasets(data_dir=DATA_DIR, cache=None):
     dfs = {}
     missing = []
-    # Columns that contain leading-zero formatted strings (e.g., MMYYYY periods)
-    str_dtype_overrides = {
-        "gstr2b": {"claim_period": str},
-        "payments": {"return_period": str},
-    }
     for key, filename in REQUIRED_FILES.items():
-        path = os.path.join(DATA_DIR, filename)
-        if os.path.exists(path):
-            dtype = str_dtype_overrides.get(key, None)
-            dfs[key] = pd.read_csv(path, dtype=dtype)
+        if os.path.exists(os.path.join(data_dir, filename)):
+            dfs[key] = read_dataset(key, data_dir, cache)
         else:
             missing.append(filename)
     return dfs, missing
 
 
+def iter_dataset_chunks(key, chunksize, data_dir=DATA_DIR, cache=None):
+    """Yield a dataset as DataFrame chunks of at most `chunksize` rows.
+
+    Always yields at least one (possibly empty) chunk so a header-only file
+    still exposes its columns, exactly as a full load would. A valid cache
+    entry is sliced instead of parsing; a stale one is not rebuilt, since
+    that would need the whole file in memory.
+    """
+    path = os.path.join(data_dir, REQUIRED_FILES[key])
+    dtype = STR_DTYPE_OVERRIDES.get(key)
+    cached = cache.iter_chunks(path, chunksize, dtype) if cache is not None else None
+    if cached is not None:
+        yield from cached
+        return
+    yielded = False
+    for chunk in pd.read_csv(path, dtype=dtype, chunksize=chunksize):
+        yielded = True
+        yield chunk
+    if not yielded:
+        yield pd.read_csv(path, dtype=dtype, nrows=0)
+
+
+def find_missing_files(data_dir=DATA_DIR):
+    return [
+        filename for filename in REQUIRED_FILES.values()
+        if not os.path.exists(os.path.join(data_dir, filename))
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Check Plan Engine
+# ---------------------------------------------------------------------------
+# Checks declare the column derivations they read ("requires") and the key
+# columns whose distinct values they need across the whole dataset ("keys").
+# A CheckPlan merges those declarations, computes every derivation once per
+# (dataset, chunk) and keeps one shared key set per (dataset, column), so ten
+# checks over the same gstr1 columns cost a single pass over each column.
+DERIVATIONS = {}
+CHECK_REGISTRY = []
+
+TAX_COLUMNS = ["cgst_amount", "sgst_amount", "igst_amount"]
+
+
+def derivation(name, columns=()):
+    """Register a per-chunk column derivation.
+
+    Derivations take `(chunk, col)`; those with fixed `columns` are requested
+    with `col=None` and only run when all of those columns are present.
+    """
+    def register(fn):
+        DERIVATIONS[name] = (fn, tuple(columns))
+        return fn
+    return register
+
+
+def register_check(cls):
+    """Add a Check class to the registry; registration order is report order."""
+    CHECK_REGISTRY.append(cls)
+    return cls
+
+
+@derivation("values")
+def derive_values(chunk, col):
+    """Non-null values as strings, in row order."""
+    series = chunk[col]
+    if isinstance(series.dtype, pd.StringDtype):
+        # Already strings: skip the Series-level dropna/astype round trip
+        values = np.asarray(series.array, dtype=object)
+        return values[~pd.isna(values)]
+    return series.dropna().astype(str).to_numpy(dtype=object)
+
+
+def distinct_counts(values):
+    """(uniques, counts) of a values array, in first-seen order."""
+    codes, uniques = pd.factorize(values)
+    return uniques, np.bincount(codes, minlength=len(uniques))
+
+
+@derivation("distinct")
+def derive_distinct(chunk, col):
+    """(uniques, counts) of the non-null string values, in first-seen order."""
+    return distinct_counts(derive_values(chunk, col))
+
+
+@derivation("numeric")
+def derive_numeric(chunk, col):
+    return pd.to_numeric(chunk[col], errors="coerce")
+
+
+@derivation("tax_sum", columns=TAX_COLUMNS)
+def derive_tax_sum(chunk, col):
+    return chunk["cgst_amount"] + chunk["sgst_amount"] + chunk["igst_amount"]
+
+
+@derivation("dates")
+def derive_dates(chunk, col):
+    """Parsed YYYY-MM-DD dates; a parse error is returned, not raised."""
+    try:
+        return pd.to_datetime(chunk[col], format="%Y-%m-%d", errors="coerce")
+    except Exception as e:
+        return e
+
+
+def count_mismatches(distinct, pattern):
+    """Number of values whose string form does not match `pattern`."""
+    uniques, counts = distinct
+    matched = pd.Series(uniques, dtype=object).str.match(pattern).to_numpy(dtype=bool)
+    return int(counts[~matched].sum())
+
+
+# Canonical ISO 8601 shapes that are validated column-wise, as templates of
+# "d" (digit), "S" (date/time separator) and literal characters, keyed by
+# string length. Anything else (offsets, basic format, week dates, commas,
+# 7+ fraction digits, ...) falls back to datetime.fromisoformat itself, so the
+# accepted set is exactly fromisoformat's.
+ISO_TIMESTAMP_TEMPLATES = {
+    10: "dddd-dd-dd",
+    16: "dddd-dd-ddSdd:dd",
+    19: "dddd-dd-ddSdd:dd:dd",
+    **{20 + n: "dddd-dd-ddSdd:dd:dd." + "d" * n for n in range(1, 7)},
+}
+ISO_TIMESTAMP_BLOCK = 1 << 20
+DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def _fromisoformat_ok(value):
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _ascii_columns(values, width):
+    """(width, n) uint8 matrix, one contiguous row per character position.
+
+    Non-ASCII code points become 0, which no template position accepts.
+    """
+    try:
+        codes = values.astype(f"S{width}").view(np.uint8).reshape(len(values), width)
+    except UnicodeEncodeError:
+        points = values.astype(f"U{width}").view(np.uint32).reshape(len(values), width)
+        codes = np.where(points < 128, points, 0).astype(np.uint8)
+    return np.ascontiguousarray(codes.T)
+
+
+def _canonical_timestamp_validity(values):
+    """Mask of values in a canonical shape whose fields are in range."""
+    width = max(ISO_TIMESTAMP_TEMPLATES)
+    valid = np.zeros(len(values), dtype=bool)
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    columns = _ascii_columns(values, width)
+
+    for length, template in ISO_TIMESTAMP_TEMPLATES.items():
+        rows = np.flatnonzero(lengths == length)
+        if len(rows) == 0:
+            continue
+        sub = columns[:length] if len(rows) == len(values) else columns[:length, rows]
+
+        ok = np.ones(len(rows), dtype=bool)
+        digits = {}
+        for pos, kind in enumerate(template):
+            if kind == "d":
+                digits[pos] = sub[pos] - np.uint8(ord("0"))
+                ok &= digits[pos] <= 9
+            elif kind == "S":
+                ok &= (sub[pos] == ord("T")) | (sub[pos] == ord(" "))
+            else:
+                ok &= sub[pos] == ord(kind)
+
+        def field(start, stop):
+            value = digits[start].astype(np.int16)
+            for pos in range(start + 1, stop):
+                value = value * 10 + digits[pos]
+            return value
+
+        year, month, day = field(0, 4), field(5, 7), field(8, 10)
+        leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+        max_day = DAYS_IN_MONTH[np.clip(month, 1, 12) - 1] + (leap & (month == 2))
+        ok &= (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= max_day)
+        if length >= 16:
+            ok &= (field(11, 13) <= 23) & (field(14, 16) <= 59)
+        if length >= 19:
+            ok &= field(17, 19) <= 59
+        valid[rows[ok]] = True
+    return valid
+
+
+def iso_timestamp_validity(values):
+    """Boolean mask of the values datetime.fromisoformat accepts.
+
+    Strings in a canonical shape are checked as a fixed-width byte matrix:
+    character classes per position, then calendar and clock ranges on the
+    extracted digit fields. Only the (rare) remainder is parsed one by one.
+    """
+    values = np.asarray(values, dtype=object)
+    valid = np.zeros(len(values), dtype=bool)
+    for start in range(0, len(values), ISO_TIMESTAMP_BLOCK):
+        block = values[start:start + ISO_TIMESTAMP_BLOCK]
+        valid[start:start + len(block)] = _canonical_timestamp_validity(block)
+
+    rest = np.flatnonzero(~valid)
+    valid[rest] = [_fromisoformat_ok(value) for value in values[rest]]
+    return valid
+
+
+class Check(ABC):
+    """
+    A validation check that folds datasets in one chunk at a time.
+
+    `consume()` is called for every chunk of every dataset with the chunk and
+    the derivations computed for it, and may only keep small running state.
+    `finalize()` writes the report entries from that state and the plan's
+    `columns`, `row_counts` and shared `keys`. A full load is simply the
+    degenerate case of one chunk per dataset.
+    """
+
+    requires = {}
+    keys = {}
+
+    def consume(self, dataset, chunk, derived):
+        pass
+
+    @abstractmethod
+    def finalize(self, report, plan):
+        """Write this check's entries to `report`."""
+
+    def merge(self, other):
+        """Fold in the state another instance built over different datasets."""
+        for name, value in vars(other).items():
+            setattr(self, name, merge_state(getattr(self, name, None), value))
+
+
+def merge_state(left, right):
+    """Combine two partial states: counters add, sets union, dicts merge per key.
+
+    Anything else (e.g. an error message) keeps the first value seen, so
+    merging partial states in dataset order matches the serial fold.
+    """
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if isinstance(left, dict):
+        merged = dict(left)
+        for key, value in right.items():
+            merged[key] = merge_state(merged.get(key), value)
+        return merged
+    if isinstance(left, (set, frozenset)):
+        return left | right
+    if isinstance(left, tuple):
+        return tuple(merge_state(a, b) for a, b in zip(left, right))
+    if isinstance(left, (int, float, np.number)):
+        return left + right
+    return left
+
+
+class CheckPlan:
+    """Fused execution plan for a list of checks."""
+
+    def __init__(self, checks=None):
+        self.checks = build_checks() if checks is None else checks
+        self.requirements = {}
+        self.key_columns = {}
+        for check in self.checks:
+            for dataset, reqs in check.requires.items():
+                planned = self.requirements.setdefault(dataset, [])
+                planned.extend(r for r in reqs if r not in planned)
+            for dataset, cols in check.keys.items():
+                planned = self.key_columns.setdefault(dataset, [])
+                planned.extend(c for c in cols if c not in planned)
+        # Key sets and distinct counts are both built from the "values"
+        # derivation, so plan it for those columns and compute it first
+        for dataset, cols in self.key_columns.items():
+            planned = self.requirements.setdefault(dataset, [])
+            planned.extend(("values", c) for c in cols if ("values", c) not in planned)
+        for planned in self.requirements.values():
+            planned.extend(
+                ("values", col) for name, col in list(planned)
+                if name == "distinct" and ("values", col) not in planned
+            )
+            planned.sort(key=lambda req: req[0] != "values")
+
+        self.columns = {}
+        self.row_counts = {}
+        self.key_sets = {}
+
+    def derive(self, dataset, chunk):
+        derived = {}
+        for name, col in self.requirements.get(dataset, []):
+            fn, inputs = DERIVATIONS[name]
+            if not all(c in chunk.columns for c in (inputs or (col,))):
+                continue
+            if name == "distinct":
+                derived[(name, col)] = distinct_counts(derived[("values", col)])
+            else:
+                derived[(name, col)] = fn(chunk, col)
+        return derived
+
+    def consume(self, dataset, chunk):
+        self.columns.setdefault(dataset, list(chunk.columns))
+        self.row_counts[dataset] = self.row_counts.get(dataset, 0) + len(chunk)
+        derived = self.derive(dataset, chunk)
+        for check in self.checks:
+            check.consume(dataset, chunk, derived)
+        for col in self.key_columns.get(dataset, []):
+            if ("values", col) in derived:
+                self.key_sets.setdefault((dataset, col), set()).update(derived[("values", col)])
+
+    def merge(self, other):
+        """Fold in a plan that consumed other datasets (see `scan_dataset`)."""
+        for check, partial in zip(self.checks, other.checks):
+            check.merge(partial)
+        self.columns.update(other.columns)
+        self.row_counts = merge_state(self.row_counts, other.row_counts)
+        self.key_sets = merge_state(self.key_sets, other.key_sets)
+
+    def finalize(self, report):
+        for check in self.checks:
+            check.finalize(report, self)
+
+
+def run_checks(report, checks, dfs):
+    """Run checks over fully loaded DataFrames (one chunk per dataset)."""
+    plan = CheckPlan(checks)
+    for dataset, df in dfs.items():
+        plan.consume(dataset, df)
+    plan.finalize(report)
+
+
+def run_checks_streaming(report, checks, chunksize, data_dir=DATA_DIR, cache=None):
+    """Run checks over every dataset in `chunksize`-row chunks.
+
+    Returns the row count of each dataset.
+    """
+    plan = CheckPlan(checks)
+    for dataset in REQUIRED_FILES:
+        for chunk in iter_dataset_chunks(dataset, chunksize, data_dir, cache):
+            plan.consume(dataset, chunk)
+    plan.finalize(report)
+    return plan.row_counts
+
+
+def scan_dataset(dataset, checks, chunksize=None, data_dir=DATA_DIR, cache=None):
+    """Run checks over a single dataset; the worker side of `run_checks_parallel`.
+
+    Returns the plan itself: per-check counters, column names, row counts
+    and key sets only, so no DataFrame ever crosses a process boundary.
+    """
+    plan = CheckPlan(checks)
+    if chunksize:
+        for chunk in iter_dataset_chunks(dataset, chunksize, data_dir, cache):
+            plan.consume(dataset, chunk)
+    else:
+        plan.consume(dataset, read_dataset(dataset, data_dir, cache))
+    return plan
+
+
+def run_checks_parallel(report, checks, workers, chunksize=None, data_dir=DATA_DIR, cache=None):
+    """Parse and check every dataset in its own worker process.
+
+    Partial plans are merged in `REQUIRED_FILES` order before finalizing, so
+    the report is identical to a serial run. Returns the row count of each
+    dataset.
+    """
+    plan = CheckPlan(checks)
+    datasets = list(REQUIRED_FILES)
+    # Tasks are pickled lazily while results are merged into plan.checks,
+    # so each one gets its own untouched copy of the checks
+    blank_checks = [copy.deepcopy(plan.checks) for _ in datasets]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partials = pool.map(
+            scan_dataset,
+            datasets,
+            blank_checks,
+            [chunksize] * len(datasets),
+            [data_dir] * len(datasets),
+            [cache] * len(datasets),
+        )
+        for partial in partials:
+            plan.merge(partial)
+    plan.finalize(report)
+    return plan.row_counts
+
+
 # ---------------------------------------------------------------------------
 # Individual Validation Checks
 # ---------------------------------------------------------------------------
@@ -150,343 +559,559 @@ def check_file_presence(report, dfs, missing):
         report.add_fail("File Presence", f"Missing: {', '.join(missing)}")
 
 
-def check_gstin_format(report, dfs):
+@register_check
+class GSTINFormatCheck(Check):
     """Validate GSTIN regex across all datasets that contain GSTIN columns."""
+
     gstin_columns = {
         "taxpayers": ["gstin"],
         "gstr1": ["supplier_gstin", "recipient_gstin"],
         "gstr2b": ["recipient_gstin"],
         "payments": ["supplier_gstin"],
     }
-    total_invalid = 0
-    details = []
+    requires = {
+        dataset: [("distinct", col) for col in cols] for dataset, cols in gstin_columns.items()
+    }
 
-    for dataset, columns in gstin_columns.items():
-        if dataset not in dfs:
-            continue
-        df = dfs[dataset]
-        for col in columns:
-            if col not in df.columns:
+    def __init__(self):
+        self.invalid = {}
+
+    def consume(self, dataset, chunk, derived):
+        for col in self.gstin_columns.get(dataset, []):
+            if ("distinct", col) not in derived:
                 continue
-            series = df[col].dropna().astype(str)
-            invalid = series[~series.str.match(GSTIN_PATTERN)]
-            if len(invalid) > 0:
-                total_invalid += len(invalid)
-                details.append(f"{dataset}.{col}: {len(invalid)} invalid")
-
-    if total_invalid == 0:
-        report.add_pass("GSTIN Regex Validation", "All GSTINs match 15-char format")
-    else:
-        report.add_fail("GSTIN Regex Validation", "; ".join(details))
+            invalid = count_mismatches(derived[("distinct", col)], GSTIN_PATTERN)
+            self.invalid[(dataset, col)] = self.invalid.get((dataset, col), 0) + invalid
+
+    def finalize(self, report, plan):
+        total_invalid = 0
+        details = []
+        for dataset, cols in self.gstin_columns.items():
+            for col in cols:
+                invalid = self.invalid.get((dataset, col), 0)
+                if invalid > 0:
+                    total_invalid += invalid
+                    details.append(f"{dataset}.{col}: {invalid} invalid")
+
+        if total_invalid == 0:
+            report.add_pass("GSTIN Regex Validation", "All GSTINs match 15-char format")
+        else:
+            report.add_fail("GSTIN Regex Validation", "; ".join(details))
 
 
-def check_iso_dates(report, dfs):
+def check_gstin_format(report, dfs):
+    """Validate GSTIN regex across all datasets that contain GSTIN columns."""
+    run_checks(report, [GSTINFormatCheck()], dfs)
+
+
+@register_check
+class ISODateCheck(Check):
     """Validate all date columns use ISO 8601 (YYYY-MM-DD) format."""
+
     date_columns = {
         "gstr1": ["invoice_date"],
     }
-    total_invalid = 0
-    details = []
+    # Columns validated with datetime.fromisoformat semantics
+    timestamp_columns = {
+        "einvoice": ["generation_timestamp"],
+    }
+    requires = {
+        "gstr1": [("distinct", "invoice_date")],
+        "einvoice": [("values", "generation_timestamp")],
+    }
 
-    for dataset, columns in date_columns.items():
-        if dataset not in dfs:
-            continue
-        df = dfs[dataset]
-        for col in columns:
-            if col not in df.columns:
+    def __init__(self):
+        self.invalid = {}
+        self.bad_ts = {}
+
+    def consume(self, dataset, chunk, derived):
+        for col in self.date_columns.get(dataset, []):
+            if ("distinct", col) not in derived:
                 continue
-            series = df[col].dropna().astype(str)
-            invalid = series[~series.str.match(ISO_DATE_PATTERN)]
-            if len(invalid) > 0:
-                total_invalid += len(invalid)
-                details.append(f"{dataset}.{col}: {len(invalid)} non-ISO dates")
-
-    # Also check timestamps in einvoice
-    if "einvoice" in dfs and "generation_timestamp" in dfs["einvoice"].columns:
-        ts = dfs["einvoice"]["generation_timestamp"].dropna().astype(str)
-        bad_ts = []
-        for val in ts:
-            try:
-                datetime.fromisoformat(val)
-            except ValueError:
-                bad_ts.append(val)
-        if bad_ts:
-            total_invalid += len(bad_ts)
-            details.append(f"einvoice.generation_timestamp: {len(bad_ts)} non-ISO timestamps")
-
-    if total_invalid == 0:
-        report.add_pass("ISO Date Validation", "All dates/timestamps are ISO 8601 compliant")
-    else:
-        report.add_fail("ISO Date Validation", "; ".join(details))
+            invalid = count_mismatches(derived[("distinct", col)], ISO_DATE_PATTERN)
+            self.invalid[(dataset, col)] = self.invalid.get((dataset, col), 0) + invalid
 
+        for col in self.timestamp_columns.get(dataset, []):
+            if ("values", col) not in derived:
+                continue
+            bad = int((~iso_timestamp_validity(derived[("values", col)])).sum())
+            self.bad_ts[(dataset, col)] = self.bad_ts.get((dataset, col), 0) + bad
+
+    def finalize(self, report, plan):
+        total_invalid = 0
+        details = []
+        for dataset, cols in self.date_columns.items():
+            for col in cols:
+                invalid = self.invalid.get((dataset, col), 0)
+                if invalid > 0:
+                    total_invalid += invalid
+                    details.append(f"{dataset}.{col}: {invalid} non-ISO dates")
+
+        for dataset, cols in self.timestamp_columns.items():
+            for col in cols:
+                bad_ts = self.bad_ts.get((dataset, col), 0)
+                if bad_ts:
+                    total_invalid += bad_ts
+                    details.append(f"{dataset}.{col}: {bad_ts} non-ISO timestamps")
+
+        if total_invalid == 0:
+            report.add_pass("ISO Date Validation", "All dates/timestamps are ISO 8601 compliant")
+        else:
+            report.add_fail("ISO Date Validation", "; ".join(details))
 
-def check_monetary_decimals(report, dfs):
+
+def check_iso_dates(report, dfs):
+    """Validate all date columns use ISO 8601 (YYYY-MM-DD) format."""
+    run_checks(report, [ISODateCheck()], dfs)
+
+
+@register_check
+class MonetaryDecimalCheck(Check):
     """Validate all monetary columns are non-negative numeric values."""
+
     money_columns = {
         "gstr1": ["invoice_value", "cgst_amount", "sgst_amount", "igst_amount"],
         "gstr2b": ["itc_claimed"],
         "payments": ["tax_paid"],
     }
-    total_invalid = 0
-    details = []
+    requires = {
+        dataset: [("numeric", col) for col in cols] for dataset, cols in money_columns.items()
+    }
 
-    for dataset, columns in money_columns.items():
-        if dataset not in dfs:
-            continue
-        df = dfs[dataset]
-        for col in columns:
-            if col not in df.columns:
+    def __init__(self):
+        self.counts = {}
+
+    def consume(self, dataset, chunk, derived):
+        for col in self.money_columns.get(dataset, []):
+            if ("numeric", col) not in derived:
                 continue
-            series = pd.to_numeric(df[col], errors="coerce")
-            neg_count = (series < 0).sum()
-            nan_count = series.isna().sum()
-            if neg_count > 0:
-                total_invalid += neg_count
-                details.append(f"{dataset}.{col}: {neg_count} negative values")
-            if nan_count > 0:
-                total_invalid += nan_count
-                details.append(f"{dataset}.{col}: {nan_count} non-numeric values")
-
-    if total_invalid == 0:
-        report.add_pass("Monetary Decimal Validation", "All monetary values are non-negative numerics")
-    else:
-        report.add_fail("Monetary Decimal Validation", "; ".join(details))
+            series = derived[("numeric", col)]
+            neg, nan = self.counts.get((dataset, col), (0, 0))
+            self.counts[(dataset, col)] = (neg + (series < 0).sum(), nan + series.isna().sum())
+
+    def finalize(self, report, plan):
+        total_invalid = 0
+        details = []
+        for dataset, cols in self.money_columns.items():
+            for col in cols:
+                if (dataset, col) not in self.counts:
+                    continue
+                neg_count, nan_count = self.counts[(dataset, col)]
+                if neg_count > 0:
+                    total_invalid += neg_count
+                    details.append(f"{dataset}.{col}: {neg_count} negative values")
+                if nan_count > 0:
+                    total_invalid += nan_count
+                    details.append(f"{dataset}.{col}: {nan_count} non-numeric values")
+
+        if total_invalid == 0:
+            report.add_pass("Monetary Decimal Validation", "All monetary values are non-negative numerics")
+        else:
+            report.add_fail("Monetary Decimal Validation", "; ".join(details))
+
+
+def check_monetary_decimals(report, dfs):
+    """Validate all monetary columns are non-negative numeric values."""
+    run_checks(report, [MonetaryDecimalCheck()], dfs)
+
+
+@register_check
+class InvoiceTaxSumCheck(Check):
+    """Validate: cgst + sgst + igst should be a component of invoice_value."""
+
+    requires = {"gstr1": [("tax_sum", None)]}
+
+    def __init__(self):
+        self.invalid = 0
+
+    def consume(self, dataset, chunk, derived):
+        if ("tax_sum", None) in derived:
+            # Tax sum must be >= 0
+            self.invalid += (derived[("tax_sum", None)] < 0).sum()
+
+    def finalize(self, report, plan):
+        if "gstr1" not in plan.columns:
+            report.add_warning("Invoice Tax Sum", "gstr1.csv not loaded")
+            return
+        if not all(c in plan.columns["gstr1"] for c in TAX_COLUMNS):
+            report.add_fail("Invoice Tax Sum", "Missing tax component columns")
+            return
+
+        if self.invalid == 0:
+            report.add_pass("Invoice Tax Sum", f"All {plan.row_counts['gstr1']} invoices have valid tax component sums")
+        else:
+            report.add_fail("Invoice Tax Sum", f"{self.invalid} invoices have negative aggregate tax")
 
 
 def check_invoice_tax_sum(report, dfs):
     """Validate: cgst + sgst + igst should be a component of invoice_value."""
-    if "gstr1" not in dfs:
-        report.add_warning("Invoice Tax Sum", "gstr1.csv not loaded")
-        return
-    df = dfs["gstr1"]
-    required = ["cgst_amount", "sgst_amount", "igst_amount"]
-    if not all(c in df.columns for c in required):
-        report.add_fail("Invoice Tax Sum", "Missing tax component columns")
-        return
+    run_checks(report, [InvoiceTaxSumCheck()], dfs)
 
-    tax_sum = df["cgst_amount"] + df["sgst_amount"] + df["igst_amount"]
-    # Tax sum must be >= 0
-    invalid = (tax_sum < 0).sum()
-    if invalid == 0:
-        report.add_pass("Invoice Tax Sum", f"All {len(df)} invoices have valid tax component sums")
-    else:
-        report.add_fail("Invoice Tax Sum", f"{invalid} invoices have negative aggregate tax")
+
+@register_check
+class InvoiceTotalValueCheck(Check):
+    """Validate: invoice_value should be > sum of tax components (since it includes taxable value)."""
+
+    requires = {"gstr1": [("tax_sum", None)]}
+
+    def __init__(self):
+        self.invalid = 0
+
+    def consume(self, dataset, chunk, derived):
+        if ("tax_sum", None) in derived and "invoice_value" in chunk.columns:
+            self.invalid += (chunk["invoice_value"] < derived[("tax_sum", None)]).sum()
+
+    def finalize(self, report, plan):
+        if "gstr1" not in plan.columns:
+            report.add_warning("Invoice Total Value", "gstr1.csv not loaded")
+            return
+        if not all(c in plan.columns["gstr1"] for c in ["invoice_value"] + TAX_COLUMNS):
+            report.add_fail("Invoice Total Value", "Missing required columns")
+            return
+
+        if self.invalid == 0:
+            report.add_pass("Invoice Total Value", "All invoice_values >= tax component sums")
+        else:
+            report.add_fail("Invoice Total Value", f"{self.invalid} invoices have total < tax sum")
 
 
 def check_invoice_total_value(report, dfs):
     """Validate: invoice_value should be > sum of tax components (since it includes taxable value)."""
-    if "gstr1" not in dfs:
-        report.add_warning("Invoice Total Value", "gstr1.csv not loaded")
-        return
-    df = dfs["gstr1"]
-    required = ["invoice_value", "cgst_amount", "sgst_amount", "igst_amount"]
-    if not all(c in df.columns for c in required):
-        report.add_fail("Invoice Total Value", "Missing required columns")
-        return
+    run_checks(report, [InvoiceTotalValueCheck()], dfs)
 
-    tax_sum = df["cgst_amount"] + df["sgst_amount"] + df["igst_amount"]
-    invalid = (df["invoice_value"] < tax_sum).sum()
-    if invalid == 0:
-        report.add_pass("Invoice Total Value", "All invoice_values >= tax component sums")
-    else:
-        report.add_fail("Invoice Total Value", f"{invalid} invoices have total < tax sum")
+
+@register_check
+class FinancialYearCheck(Check):
+    """Validate invoice dates can derive a valid financial year."""
+
+    requires = {"gstr1": [("dates", "invoice_date")]}
+
+    def __init__(self):
+        self.invalid_count = 0
+        self.years = set()
+        self.error = None
+
+    def consume(self, dataset, chunk, derived):
+        if ("dates", "invoice_date") not in derived or self.error:
+            return
+        dates = derived[("dates", "invoice_date")]
+        if isinstance(dates, Exception):
+            self.error = str(dates)
+            return
+        self.invalid_count += dates.isna().sum()
+        self.years.update(dates.dt.year.dropna().unique())
+
+    def finalize(self, report, plan):
+        if "gstr1" not in plan.columns:
+            report.add_warning("Financial Year Derivation", "gstr1.csv not loaded")
+            return
+        if "invoice_date" not in plan.columns["gstr1"]:
+            report.add_fail("Financial Year Derivation", "Missing invoice_date column")
+            return
+
+        if self.error:
+            report.add_fail("Financial Year Derivation", self.error)
+        elif self.invalid_count > 0:
+            report.add_fail("Financial Year Derivation", f"{self.invalid_count} dates cannot be parsed")
+        else:
+            report.add_pass("Financial Year Derivation", f"Dates span year(s): {sorted(self.years)}")
 
 
 def check_financial_year_derivation(report, dfs):
     """Validate invoice dates can derive a valid financial year."""
-    if "gstr1" not in dfs:
-        report.add_warning("Financial Year Derivation", "gstr1.csv not loaded")
-        return
-    df = dfs["gstr1"]
-    if "invoice_date" not in df.columns:
-        report.add_fail("Financial Year Derivation", "Missing invoice_date column")
-        return
+    run_checks(report, [FinancialYearCheck()], dfs)
 
-    try:
-        dates = pd.to_datetime(df["invoice_date"], format="%Y-%m-%d", errors="coerce")
-        invalid_count = dates.isna().sum()
-        if invalid_count > 0:
-            report.add_fail("Financial Year Derivation", f"{invalid_count} dates cannot be parsed")
-        else:
-            years = dates.dt.year.unique()
-            report.add_pass("Financial Year Derivation", f"Dates span year(s): {sorted(years)}")
-    except Exception as e:
-        report.add_fail("Financial Year Derivation", str(e))
+
+@register_check
+class ForeignKeyCheck(Check):
+    """Cross-dataset FK checks: invoices reference existing taxpayers, etc."""
+
+    keys = {
+        "taxpayers": ["gstin"],
+        "gstr1": ["supplier_gstin", "recipient_gstin", "invoice_number"],
+        "gstr2b": ["recipient_gstin", "invoice_number"],
+        "payments": ["supplier_gstin"],
+    }
+
+    def finalize(self, report, plan):
+        columns, keys = plan.columns, plan.key_sets
+        details_pass = []
+        details_fail = []
+
+        # 1. gstr1.supplier_gstin -> taxpayers.gstin
+        if "gstr1" in columns and "taxpayers" in columns:
+            tp_set = keys[("taxpayers", "gstin")]
+            supplier_set = keys[("gstr1", "supplier_gstin")]
+            orphan_suppliers = supplier_set - tp_set
+            if not orphan_suppliers:
+                details_pass.append(f"gstr1.supplier_gstin -> taxpayers.gstin ({len(supplier_set)} resolved)")
+            else:
+                details_fail.append(f"gstr1.supplier_gstin: {len(orphan_suppliers)} orphaned GSTINs not in taxpayers")
+
+        # 2. gstr1.recipient_gstin -> taxpayers.gstin
+        if "gstr1" in columns and "taxpayers" in columns:
+            recipient_set = keys[("gstr1", "recipient_gstin")]
+            orphan_recipients = recipient_set - tp_set
+            if not orphan_recipients:
+                details_pass.append(f"gstr1.recipient_gstin -> taxpayers.gstin ({len(recipient_set)} resolved)")
+            else:
+                details_fail.append(f"gstr1.recipient_gstin: {len(orphan_recipients)} orphaned GSTINs not in taxpayers")
+
+        # 3. gstr2b.recipient_gstin -> taxpayers.gstin
+        if "gstr2b" in columns and "taxpayers" in columns:
+            r2b_recipients = keys[("gstr2b", "recipient_gstin")]
+            orphan_r2b = r2b_recipients - tp_set
+            if not orphan_r2b:
+                details_pass.append(f"gstr2b.recipient_gstin -> taxpayers.gstin ({len(r2b_recipients)} resolved)")
+            else:
+                details_fail.append(f"gstr2b.recipient_gstin: {len(orphan_r2b)} orphaned GSTINs not in taxpayers")
+
+        # 4. payments.supplier_gstin -> taxpayers.gstin
+        if "payments" in columns and "taxpayers" in columns:
+            pay_suppliers = keys[("payments", "supplier_gstin")]
+            orphan_pay = pay_suppliers - tp_set
+            if not orphan_pay:
+                details_pass.append(f"payments.supplier_gstin -> taxpayers.gstin ({len(pay_suppliers)} resolved)")
+            else:
+                details_fail.append(f"payments.supplier_gstin: {len(orphan_pay)} orphaned GSTINs not in taxpayers")
+
+        # 5. gstr2b.invoice_number -> gstr1.invoice_number (subset expected due to mismatch injection)
+        if "gstr2b" in columns and "gstr1" in columns:
+            gstr1_invs = keys[("gstr1", "invoice_number")]
+            gstr2b_invs = keys[("gstr2b", "invoice_number")]
+            orphan_invs = gstr2b_invs - gstr1_invs
+            if not orphan_invs:
+                details_pass.append(f"gstr2b.invoice_number -> gstr1.invoice_number ({len(gstr2b_invs)} resolved)")
+            else:
+                details_fail.append(f"gstr2b.invoice_number: {len(orphan_invs)} invoices not found in gstr1")
+
+        if details_fail:
+            report.add_fail("Cross-Dataset FK Resolution", "; ".join(details_fail))
+        if details_pass:
+            report.add_pass("Cross-Dataset FK Resolution", "; ".join(details_pass))
 
 
 def check_foreign_key_resolution(report, dfs):
     """Cross-dataset FK checks: invoices reference existing taxpayers, etc."""
-    details_pass = []
-    details_fail = []
-
-    # 1. gstr1.supplier_gstin -> taxpayers.gstin
-    if "gstr1" in dfs and "taxpayers" in dfs:
-        tp_set = set(dfs["taxpayers"]["gstin"].dropna().astype(str))
-        supplier_set = set(dfs["gstr1"]["supplier_gstin"].dropna().astype(str))
-        orphan_suppliers = supplier_set - tp_set
-        if not orphan_suppliers:
-            details_pass.append(f"gstr1.supplier_gstin -> taxpayers.gstin ({len(supplier_set)} resolved)")
-        else:
-            details_fail.append(f"gstr1.supplier_gstin: {len(orphan_suppliers)} orphaned GSTINs not in taxpayers")
-
-    # 2. gstr1.recipient_gstin -> taxpayers.gstin
-    if "gstr1" in dfs and "taxpayers" in dfs:
-        recipient_set = set(dfs["gstr1"]["recipient_gstin"].dropna().astype(str))
-        orphan_recipients = recipient_set - tp_set
-        if not orphan_recipients:
-            details_pass.append(f"gstr1.recipient_gstin -> taxpayers.gstin ({len(recipient_set)} resolved)")
-        else:
-            details_fail.append(f"gstr1.recipient_gstin: {len(orphan_recipients)} orphaned GSTINs not in taxpayers")
-
-    # 3. gstr2b.recipient_gstin -> taxpayers.gstin
-    if "gstr2b" in dfs and "taxpayers" in dfs:
-        r2b_recipients = set(dfs["gstr2b"]["recipient_gstin"].dropna().astype(str))
-        orphan_r2b = r2b_recipients - tp_set
-        if not orphan_r2b:
-            details_pass.append(f"gstr2b.recipient_gstin -> taxpayers.gstin ({len(r2b_recipients)} resolved)")
-        else:
-            details_fail.append(f"gstr2b.recipient_gstin: {len(orphan_r2b)} orphaned GSTINs not in taxpayers")
-
-    # 4. payments.supplier_gstin -> taxpayers.gstin
-    if "payments" in dfs and "taxpayers" in dfs:
-        pay_suppliers = set(dfs["payments"]["supplier_gstin"].dropna().astype(str))
-        orphan_pay = pay_suppliers - tp_set
-        if not orphan_pay:
-            details_pass.append(f"payments.supplier_gstin -> taxpayers.gstin ({len(pay_suppliers)} resolved)")
-        else:
-            details_fail.append(f"payments.supplier_gstin: {len(orphan_pay)} orphaned GSTINs not in taxpayers")
-
-    # 5. gstr2b.invoice_number -> gstr1.invoice_number (subset expected due to mismatch injection)
-    if "gstr2b" in dfs and "gstr1" in dfs:
-        gstr1_invs = set(dfs["gstr1"]["invoice_number"].dropna().astype(str))
-        gstr2b_invs = set(dfs["gstr2b"]["invoice_number"].dropna().astype(str))
-        orphan_invs = gstr2b_invs - gstr1_invs
-        if not orphan_invs:
-            details_pass.append(f"gstr2b.invoice_number -> gstr1.invoice_number ({len(gstr2b_invs)} resolved)")
-        else:
-            details_fail.append(f"gstr2b.invoice_number: {len(orphan_invs)} invoices not found in gstr1")
+    run_checks(report, [ForeignKeyCheck()], dfs)
+
 
-    if details_fail:
-        report.add_fail("Cross-Dataset FK Resolution", "; ".join(details_fail))
-    if details_pass:
-        report.add_pass("Cross-Dataset FK Resolution", "; ".join(details_pass))
+@register_check
+class DuplicateInvoiceCheck(Check):
+    """Check for duplicate invoice numbers within gstr1 (expected unique)."""
+
+    requires = {"gstr1": [("values", "invoice_number")]}
+    keys = {"gstr1": ["invoice_number"]}
+
+    def __init__(self):
+        self.present = 0
+
+    def consume(self, dataset, chunk, derived):
+        if dataset == "gstr1" and ("values", "invoice_number") in derived:
+            self.present += len(derived[("values", "invoice_number")])
+
+    def finalize(self, report, plan):
+        if "gstr1" not in plan.columns:
+            report.add_warning("Duplicate Invoice Check", "gstr1.csv not loaded")
+            return
+        if "invoice_number" not in plan.columns["gstr1"]:
+            report.add_fail("Duplicate Invoice Check", "Missing invoice_number column")
+            return
+
+        rows = plan.row_counts["gstr1"]
+        distinct = len(plan.key_sets[("gstr1", "invoice_number")])
+        # Every null after the first counts as a duplicate, as in Series.duplicated()
+        dupes = (self.present - distinct) + max(rows - self.present - 1, 0)
+        if dupes == 0:
+            report.add_pass("Duplicate Invoice Check", f"All {rows} invoice numbers are unique in gstr1")
+        else:
+            report.add_warning("Duplicate Invoice Check", f"{dupes} duplicate invoice numbers found in gstr1")
 
 
 def check_duplicate_invoices(report, dfs):
     """Check for duplicate invoice numbers within gstr1 (expected unique)."""
-    if "gstr1" not in dfs:
-        report.add_warning("Duplicate Invoice Check", "gstr1.csv not loaded")
-        return
-    df = dfs["gstr1"]
-    if "invoice_number" not in df.columns:
-        report.add_fail("Duplicate Invoice Check", "Missing invoice_number column")
-        return
+    run_checks(report, [DuplicateInvoiceCheck()], dfs)
 
-    dupes = df["invoice_number"].duplicated().sum()
-    if dupes == 0:
-        report.add_pass("Duplicate Invoice Check", f"All {len(df)} invoice numbers are unique in gstr1")
-    else:
-        report.add_warning("Duplicate Invoice Check", f"{dupes} duplicate invoice numbers found in gstr1")
+
+@register_check
+class IRNLinkageCheck(Check):
+    """Validate IRN records link back to existing invoices in gstr1."""
+
+    keys = {
+        "gstr1": ["invoice_number", "irn"],
+        "einvoice": ["invoice_number", "irn", "status"],
+    }
+
+    def finalize(self, report, plan):
+        columns, keys = plan.columns, plan.key_sets
+        if "einvoice" not in columns or "gstr1" not in columns:
+            report.add_warning("IRN Linkage Feasibility", "einvoice.csv or gstr1.csv not loaded")
+            return
+
+        einv_inv_nums = keys[("einvoice", "invoice_number")]
+        gstr1_inv_nums = keys[("gstr1", "invoice_number")]
+
+        orphan_irns = einv_inv_nums - gstr1_inv_nums
+        if not orphan_irns:
+            report.add_pass("IRN Linkage Feasibility", f"All {len(einv_inv_nums)} IRNs link to valid gstr1 invoices")
+        else:
+            report.add_fail("IRN Linkage Feasibility", f"{len(orphan_irns)} IRNs reference non-existent invoices")
+
+        # Also check: IRN hash from gstr1.irn column matches einvoice.irn
+        if "irn" in columns["gstr1"] and "irn" in columns["einvoice"]:
+            gstr1_irns = keys[("gstr1", "irn")] - {""}
+            einv_irns = keys[("einvoice", "irn")]
+            missing_from_einv = gstr1_irns - einv_irns
+            if not missing_from_einv:
+                report.add_pass("IRN Hash Cross-Reference", f"All {len(gstr1_irns)} gstr1 IRN hashes exist in einvoice")
+            else:
+                report.add_fail("IRN Hash Cross-Reference", f"{len(missing_from_einv)} gstr1 IRN hashes missing from einvoice")
+
+        # Check IRN status values
+        if "status" in columns["einvoice"]:
+            statuses = keys[("einvoice", "status")]
+            invalid_statuses = statuses - VALID_IRN_STATUSES
+            if not invalid_statuses:
+                report.add_pass("IRN Status Values", f"All statuses valid: {statuses}")
+            else:
+                report.add_fail("IRN Status Values", f"Invalid statuses found: {invalid_statuses}")
 
 
 def check_irn_linkage(report, dfs):
     """Validate IRN records link back to existing invoices in gstr1."""
-    if "einvoice" not in dfs or "gstr1" not in dfs:
-        report.add_warning("IRN Linkage Feasibility", "einvoice.csv or gstr1.csv not loaded")
-        return
+    run_checks(report, [IRNLinkageCheck()], dfs)
 
-    einv_inv_nums = set(dfs["einvoice"]["invoice_number"].dropna().astype(str))
-    gstr1_inv_nums = set(dfs["gstr1"]["invoice_number"].dropna().astype(str))
 
-    orphan_irns = einv_inv_nums - gstr1_inv_nums
-    if not orphan_irns:
-        report.add_pass("IRN Linkage Feasibility", f"All {len(einv_inv_nums)} IRNs link to valid gstr1 invoices")
-    else:
-        report.add_fail("IRN Linkage Feasibility", f"{len(orphan_irns)} IRNs reference non-existent invoices")
-
-    # Also check: IRN hash from gstr1.irn column matches einvoice.irn
-    if "irn" in dfs["gstr1"].columns and "irn" in dfs["einvoice"].columns:
-        gstr1_irns = set(dfs["gstr1"]["irn"].dropna().astype(str)) - {""}
-        einv_irns = set(dfs["einvoice"]["irn"].dropna().astype(str))
-        missing_from_einv = gstr1_irns - einv_irns
-        if not missing_from_einv:
-            report.add_pass("IRN Hash Cross-Reference", f"All {len(gstr1_irns)} gstr1 IRN hashes exist in einvoice")
-        else:
-            report.add_fail("IRN Hash Cross-Reference", f"{len(missing_from_einv)} gstr1 IRN hashes missing from einvoice")
-
-    # Check IRN status values
-    if "status" in dfs["einvoice"].columns:
-        statuses = set(dfs["einvoice"]["status"].dropna().astype(str))
-        invalid_statuses = statuses - VALID_IRN_STATUSES
-        if not invalid_statuses:
-            report.add_pass("IRN Status Values", f"All statuses valid: {statuses}")
+@register_check
+class ReturnPaymentCompletenessCheck(Check):
+    """Validate that payment records cover the supplier GSTINs from gstr1."""
+
+    period_columns = {
+        "gstr2b": "claim_period",
+        "payments": "return_period",
+    }
+    requires = {
+        dataset: [("distinct", col)] for dataset, col in period_columns.items()
+    }
+    keys = {
+        "gstr1": ["supplier_gstin"],
+        "payments": ["supplier_gstin"],
+    }
+
+    def __init__(self):
+        self.invalid_periods = {}
+
+    def consume(self, dataset, chunk, derived):
+        col = self.period_columns.get(dataset)
+        if col and ("distinct", col) in derived:
+            invalid = count_mismatches(derived[("distinct", col)], MMYYYY_PATTERN)
+            self.invalid_periods[dataset] = self.invalid_periods.get(dataset, 0) + invalid
+
+    def finalize(self, report, plan):
+        columns, keys = plan.columns, plan.key_sets
+        if "payments" not in columns or "gstr1" not in columns:
+            report.add_warning("Return/Payment Completeness", "payments.csv or gstr1.csv not loaded")
+            return
+
+        gstr1_suppliers = keys[("gstr1", "supplier_gstin")]
+        payment_suppliers = keys[("payments", "supplier_gstin")]
+
+        missing_payments = gstr1_suppliers - payment_suppliers
+        if not missing_payments:
+            report.add_pass("Return/Payment Completeness", f"All {len(gstr1_suppliers)} suppliers have payment records")
         else:
-            report.add_fail("IRN Status Values", f"Invalid statuses found: {invalid_statuses}")
+            report.add_warning("Return/Payment Completeness", f"{len(missing_payments)} suppliers in gstr1 have no payment record")
+
+        # Check claim period format in gstr2b
+        if "gstr2b" in columns and "claim_period" in columns["gstr2b"]:
+            if self.invalid_periods["gstr2b"] == 0:
+                report.add_pass("Claim Period Format", "All gstr2b claim_period values match MMYYYY")
+            else:
+                report.add_fail("Claim Period Format", f"{self.invalid_periods['gstr2b']} invalid claim_period values")
+
+        # Check return_period in payments
+        if "return_period" in columns["payments"]:
+            if self.invalid_periods["payments"] == 0:
+                report.add_pass("Payment Period Format", "All payment return_period values match MMYYYY")
+            else:
+                report.add_fail("Payment Period Format", f"{self.invalid_periods['payments']} invalid return_period values")
 
 
 def check_return_payment_completeness(report, dfs):
     """Validate that payment records cover the supplier GSTINs from gstr1."""
-    if "payments" not in dfs or "gstr1" not in dfs:
-        report.add_warning("Return/Payment Completeness", "payments.csv or gstr1.csv not loaded")
-        return
+    run_checks(report, [ReturnPaymentCompletenessCheck()], dfs)
 
-    gstr1_suppliers = set(dfs["gstr1"]["supplier_gstin"].dropna().astype(str))
-    payment_suppliers = set(dfs["payments"]["supplier_gstin"].dropna().astype(str))
 
-    missing_payments = gstr1_suppliers - payment_suppliers
-    if not missing_payments:
-        report.add_pass("Return/Payment Completeness", f"All {len(gstr1_suppliers)} suppliers have payment records")
-    else:
-        report.add_warning("Return/Payment Completeness", f"{len(missing_payments)} suppliers in gstr1 have no payment record")
-
-    # Check claim period format in gstr2b
-    if "gstr2b" in dfs and "claim_period" in dfs["gstr2b"].columns:
-        periods = dfs["gstr2b"]["claim_period"].dropna().astype(str)
-        invalid_periods = periods[~periods.str.match(MMYYYY_PATTERN)]
-        if len(invalid_periods) == 0:
-            report.add_pass("Claim Period Format", "All gstr2b claim_period values match MMYYYY")
-        else:
-            report.add_fail("Claim Period Format", f"{len(invalid_periods)} invalid claim_period values")
-
-    # Check return_period in payments
-    if "return_period" in dfs["payments"].columns:
-        periods = dfs["payments"]["return_period"].dropna().astype(str)
-        invalid_periods = periods[~periods.str.match(MMYYYY_PATTERN)]
-        if len(invalid_periods) == 0:
-            report.add_pass("Payment Period Format", "All payment return_period values match MMYYYY")
-        else:
-            report.add_fail("Payment Period Format", f"{len(invalid_periods)} invalid return_period values")
+def build_checks():
+    """Fresh instances of every registered check, in report order."""
+    return [cls() for cls in CHECK_REGISTRY]
 
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Validate generated datasets against Contract 1.")
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Stream each CSV in chunks of this many rows instead of loading it whole",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parse and check datasets in this many processes (one dataset per task)",
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory holding the generated CSVs")
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Columnar snapshot cache for the parsed CSVs (default: <data-dir>/.cache)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Parse the CSVs without the snapshot cache")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
     report = ValidationReport()
+    cache = None
+    if not args.no_cache:
+        cache = CSVCache(args.cache_dir or os.path.join(args.data_dir, ".cache"))
 
-    print("Loading datasets...")
-    dfs, missing = load_datasets()
+    if args.chunksize or args.workers > 1:
+        missing = find_missing_files(args.data_dir)
+    else:
+        print("Loading datasets...")
+        dfs, missing = load_datasets(args.data_dir, cache)
 
-    check_file_presence(report, dfs, missing)
+    check_file_presence(report, None, missing)
 
     if missing:
         print(f"Cannot proceed: missing files {missing}")
         report.print_report()
         sys.exit(1)
 
-    print(f"Loaded: {', '.join(f'{k}({len(v)} rows)' for k, v in dfs.items())}")
-    print("Running validation checks...\n")
-
-    check_gstin_format(report, dfs)
-    check_iso_dates(report, dfs)
-    check_monetary_decimals(report, dfs)
-    check_invoice_tax_sum(report, dfs)
-    check_invoice_total_value(report, dfs)
-    check_financial_year_derivation(report, dfs)
-    check_foreign_key_resolution(report, dfs)
-    check_duplicate_invoices(report, dfs)
-    check_irn_linkage(report, dfs)
-    check_return_payment_completeness(report, dfs)
+    if args.workers > 1:
+        print(f"Loading and checking datasets in {args.workers} worker processes...")
+        print("Running validation checks...\n")
+        row_counts = run_checks_parallel(
+            report, build_checks(), args.workers, args.chunksize, args.data_dir, cache
+        )
+        print(f"Loaded: {', '.join(f'{k}({v} rows)' for k, v in row_counts.items())}")
+    elif args.chunksize:
+        print(f"Streaming datasets in chunks of {args.chunksize} rows...")
+        print("Running validation checks...\n")
+        row_counts = run_checks_streaming(
+            report, build_checks(), args.chunksize, args.data_dir, cache
+        )
+        print(f"Loaded: {', '.join(f'{k}({v} rows)' for k, v in row_counts.items())}")
+    else:
+        print(f"Loaded: {', '.join(f'{k}({len(v)} rows)' for k, v in dfs.items())}")
+        print("Running validation checks...\n")
+        run_checks(report, build_checks(), dfs)
 
     report.print_report()
 
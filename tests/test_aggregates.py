@@ -0,0 +1,129 @@
+"""
+Dashboard aggregates — rollups refreshed per reconciliation run and per manifest.
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.api.aggregates import MISMATCH_FIELDS, AggregateStore  # noqa: E402
+from backend.api.cache import manifest_tags  # noqa: E402
+from backend.api.graph import GraphPool  # noqa: E402
+from backend.api.main import create_app  # noqa: E402
+from backend.api.schemas import ItcAtRisk, MismatchCounts, TopRiskyVendors  # noqa: E402
+from backend.graph.csr import read_columns  # noqa: E402
+from backend.reconciliation.matching import dump_vectors, reconcile  # noqa: E402
+from backend.risk.feature_store import FeatureStore  # noqa: E402
+from test_api import FakeAsyncDriver, call, write_manifest  # noqa: E402
+from test_feature_store import payment, ret, taxed, write  # noqa: E402
+from test_graph_loader import RECIPIENT, SUPPLIER  # noqa: E402
+from test_reconciliation import side  # noqa: E402
+
+NOW = datetime(2026, 2, 1, 9, 30, tzinfo=timezone.utc)
+
+
+def run(tmp_path, name, gstr1, gstr2b):
+    """Contract 3 NDJSON of a reconciliation run, matched keys included."""
+    path = tmp_path / name
+    path.write_text(dump_vectors(reconcile(side(gstr1), side(gstr2b)), include_matched=True))
+    return read_columns([str(path)], list(MISMATCH_FIELDS)), str(path)
+
+
+def test_reconciliation_run_replaces_its_periods(tmp_path):
+    """Verify ITC at risk and status counts per run, a re-run replacing only its own period."""
+    store = AggregateStore(str(tmp_path / "aggregates.sqlite"), clock=lambda: NOW)
+    assert store.itc_at_risk()["freshness"] == {"updatedAt": None, "source": None}
+
+    january = run(
+        tmp_path,
+        "run_1.ndjson",
+        [("INV-1", "100.00", "18.00"), ("INV-2", "500.00", "90.00"), ("INV-3", "100.00", "18.00")],
+        [("INV-1", "100.00", "18.00"), ("INV-2", "500.00", "88.00"), ("INV-5", "10.00", "1.80")],
+    )
+    assert store.update_mismatches(*january) == ["012026"]
+    february = run(tmp_path, "run_2.ndjson", [("INV-9", "10.00", "1.80")], [("INV-8", "10.00", "1.80")])
+    february[0]["filingPeriod"] = "022026"
+    store.update_mismatches(*february)
+
+    view = store.itc_at_risk(state=SUPPLIER[:2])
+    ItcAtRisk.model_validate(view)
+    # 2.00 short in GSTR-2B and 18.00 missing from it; INV-5's negative difference is no ITC at risk
+    assert [(p["returnPeriod"], p["invoices"], p["itcAtRisk"]) for p in view["points"]] == [
+        ("012026", 3, 2_000),
+        ("022026", 2, 180),
+    ]
+    assert view["freshness"] == {"updatedAt": NOW.isoformat(), "source": "run_2.ndjson"}
+    counts = store.mismatch_counts(period="012026")
+    MismatchCounts.model_validate(counts)
+    assert {c["matchStatus"]: c["invoices"] for c in counts["counts"]} == {
+        "MATCHED": 1,
+        "AMOUNT_MISMATCH": 1,
+        "MISSING_IN_GSTR2B": 1,
+        "MISSING_IN_GSTR1": 1,
+    }
+
+    # January re-reconciled clean: its point stays, with nothing at risk
+    clean = [("INV-1", "100.00", "18.00")]
+    store.update_mismatches(*run(tmp_path, "run_3.ndjson", clean, clean))
+    assert [(p["invoices"], p["itcAtRisk"]) for p in store.itc_at_risk()["points"]] == [(0, 0), (2, 180)]
+    assert store.itc_at_risk(state="07")["points"] == []
+    print("  [OK] Reconciliation run replaces its periods")
+
+
+def test_vendors_rescored_per_manifest_and_served(tmp_path):
+    """Verify only the rows a manifest touches are rescored, and the widgets are served with freshness."""
+    features = FeatureStore(str(tmp_path / "features.sqlite"))
+    store = AggregateStore(str(tmp_path / "aggregates.sqlite"), clock=lambda: NOW)
+    invoices = write(tmp_path, "invoice_1.ndjson", "invoice", [taxed(0), taxed(1)])
+    returns = write(tmp_path, "return_1.ndjson", "return", [ret(RECIPIENT, "GSTR3B", "2026-03-30", itc="100.00")])
+    first = write_manifest(tmp_path, "manifest_1.json", [invoices, returns])
+    features.update([invoices, returns])
+    assert store.update_vendors(features, manifest_tags(first), first) == 2
+
+    top = store.top_vendors()
+    TopRiskyVendors.model_validate(top)
+    assert top["returnPeriod"] == "012026" and [v["gstin"] for v in top["vendors"]] == [RECIPIENT, SUPPLIER]
+    supplier_score = top["vendors"][1]["riskScore"]
+    assert top["vendors"][0]["itcMismatch"] == 10_000 - 2 * 1_800
+
+    # The supplier pays: only its row is rescored
+    paid = write(tmp_path, "payment_1.ndjson", "payment", [payment(0, total="36.00")])
+    second = write_manifest(tmp_path, "manifest_2.json", [paid])
+    features.update([paid])
+    assert store.update_vendors(features, manifest_tags(second), second) == 1
+    vendors = {v["gstin"]: v for v in store.top_vendors(period="012026")["vendors"]}
+    assert vendors[SUPPLIER]["riskScore"] < supplier_score
+    assert [v["gstin"] for v in store.top_vendors(state=SUPPLIER[:2])["vendors"]] == [SUPPLIER]
+    assert store.top_vendors(period="022026") == {
+        "contractVersion": top["contractVersion"],
+        "freshness": {"updatedAt": NOW.isoformat(), "source": "manifest_2.json"},
+        "returnPeriod": "022026",
+        "vendors": [],
+    }
+
+    # An invoice tombstone names no recipient: every row of its period is rescored
+    key = {"supplierGstin": SUPPLIER, "invoiceNumber": "INV-009", "filingPeriod": "012026"}
+    deleted = write(tmp_path, "invoice_tombstone_1.ndjson", "invoice", [key])
+    third = write_manifest(tmp_path, "manifest_3.json", tombstones=[deleted])
+    assert store.update_vendors(features, manifest_tags(third), third) == 2
+    features.close()
+
+    app = create_app(graph=GraphPool(FakeAsyncDriver()), features=None, aggregate_store=store)
+    bare = create_app(graph=GraphPool(FakeAsyncDriver()), features=None)
+
+    async def scenario():
+        return (
+            await call(app, "/dashboard/risky-vendors", "limit=1"),
+            await call(app, "/dashboard/mismatch-counts", "state=27"),
+            await call(bare, "/dashboard/itc-at-risk"),
+        )
+
+    vendors, counts, unavailable = asyncio.run(scenario())
+    assert vendors[0] == 200 and len(TopRiskyVendors.model_validate_json(vendors[2]).vendors) == 1
+    assert counts[0] == 200 and MismatchCounts.model_validate_json(counts[2]).freshness.updated_at is None
+    assert unavailable[0] == 503
+    print("  [OK] Vendors rescored per manifest and served")
@@ -0,0 +1,352 @@
+"""
+API — shared async graph pool, 429 backpressure, risk endpoint, response cache,
+streamed exports.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.api.cache import LoadJournal, ResponseCache, manifest_tags  # noqa: E402
+from backend.api.exports import ExportStore, decode_cursor  # noqa: E402
+from backend.api.graph import GraphPool  # noqa: E402
+from backend.api.main import apply_loads, create_app, reload_features  # noqa: E402
+from backend.graph.loader import record_load  # noqa: E402
+from backend.reconciliation.matching import dump_vectors, reconcile  # noqa: E402
+from backend.risk.feature_store import FeatureStore  # noqa: E402
+from test_feature_store import payment, ret, taxed, write  # noqa: E402
+from test_graph_loader import RECIPIENT, SUPPLIER  # noqa: E402
+from test_reconciliation import side  # noqa: E402
+
+
+class FakeResult:
+    def __init__(self, records):
+        self.records = records
+
+    async def data(self):
+        return self.records
+
+
+class FakeAsyncDriver:
+    """Records read queries; `gate`, when set, holds every query until it opens."""
+
+    def __init__(self, records=(), gate=None):
+        self.records = list(records)
+        self.gate = gate
+        self.queries = []
+        self.sessions = []
+        self.closed = False
+
+    def session(self, **config):
+        self.sessions.append(config)
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute_read(self, fn, *args):
+        return await fn(self, *args)
+
+    async def run(self, query, params):
+        self.queries.append((query, params))
+        if self.gate is not None:
+            await self.gate.wait()
+        return FakeResult(self.records)
+
+    async def close(self):
+        self.closed = True
+
+
+async def call(app, path, query=""):
+    """`(status, headers, body)` of one GET through the ASGI interface."""
+    scope = {
+        "type": "http",
+        # 2.4: a streamed response does not also listen for a disconnect
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = messages[0]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], dict((k.decode(), v.decode()) for k, v in start["headers"]), body
+
+
+def test_broken_paths_read_through_the_shared_pool():
+    """Verify both queries run as routed reads on the one driver, which closes at shutdown."""
+    driver = FakeAsyncDriver([{"invoiceNumber": "INV-001", "filingPeriod": "012026", "reported": False}])
+    app = create_app(graph=GraphPool(driver, database="gst"), features=None)
+
+    async def scenario():
+        async with app.router.lifespan_context(app):
+            ok = await call(app, f"/reconciliation/{SUPPLIER}/broken-paths", "period=012026&limit=5")
+            bad = await call(app, "/reconciliation/not-a-gstin/broken-paths")
+        return ok, bad
+
+    (status, _, body), (bad_status, _, _) = asyncio.run(scenario())
+    assert status == 200 and bad_status == 422
+    payload = json.loads(body)
+    assert payload["missingPayment"][0]["invoiceNumber"] == "INV-001"
+    assert len(payload["ghostInvoices"]) == 1
+    assert [params for _, params in driver.queries] == [{"gstin": SUPPLIER, "period": "012026", "limit": 5}] * 2
+    assert driver.sessions == [{"database": "gst", "default_access_mode": "READ"}] * 2
+    assert driver.closed
+    print("  [OK] Broken paths read through the shared pool")
+
+
+def test_saturated_pool_answers_429():
+    """Verify a request finding every slot busy is turned away, not queued."""
+
+    async def scenario():
+        gate = asyncio.Event()
+        graph = GraphPool(FakeAsyncDriver(gate=gate), pool_size=1, acquire_timeout=0.01)
+        app = create_app(graph=graph, features=None)
+        path = f"/reconciliation/{SUPPLIER}/broken-paths"
+        first = asyncio.ensure_future(call(app, path))
+        await asyncio.sleep(0.01)
+        second = await call(app, path)
+        gate.set()
+        return await first, second, graph.rejected
+
+    first, second, rejected = asyncio.run(scenario())
+    assert first[0] == 200
+    assert second[0] == 429 and second[1]["retry-after"] == "1"
+    assert rejected == 1
+    print("  [OK] Saturated pool answers 429")
+
+
+def test_risk_scores_from_feature_store(tmp_path):
+    """Verify /risk serves Contract 4 entities per period, 404 and 503 otherwise."""
+    path = str(tmp_path / "features.sqlite")
+    store = FeatureStore(path)
+    store.update([write(tmp_path, "invoice_1.ndjson", "invoice", [taxed(0), taxed(1)])])
+    store.commit()
+    app = create_app(graph=GraphPool(FakeAsyncDriver()), features=store)
+
+    async def scenario():
+        return (
+            await call(app, f"/risk/{SUPPLIER}"),
+            await call(app, f"/risk/{RECIPIENT}", "period=022026"),
+            await call(create_app(graph=GraphPool(FakeAsyncDriver()), features=None), f"/risk/{SUPPLIER}"),
+        )
+
+    (status, _, body), missing, unavailable = asyncio.run(scenario())
+    assert status == 200
+    [entity] = json.loads(body)
+    assert entity["gstin"] == SUPPLIER and entity["returnPeriod"] == "012026"
+    assert entity["reasons"] == ["MISSING_PAYMENT"] and entity["riskScore"] == 20
+    assert missing[0] == 404 and unavailable[0] == 503
+
+    # The batch jobs commit a new generation; the API picks it up
+    writer = FeatureStore(path)
+    writer.update([write(tmp_path, "invoice_2.ndjson", "invoice", [taxed(2)])])
+    writer.commit()
+    writer.close()
+    assert asyncio.run(reload_features(app.state)) and not asyncio.run(reload_features(app.state))
+    assert app.state.features.vector(SUPPLIER, "012026")["invoices_issued"] == 3
+    app.state.features.close()
+    print("  [OK] Risk scored from the feature store")
+
+
+def write_manifest(tmp_path, name, batches=(), tombstones=()):
+    manifest = {
+        section: [{"entity": entity, "file": Path(path).name} for entity, path in files]
+        for section, files in (("batches", batches), ("tombstones", tombstones))
+    }
+    path = tmp_path / name
+    path.write_text(json.dumps(manifest))
+    return str(path)
+
+
+def test_response_cache_lru_ttl_and_byte_cap():
+    """Verify LRU eviction under the byte cap, TTL expiry, tag invalidation and stale puts."""
+    now = [0.0]
+    cache = ResponseCache(max_bytes=10, ttl=60, clock=lambda: now[0])
+    cache.put("a", b"aaaa", {("A", "012026")}, cache.generation)
+    cache.put("b", b"bbbb", {("B", "012026"), ("A", "022026")}, cache.generation)
+    assert cache.get("a") == b"aaaa"  # "b" is now least recently used
+    cache.put("c", b"cccc", {("C", "012026")}, cache.generation)
+    assert cache.get("b") is None and len(cache) == 2 and cache.size == 8
+
+    generation = cache.generation
+    assert cache.invalidate({("A", None)}) == 1  # every period of A
+    cache.put("a", b"aaaa", {("A", "012026")}, generation)  # read before the invalidation
+    assert cache.get("a") is None
+
+    now[0] = 61
+    assert cache.get("c") is None
+    assert cache.stats() == {
+        "entries": 0,
+        "bytes": 0,
+        "maxBytes": 10,
+        "hits": 1,
+        "misses": 3,
+        "hitRatio": 0.25,
+        "evictions": 1,
+        "expirations": 1,
+        "invalidations": 1,
+    }
+    print("  [OK] Response cache LRU, TTL and byte cap")
+
+
+def test_manifest_tags(tmp_path):
+    """Verify a manifest's batches tag the GSTIN/periods they touch; keyless tombstones tag everything."""
+    invoices = write(tmp_path, "invoice_1.ndjson", "invoice", [taxed(0), taxed(1, recipientGstin=None)])
+    returns = write(tmp_path, "return_1.ndjson", "return", [ret(SUPPLIER, "GSTR1", "2026-02-11")])
+    payments = write(tmp_path, "payment_1.ndjson", "payment", [payment(0)])
+    manifest = write_manifest(tmp_path, "manifest_1.json", [invoices, returns, payments])
+    assert manifest_tags(manifest) == {(SUPPLIER, "012026"), (RECIPIENT, "012026")}
+
+    deleted = write(tmp_path, "return_tombstone_1.ndjson", "return", [{"returnId": "RET-1"}])
+    assert manifest_tags(write_manifest(tmp_path, "manifest_2.json", tombstones=[deleted])) == {(None, None)}
+    print("  [OK] Manifest tags")
+
+
+def test_invoice_view_cached_until_a_load_touches_it(tmp_path):
+    """Verify a warm hit skips the graph, and a load touching a counterparty's period invalidates it."""
+    supplied = {
+        "direction": "INWARD",
+        "supplierGstin": SUPPLIER,
+        "recipientGstin": RECIPIENT,
+        "invoiceNumber": "INV-000",
+        "totalValue": "118.00",
+        "inGstr1": True,
+        "inGstr2b": True,
+        "paid": False,
+        "matchStatus": "MISSING_PAYMENT",
+    }
+    driver = FakeAsyncDriver([supplied])
+    journal_path = str(tmp_path / "loads.ndjson")
+    journal = LoadJournal(journal_path)
+    app = create_app(graph=GraphPool(driver), features=None, journal=journal)
+    path = f"/reconciliation/{RECIPIENT}/invoices"
+
+    async def scenario():
+        first = await call(app, path, "period=012026")
+        second = await call(app, path, "period=012026")
+        # A load touching another period keeps the entry
+        other = write(tmp_path, "payment_1.ndjson", "payment", [dict(payment(0), returnPeriod="022026")])
+        record_load(write_manifest(tmp_path, "manifest_1.json", [other]), journal_path)
+        kept = await apply_loads(app.state.cache, journal)
+        # The supplier's payment for the period changes the recipient's view
+        paid = write(tmp_path, "payment_2.ndjson", "payment", [payment(1)])
+        record_load(write_manifest(tmp_path, "manifest_2.json", [paid]), journal_path)
+        dropped = await apply_loads(app.state.cache, journal)
+        third = await call(app, path, "period=012026")
+        return first, second, kept, dropped, third
+
+    first, second, kept, dropped, third = asyncio.run(scenario())
+    assert [first[1]["x-cache"], second[1]["x-cache"], third[1]["x-cache"]] == ["MISS", "HIT", "MISS"]
+    assert first[2] == second[2]
+    view = json.loads(second[2])
+    assert view["contractVersion"] == "1.0.0" and view["invoices"] == [supplied]
+    assert (kept, dropped) == (0, 1)
+    assert len(driver.queries) == 2
+    assert driver.queries[0][1] == {"gstin": RECIPIENT, "period": "012026"}
+    print("  [OK] Invoice view cached until a load touches it")
+
+
+def test_invoice_tombstone_evicts_the_recipient_view(tmp_path):
+    """Verify a deleted invoice drops its recipient's cached view, though the tombstone names only the supplier."""
+    journal_path = str(tmp_path / "loads.ndjson")
+    journal = LoadJournal(journal_path)
+    app = create_app(graph=GraphPool(FakeAsyncDriver()), features=None, journal=journal)
+    path = f"/reconciliation/{RECIPIENT}/invoices"
+
+    def tombstone(name, period):
+        key = {"supplierGstin": SUPPLIER, "invoiceNumber": "INV-000", "filingPeriod": period}
+        deleted = write(tmp_path, f"invoice_tombstone_{name}.ndjson", "invoice", [key])
+        record_load(write_manifest(tmp_path, f"manifest_{name}.json", tombstones=[deleted]), journal_path)
+
+    async def scenario():
+        await call(app, path, "period=012026")
+        tombstone("1", "022026")
+        kept = await apply_loads(app.state.cache, journal)
+        tombstone("2", "012026")
+        dropped = await apply_loads(app.state.cache, journal)
+        return kept, dropped, await call(app, path, "period=012026")
+
+    kept, dropped, after = asyncio.run(scenario())
+    assert (kept, dropped) == (0, 1) and after[1]["x-cache"] == "MISS"
+    print("  [OK] Invoice tombstone evicts the recipient view")
+
+
+def test_exports_stream_keyset_pages(tmp_path):
+    """Verify following X-Next-Cursor pages through the whole export in key order, filters applied."""
+    gstr1 = side([(f"INV-{i}", "100.00", "18.00") for i in range(7)] + [("INV-9", "100.00", "18.00")])
+    gstr2b = side([("INV-9", "100.00", "18.00"), ("INV-8", "100.00", "18.00")])
+    vectors = tmp_path / "mismatch_vectors.ndjson"
+    vectors.write_text(dump_vectors(reconcile(gstr1, gstr2b), include_matched=True))
+    store = ExportStore(str(tmp_path / "exports.sqlite"))
+    assert store.replace("mismatches", [str(vectors)], group_size=4) == 9
+    app = create_app(graph=GraphPool(FakeAsyncDriver()), features=None, export_store=store)
+
+    async def scenario():
+        pages, cursor = [], ""
+        while True:
+            status, headers, body = await call(app, "/exports/mismatches", f"state=27&limit=4&cursor={cursor}")
+            assert status == 200 and headers["content-type"] == "application/x-ndjson"
+            pages.append([json.loads(line) for line in body.decode().splitlines()])
+            cursor = headers.get("x-next-cursor")
+            if cursor is None:
+                return pages
+            assert decode_cursor(cursor, 3)[1] == pages[-1][-1]["invoiceNumber"]
+
+    async def filtered():
+        return (
+            await call(app, "/exports/mismatches", "status=MISSING_IN_GSTR1"),
+            await call(app, "/exports/mismatches", "state=29"),
+            await call(app, "/exports/mismatches", "cursor=not-a-cursor"),
+            await call(create_app(graph=GraphPool(FakeAsyncDriver()), features=None), "/exports/scores"),
+        )
+
+    pages = asyncio.run(scenario())
+    assert [len(page) for page in pages] == [4, 4, 1]
+    numbers = [vector["invoiceNumber"] for page in pages for vector in page]
+    assert numbers == sorted(numbers) and len(set(numbers)) == 9
+    (_, _, missing), (_, _, other_state), (bad_status, _, _), (unavailable, _, _) = asyncio.run(filtered())
+    assert [json.loads(line)["invoiceNumber"] for line in missing.splitlines()] == ["INV-8"]
+    assert other_state == b"" and bad_status == 400 and unavailable == 503
+    print("  [OK] Exports stream keyset pages")
+
+
+def test_export_state_filter_covers_state_99(tmp_path):
+    """Verify the state range has a bound above the highest state code."""
+    gstr1 = side([("INV-1", "100.00", "18.00"), ("INV-2", "100.00", "18.00"), ("INV-3", "100.00", "18.00")])
+    gstr1.loc[1:, "supplier_gstin"] = "99" + SUPPLIER[2:]
+    vectors = tmp_path / "mismatch_vectors.ndjson"
+    vectors.write_text(dump_vectors(reconcile(gstr1, gstr1.iloc[:0])))
+    store = ExportStore(str(tmp_path / "exports.sqlite"))
+    store.replace("mismatches", [str(vectors)])
+
+    def numbers(state, after=None):
+        text = "".join(store.lines("mismatches", {"state": state}, after))
+        return [json.loads(line)["invoiceNumber"] for line in text.splitlines()]
+
+    assert numbers("99") == ["INV-2", "INV-3"] and numbers("27") == ["INV-1"]
+    last, more = store.page_end("mismatches", {"state": "99"}, limit=1)
+    assert more and numbers("99", last) == ["INV-3"]
+    print("  [OK] State 99 exported")
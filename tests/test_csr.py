@@ -0,0 +1,88 @@
+"""
+In-memory graph engine — CSR adjacency and vectorized broken-path patterns.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.graph.csr import Adjacency, CSRGraph, extract_columns, read_columns  # noqa: E402
+from test_graph_loader import SUPPLIER, invoice, write_batches  # noqa: E402
+
+GHOST = "27AAAAA0000A1Z5"
+
+
+def test_adjacency_dedupes_and_transposes():
+    """Verify edges are sorted per source, duplicates and dangling ends dropped."""
+    adjacency = Adjacency.from_pairs([2, 0, 2, 0, -1, 1], [1, 3, 0, 3, 2, -1], 3, 4)
+    assert adjacency.indptr.tolist() == [0, 1, 1, 3]
+    assert adjacency.indices.tolist() == [3, 0, 1]
+    assert adjacency.any().tolist() == [True, False, True]
+    assert adjacency.any(np.array([False, True, False, False])).tolist() == [False, False, True]
+    assert adjacency.reached(np.array([True, False, False])).tolist() == [False, False, False, True]
+
+    reverse = adjacency.transpose()
+    assert reverse.indptr.tolist() == [0, 1, 2, 2, 3]
+    assert reverse.indices.tolist() == [2, 2, 0]
+    print("  [OK] CSR adjacency dedupes and transposes")
+
+
+def test_columns_cut_from_canonical_lines(tmp_path):
+    """Verify columns cut from the raw bytes match a full decode, escapes included."""
+    rows = [
+        {"invoiceNumber": 'INV-"1"\\A', "supplierGstin": SUPPLIER, "irn": None},
+        {"invoiceNumber": "INV-₹2", "supplierGstin": SUPPLIER, "irn": "a" * 64},
+    ]
+    data = "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows).encode()
+    fields = ("invoiceNumber", "irn")
+    assert extract_columns(data, fields) == [[row[f] for row in rows] for f in fields]
+
+    # Other spellings, or a field absent from some lines, decode the rows
+    rows.append({"invoiceNumber": "INV-3", "supplierGstin": SUPPLIER})
+    path = tmp_path / "invoice_batch_1_p1.ndjson"
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    assert extract_columns(path.read_bytes(), fields) is None
+    frame = read_columns([str(path)], fields)
+    assert frame["invoiceNumber"].tolist() == [row["invoiceNumber"] for row in rows]
+    assert frame["irn"].tolist() == [None, "a" * 64, None]
+    print("  [OK] Columns cut from canonical lines")
+
+
+def test_reconcile_flags_broken_paths(tmp_path):
+    """Verify the Golden Path, missing payment and ghost invoice flags per invoice."""
+    ghost = dict(invoice(2), supplierGstin=GHOST)
+    unpaid = dict(invoice(3), filingPeriod="022026")
+    batches = write_batches(tmp_path, [invoice(0), invoice(1, recipient=None), ghost, unpaid, invoice(0)])
+    graph = CSRGraph.from_batches(batches)
+
+    assert len(graph.nodes["Invoice"]) == 4  # the repeated INV-000 is one node
+    assert len(graph.edges["SUPPLIED"]) == 3
+    assert len(graph.edges["RECEIVED"]) == 3
+    assert len(graph.edges["REPORTED_IN"]) == 4  # 012026 only: two GSTR1, two GSTR2B
+    assert len(graph.edges["PAID_VIA"]) == 1
+    assert len(graph.reverse("SUPPLIED")) == 3
+
+    report = graph.reconcile().set_index("invoiceNumber")
+    assert report["goldenPath"].to_dict() == {"INV-000": True, "INV-001": True, "INV-002": False, "INV-003": False}
+    assert not report["missingPayment"].any()
+    assert report["ghostInvoice"].to_dict() == {"INV-000": False, "INV-001": False, "INV-002": True, "INV-003": False}
+    assert report.loc["INV-003", "supplied"] and not report.loc["INV-003", "reportedInGstr1"]
+    print("  [OK] Broken paths flagged per invoice")
+
+
+def test_reconcile_flags_unpaid_returns(tmp_path):
+    """Verify an invoice reported in an unpaid GSTR1 is flagged as missing payment."""
+    batches = write_batches(tmp_path, [invoice(0)])
+    payment = next(path for entity, path in batches if entity == "payment")
+    pending = {"paymentId": "PMT-1", "gstin": SUPPLIER, "returnPeriod": "012026", "paymentStatus": "PENDING"}
+    Path(payment).write_text(json.dumps(pending) + "\n")
+    report = CSRGraph.from_batches(batches).reconcile()
+    assert report["missingPayment"].tolist() == [True]
+    assert report["goldenPath"].tolist() == [False]
+    assert report["supplierGstin"].tolist() == [SUPPLIER]
+    print("  [OK] Unpaid GSTR1 returns flag missing payment")
@@ -0,0 +1,74 @@
+"""
+Columnar CSV snapshot cache — round-trip and invalidation tests.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add scripts/ to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from csv_cache import CSVCache  # noqa: E402
+
+DTYPE = {"claim_period": str, "invoice_number": str}
+
+
+def write_csv(path: Path, periods=("012026", "022026")):
+    pd.DataFrame(
+        {
+            "invoice_number": ["INV-1", None, "00123", "ÄÖ-7"],
+            "claim_period": [periods[0], periods[1], None, periods[0]],
+            "itc_claimed": [18.0, None, 9.5, 0.0],
+            "line_count": [1, 2, 3, 4],
+            "mixed": ["x", "1", None, "y"],
+        }
+    ).to_csv(path, index=False)
+
+
+def test_cache_round_trip(tmp_path):
+    """Verify a cache hit returns exactly what read_csv does, leading zeros included."""
+    source = tmp_path / "gstr2b.csv"
+    write_csv(source)
+    cache = CSVCache(str(tmp_path / ".cache"))
+    expected = pd.read_csv(source, dtype=DTYPE)
+
+    miss = cache.read_csv(str(source), dtype=DTYPE)
+    assert cache.lookup(str(source), DTYPE) is not None
+    hit = cache.read_csv(str(source), dtype=DTYPE)
+
+    pd.testing.assert_frame_equal(miss, expected)
+    pd.testing.assert_frame_equal(hit, expected)
+    assert list(hit["claim_period"][:2]) == ["012026", "022026"]
+
+    chunks = list(cache.iter_chunks(str(source), 3, dtype=DTYPE))
+    assert [len(c) for c in chunks] == [3, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+    print("  [OK] Cache round-trips read_csv")
+
+
+def test_cache_invalidation(tmp_path):
+    """Verify a touched file stays cached and a changed one is re-parsed."""
+    source = tmp_path / "gstr2b.csv"
+    write_csv(source)
+    cache = CSVCache(str(tmp_path / ".cache"))
+    cache.read_csv(str(source), dtype=DTYPE)
+
+    # Different dtype overrides are a different entry
+    assert cache.lookup(str(source)) is None
+
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.lookup(str(source), DTYPE) is not None
+
+    write_csv(source, periods=("032026", "042026"))
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert cache.lookup(str(source), DTYPE) is None
+    assert cache.iter_chunks(str(source), 2, dtype=DTYPE) is None
+
+    reloaded = cache.read_csv(str(source), dtype=DTYPE)
+    assert reloaded["claim_period"][0] == "032026"
+    assert cache.lookup(str(source), DTYPE) is not None
+    print("  [OK] Cache invalidates on content change")
@@ -0,0 +1,129 @@
+"""
+Circular trading detection — SCC pruning and bounded cycle enumeration.
+"""
+
+import itertools
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.graph.cycles import (  # noqa: E402
+    TradeGraph,
+    cycle_record,
+    find_cycles,
+    plan_tasks,
+    strongly_connected_components,
+)
+from backend.ingestion import money  # noqa: E402
+from test_graph_loader import SUPPLIER, invoice, write_batches  # noqa: E402
+
+
+def random_graph(n=40, edges=90, seed=0):
+    rng = np.random.default_rng(seed)
+    pairs = {(int(a), int(b)) for a, b in rng.integers(0, n, (edges, 2)) if a != b}
+    sources, targets = map(list, zip(*sorted(pairs)))
+    values = money.parse_money([str(v) for v in rng.integers(1, 100, len(sources))])
+    return TradeGraph.from_invoices([f"G{i:02d}" for i in sources], [f"G{i:02d}" for i in targets], values)
+
+
+def brute_force_cycles(graph, max_length, min_value=0):
+    """Every simple cycle, rotated to start at its lowest node ID."""
+    sources, targets, values = graph.edges()
+    edges = {(s, t): v for s, t, v in zip(sources.tolist(), targets.tolist(), values.tolist()) if v >= min_value}
+    found = set()
+    for length in range(2, max_length + 1):
+        for nodes in itertools.permutations(range(len(graph.gstins)), length):
+            if nodes[0] == min(nodes):
+                steps = list(zip(nodes, nodes[1:] + nodes[:1]))
+                if all(step in edges for step in steps):
+                    found.add((tuple(graph.gstins[list(nodes)]), tuple(edges[step] for step in steps)))
+    return found
+
+
+def test_scc_labels_match_reachability():
+    """Verify two nodes share a label exactly when each reaches the other."""
+    graph = random_graph()
+    n = len(graph.gstins)
+    sources, targets, _ = graph.edges()
+    reach = np.eye(n, dtype=bool)
+    reach[sources, targets] = True
+    for k in range(n):
+        reach |= reach[:, [k]] & reach[[k], :]
+
+    labels = strongly_connected_components(n, sources, targets)
+    mutual = reach & reach.T
+    on_cycle = mutual.sum(axis=1) > 1
+    assert ((labels >= 0) == on_cycle).all()
+    same = labels[:, None] == labels[None, :]
+    assert (same[on_cycle][:, on_cycle] == mutual[on_cycle][:, on_cycle]).all()
+    print("  [OK] SCC labels match reachability")
+
+
+def test_cycles_match_brute_force():
+    """Verify every bounded cycle is found once, in and out of a process pool."""
+    graph = random_graph(n=12, edges=40, seed=3)
+    expected = brute_force_cycles(graph, 5)
+    assert len(expected) > 5
+    serial = [(tuple(g), tuple(v)) for g, v in find_cycles(graph, max_length=5, workers=1)]
+    assert len(serial) == len(set(serial)) and set(serial) == expected
+
+    pooled = {(tuple(g), tuple(v)) for g, v in find_cycles(graph, max_length=5, workers=2)}
+    assert pooled == expected
+    heavy = {(tuple(g), tuple(v)) for g, v in find_cycles(graph, max_length=5, min_value=5_000, workers=1)}
+    assert heavy == brute_force_cycles(graph, 5, min_value=5_000)
+    print("  [OK] Bounded cycles match brute force")
+
+
+def test_cycles_from_invoice_batches(tmp_path):
+    """Verify invoice values are summed per trade edge and cycles recorded in rupees."""
+    middle, last = "29AABCU9603R1ZM", "07AAACR5055K1Z5"
+    rows = [
+        invoice(0, recipient=middle),
+        invoice(1, recipient=middle),  # same edge, summed
+        dict(invoice(2, recipient=last), supplierGstin=middle),
+        dict(invoice(3, recipient=SUPPLIER), supplierGstin=last, totalValue="50.5"),
+        invoice(4, recipient=None),  # B2C, no edge
+        invoice(5, recipient=SUPPLIER),  # self-supply, no edge
+    ]
+    graph = TradeGraph.from_batches(write_batches(tmp_path, rows))
+    assert len(graph.adjacency) == 3
+    [(gstins, edge_values)] = find_cycles(graph, workers=1)
+    assert gstins == [SUPPLIER, middle, last]
+    assert cycle_record(gstins, edge_values) == {
+        "gstins": [SUPPLIER, middle, last],
+        "length": 3,
+        "edgeValues": ["236.00", "118.00", "50.50"],
+        "minValue": "50.50",
+    }
+    assert list(find_cycles(graph, min_value=5_051, workers=1)) == []
+    assert list(find_cycles(graph, max_length=2, workers=1)) == []
+    assert plan_tasks(np.array([0, 2, 2, 5, 6]), task_edges=3) == [(0, 2), (2, 4)]
+    print("  [OK] Cycles found from invoice batches")
+
+
+def test_delta_manifests_are_refused(tmp_path):
+    """Verify a delta run's manifest, missing its unchanged invoices, is not read as the whole trade graph."""
+    batches = write_batches(tmp_path, [invoice(0, recipient="29AABCU9603R1ZM")])
+
+    def manifest(name, unchanged):
+        path = tmp_path / name
+        path.write_text(
+            json.dumps(
+                {
+                    "batches": [{"entity": entity, "file": Path(file).name} for entity, file in batches],
+                    "sources": [{"entity": "invoice", "source": "jan.csv", "rows": 3, "unchanged": unchanged}],
+                }
+            )
+        )
+        return str(path)
+
+    assert len(TradeGraph.from_manifest(manifest("manifest_1.json", 0), verify=False).adjacency) == 1
+    with pytest.raises(ValueError, match="delta"):
+        TradeGraph.from_manifest(manifest("manifest_2.json", 2), verify=False)
+    print("  [OK] Delta manifests refused")
@@ -0,0 +1,129 @@
+"""
+Vendor risk feature store — incremental per-(GSTIN, period) aggregates.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.risk.feature_store import FEATURES, FeatureStore, filing_delays  # noqa: E402
+from test_graph_loader import RECIPIENT, SUPPLIER, invoice  # noqa: E402
+
+
+def ret(gstin, return_type, filing_date, status="FILED", liability="0", itc="0"):
+    return {
+        "returnId": f"RET-{gstin}-{return_type}-012026",
+        "gstin": gstin,
+        "returnType": return_type,
+        "returnPeriod": "012026",
+        "filingDate": filing_date,
+        "filingStatus": status,
+        "totalTaxLiability": liability,
+        "itcClaimedIgst": itc,
+        "itcClaimedCgst": "0",
+        "itcClaimedSgst": "0",
+        "itcClaimedCess": "0",
+    }
+
+
+def payment(i, status="PAID", total="18.00"):
+    return {
+        "paymentId": f"PMT-{i}",
+        "gstin": SUPPLIER,
+        "returnPeriod": "012026",
+        "paymentStatus": status,
+        "totalPaid": total,
+    }
+
+
+def write(tmp_path, name, entity, rows):
+    path = tmp_path / name
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    return entity, str(path)
+
+
+def taxed(i, igst="18.00", **fields):
+    amounts = {"taxableValue": "100.00", "igstAmount": igst, "cgstAmount": "0", "sgstAmount": "0", "cessAmount": "0"}
+    return dict(invoice(i), **amounts, **fields)
+
+
+def test_filing_delays_from_due_dates():
+    """Verify days late against the 11th (GSTR-1) and 20th (GSTR-3B) of the next month."""
+    delays = filing_delays(
+        ["GSTR1", "GSTR1", "GSTR3B", "GSTR3B", "GSTR9"],
+        ["012026", "122025", "012026", "012026", "012026"],
+        ["2026-02-11", "2026-01-15", "2026-02-25", None, "2027-01-01"],
+    )
+    assert delays.tolist() == [0, 4, 5, 0, 0]
+    print("  [OK] Filing delays from due dates")
+
+
+def test_updates_replace_and_tombstone_contributions(tmp_path):
+    """Verify changed records replace their contribution and tombstones subtract it."""
+    store = FeatureStore(str(tmp_path / "features.sqlite"))
+    invoices = write(tmp_path, "invoice_1.ndjson", "invoice", [taxed(0), taxed(1), taxed(2, recipientGstin=None)])
+    returns = write(
+        tmp_path,
+        "return_1.ndjson",
+        "return",
+        [ret(SUPPLIER, "GSTR1", "2026-02-14"), ret(RECIPIENT, "GSTR3B", "2026-02-20", liability="10.00", itc="50.00")],
+    )
+    store.update([invoices, returns, invoices])  # a repeated batch is not counted twice
+    supplier = store.vector(SUPPLIER, "012026")
+    assert supplier["invoices_issued"] == 3 and supplier["outward_tax"] == 5_400
+    assert supplier["returns_late"] == 1 and supplier["filing_delay_days"] == 3
+    assert supplier["missing_payment_invoices"] == 3
+    buyer = store.vector(RECIPIENT, "012026")
+    assert buyer["invoices_received"] == 2 and buyer["inward_tax"] == 3_600
+    assert buyer["itc_claimed"] == 5_000 and buyer["itc_mismatch"] == 1_400 and buyer["unpaid_tax"] == 1_000
+
+    changed = write(tmp_path, "invoice_2.ndjson", "invoice", [taxed(1, igst="9.00")])
+    paid = write(tmp_path, "payment_1.ndjson", "payment", [payment(1), payment(2, status="FAILED")])
+    key = {"supplierGstin": SUPPLIER, "invoiceNumber": "INV-000", "filingPeriod": "012026"}
+    removed = write(tmp_path, "invoice_tombstone.ndjson", "invoice", [key])
+    store.update([changed, paid], [removed])
+    supplier = store.vector(SUPPLIER, "012026")
+    assert supplier["invoices_issued"] == 2 and supplier["outward_tax"] == 2_700
+    assert supplier["payments_made"] == 1 and supplier["tax_paid"] == 1_800
+    assert supplier["missing_payment_invoices"] == 0
+    assert store.vector(RECIPIENT, "012026")["inward_tax"] == 900
+    assert store.vector(SUPPLIER, "022026") is None
+    assert list(store.history(RECIPIENT)) == ["012026"]
+    store.commit()
+    store.close()
+    print("  [OK] Updates replace and tombstone contributions")
+
+
+def test_snapshot_reload_and_rebuild(tmp_path):
+    """Verify a reopened store serves the snapshot, and rebuilds a stale one."""
+    path = str(tmp_path / "features.sqlite")
+    store = FeatureStore(path)
+    store.update([write(tmp_path, "invoice_1.ndjson", "invoice", [taxed(i) for i in range(3)])])
+    store.commit()
+    expected = store.frame()
+    store.update([write(tmp_path, "invoice_2.ndjson", "invoice", [taxed(3)])])
+    store.close()  # uncommitted: rolled back
+
+    reopened = FeatureStore(path)
+    assert reopened.frame().equals(expected)
+    assert list(reopened.frame().columns) == ["gstin", "period", *FEATURES]
+    reopened.update([write(tmp_path, "invoice_3.ndjson", "invoice", [taxed(4)])])
+    reopened.commit()
+    reopened.close()
+
+    # A snapshot a generation behind the contributions is rebuilt from them
+    snapshot = tmp_path / "features.npz"
+    with np.load(snapshot) as data:
+        stale = dict(data)
+    stale["generation"] = np.array(1)
+    np.savez(snapshot, **stale)
+    rebuilt = FeatureStore(path)
+    assert rebuilt.vector(SUPPLIER, "012026")["invoices_issued"] == 4
+    assert rebuilt.vector(RECIPIENT, "012026")["inward_tax"] == 7_200
+    rebuilt.close()
+    print("  [OK] Snapshot reloaded, stale snapshot rebuilt")
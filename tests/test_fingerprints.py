@@ -0,0 +1,145 @@
+"""
+Delta ingestion — fingerprint store, changed rows and tombstones.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.graph.loader import GraphLoader, read_manifest  # noqa: E402
+from backend.ingestion.ingest_service import IngestService  # noqa: E402
+from test_graph_loader import RecordingDriver  # noqa: E402
+from test_ingest_service import INVOICE_ROW  # noqa: E402
+
+
+def write_month(path, numbers, period="012026", changed=()):
+    rows = []
+    for i in numbers:
+        row = dict(INVOICE_ROW, invoice_number=f"INV-{i:03d}", filing_period=period)
+        if i in changed:
+            row["taxable_value"], row["total_value"] = "2000.00", "2180.00"
+        rows.append(row)
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def run(tmp_path, sources, workers=1):
+    service = IngestService(
+        output_dir=str(tmp_path / "out"),
+        error_log=str(tmp_path / "errors.json"),
+        chunksize=3,
+        workers=workers,
+        fingerprints=str(tmp_path / "state" / "fingerprints.sqlite"),
+    )
+    summaries = service.process(sources)
+    manifest = service.manifest_path and json.loads(Path(service.manifest_path).read_text())
+    return service, summaries, manifest
+
+
+def emitted(service, manifest):
+    lines = []
+    for batch in manifest["batches"]:
+        lines += (Path(service.output_dir) / batch["file"]).read_text().splitlines()
+    return [json.loads(line)["invoiceNumber"] for line in lines]
+
+
+def test_unchanged_rerun_emits_nothing(tmp_path):
+    """Verify a re-ingested, unchanged month writes no batch and no manifest."""
+    source = tmp_path / "jan.csv"
+    write_month(source, range(7))
+    service, _, manifest = run(tmp_path, {"invoice": str(source)})
+    assert emitted(service, manifest) == [f"INV-{i:03d}" for i in range(7)]
+    assert manifest["sources"][0]["unchanged"] == 0
+
+    written = []
+    service = IngestService(
+        output_dir=str(tmp_path / "out"),
+        error_log=str(tmp_path / "errors.json"),
+        chunksize=3,
+        fingerprints=str(tmp_path / "state" / "fingerprints.sqlite"),
+    )
+    write_file = service._write_file
+    service._write_file = lambda path, *args: written.append(path) or write_file(path, *args)
+    [summary] = service.process({"invoice": str(source)})
+    assert written == [] and service.manifest_path is None
+    assert summary["unchanged"] == 7 and summary["batches"] == []
+    assert len(list((tmp_path / "out").glob("invoice_batch_*.ndjson"))) == 3  # first run only
+    assert len(list((tmp_path / "out").glob("manifest_*.json"))) == 1
+    print("  [OK] Unchanged re-ingest writes nothing")
+
+
+def test_changed_and_removed_rows(tmp_path):
+    """Verify only changed/new rows are emitted and removed ones are tombstoned per period."""
+    jan, feb = tmp_path / "jan.csv", tmp_path / "feb.csv"
+    write_month(jan, range(5))
+    write_month(feb, range(3), period="022026")
+    run(tmp_path, [("invoice", str(jan)), ("invoice", str(feb))])
+
+    # January refresh: INV-001 changed, INV-004 gone, INV-005 new; February untouched
+    write_month(jan, [0, 1, 2, 3, 5], changed={1})
+    service, _, manifest = run(tmp_path, {"invoice": str(jan)})
+    assert emitted(service, manifest) == ["INV-001", "INV-005"]
+
+    [tombstone] = manifest["tombstones"]
+    assert tombstone["rows"] == 1
+    keys = [json.loads(line) for line in (Path(service.output_dir) / tombstone["file"]).read_text().splitlines()]
+    supplier = INVOICE_ROW["supplier_gstin"]
+    assert keys == [{"supplierGstin": supplier, "invoiceNumber": "INV-004", "filingPeriod": "012026"}]
+
+    # The loader deletes what the tombstones key
+    _, batches, tombstones = read_manifest(service.manifest_path)
+    driver = RecordingDriver()
+    stats = GraphLoader(driver).load(batches, tombstones=tombstones)
+    assert stats["deleted"]["Invoice"] == {"rows": 1, "deleted": 1}
+    assert any("DETACH DELETE" in query for query, _, _ in driver.writes)
+
+    # Tombstoned rows are forgotten: the same refresh again is a no-op
+    _, _, manifest = run(tmp_path, {"invoice": str(jan)})
+    assert manifest is None
+    print("  [OK] Changed rows emitted, removed rows tombstoned")
+
+
+def test_single_key_tombstones_reach_the_loader_as_rows(tmp_path):
+    """Verify a removed taxpayer, keyed on its GSTIN alone, is deleted by a one-value row."""
+    source = tmp_path / "taxpayers.csv"
+    taxpayer = {
+        "legal_name": "Seller",
+        "registration_type": "REGULAR",
+        "registration_status": "ACTIVE",
+        "registration_date": "2020-04-01",
+        "state_code": "27",
+        "pan": "AAPFU0939F",
+    }
+    gstins = ["27AAPFU0939F1ZV", "27AAPFU0939F2ZU"]
+    pd.DataFrame([dict(taxpayer, gstin=gstin) for gstin in gstins]).to_csv(source, index=False)
+    run(tmp_path, {"taxpayer": str(source)})
+    pd.DataFrame([dict(taxpayer, gstin=gstins[0])]).to_csv(source, index=False)
+    service, _, manifest = run(tmp_path, {"taxpayer": str(source)})
+
+    _, batches, tombstones = read_manifest(service.manifest_path)
+    driver = RecordingDriver()
+    stats = GraphLoader(driver).load(batches, tombstones=tombstones)
+    assert stats["deleted"]["Taxpayer"]["rows"] == 1
+    [rows] = [rows for query, rows, _ in driver.writes if "DETACH DELETE" in query]
+    assert [list(row) for row in rows] == [[gstins[1]]]
+    print("  [OK] Single-key tombstones reach the loader as rows")
+
+
+def test_parallel_delta_matches_serial(tmp_path):
+    """Verify delta filtering also applies to batches written by worker processes."""
+    source = tmp_path / "jan.csv"
+    write_month(source, range(40))
+    run(tmp_path, {"invoice": str(source)}, workers=2)
+    write_month(source, range(40), changed={7, 31})
+    service, [summary], manifest = run(tmp_path, {"invoice": str(source)}, workers=2)
+    assert sorted(emitted(service, manifest)) == ["INV-007", "INV-031"]
+    assert summary["unchanged"] == 38
+
+    # The parent stored what the workers kept
+    _, _, manifest = run(tmp_path, {"invoice": str(source)}, workers=2)
+    assert manifest is None
+    print("  [OK] Parallel runs filtered the same way")
@@ -0,0 +1,80 @@
+"""
+Near-miss invoice matching — blocking keys, candidate scoring, merged vectors.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.reconciliation.fuzzy import (  # noqa: E402
+    blocking_keys,
+    dice_similarity,
+    merge_near_matches,
+    near_matches,
+)
+from backend.reconciliation.matching import dump_vectors, reconcile, status_counts  # noqa: E402
+from backend.reconciliation.schemas import MismatchVector  # noqa: E402
+from test_reconciliation import side  # noqa: E402
+
+OTHER = "29AABCU9603R1ZM"
+
+
+def test_blocking_keys_from_digit_runs():
+    """Verify suffix, digit and sorted-digit keys, with None where there are no digits."""
+    keys = blocking_keys(["INV/23-24/0017", "2324-17", "INV-1243", "CASH"])
+    assert list(keys["suffix"]) == ["17", "17", "1243", None]
+    assert list(keys["digits"]) == ["232417", "232417", "1243", None]
+    assert list(keys["sorted"]) == ["122347", "122347", "1234", None]
+    print("  [OK] Blocking keys read off digit runs")
+
+
+def test_dice_similarity_of_bigrams():
+    """Verify the column-wise bigram Dice score, repeats counted once."""
+    keys = ["INV1234", "INV1243", "AAAA", "AA", "7", "7", "8"]
+    scores = dice_similarity(keys, [0, 2, 4, 4], [1, 3, 5, 6])
+    assert round(scores[0], 4) == round(2 * 4 / 12, 4)
+    assert list(scores[1:]) == [1.0, 1.0, 0.0]
+    print("  [OK] Bigram Dice similarity")
+
+
+def test_near_misses_pair_within_bucket_and_tolerance():
+    """Verify respelled invoices pair up, while other buckets, amounts and numbers do not."""
+    gstr1 = side(
+        [
+            ("INV/23-24/0017", "100.00", "18.00"),
+            ("INV-1234", "50.00", "9.00"),
+            ("INV-555", "70.00", "7.00"),  # GSTR-2B amount differs
+            ("INV-900", "30.00", "3.00"),  # GSTR-2B copy is another supplier's
+            ("ABC-1", "10.00", "1.00"),  # same suffix, unlike number
+        ]
+    )
+    gstr2b = side(
+        [
+            ("2324/17", "100.00", "18.00"),
+            ("inv 1243", "50.00", "9.00"),
+            ("INV/555A", "75.00", "7.00"),
+            ("INV-0900", "30.00", "3.00"),
+            ("XYZ-1", "10.00", "1.00"),
+        ]
+    )
+    gstr2b.loc[3, "supplier_gstin"] = OTHER
+
+    result = reconcile(gstr1, gstr2b)
+    assert status_counts(result)["MATCHED"] == 0
+    pairs = near_matches(result)
+    numbers = result["invoice_number"].to_numpy()
+    assert [(numbers[a], numbers[b]) for a, b in zip(pairs["gstr1_row"], pairs["gstr2b_row"])] == [
+        ("INV/23-24/0017", "2324/17"),
+        ("INV-1234", "inv 1243"),
+    ]
+
+    merged = merge_near_matches(result, pairs)
+    assert status_counts(merged) == {"MATCHED": 2, "AMOUNT_MISMATCH": 0, "MISSING_IN_GSTR2B": 3, "MISSING_IN_GSTR1": 3}
+    lines = dump_vectors(merged, include_matched=True).splitlines()
+    assert len(lines) == 8
+    vectors = [MismatchVector.model_validate_json(line) for line in lines]
+    assert vectors[0].invoice_number == "INV/23-24/0017" and vectors[0].gstr2b_invoice_number == "2324/17"
+    assert vectors[0].model_dump_json(by_alias=True) == lines[0]
+    print("  [OK] Near misses paired within bucket and tolerance")
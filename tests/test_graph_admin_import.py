@@ -0,0 +1,141 @@
+"""
+Offline graph build — Contract 1 batches to neo4j-admin import CSVs.
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.graph.admin_import import export_import_csv, import_command  # noqa: E402
+from backend.graph.loader import NODE_KEYS, GraphLoader, node_fields  # noqa: E402
+from test_graph_loader import RECIPIENT, SUPPLIER, RecordingDriver, invoice, write_batches  # noqa: E402
+
+
+def write_manifest(tmp_path, batches):
+    manifest = {
+        "contractVersion": "1.0.0",
+        "batches": [{"file": Path(path).name, "entity": entity} for entity, path in batches],
+    }
+    path = tmp_path / "manifest_1710000000000.json"
+    path.write_text(json.dumps(manifest))
+    return str(path)
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def export(tmp_path, invoices):
+    manifest = write_manifest(tmp_path, write_batches(tmp_path, invoices))
+    out = tmp_path / "import"
+    exporter = export_import_csv(manifest, out)
+    args = (out / "import.args").read_text().splitlines()
+    return exporter, out, args
+
+
+def files_for(args, option, name):
+    """Header and data files named by `--option=name=...`."""
+    prefix = f"--{option}={name}="
+    value = next(arg for arg in args if arg.startswith(prefix))
+    return value[len(prefix) :].split(",")
+
+
+def test_nodes_get_id_spaces_and_audit_properties(tmp_path):
+    """Verify node files use per-label ID spaces and carry the audit properties."""
+    rows = [dict(invoice(i), reverseCharge=i == 0) for i in range(3)]
+    exporter, out, args = export(tmp_path, rows)
+
+    assert exporter.counts["Invoice"] == 3 and exporter.counts["Taxpayer"] == 2
+    header, data = files_for(args, "nodes", "Invoice")
+    columns = read_csv(header)[0]
+    assert columns[0] == ":ID(Invoice)"
+    assert "reverseCharge:boolean" in columns
+    assert columns[-3:] == ["ingestedAt", "sourceFile", "contractVersion"]
+
+    first = dict(zip(columns, read_csv(data)[0]))
+    assert first[":ID(Invoice)"] == f"{SUPPLIER}|INV-000|012026"
+    assert first["reverseCharge:boolean"] == "true"
+    assert first["sourceFile"] == "invoice_batch_1710000000000_p1.ndjson"
+    assert first["contractVersion"] == "1.0.0"
+    assert read_csv(files_for(args, "nodes", "Taxpayer")[0])[0][0] == "gstin:ID(Taxpayer)"
+    assert "--skip-duplicate-nodes=true" not in args and "--multiline-fields=true" not in args
+    assert import_command(out)[-1] == f"@{out / 'import.args'}"
+    print("  [OK] Node files with ID spaces and audit properties")
+
+
+def test_relationships_match_loader_rules(tmp_path):
+    """Verify edges resolve the same endpoints the MERGE loader would."""
+    rows = [invoice(0, irn="a" * 64), invoice(1, recipient=None)]
+    exporter, out, args = export(tmp_path, rows)
+
+    def edges(rel_type):
+        header, *data = files_for(args, "relationships", rel_type)
+        assert read_csv(header)[0][0].startswith(":START_ID(")
+        return [tuple(row) for path in data for row in read_csv(path)]
+
+    inv0, inv1 = f"{SUPPLIER}|INV-000|012026", f"{SUPPLIER}|INV-001|012026"
+    assert edges("SUPPLIED") == [(SUPPLIER, inv0), (SUPPLIER, inv1)]
+    assert edges("RECEIVED") == [(RECIPIENT, inv0)]
+    assert edges("REGISTERED") == [(inv0, "a" * 64)]
+    assert edges("REPORTED_IN") == [
+        (inv0, f"RET-{SUPPLIER}-GSTR1-012026"),
+        (inv0, f"RET-{RECIPIENT}-GSTR2B-012026"),
+        (inv1, f"RET-{SUPPLIER}-GSTR1-012026"),
+    ]
+    assert edges("PAID_VIA") == [(f"RET-{SUPPLIER}-GSTR1-012026", "PMT-1")]
+    assert exporter.counts["FILED"] == 2
+    print("  [OK] Relationship files follow the loader's matching rules")
+
+
+def test_repeated_invoice_exports_like_the_merge_load(tmp_path):
+    """Verify an invoice in two batches keeps its last row and its edges once, as the MERGE loader leaves it."""
+    batches = write_batches(tmp_path, [invoice(0), invoice(1)])
+    later = tmp_path / "invoice_batch_1710000000001_p1.ndjson"
+    later.write_text(json.dumps(dict(invoice(1), totalValue="236.00")) + "\n")
+    batches.append(("invoice", str(later)))
+    out = tmp_path / "import"
+    export_import_csv(write_manifest(tmp_path, batches), out)
+    args = (out / "import.args").read_text().splitlines()
+
+    # What the loader's MERGE ... SET n += row leaves: the last row per key
+    driver = RecordingDriver()
+    GraphLoader(driver, sessions=1).load(batches)
+    fields = node_fields("invoice")
+    keys = [fields.index(key) for key in NODE_KEYS["invoice"][1]]
+    loaded = {}
+    for query, rows, _ in driver.writes:
+        if "MERGE (n:Invoice" in query:
+            for row in rows:
+                loaded["|".join(row[k] for k in keys)] = row[fields.index("totalValue")]
+
+    header, *data = files_for(args, "nodes", "Invoice")
+    columns = read_csv(header)[0]
+    exported = [dict(zip(columns, row)) for path in data for row in read_csv(path)]
+    assert {row[":ID(Invoice)"]: row["totalValue"] for row in exported} == loaded
+    assert len(exported) == 2 and loaded[f"{SUPPLIER}|INV-001|012026"] == "236.00"
+
+    # MERGEd edges: one per (start, end) pair
+    for rel_type, count in (("SUPPLIED", 2), ("RECEIVED", 2), ("REPORTED_IN", 4)):
+        header, *data = files_for(args, "relationships", rel_type)
+        pairs = [tuple(row) for path in data for row in read_csv(path)]
+        assert len(pairs) == len(set(pairs)) == count
+    print("  [OK] Repeated invoice exported as MERGE leaves it")
+
+
+def test_multiline_values_switch_on_multiline_mode(tmp_path):
+    """Verify a value with a newline is quoted and enables multiline parsing."""
+    batches = write_batches(tmp_path, [invoice(0)])
+    taxpayer_path = dict(batches)["taxpayer"]
+    Path(taxpayer_path).write_text(json.dumps({"gstin": SUPPLIER, "legalName": "Seller\nUnit 2"}) + "\n")
+    out = tmp_path / "import"
+    export_import_csv(write_manifest(tmp_path, batches), out)
+    args = (out / "import.args").read_text().splitlines()
+    assert "--multiline-fields=true" in args
+    header, data = files_for(args, "nodes", "Taxpayer")
+    assert dict(zip(read_csv(header)[0], read_csv(data)[0]))["legalName"] == "Seller\nUnit 2"
+    print("  [OK] Multiline values handled")
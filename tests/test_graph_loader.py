@@ -0,0 +1,202 @@
+"""
+Graph loader — NDJSON batches to UNWIND transactions.
+
+The unit tests record the transactions a `GraphLoader` sends through a
+stand-in driver. `test_load_into_neo4j` runs the same load against a real
+server when NEO4J_TEST_URI points at a disposable one, e.g.:
+
+    docker run --rm -p 7687:7687 -e NEO4J_AUTH=neo4j/testpassword neo4j:5
+    NEO4J_TEST_URI=bolt://localhost:7687 NEO4J_TEST_PASSWORD=testpassword pytest tests/test_graph_loader.py
+"""
+
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.graph.loader import GraphLoader, read_manifest  # noqa: E402
+from backend.graph.migrations import SchemaError, expected_schema, load_migrations, migrate  # noqa: E402
+
+SUPPLIER = "27AAPFU0939F1ZV"
+RECIPIENT = "29AABCU9603R1ZM"
+
+
+class RecordingDriver:
+    """Just enough of `neo4j.Driver` to capture what the loader writes."""
+
+    def __init__(self, schema=True):
+        self.writes = []
+        self.lock = threading.Lock()
+        self.constraints, self.indexes = expected_schema(load_migrations()) if schema else (set(), set())
+
+    def session(self, database=None):
+        return RecordingSession(self)
+
+    def execute_query(self, query, database_=None):
+        if query.startswith("SHOW CONSTRAINTS"):
+            return [{"name": name} for name in self.constraints], None, None
+        names = self.constraints | self.indexes
+        return [{"name": name, "state": "ONLINE"} for name in names], None, None
+
+
+class RecordingSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, fn, *args):
+        return fn(self, *args)
+
+    def run(self, query, rows, **params):
+        with self.driver.lock:
+            self.driver.writes.append((query, list(rows), params))
+        created = len(rows)
+        counters = SimpleNamespace(nodes_created=created, relationships_created=created, nodes_deleted=created)
+        return SimpleNamespace(consume=lambda: SimpleNamespace(counters=counters))
+
+
+def invoice(i, recipient=RECIPIENT, irn=None):
+    return {
+        "invoiceNumber": f"INV-{i:03d}",
+        "supplierGstin": SUPPLIER,
+        "recipientGstin": recipient,
+        "totalValue": "118.00",
+        "irn": irn,
+        "filingPeriod": "012026",
+    }
+
+
+def write_batches(tmp_path, invoices):
+    entities = {
+        "taxpayer": [{"gstin": SUPPLIER, "legalName": "Seller"}, {"gstin": RECIPIENT, "legalName": "Buyer"}],
+        "invoice": invoices,
+        "return": [
+            {"returnId": f"RET-{SUPPLIER}-GSTR1-012026", "gstin": SUPPLIER, "returnType": "GSTR1", "returnPeriod": "012026"},
+            {"returnId": f"RET-{RECIPIENT}-GSTR2B-012026", "gstin": RECIPIENT, "returnType": "GSTR2B", "returnPeriod": "012026"},
+        ],
+        "payment": [{"paymentId": "PMT-1", "gstin": SUPPLIER, "returnPeriod": "012026", "paymentStatus": "PAID"}],
+        "irn": [{"irn": "a" * 64, "invoiceNumber": "INV-000", "supplierGstin": SUPPLIER}],
+    }
+    batches = []
+    for entity, rows in entities.items():
+        path = tmp_path / f"{entity}_batch_1710000000000_p1.ndjson"
+        path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+        batches.append((entity, str(path)))
+    return batches
+
+
+def test_nodes_then_relationships_in_sized_batches(tmp_path):
+    """Verify nodes load per label before edges, in UNWIND batches of batch_size."""
+    batches = write_batches(tmp_path, [invoice(i, irn="a" * 64 if i == 0 else None) for i in range(5)])
+    driver = RecordingDriver()
+    stats = GraphLoader(driver, batch_size=2, sessions=3).load(batches)
+
+    assert stats["nodes"]["Invoice"] == {"rows": 5, "created": 5}
+    assert stats["nodes"]["Taxpayer"]["rows"] == 2
+    assert {name: counts["rows"] for name, counts in stats["relationships"].items()} == {
+        "SUPPLIED": 5,
+        "RECEIVED": 5,
+        "REPORTED_IN": 10,
+        "REGISTERED": 1,
+        "FILED": 2,
+        "PAID_VIA": 1,
+    }
+
+    invoice_writes = [w for w in driver.writes if "MERGE (n:Invoice" in w[0]]
+    assert sorted(len(rows) for _, rows, _ in invoice_writes) == [1, 2, 2]
+    assert all(query.startswith("UNWIND $rows AS r") for query, _, _ in driver.writes)
+    query, rows, params = invoice_writes[0]
+    # Rows go out positionally, with the query indexing into them
+    assert isinstance(rows[0], tuple) and "r.supplierGstin" not in query and "supplierGstin: r[" in query
+    assert params["sourceFile"] == "invoice_batch_1710000000000_p1.ndjson"
+    assert params["contractVersion"] == "1.0.0"
+
+    # Every node write happens before the first relationship write
+    kinds = ["rel" if "]->(" in query else "node" for query, _, _ in driver.writes]
+    assert kinds == sorted(kinds, key=lambda kind: kind == "rel")
+    reported = {}
+    for query, rows, _ in driver.writes:
+        if ":REPORTED_IN" in query:
+            return_type = "GSTR1" if "'GSTR1'" in query else "GSTR2B"
+            reported[return_type] = reported.get(return_type, 0) + len(rows)
+    assert reported == {"GSTR1": 5, "GSTR2B": 5}
+    print("  [OK] Nodes then relationships, in sized UNWIND batches")
+
+
+def test_b2c_invoices_get_no_buyer_edges(tmp_path):
+    """Verify invoices without a recipient only feed seller-side edges."""
+    batches = write_batches(tmp_path, [invoice(0, recipient=None)])
+    stats = GraphLoader(RecordingDriver()).load(batches)
+    assert stats["relationships"]["RECEIVED"]["rows"] == 0
+    assert stats["relationships"]["REPORTED_IN"]["rows"] == 1
+    print("  [OK] B2C invoices skip buyer edges")
+
+
+def test_load_refuses_missing_schema(tmp_path):
+    """Verify nothing is written when the key constraints are missing."""
+    driver = RecordingDriver(schema=False)
+    with pytest.raises(SchemaError):
+        GraphLoader(driver).load(write_batches(tmp_path, [invoice(0)]))
+    assert driver.writes == []
+    print("  [OK] Load refused without schema")
+
+
+def test_manifest_checksums_are_verified(tmp_path):
+    """Verify a batch that no longer matches its manifest SHA-256 is refused."""
+    from backend.ingestion.ingest_service import IngestService
+    from test_ingest_service import write_invoices
+
+    source = tmp_path / "invoice.csv"
+    write_invoices(source, rows=3)
+    service = IngestService(output_dir=str(tmp_path / "out"), error_log=str(tmp_path / "errors.json"))
+    service.process({"invoice": str(source)})
+
+    version, batches, tombstones = read_manifest(service.manifest_path)
+    assert version == "1.0.0" and [entity for entity, _ in batches] == ["invoice"] and tombstones == []
+    stats = GraphLoader(RecordingDriver()).load_manifest(service.manifest_path)
+    assert stats["nodes"]["Invoice"]["rows"] == 3
+
+    with open(batches[0][1], "a", encoding="utf-8") as f:
+        f.write("\n")
+    with pytest.raises(ValueError):
+        read_manifest(service.manifest_path)
+    print("  [OK] Manifest checksums verified")
+
+
+@pytest.mark.skipif(not os.environ.get("NEO4J_TEST_URI"), reason="NEO4J_TEST_URI not set")
+def test_load_into_neo4j(tmp_path):
+    """Verify the load against a real (disposable) Neo4j instance."""
+    from neo4j import GraphDatabase
+
+    auth = (os.environ.get("NEO4J_TEST_USER", "neo4j"), os.environ.get("NEO4J_TEST_PASSWORD", "neo4j"))
+    batches = write_batches(tmp_path, [invoice(i, irn="a" * 64 if i == 0 else None) for i in range(5)])
+    with GraphDatabase.driver(os.environ["NEO4J_TEST_URI"], auth=auth) as driver:
+        driver.execute_query("MATCH (n) DETACH DELETE n")
+        migrate(driver)
+        loader = GraphLoader(driver, batch_size=2, sessions=2)
+        loader.load(batches)
+        # A second load MERGEs onto the same graph
+        stats = loader.load(batches)
+        assert stats["nodes"]["Invoice"]["created"] == 0
+
+        records, _, _ = driver.execute_query(
+            "MATCH (:Taxpayer {gstin: $gstin})-[:SUPPLIED]->(i:Invoice)-[:REPORTED_IN]->"
+            "(:ReturnFiling {returnType: 'GSTR1'})-[:PAID_VIA]->(:Payment) RETURN count(i) AS n",
+            gstin=SUPPLIER,
+        )
+        assert records[0]["n"] == 5
+        records, _, _ = driver.execute_query("MATCH (:Invoice)-[r:REGISTERED]->(:IRN) RETURN count(r) AS n")
+        assert records[0]["n"] == 1
+    print("  [OK] Loaded into Neo4j")
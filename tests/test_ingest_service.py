@@ -0,0 +1,191 @@
+"""
+Ingestion service — CSV to Contract 1 NDJSON batch tests.
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.ingestion.ingest_service import IngestService  # noqa: E402
+from backend.ingestion.schemas import Invoice  # noqa: E402
+
+INVOICE_ROW = {
+    "invoice_number": "INV-001",
+    "invoice_date": "2026-01-15",
+    "invoice_type": "B2B",
+    "invoice_status": "ACTIVE",
+    "supply_type": "INTRA_STATE",
+    "document_type": "INV",
+    "supplier_gstin": "27AAPFU0939F1ZV",
+    "recipient_gstin": "29AABCU9603R1ZM",
+    "taxable_value": "1000.00",
+    "igst_amount": "0.00",
+    "cgst_amount": "90.00",
+    "sgst_amount": "90.00",
+    "cess_amount": "0.00",
+    "total_value": "1180.00",
+    "place_of_supply": "27",
+    "reverse_charge": "false",
+    "irn": "",
+    "filing_period": "012026",
+}
+
+
+def write_invoices(path: Path, rows=5, bad=()):
+    """Write `rows` invoices; rows listed in `bad` get a negative taxable value."""
+    records = []
+    for i in range(rows):
+        row = dict(INVOICE_ROW, invoice_number=f"INV-{i:03d}")
+        if i in bad:
+            row["taxable_value"] = "-1.00"
+        records.append(row)
+    pd.DataFrame(records).to_csv(path, index=False)
+
+
+def read_batches(output_dir: Path):
+    lines = []
+    for batch in sorted(output_dir.glob("invoice_batch_*.ndjson")):
+        lines.extend(batch.read_text().splitlines())
+    return lines
+
+
+def test_process_writes_ndjson_batches(tmp_path):
+    """Verify valid rows land in per-chunk NDJSON batches in input order."""
+    source = tmp_path / "invoice.csv"
+    write_invoices(source, rows=5)
+    service = IngestService(
+        output_dir=str(tmp_path / "out"), error_log=str(tmp_path / "logs" / "errors.json"), chunksize=2
+    )
+    [summary] = service.process({"invoice": str(source)})
+
+    assert summary["rows"] == summary["valid"] == 5
+    assert [b["rows"] for b in summary["batches"]] == [2, 2, 1]
+    for batch in summary["batches"]:
+        assert re.fullmatch(r"invoice_batch_\d+_p1\.ndjson", batch["file"])
+
+    lines = read_batches(tmp_path / "out")
+    assert [json.loads(line)["invoiceNumber"] for line in lines] == [f"INV-{i:03d}" for i in range(5)]
+    expected = Invoice(**dict(INVOICE_ROW, invoice_number="INV-000", irn=None)).model_dump_json(by_alias=True)
+    assert lines[0] == expected
+    assert json.loads((tmp_path / "logs" / "errors.json").read_text()) == []
+    print("  [OK] NDJSON batches written per chunk")
+
+
+def test_invalid_rows_are_logged_and_dropped(tmp_path):
+    """Verify failing rows are dropped from batches and logged with details."""
+    source = tmp_path / "invoice.csv"
+    write_invoices(source, rows=4, bad={1, 2})
+    error_log = tmp_path / "logs" / "errors.json"
+    service = IngestService(output_dir=str(tmp_path / "out"), error_log=str(error_log), chunksize=3)
+    [summary] = service.process([("invoice", str(source))])
+
+    assert (summary["valid"], summary["invalid"]) == (2, 2)
+    lines = read_batches(tmp_path / "out")
+    assert [json.loads(line)["invoiceNumber"] for line in lines] == ["INV-000", "INV-003"]
+
+    errors = json.loads(error_log.read_text())
+    assert [(e["row"], e["column"], e["input"], e["constraint"]) for e in errors] == [
+        (2, "taxable_value", "-1.00", "greater_than_equal"),
+        (3, "taxable_value", "-1.00", "greater_than_equal"),
+    ]
+    print("  [OK] Invalid rows logged and dropped")
+
+
+def test_plan_shards_respects_quoted_newlines(tmp_path):
+    """Verify shards start on record boundaries, never inside a quoted field."""
+    from backend.ingestion.sharding import open_shard, plan_shards
+
+    source = tmp_path / "taxpayer.csv"
+    names = [f'"Trader {i}\nUnit ""{i}"""' if i % 3 == 0 else f"Trader {i}" for i in range(50)]
+    source.write_text("gstin,legal_name\n" + "".join(f"27AAPFU0939F1ZV,{n}\n" for n in names))
+    expected = pd.read_csv(source, dtype=str)
+
+    for count in (1, 2, 7, 50):
+        header_end, shards = plan_shards(str(source), count, block_size=64)
+        assert 1 <= len(shards) <= count
+        parts = [pd.read_csv(open_shard(str(source), header_end, start, end), dtype=str)
+                 for start, end, _ in shards]
+        assert [rows for _, _, rows in shards] == list(pd.Series([len(p) for p in parts]).cumsum().shift(fill_value=0))
+        pd.testing.assert_frame_equal(pd.concat(parts, ignore_index=True), expected)
+    print("  [OK] Shards respect quoted newlines")
+
+
+def test_parallel_ingest_matches_serial(tmp_path, monkeypatch):
+    """Verify sharded multi-process ingestion writes the serial output, plus a manifest."""
+    import hashlib
+
+    from backend.ingestion import ingest_service
+
+    monkeypatch.setattr(ingest_service, "MIN_SHARD_BYTES", 256)
+    source = tmp_path / "invoice.csv"
+    write_invoices(source, rows=40, bad={3, 17, 39})
+
+    runs = {}
+    for workers in (1, 3):
+        out = tmp_path / f"out{workers}"
+        error_log = tmp_path / f"errors{workers}.json"
+        service = IngestService(output_dir=str(out), error_log=str(error_log), chunksize=4, workers=workers)
+        [summary] = service.process({"invoice": str(source)})
+        manifest = json.loads(Path(service.manifest_path).read_text())
+        lines = []
+        for batch in manifest["batches"]:
+            data = (out / batch["file"]).read_bytes()
+            assert hashlib.sha256(data).hexdigest() == batch["sha256"]
+            assert len(data.splitlines()) == batch["rows"]
+            lines.extend(data.decode().splitlines())
+        runs[workers] = (summary["rows"], summary["valid"], lines, json.loads(error_log.read_text()), manifest)
+
+    rows, valid, lines, errors, manifest = runs[3]
+    assert (rows, valid, lines, errors) == runs[1][:4]
+    assert [e["row"] for e in errors] == [4, 18, 40]
+    assert {b["processId"] for b in manifest["batches"]} <= {"p1", "p2", "p3"}
+    assert all(b["file"].endswith(f"_{b['processId']}.ndjson") for b in manifest["batches"])
+    assert manifest["sources"][0]["invalid"] == manifest["errors"] == 3
+    print("  [OK] Parallel ingestion matches serial")
+
+
+def test_parallel_errors_of_same_named_sources(tmp_path):
+    """Verify sources sharing a file name keep their error records apart across workers."""
+    invoices, taxpayers = tmp_path / "invoices" / "data.csv", tmp_path / "taxpayers" / "data.csv"
+    invoices.parent.mkdir()
+    taxpayers.parent.mkdir()
+    write_invoices(invoices, rows=3, bad={1})
+    pd.DataFrame([{"gstin": "27AAPFU0939F1ZV"}, {"gstin": "bad"}]).to_csv(taxpayers, index=False)
+    error_log = tmp_path / "errors.json"
+    service = IngestService(output_dir=str(tmp_path / "out"), error_log=str(error_log), workers=2)
+    service.process({"invoice": str(invoices), "taxpayer": str(taxpayers)})
+    errors = json.loads(error_log.read_text())
+    assert {(e["entity"], e["row"]) for e in errors} == {("invoice", 2), ("taxpayer", 1), ("taxpayer", 2)}
+    assert not list(tmp_path.glob("errors.json.*.part"))
+    print("  [OK] Same-named sources keep their errors apart")
+
+
+def test_raw_spellings_are_normalized_before_validation(tmp_path):
+    """Verify raw dates, amounts, enums and GSTINs pass after normalization."""
+    source = tmp_path / "invoice.csv"
+    raw = dict(
+        INVOICE_ROW,
+        invoice_date="15-01-2026",
+        taxable_value="1,000.00",
+        supply_type="Intra-State",
+        supplier_gstin="27aapfu0939f1zv",
+        cess_amount="",
+    )
+    pd.DataFrame([raw, dict(raw, invoice_type="B2X")]).to_csv(source, index=False)
+    error_log = tmp_path / "errors.json"
+    service = IngestService(output_dir=str(tmp_path / "out"), error_log=str(error_log))
+    [summary] = service.process({"invoice": str(source)})
+
+    assert (summary["valid"], summary["invalid"]) == (1, 1)
+    [line] = read_batches(tmp_path / "out")
+    expected = Invoice(**dict(INVOICE_ROW, cess_amount="0.00", irn=None)).model_dump_json(by_alias=True)
+    assert line == expected
+    [error] = json.loads(error_log.read_text())
+    assert (error["row"], error["column"], error["input"], error["constraint"]) == (2, "invoice_type", "B2X", "enum")
+    print("  [OK] Raw spellings normalized before validation")
@@ -0,0 +1,119 @@
+"""
+Fixed-point money columns — bit-identity with Decimal arithmetic.
+"""
+
+import random
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.api.aggregates import AggregateStore  # noqa: E402
+from backend.graph.cycles import TradeGraph  # noqa: E402
+from backend.ingestion import money  # noqa: E402
+from backend.ingestion.ingest_service import IngestService  # noqa: E402
+from backend.reconciliation.matching import read_side, reconcile, status_counts  # noqa: E402
+from test_ingest_service import INVOICE_ROW  # noqa: E402
+
+
+def random_amounts(n, seed=0):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        whole = str(rng.randrange(0, 10 ** rng.randrange(1, 14)))
+        places = rng.choice([0, 1, 2, 2, 2])
+        out.append(whole + ("." + str(rng.randrange(10**places)).zfill(places) if places else ""))
+    return out
+
+
+def test_round_trip_matches_decimal():
+    """Verify parse -> format reproduces str(Decimal) for every spelling."""
+    values = random_amounts(2000) + ["0", "0.00", ".5", "12.", "-3.25", "+5", " 7 ", "1E+3", "1.000"]
+    values += ["-0.00", "-0", "-.0", " -0.0 ", "-0E+3", "-0.000"]
+    column = money.parse_money(values)
+    assert list(money.format_money(column)) == [str(Decimal(v)) for v in values]
+    assert money.to_decimals(column) == [Decimal(v) for v in values]
+    assert [d.as_tuple() for d in money.to_decimals(column)] == [Decimal(v).as_tuple() for v in values]
+
+    from_decimals = money.money_from_decimals([Decimal(v) for v in values])
+    assert np.array_equal(from_decimals.paise, column.paise)
+    assert np.array_equal(from_decimals.scale, column.scale)
+    assert np.array_equal(from_decimals.negative_zero, column.negative_zero)
+    assert money.parse_money(["0", "1.00"]).negative_zero is None
+    print("  [OK] Money round-trips through strings and Decimal")
+
+
+def test_invalid_amounts_raise():
+    """Verify amounts that are not a whole number of paise are refused."""
+    for bad in ["abc", "", "1.234", "NaN", "-"]:
+        with pytest.raises(ValueError):
+            money.parse_money([bad])
+    print("  [OK] Non-paise amounts rejected")
+
+
+def test_sums_match_decimal():
+    """Verify row-wise, column and grouped sums are bit-identical to Decimal, negative zeros included."""
+    a_text, b_text = random_amounts(1000, seed=1), random_amounts(1000, seed=2)
+    a_text += ["-0.00", "-0.00", "-0", "0.0", "-0.0", "5"]
+    b_text += ["-0.0", "0", "0.00", "-0", "1.5", "-0.00"]
+    a, b = money.parse_money(a_text), money.parse_money(b_text)
+    a_dec, b_dec = [Decimal(v) for v in a_text], [Decimal(v) for v in b_text]
+
+    assert list(money.format_money(money.add(a, b))) == [str(x + y) for x, y in zip(a_dec, b_dec)]
+    assert list(money.format_money(money.subtract(a, b))) == [str(x - y) for x, y in zip(a_dec, b_dec)]
+    assert str(money.total(a)) == str(sum(a_dec))
+
+    codes = np.random.default_rng(0).integers(0, 7, len(a_text))
+    grouped = money.format_money(money.group_sums(a, codes, 8))
+    expected = [str(sum(d for d, code in zip(a_dec, codes) if code == g)) for g in range(8)]
+    assert list(grouped) == expected
+    print("  [OK] Sums are bit-identical to Decimal")
+
+
+def test_tax_component_checks():
+    """Verify tolerance comparisons and the tax-component check are exact."""
+    taxable = money.parse_money(["100.00", "100.00", "100.00"])
+    cgst = money.parse_money(["9.00", "9.00", "9"])
+    sgst = money.parse_money(["9.00", "9.01", "9"])
+    igst = money.parse_money(["0", "0", "0"])
+    cess = money.parse_money(["0.00", "0.00", "0.00"])
+    total_value = money.parse_money(["118.00", "118.00", "118.02"])
+
+    components = [taxable, cgst, sgst, igst, cess]
+    assert money.tax_component_mismatch(total_value, components).tolist() == [False, True, True]
+    assert money.tax_component_mismatch(total_value, components, tolerance_paise=1).tolist() == [False, False, True]
+    assert money.within_tolerance(total_value, money.add(*components), 2).all()
+    print("  [OK] Tax-component checks run on paise")
+
+
+def test_negative_zero_end_to_end(tmp_path):
+    """Verify a "-0.00" amount the models accept flows through ingestion and the bulk consumers."""
+    source = tmp_path / "invoices.csv"
+    zero = dict(INVOICE_ROW, invoice_number="INV-002", taxable_value="-0.00", cgst_amount="-0.00", sgst_amount="0.00")
+    pd.DataFrame([INVOICE_ROW, dict(zero, total_value="-0.00")]).to_csv(source, index=False)
+    service = IngestService(output_dir=str(tmp_path / "out"), error_log=str(tmp_path / "errors.json"))
+    [summary] = service.process({"invoice": str(source)})
+    assert summary["valid"] == 2
+    [batch] = summary["batches"]
+    assert '"totalValue":"-0.00"' in (tmp_path / "out" / batch["file"]).read_text()
+
+    assert TradeGraph.from_manifest(service.manifest_path).values.tolist() == [118_000]
+    assert status_counts(reconcile(read_side(str(source)), read_side(str(source))))["MATCHED"] == 2
+    frame = pd.DataFrame(
+        {
+            "supplierGstin": [INVOICE_ROW["supplier_gstin"]],
+            "filingPeriod": ["012026"],
+            "matchStatus": ["MATCHED"],
+            "taxAmountDifference": ["-0.00"],
+        }
+    )
+    store = AggregateStore(str(tmp_path / "aggregates.sqlite"))
+    assert store.update_mismatches(frame, "run.ndjson") == ["012026"]
+    assert store.itc_at_risk()["points"][0]["itcAtRisk"] == 0
+    print("  [OK] Negative zero is read, not refused")
@@ -0,0 +1,164 @@
+"""
+Contract 5 neighbourhoods — collapsed links, top-N pruning, level of detail.
+"""
+
+import asyncio
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.api import neighbourhood as hood  # noqa: E402
+from backend.api.graph import GraphPool  # noqa: E402
+from backend.api.main import create_app  # noqa: E402
+from backend.api.schemas import Neighbourhood, generate_contract  # noqa: E402
+from test_api import FakeAsyncDriver, FakeResult, call  # noqa: E402
+
+CENTRE = "27AAPFU0939F1ZV"
+
+
+def gstin(i):
+    return f"29AAAAA{i:04d}A1Z5"
+
+
+def rupees(paise):
+    return f"{paise // 100}.{paise % 100:02d}"
+
+
+class TradeDriver(FakeAsyncDriver):
+    """Answers the neighbourhood queries from `(supplier, recipient, invoice number, paise)` invoices."""
+
+    def __init__(self, invoices):
+        super().__init__()
+        self.invoices = [(s, r, number, rupees(paise)) for s, r, number, paise in invoices]
+        self.pairs = defaultdict(list)
+        for supplier, recipient, _, value in self.invoices:
+            self.pairs[supplier, recipient].append(value)
+
+    def rows(self, pairs):
+        return [{"supplier": s, "recipient": r, "invoices": len(v), "values": v} for (s, r), v in pairs]
+
+    async def run(self, query, params):
+        self.queries.append((query, params))
+        if query == hood.INVOICE_QUERY:
+            centre, others = params["gstin"], set(params["others"])
+            return FakeResult(
+                [
+                    {"supplier": s, "recipient": r, "invoiceNumber": number, "totalValue": value}
+                    for s, r, number, value in sorted(self.invoices)
+                    if (s == centre and r in others) or (r == centre and s in others)
+                ]
+            )
+        frontier = set(params["frontier"])
+        if query == hood.RIM_QUERY:
+            return FakeResult(self.rows(p for p in self.pairs.items() if p[0][0] in frontier and p[0][1] in frontier))
+        columns = {"near": [], "far": [], "outbound": [], "invoices": [], "values": []}
+        for outbound in (True, False):
+            for (s, r), v in self.pairs.items():
+                near, far = (s, r) if outbound else (r, s)
+                if near in frontier:
+                    for name, value in zip(columns, (near, far, outbound, len(v), v)):
+                        columns[name].append(value)
+        return FakeResult([columns])
+
+
+def view_of(driver, **options):
+    view = asyncio.run(hood.neighbourhood(GraphPool(driver), CENTRE, **options))
+    Neighbourhood.model_validate_json(hood.dump_neighbourhood(view))
+    return view
+
+
+def test_hub_is_collapsed_and_pruned_to_top_nodes():
+    """Verify a hub's invoices become weighted links and only the top nodes, each linked inward, are kept."""
+    invoices = [(CENTRE, gstin(i), f"INV-{i}-{k}", 100 * (i + 1)) for i in range(40) for k in range(3)]
+    invoices += [(gstin(i), gstin(100 + i), f"B-{i}", 50) for i in range(40)]  # second hop
+    view = view_of(TradeDriver(invoices), hops=2, max_nodes=10, max_links=12, detail_invoices=10)
+    nodes, links = view["nodes"], view["links"]
+
+    # 40 counterparties, and the second-hop partners of the 9 kept ones
+    assert view["truncated"] and view["totalNodes"] == 1 + 40 + 9
+    assert len(nodes["label"]) == 10 and set(nodes["kind"]) == {"TAXPAYER"}
+    # The highest-value counterparties are kept; the hub's 120 invoices stay collapsed
+    assert nodes["label"][1:4] == [gstin(39), gstin(38), gstin(37)]
+    top = list(zip(links["source"], links["target"])).index((0, 1))
+    assert links["invoices"][top] == 3 and links["value"][top] == 3 * 4000
+    assert len(links["source"]) <= 12
+    for node in range(1, 10):
+        inward = [
+            s if t == node else t
+            for s, t in zip(links["source"], links["target"])
+            if node in (s, t) and nodes["hop"][s if t == node else t] < nodes["hop"][node]
+        ]
+        assert inward, f"node {node} has no link towards the centre"
+
+    # Each node's strongest inward link outlives stronger links elsewhere
+    kept = hood.prune_links(
+        np.array([0, 0, 1, 1, 2]), np.array([1, 2, 2, 3, 3]), np.array([10, 5, 7, 1, 9]), np.array([0, 1, 1, 2]), 3
+    )
+    assert kept.tolist() == [0, 1, 4]
+    print("  [OK] Hub collapsed and pruned to top nodes")
+
+
+def test_small_neighbourhood_shows_invoices_and_rim_links():
+    """Verify few centre invoices are drawn as nodes and loops through the rim are kept."""
+    invoices = [
+        (CENTRE, gstin(1), "INV-1", 1_000),
+        (gstin(1), gstin(2), "INV-2", 900),
+        (gstin(2), CENTRE, "INV-3", 800),
+    ]
+    view = view_of(TradeDriver(invoices), hops=1, detail_invoices=5)
+    nodes, links = view["nodes"], view["links"]
+    assert nodes["label"] == [CENTRE, gstin(1), gstin(2), "INV-1", "INV-3"]
+    assert nodes["kind"] == ["TAXPAYER"] * 3 + ["INVOICE"] * 2
+    ids = {label: i for i, label in enumerate(nodes["label"])}
+    pairs = set(zip(links["source"], links["target"]))
+    assert (ids[gstin(1)], ids[gstin(2)]) in pairs  # rim link
+    assert {(0, ids["INV-1"]), (ids["INV-1"], ids[gstin(1)]), (ids[gstin(2)], ids["INV-3"])} <= pairs
+    assert nodes["value"][ids["INV-1"]] == 1_000 and nodes["value"][0] == 1_800
+
+    collapsed = view_of(TradeDriver(invoices), hops=1, detail_invoices=1)
+    assert set(collapsed["nodes"]["kind"]) == {"TAXPAYER"}
+    # Past 2**53 paise a float sum would round
+    assert hood.paise_sums([["90071992547409.93", "0.01"], []]).tolist() == [9007199254740994, 0]
+    print("  [OK] Small neighbourhood shows invoices and rim links")
+
+
+def test_rank_by_risk_and_endpoint():
+    """Verify risk ranking keeps the riskiest taxpayers, and the endpoint returns 404 for no trade."""
+    invoices = [(CENTRE, gstin(i), f"INV-{i}", 100 * (i + 1)) for i in range(5)]
+    risky = {gstin(0): 90, gstin(1): 80}
+    view = view_of(
+        TradeDriver(invoices),
+        hops=1,
+        max_nodes=3,
+        rank_by="RISK",
+        risk=lambda gstins: [risky.get(g) for g in gstins],
+        detail_invoices=0,
+    )
+    assert view["nodes"]["label"] == [CENTRE, gstin(0), gstin(1)]
+    assert view["nodes"]["risk"] == [None, 90, 80] and view["rankBy"] == "RISK"
+
+    app = create_app(graph=GraphPool(TradeDriver(invoices)), features=None)
+
+    async def scenario():
+        return (
+            await call(app, f"/graph/{CENTRE}/neighbourhood", "hops=1&max_nodes=4&detail_invoices=0"),
+            await call(app, f"/graph/{gstin(99)}/neighbourhood"),
+        )
+
+    ok, missing = asyncio.run(scenario())
+    assert ok[0] == 200 and len(json.loads(ok[2])["nodes"]["label"]) == 4
+    assert missing[0] == 404
+    print("  [OK] Rank by risk and endpoint")
+
+
+def test_contract_5_file_is_current():
+    """Verify contracts/contract_5.json matches the Neighbourhood model."""
+    path = Path(__file__).resolve().parent.parent / "contracts" / "contract_5.json"
+    assert json.loads(path.read_text()) == json.loads(json.dumps(generate_contract(), default=str))
+    print("  [OK] contract_5.json is current")
@@ -0,0 +1,188 @@
+"""
+GSTR-1 vs GSTR-2B reconciliation — hash join, tolerance bands, Contract 3 output.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.reconciliation.matching import (  # noqa: E402
+    dump_vectors,
+    invoice_key,
+    main,
+    normalize_invoice_numbers,
+    read_side,
+    reconcile,
+    reconcile_files,
+    status_counts,
+)
+from backend.reconciliation.schemas import MismatchVector, generate_contract  # noqa: E402
+
+SUPPLIER = "27AAPFU0939F1ZV"
+RECIPIENT = "29AABCU9603R1ZM"
+
+
+def side(rows):
+    """A frame of `(invoice_number, taxable_value, igst_amount)` records."""
+    return pd.DataFrame(
+        [
+            {
+                "supplier_gstin": SUPPLIER,
+                "recipient_gstin": RECIPIENT,
+                "invoice_number": number,
+                "filing_period": "012026",
+                "taxable_value": taxable,
+                "igst_amount": tax,
+            }
+            for number, taxable, tax in rows
+        ]
+    )
+
+
+def test_invoice_numbers_normalize_column_wise():
+    """Verify the column-wise invoice key equals the per-value rule, non-ASCII included."""
+    raw = ["inv/0042", "INV-42", "INV/2026/007", "0", "A-00", "000123", "", "ñ-01", "ß0", " -A--1/ ", "--", "A-0-1"]
+    assert list(normalize_invoice_numbers(raw)) == [invoice_key(v) for v in raw]
+    assert invoice_key("inv/0042") == invoice_key(" INV - 42 ") == "INV/42"
+    print("  [OK] Invoice numbers normalize column-wise")
+
+
+def test_separators_keep_distinct_invoices_apart():
+    """Verify numbers differing only in where their separators fall stay two keys, never a match."""
+    assert invoice_key("A-1/23") != invoice_key("A-12/3")
+    result = reconcile(side([("A-1/23", "100.00", "18.00")]), side([("A-12/3", "100.00", "18.00")]))
+    assert dict(zip(result["invoice_key"], result["match_status"])) == {
+        "A/1/23": "MISSING_IN_GSTR2B",
+        "A/12/3": "MISSING_IN_GSTR1",
+    }
+    print("  [OK] Separators keep distinct invoices apart")
+
+
+def test_classification_and_tolerances():
+    """Verify each key is matched, mismatched or missing, within paise tolerances."""
+    gstr1 = side(
+        [
+            ("INV/0001", "1,000.00", "180.00"),  # matched despite spelling
+            ("INV-2", "500.00", "90.00"),  # tax off by 2.00
+            ("INV-3", "100.00", "18.00"),  # missing in 2B
+            ("INV-4", "60.00", "6.00"),  # reported twice, summed
+            ("INV-4", "40.00", "3.00"),
+        ]
+    )
+    gstr2b = side(
+        [
+            ("inv 1", "1000.00", "180.00"),
+            ("INV-2", "500.00", "88.00"),
+            ("INV-4", "100.00", "9.00"),
+            ("INV-5", "10.00", "1.80"),  # missing in 1
+        ]
+    )
+    gstr2b.loc[3, "supplier_gstin"] = SUPPLIER.lower() + " "
+
+    result = reconcile(gstr1, gstr2b).set_index("invoice_key")
+    assert result["match_status"].to_dict() == {
+        "INV/1": "MATCHED",
+        "INV/2": "AMOUNT_MISMATCH",
+        "INV/3": "MISSING_IN_GSTR2B",
+        "INV/4": "MATCHED",
+        "INV/5": "MISSING_IN_GSTR1",
+    }
+    assert result.loc["INV/1", "invoice_number"] == "INV/0001"  # GSTR-1 spelling first
+    assert result.loc["INV/2", "tax_amount_difference"] == 200
+    assert result.loc["INV/4", "gstr1_taxable_value"] == 10_000
+    assert pd.isna(result.loc["INV/3", "gstr2b_tax_amount"])
+    assert result.loc["INV/5", "supplier_gstin"] == SUPPLIER
+
+    loose = reconcile(gstr1, gstr2b, {"tax_amount": 200})
+    assert status_counts(loose) == {
+        "MATCHED": 3,
+        "AMOUNT_MISMATCH": 0,
+        "MISSING_IN_GSTR2B": 1,
+        "MISSING_IN_GSTR1": 1,
+    }
+    print("  [OK] Keys classified within paise tolerances")
+
+
+def test_vectors_are_contract_3_lines(tmp_path):
+    """Verify output lines are byte-identical to MismatchVector.model_dump_json."""
+    gstr1 = tmp_path / "gstr1.csv"
+    gstr2b = tmp_path / "gstr2b.csv"
+    side([("INV-1", "100.00", "18.00"), ("INV-2", "", "5.00")]).to_csv(gstr1, index=False)
+    frame = side([("INV-1", "100.00", "16.00"), ("INV-3", "10.00", "1.80")]).drop(columns="recipient_gstin")
+    frame.rename(columns={"supplier_gstin": "supplierGstin", "igst_amount": "igstAmount"}).to_csv(gstr2b, index=False)
+
+    result = reconcile(read_side(str(gstr1), chunksize=1), read_side(str(gstr2b)))
+    lines = dump_vectors(result).splitlines()
+    assert len(lines) == 3
+    for line in lines:
+        assert MismatchVector.model_validate_json(line).model_dump_json(by_alias=True) == line
+    vectors = {v["invoiceKey"]: v for v in map(json.loads, lines)}
+    assert vectors["INV/2"]["gstr1TaxableValue"] == "0.00" and vectors["INV/2"]["gstr2bTaxableValue"] is None
+    assert vectors["INV/3"]["recipientGstin"] is None
+    assert len(dump_vectors(result, include_matched=True).splitlines()) == 3
+
+    with pytest.raises(ValueError, match="filing_period"):
+        reconcile(frame.drop(columns="filing_period"), frame)
+    print("  [OK] Mismatch vectors are Contract 3 lines")
+
+
+def test_validator_layouts_reconcile_by_period(tmp_path):
+    """Verify the validator's gstr1/gstr2b CSVs reconcile period by period, claims resolved to their supplier."""
+    gstr1 = tmp_path / "gstr1.csv"
+    gstr2b = tmp_path / "gstr2b.csv"
+    pd.DataFrame(
+        [
+            (SUPPLIER, RECIPIENT, "INV-1", "2026-01-05", "1180.00", "0.00", "0.00", "180.00", ""),
+            (SUPPLIER, RECIPIENT, "INV-2", "2026-02-10", "590.00", "45.00", "45.00", "0.00", ""),
+            (SUPPLIER, RECIPIENT, "INV-3", "2026-02-11", "118.00", "0.00", "0.00", "18.00", ""),
+        ],
+        columns=[
+            "supplier_gstin", "recipient_gstin", "invoice_number", "invoice_date", "invoice_value",
+            "cgst_amount", "sgst_amount", "igst_amount", "irn",
+        ],
+    ).to_csv(gstr1, index=False)
+    pd.DataFrame(
+        [
+            (RECIPIENT, "inv/1", "180.00", "012026"),
+            (RECIPIENT.lower(), "INV-2", "80.00", "022026"),  # 10.00 short
+            (RECIPIENT, "GHOST-9", "50.00", "012026"),  # filed by no supplier
+        ],
+        columns=["recipient_gstin", "invoice_number", "itc_claimed", "claim_period"],
+    ).to_csv(gstr2b, index=False)
+
+    periods = list(reconcile_files(str(gstr1), str(gstr2b), chunksize=2))
+    assert [period for period, _, _ in periods] == ["012026", "022026"]
+    result = pd.concat([result for _, result, _ in periods]).set_index("invoice_key")
+    assert result["match_status"].to_dict() == {
+        "INV/1": "MATCHED",
+        "INV/2": "AMOUNT_MISMATCH",
+        "INV/3": "MISSING_IN_GSTR2B",
+    }
+    assert result.loc["INV/1", "gstr1_taxable_value"] == 100_000
+    assert pd.isna(result.loc["INV/1", "gstr2b_taxable_value"])
+    assert result.loc["INV/1", "taxable_value_difference"] == 0
+    assert result.loc["INV/2", "supplier_gstin"] == SUPPLIER
+    assert result.loc["INV/2", "tax_amount_difference"] == 1_000
+    unresolved = pd.concat([claims for _, _, claims in periods])
+    assert unresolved.to_dict("records") == [
+        {"recipient_gstin": RECIPIENT, "invoice_number": "GHOST-9", "filing_period": "012026", "tax_amount": "50.00"}
+    ]
+
+    output = tmp_path / "vectors.ndjson"
+    main([str(gstr1), str(gstr2b), "-o", str(output)])
+    assert len(output.read_text().splitlines()) == 2
+    assert "GHOST-9" in (tmp_path / "vectors.unresolved.csv").read_text()
+    print("  [OK] Validator layouts reconcile by period")
+
+
+def test_contract_3_file_is_current():
+    """Verify contracts/contract_3.json matches the MismatchVector model."""
+    path = Path(__file__).resolve().parent.parent / "contracts" / "contract_3.json"
+    assert json.loads(path.read_text()) == json.loads(json.dumps(generate_contract(), default=str))
+    print("  [OK] contract_3.json is current")
@@ -8,7 +8,7 @@ JSON serialization produces contract-compliant output.
 
 import json
 import sys
-from datetime import date, datetime
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from pathlib import Path
 
@@ -22,6 +22,8 @@ from backend.ingestion.schemas import (
     ReturnFiling,
     Taxpayer,
 )
+from backend.ingestion.money import parse_money
+from backend.ingestion.serializer import dump_columns, dump_models
 from backend.ingestion.schemas.enums import (
     DocumentType,
     GSTRegistrationStatus,
@@ -265,6 +267,107 @@ def test_validation_errors():
     print("  ✅ Validation error handling OK (3/3 caught)")
 
 
+def bulk_samples():
+    """Models covering optional fields, awkward strings, amounts and offsets."""
+    taxpayers = [
+        Taxpayer(
+            gstin="27AAPFU0939F1ZV",
+            legal_name=name,
+            trade_name=trade,
+            registration_type=GSTRegistrationType.REGULAR,
+            registration_status=GSTRegistrationStatus.ACTIVE,
+            registration_date=date(2017, 7, 1),
+            cancellation_date=cancelled,
+            state_code="27",
+            pan="AAPFU0939F",
+        )
+        for name, trade, cancelled in [
+            ('Quote "Co" \\ Sons', None, None),
+            ("Tab\tNew\nline \x00\x1f\x7f", "TradeCo", date(2024, 3, 31)),
+            ("Ünïcödé 商号 😀 </script> \u2028", "", None),
+        ]
+    ]
+    invoices = [
+        Invoice(
+            invoice_number=f"INV-{i}",
+            invoice_date=date(2026, 1, 15 + i),
+            invoice_type=InvoiceType.B2B,
+            invoice_status=InvoiceStatus.ACTIVE,
+            supply_type=SupplyType.INTRA_STATE,
+            document_type=DocumentType.INV,
+            supplier_gstin="27AAPFU0939F1ZV",
+            recipient_gstin=recipient,
+            taxable_value=Decimal(taxable),
+            igst_amount=Decimal("0"),
+            cgst_amount=Decimal("9.5"),
+            sgst_amount=Decimal("9.50"),
+            cess_amount=Decimal("0.00"),
+            total_value=Decimal(total),
+            place_of_supply="27",
+            reverse_charge=reverse,
+            irn=irn,
+            filing_period="012026",
+        )
+        for i, (recipient, taxable, total, reverse, irn) in enumerate(
+            [
+                ("29AABCU9603R1ZM", "100000.00", "100019.00", False, None),
+                (None, "1E+3", "1019", True, "b" * 64),
+                (None, "12.", "31.000", False, ""),
+            ]
+        )
+    ]
+    irns = [
+        IRN(
+            irn="a" * 64,
+            irn_date=irn_date,
+            irn_status=IRNStatus.ACTIVE,
+            invoice_number="INV-2026-001",
+            supplier_gstin="27AAPFU0939F1ZV",
+            document_type=DocumentType.INV,
+            signed_invoice=None,
+            signed_qr_code="qr",
+            ack_number="ACK123456789",
+            ack_date=datetime(2026, 1, 15, 10, 30, 5, 120),
+            cancellation_date=cancelled,
+            cancellation_reason=None,
+        )
+        for irn_date, cancelled in [
+            (datetime(2026, 1, 15, 10, 30, 0), None),
+            (
+                datetime(2026, 1, 15, tzinfo=timezone.utc),
+                datetime(2026, 2, 1, 9, 0, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+            ),
+            (datetime(2026, 1, 15, tzinfo=timezone(timedelta(hours=-3, seconds=5))), None),
+        ]
+    ]
+    return {Taxpayer: taxpayers, Invoice: invoices, IRN: irns}
+
+
+def test_bulk_serializer_matches_model_dump_json():
+    """Verify dump_models() is byte-identical to per-object model_dump_json."""
+    for model, instances in bulk_samples().items():
+        expected = "".join(m.model_dump_json(by_alias=True) + "\n" for m in instances)
+        assert dump_models(model, instances) == expected, model.__name__
+        for line in dump_models(model, instances).splitlines():
+            assert model.model_validate_json(line).model_dump_json(by_alias=True) == line
+    assert dump_models(Invoice, []) == ""
+    print("  [OK] Bulk serializer matches model_dump_json")
+
+
+def test_bulk_serializer_from_columns():
+    """Verify a columnar frame with paise amounts renders the same lines."""
+    invoices = bulk_samples()[Invoice]
+    columns = {name: [getattr(inv, name) for inv in invoices] for name in Invoice.model_fields}
+    for name in ("taxable_value", "cgst_amount", "total_value"):
+        columns[name] = parse_money([str(value) for value in columns[name]])
+    # Enum fields may be given as their raw values
+    columns["invoice_type"] = ["B2B"] * len(invoices)
+
+    expected = "".join(inv.model_dump_json(by_alias=True) + "\n" for inv in invoices)
+    assert dump_columns(Invoice, columns) == expected
+    print("  [OK] Bulk serializer renders columnar frames")
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("CONTRACT v1.0.0 -- Schema Verification")
@@ -277,6 +380,8 @@ if __name__ == "__main__":
     sample_return = test_return_filing_serialization()
     sample_payment = test_payment_serialization()
     sample_irn = test_irn_serialization()
+    test_bulk_serializer_matches_model_dump_json()
+    test_bulk_serializer_from_columns()
 
     # 2. Validation tests
     print("\n[VALIDATION TESTS]")
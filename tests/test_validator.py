@@ -0,0 +1,165 @@
+"""
+Dataset validator — full-load vs. streaming equivalence.
+
+Writes a small set of generated_data CSVs with injected defects and checks
+that every execution mode of scripts/validator.py produces the same report.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add scripts/ to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import validator  # noqa: E402
+
+
+def write_datasets(data_dir: Path):
+    """Write the five required CSVs with a handful of known defects."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(
+        {"gstin": ["27AAPFU0939F1ZV", "29AABCU9603R1ZM", "BADGSTIN"]}
+    ).to_csv(data_dir / "taxpayers.csv", index=False)
+    pd.DataFrame(
+        {
+            "supplier_gstin": ["27AAPFU0939F1ZV"] * 4 + ["29AABCU9603R1ZM"] * 3,
+            "recipient_gstin": ["29AABCU9603R1ZM"] * 6 + ["33AAACX0000A1ZQ"],
+            # a duplicate split across chunks and two null invoice numbers
+            "invoice_number": ["INV-1", "INV-2", None, "INV-4", "INV-1", None, "00123"],
+            "invoice_date": ["2026-01-15", "2026-01-16", "2025-12-31", "15/01/2026",
+                             "2026-01-17", "2026-01-18", "2026-01-19"],
+            "invoice_value": [118.0, 236.0, 100.0, 50.0, 10.0, -5.0, 1180.0],
+            "cgst_amount": [9.0, 18.0, 0.0, 0.0, 9.0, 0.0, 90.0],
+            "sgst_amount": [9.0, 18.0, 0.0, 0.0, 9.0, 0.0, 90.0],
+            "igst_amount": [0.0, 0.0, 18.0, 9.0, 0.0, 0.0, 0.0],
+            "irn": ["a" * 64, "", "", "b" * 64, "", "", ""],
+        }
+    ).to_csv(data_dir / "gstr1.csv", index=False)
+    pd.DataFrame(
+        {
+            "recipient_gstin": ["29AABCU9603R1ZM", "29AABCU9603R1ZM"],
+            "invoice_number": ["INV-1", "INV-404"],
+            "itc_claimed": [18.0, 18.0],
+            "claim_period": ["012026", "132026"],
+        }
+    ).to_csv(data_dir / "gstr2b.csv", index=False)
+    pd.DataFrame(
+        {"supplier_gstin": ["27AAPFU0939F1ZV"], "tax_paid": [18.0], "return_period": ["012026"]}
+    ).to_csv(data_dir / "payments.csv", index=False)
+    pd.DataFrame(
+        {
+            "irn": ["a" * 64, "c" * 64],
+            "invoice_number": ["INV-1", "INV-9"],
+            "generation_timestamp": ["2026-01-15T10:30:00", "2026-01-15 25:00"],
+            "status": ["ACTIVE", "VOID"],
+        }
+    ).to_csv(data_dir / "einvoice.csv", index=False)
+
+
+def full_load_report(data_dir):
+    report = validator.ValidationReport()
+    dfs, missing = validator.load_datasets(str(data_dir))
+    assert not missing
+    validator.run_checks(report, validator.build_checks(), dfs)
+    return report
+
+
+def test_streaming_matches_full_load(tmp_path):
+    """Verify --chunksize streaming yields the exact full-load report."""
+    write_datasets(tmp_path)
+    expected = full_load_report(tmp_path)
+    assert expected.fails and expected.warnings
+
+    for chunksize in (1, 2, 3, 1000):
+        report = validator.ValidationReport()
+        row_counts = validator.run_checks_streaming(
+            report, validator.build_checks(), chunksize, str(tmp_path)
+        )
+        assert report.passes == expected.passes
+        assert report.fails == expected.fails
+        assert report.warnings == expected.warnings
+        assert row_counts["gstr1"] == 7
+    print("  [OK] Streaming report matches full load")
+
+
+def test_check_functions_match_registry(tmp_path):
+    """Verify the per-check functions still produce the registry report."""
+    write_datasets(tmp_path)
+    expected = full_load_report(tmp_path)
+    dfs, _ = validator.load_datasets(str(tmp_path))
+
+    report = validator.ValidationReport()
+    validator.check_gstin_format(report, dfs)
+    validator.check_iso_dates(report, dfs)
+    validator.check_monetary_decimals(report, dfs)
+    validator.check_invoice_tax_sum(report, dfs)
+    validator.check_invoice_total_value(report, dfs)
+    validator.check_financial_year_derivation(report, dfs)
+    validator.check_foreign_key_resolution(report, dfs)
+    validator.check_duplicate_invoices(report, dfs)
+    validator.check_irn_linkage(report, dfs)
+    validator.check_return_payment_completeness(report, dfs)
+
+    assert report.passes == expected.passes
+    assert report.fails == expected.fails
+    assert report.warnings == expected.warnings
+    print("  [OK] Check functions match registry")
+
+
+def test_plan_computes_shared_derivations_once(tmp_path, monkeypatch):
+    """Verify each derivation runs once per dataset however many checks use it."""
+    write_datasets(tmp_path)
+    dfs, _ = validator.load_datasets(str(tmp_path))
+    calls = {}
+
+    for name, (fn, inputs) in list(validator.DERIVATIONS.items()):
+        def counted(chunk, col, _fn=fn, _name=name):
+            calls[(_name, col)] = calls.get((_name, col), 0) + 1
+            return _fn(chunk, col)
+        monkeypatch.setitem(validator.DERIVATIONS, name, (counted, inputs))
+
+    plan = validator.CheckPlan()
+    # supplier_gstin feeds the GSTIN regex, FK and payment-completeness checks
+    assert plan.requirements["gstr1"].count(("values", "supplier_gstin")) == 1
+    plan.consume("gstr1", dfs["gstr1"])
+
+    assert calls[("values", "supplier_gstin")] == 1
+    assert calls[("values", "invoice_number")] == 1
+    assert calls[("tax_sum", None)] == 1
+    assert all(count == 1 for count in calls.values())
+    print("  [OK] Shared derivations computed once")
+
+
+def test_iso_timestamp_validity_matches_fromisoformat():
+    """Verify the column-wise timestamp check accepts exactly what fromisoformat does."""
+    values = [
+        "2026-01-15", "2026-01-15T10:30", "2026-01-15 10:30:00", "2026-01-15T10:30:00.5",
+        "2026-01-15T10:30:00.123456", "2026-01-15T10:30:00.1234567", "2024-02-29T00:00:00",
+        "2026-02-29T00:00:00", "2100-02-29", "0000-01-01", "0001-01-01", "2026-13-01",
+        "2026-01-15T24:00:00", "2026-01-15T10:60", "2026-01-15T10:30:60", "2026-01-15x10:30",
+        "20260115", "2026-01-15T10:30:00+05:30", "2026-01-15T10:30:00Z", "2026-1-15",
+        "２０２６-01-15", "2026-01-15\x00", " 2026-01-15", "", "n/a",
+    ]
+    expected = [validator._fromisoformat_ok(v) for v in values]
+    assert list(validator.iso_timestamp_validity(values)) == expected
+    print("  [OK] Column-wise timestamps match fromisoformat")
+
+
+def test_parallel_matches_serial(tmp_path):
+    """Verify --workers merges per-dataset results into the serial report."""
+    write_datasets(tmp_path)
+    expected = full_load_report(tmp_path)
+
+    for chunksize in (None, 2):
+        report = validator.ValidationReport()
+        row_counts = validator.run_checks_parallel(
+            report, validator.build_checks(), 2, chunksize, str(tmp_path)
+        )
+        assert report.passes == expected.passes
+        assert report.fails == expected.fails
+        assert report.warnings == expected.warnings
+        assert list(row_counts) == list(validator.REQUIRED_FILES)
+        assert row_counts["gstr1"] == 7
+    print("  [OK] Parallel report matches serial run")